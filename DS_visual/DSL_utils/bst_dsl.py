@@ -1,5 +1,8 @@
 from tkinter import messagebox
 
+# create 的值超过这个数量时不再逐个动画插入，而是直接平衡构建
+CREATE_ANIMATION_LIMIT = 20
+
 def _split_items_from_args(args):
     items = []
     for tok in args:
@@ -42,6 +45,17 @@ def process(vis, text):
         items = _split_items_from_args(args)
         vis.clear_canvas()
         vis.input_var.set(",".join(items))
-        vis.start_insert_animated()
+        if len(items) > CREATE_ANIMATION_LIMIT and hasattr(vis, "build_balanced_direct"):
+            vis.build_balanced_direct()
+        else:
+            vis.start_insert_animated()
+        return
+    if cmd in ("build", "balanced"):
+        items = _split_items_from_args(args)
+        vis.input_var.set(",".join(items))
+        vis.build_balanced_direct()
+        return
+    if cmd == "rebalance":
+        vis.rebalance_tree()
         return
     return
@@ -1,25 +1,57 @@
-from typing import Any, Optional, List, Tuple, Dict
+from typing import Any, Iterable, Iterator, Optional, List, Tuple, Dict
 import copy
+import functools
+import heapq
+import itertools
+import weakref
+
+try:
+    from binary_tree.tree_iter import iter_inorder, iter_range
+    from binary_tree.tree_keys import float_key, compare_keys
+except ImportError:  # 以 DS_visual.avl... 方式导入时 (测试)
+    from DS_visual.binary_tree.tree_iter import iter_inorder, iter_range
+    from DS_visual.binary_tree.tree_keys import float_key, compare_keys
+
+# 节点编号：进程内唯一且不会复用 (id(self) 在节点被回收后可能分给新节点)
+_node_ids = itertools.count(1)
+
 
 class AVLNode:
     def __init__(self, val: Any):
-        self.val = val
+        self.val = val  # 同时算出比较键 key
         self.left: Optional['AVLNode'] = None
         self.right: Optional['AVLNode'] = None
         self.parent: Optional['AVLNode'] = None
         self.height: int = 1
-        self.id = id(self)
+        self.id = next(_node_ids)
+        # 副本 (clone_tree / 快照日志重建) 对应的模型节点的 id；模型中的节点为 None
+        self.orig_id: Optional[int] = None
+
+    @property
+    def val(self) -> Any:
+        return self._val
+
+    @val.setter
+    def val(self, value: Any):
+        # 比较键只在值改变时计算一次 (删除时与后继交换值也会经过这里)
+        self._val = value
+        self.key = float_key(value)
+
+    @property
+    def stable_id(self) -> int:
+        """跨快照不变的节点标识：副本取 orig_id，模型中的节点取自身 id (布局 / 动画用作键)"""
+        return self.orig_id if self.orig_id is not None else self.id
 
     def __repr__(self):
         return f"AVLNode({self.val})"
 
 def clone_tree(node: Optional[AVLNode]) -> Optional[AVLNode]:
-    """深拷贝一棵树（复制 val, 结构、height；parent 指针在重建时会被正确设置）"""
+    """深拷贝一棵树（复制 val, 结构、height；parent 指针在重建时会被正确设置；orig_id 指向原节点）"""
     if node is None:
         return None
-    # 使用递归复制节点（不保留原 id）
     new_node = AVLNode(node.val)
     new_node.height = node.height
+    new_node.orig_id = node.stable_id
     new_node.left = clone_tree(node.left)
     new_node.right = clone_tree(node.right)
     if new_node.left:
@@ -28,14 +60,158 @@ def clone_tree(node: Optional[AVLNode]) -> Optional[AVLNode]:
         new_node.right.parent = new_node
     return new_node
 
+class _Journal:
+    """
+    模型的修改日志：按时间分段，每段记录 节点 -> 该段内第一次修改前的字段
+    (left, right, parent, height, val)。段的绝对编号 = base + 列表下标。
+    """
+
+    def __init__(self, base: int = 0):
+        self.base = base
+        self.segments: List[Dict[AVLNode, tuple]] = [{}]
+
+
+class AVLSnapshotLog:
+    """
+    insert_with_steps / delete_with_steps 返回的快照序列 (增量日志，代替每步 clone_tree)
+
+    用法与原来的快照列表相同：len(log)、log[i] (可为负数)、遍历；log[i] 在访问时才
+    重建出第 i 个检查点时整棵树的副本 (与 clone_tree 的结果一样，O(n))。
+
+    日志本身只保存每个检查点时的根和它在模型修改日志中的段号；结构变化 (链接改写、
+    高度更新、删除时交换值) 以节点对象为稳定标识记在模型的修改日志里，一次操作 O(log n)。
+    只要快照日志仍被引用，模型之后的修改也继续记录，所以旧快照始终可以重建。
+    """
+
+    def __init__(self, journal: _Journal):
+        self._journal = journal
+        self._roots: List[Optional[AVLNode]] = []
+        self._marks: List[int] = []  # 每个检查点开始的段号
+
+    def _checkpoint(self, root: Optional[AVLNode]) -> None:
+        journal = self._journal
+        journal.segments.append({})
+        self._roots.append(root)
+        self._marks.append(journal.base + len(journal.segments) - 1)
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def __getitem__(self, i: int) -> Optional[AVLNode]:
+        if i < 0:
+            i += len(self._roots)
+        if not 0 <= i < len(self._roots):
+            raise IndexError("snapshot index out of range")
+        return self.reconstruct(i)
+
+    def __iter__(self):
+        return (self.reconstruct(i) for i in range(len(self._roots)))
+
+    def touched(self, i: int) -> List[AVLNode]:
+        """检查点 i 到 i+1 之间被修改过的 (模型中的) 节点"""
+        if i + 1 >= len(self._roots):
+            return []
+        journal = self._journal
+        seen: Dict[AVLNode, None] = {}
+        for seg in journal.segments[self._marks[i] - journal.base:self._marks[i + 1] - journal.base]:
+            seen.update(dict.fromkeys(seg))
+        return list(seen)
+
+    def reconstruct(self, i: int) -> Optional[AVLNode]:
+        """重建第 i 个检查点时的树 (新节点，parent 已设置，orig_id 为模型节点的 id)，不修改模型"""
+        root = self._roots[i]
+        if root is None:
+            return None
+        # 从最新一段往回覆盖，最后留下的是检查点 i 之后第一次修改前的字段
+        journal = self._journal
+        overlay: Dict[AVLNode, tuple] = {}
+        for seg in reversed(journal.segments[self._marks[i] - journal.base:]):
+            overlay.update(seg)
+
+        def fields(node: AVLNode) -> tuple:
+            saved = overlay.get(node)
+            return saved if saved is not None else (node.left, node.right, node.parent, node.height, node._val)
+
+        left, right, _, height, val = fields(root)
+        new_root = AVLNode(val)
+        new_root.height = height
+        new_root.orig_id = root.id
+        stack = [(new_root, left, right)]
+        while stack:
+            copy_node, left, right = stack.pop()
+            for child, side in ((left, "left"), (right, "right")):
+                if child is None:
+                    continue
+                c_left, c_right, _, c_height, c_val = fields(child)
+                new_child = AVLNode(c_val)
+                new_child.height = c_height
+                new_child.orig_id = child.id
+                new_child.parent = copy_node
+                setattr(copy_node, side, new_child)
+                stack.append((new_child, c_left, c_right))
+        return new_root
+
+
+def _log_released(model_ref: 'weakref.ref', _log_ref: 'weakref.ref') -> None:
+    """快照日志被回收时的回调：没有存活的日志后停止记录修改"""
+    model = model_ref()
+    if model is not None:
+        model._release_logs()
+
+
 class AVLModel:
     def __init__(self):
         self.root: Optional[AVLNode] = None
+        # 修改日志只在有快照日志存活时记录 (否则为 None，修改树没有额外开销)
+        self._journal: Optional[_Journal] = None
+        # 存活的快照日志：(起始段号, 序号, 弱引用) 的最小堆，堆顶决定日志可以裁掉多少
+        self._live_logs: List[tuple] = []
+        self._log_counter = 0
+
+    def _touch(self, *nodes: Optional[AVLNode]) -> None:
+        """修改节点字段之前调用：有快照日志存活时记下修改前的字段"""
+        journal = self._journal
+        if journal is None:
+            return
+        seg = journal.segments[-1]
+        for node in nodes:
+            if node is not None and node not in seg:
+                seg[node] = (node.left, node.right, node.parent, node.height, node._val)
+
+    def _release_logs(self) -> None:
+        """丢弃已被回收的快照日志，并裁掉不再需要的修改日志前缀"""
+        live = self._live_logs
+        while live and live[0][2]() is None:
+            heapq.heappop(live)
+        journal = self._journal
+        if journal is None:
+            return
+        if not live:
+            self._journal = None
+            return
+        drop = live[0][0] - journal.base
+        if drop > 0:
+            del journal.segments[:drop]
+            journal.base += drop
+
+    def _new_log(self) -> AVLSnapshotLog:
+        self._release_logs()
+        if self._journal is None:
+            self._journal = _Journal()
+        log = AVLSnapshotLog(self._journal)
+        start = self._journal.base + len(self._journal.segments)  # 第一个检查点的段号
+        self._log_counter += 1
+        # 快照日志被回收时立即裁剪 / 释放修改日志 (回调只弱引用模型)
+        heapq.heappush(self._live_logs, (start, self._log_counter,
+                                         weakref.ref(log, functools.partial(_log_released, weakref.ref(self)))))
+        return log
 
     def _height(self, node: Optional[AVLNode]) -> int:
         return node.height if node else 0
 
     def _update_height(self, node: AVLNode):
+        if self._journal is not None:
+            self._touch(node)
         node.height = 1 + max(self._height(node.left), self._height(node.right))
 
     def _balance_factor(self, node: AVLNode) -> int:
@@ -44,27 +220,9 @@ class AVLModel:
     def _compare(self, val1: Any, val2: Any) -> int:
         """比较两个值，优先按数字比较，失败则按字符串比较
         返回: -1 if val1 < val2, 0 if val1 == val2, 1 if val1 > val2
+        (树内的比较直接使用节点上预计算的 key，见 binary_tree.tree_keys)
         """
-        try:
-            # 尝试转换为数字进行比较
-            num1 = float(val1)
-            num2 = float(val2)
-            if num1 < num2:
-                return -1
-            elif num1 > num2:
-                return 1
-            else:
-                return 0
-        except (ValueError, TypeError):
-            # 转换失败，使用字符串比较
-            str1 = str(val1)
-            str2 = str(val2)
-            if str1 < str2:
-                return -1
-            elif str1 > str2:
-                return 1
-            else:
-                return 0
+        return compare_keys(float_key(val1), float_key(val2))
 
     # rotations (same as before)
     def _rotate_right(self, z: AVLNode) -> AVLNode:
@@ -72,6 +230,8 @@ class AVLModel:
         if y is None:
             return z
         T3 = y.right
+        if self._journal is not None:
+            self._touch(z, y, T3, z.parent)
         y.right = z
         z.left = T3
         parent = z.parent
@@ -93,6 +253,8 @@ class AVLModel:
         if y is None:
             return z
         T2 = y.left
+        if self._journal is not None:
+            self._touch(z, y, T2, z.parent)
         y.left = z
         z.right = T2
         parent = z.parent
@@ -109,54 +271,181 @@ class AVLModel:
         self._update_height(y)
         return y
 
-    def insert_with_steps(self, val: Any) -> Tuple[AVLNode, List[AVLNode], List[Dict], List[Optional[AVLNode]]]:
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any]) -> 'AVLModel':
+        """
+        O(n) 批量构建：keys 已按 _compare 的顺序排好 (允许重复)，每个区间取中点作根，
+        得到完全平衡的树 (左右子树大小至多差 1)，height 和 parent 同时设好。
+        大小为 m 的子树高度恰为 m.bit_length()。
+
+        Raises:
+            ValueError: keys 没有排好序
+        """
+        model = cls()
+        nodes = [AVLNode(k) for k in keys]
+        for i in range(1, len(nodes)):
+            if compare_keys(nodes[i - 1].key, nodes[i].key) > 0:
+                raise ValueError(f"from_sorted: keys not sorted at index {i} "
+                                 f"({nodes[i - 1].val!r} > {nodes[i].val!r})")
+        n = len(nodes)
+        stack: List[Tuple[int, int, Optional[AVLNode], bool]] = [(0, n - 1, None, False)] if n else []
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            node.height = (hi - lo + 1).bit_length()
+            node.parent = parent
+            if parent is None:
+                model.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if lo < mid:
+                stack.append((lo, mid - 1, node, True))
+            if mid < hi:
+                stack.append((mid + 1, hi, node, False))
+        return model
+
+    # ==================== 无动画的快速路径 (不记录路径 / 旋转 / 快照) ====================
+
+    def _rebalance(self, node: Optional[AVLNode]) -> None:
+        """从 node 向上更新高度并在失衡处旋转；某个节点高度不变且平衡时，祖先都不会变，提前停止"""
+        while node:
+            old_height = node.height
+            self._update_height(node)
+            bf = self._balance_factor(node)
+            if bf > 1:
+                if self._balance_factor(node.left) < 0:
+                    self._rotate_left(node.left)   # LR
+                node = self._rotate_right(node)
+                if node.parent is None:
+                    self.root = node
+            elif bf < -1:
+                if self._balance_factor(node.right) > 0:
+                    self._rotate_right(node.right)  # RL
+                node = self._rotate_left(node)
+                if node.parent is None:
+                    self.root = node
+            elif node.height == old_height:
+                return
+            node = node.parent
+
+    def insert(self, val: Any) -> AVLNode:
+        """插入 (与 insert_with_steps 的结果相同，但不记录步骤)，返回新节点"""
+        new_node = AVLNode(val)
+        cur = self.root
+        if cur is None:
+            self.root = new_node
+            return new_node
+        key = new_node.key
+        while True:
+            if compare_keys(key, cur.key) < 0:
+                if cur.left is None:
+                    self._touch(cur)
+                    cur.left = new_node
+                    break
+                cur = cur.left
+            else:
+                if cur.right is None:
+                    self._touch(cur)
+                    cur.right = new_node
+                    break
+                cur = cur.right
+        new_node.parent = cur
+        self._rebalance(cur)
+        return new_node
+
+    def insert_many(self, values: Iterable[Any]) -> int:
+        """依次插入多个值 (批量 / 加载时使用)，返回插入的个数"""
+        count = 0
+        for val in values:
+            self.insert(val)
+            count += 1
+        return count
+
+    def delete(self, val: Any) -> bool:
+        """删除第一个等于 val 的节点 (与 delete_with_steps 的结果相同，但不记录步骤)；返回是否找到"""
+        key = float_key(val)
+        target = self.root
+        while target:
+            cmp = compare_keys(key, target.key)
+            if cmp == 0:
+                break
+            target = target.left if cmp < 0 else target.right
+        if target is None:
+            return False
+        if target.left and target.right:
+            succ = target.right
+            while succ.left:
+                succ = succ.left
+            self._touch(target, succ)
+            target.val, succ.val = succ.val, target.val
+            target = succ
+        child = target.left if target.left else target.right
+        parent = target.parent
+        self._touch(child, parent)
+        if child:
+            child.parent = parent
+        if parent is None:
+            self.root = child
+        elif parent.left is target:
+            parent.left = child
+        else:
+            parent.right = child
+        self._rebalance(parent)
+        return True
+
+    def insert_with_steps(self, val: Any) -> Tuple[AVLNode, List[AVLNode], List[Dict], AVLSnapshotLog]:
         """
         插入并返回丰富信息：
           - inserted_node: 新插入的节点引用 (在 current model 中)
           - path_nodes: 插入时访问的节点（按顺序，便于可视化搜索路径）
           - rotations: list of rotation dicts: { type:'LL'|'RR'|'LR'|'RL', 'z':z_node, 'y':y_node, 'x':x_node, 'new_root':new_subroot }
-          - snapshots: list of tree-roots 的 clone：
+          - snapshots: AVLSnapshotLog，按下标访问时才重建对应的树 (clone)：
                 snapshots[0] = tree 在插入前的 clone (可为 None)
                 snapshots[1] = tree 在插入后但尚未旋转（clone）
                 snapshots[2..] = tree 每次旋转后对应的 clone（按 rotations 顺序）
         注意：快照中的节点为 clone（id 不同），仅用于可视化（位置计算）；path_nodes/rotations 中的节点是 model 中的真实节点。
+        记录快照只需 O(log n)，不再每步复制整棵树。
         """
         rotations: List[Dict] = []
         path_nodes: List[AVLNode] = []
-        snapshots: List[Optional[AVLNode]] = []
+        log = self._new_log()
 
         # snapshot before any modification
-        snapshots.append(clone_tree(self.root))
+        log._checkpoint(self.root)
 
         # normal BST insert (record path)
         if self.root is None:
             self.root = AVLNode(val)
             path_nodes.append(self.root)
             # snapshot after insertion (no rotations)
-            snapshots.append(clone_tree(self.root))
-            return self.root, path_nodes, rotations, snapshots
+            log._checkpoint(self.root)
+            return self.root, path_nodes, rotations, log
 
+        key = float_key(val)
         cur = self.root
         parent = None
+        go_left = False
         while cur:
             parent = cur
             path_nodes.append(cur)
-            if self._compare(val, cur.val) < 0:
-                cur = cur.left
-            else:
-                cur = cur.right
+            go_left = compare_keys(key, cur.key) < 0
+            cur = cur.left if go_left else cur.right
 
         # attach new node
         new_node = AVLNode(val)
         new_node.parent = parent
-        if self._compare(val, parent.val) < 0:
+        self._touch(parent)
+        if go_left:
             parent.left = new_node
         else:
             parent.right = new_node
         path_nodes.append(new_node)
 
         # snapshot immediately after insertion (before rotations)
-        snapshots.append(clone_tree(self.root))
+        log._checkpoint(self.root)
 
         # rebalance upwards, record rotations and snapshot after each rotation
         node = new_node.parent
@@ -173,7 +462,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'LL', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -187,7 +476,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'LR', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -200,7 +489,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'RR', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -214,13 +503,13 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'RL', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
             node = node.parent
 
-        return new_node, path_nodes, rotations, snapshots
+        return new_node, path_nodes, rotations, log
 
     def search_with_steps(self, val: Any) -> Tuple[Optional[AVLNode], List[AVLNode], bool]:
         """
@@ -231,10 +520,11 @@ class AVLModel:
         """
         path_nodes: List[AVLNode] = []
         
+        key = float_key(val)
         cur = self.root
         while cur:
             path_nodes.append(cur)
-            cmp = self._compare(val, cur.val)
+            cmp = compare_keys(key, cur.key)
             if cmp == 0:
                 # 找到了
                 return cur, path_nodes, True
@@ -246,13 +536,27 @@ class AVLModel:
         # 未找到
         return None, path_nodes, False
 
-    def delete_with_steps(self, val: Any) -> Tuple[Optional[AVLNode], List[AVLNode], List[Dict], List[Optional[AVLNode]]]:
+    # ==================== 惰性遍历 / 区间扫描 (沿 parent 指针，无递归) ====================
+
+    def iter_nodes(self) -> Iterator[AVLNode]:
+        """按中序惰性产出节点"""
+        return iter_inorder(self.root)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (node.val for node in iter_inorder(self.root))
+
+    def range(self, lo: Any, hi: Any) -> Iterator[Any]:
+        """按中序惰性产出 lo <= 值 <= hi 的值 (按 _compare 比较)，区间外的子树不会访问"""
+        return (node.val for node in
+                iter_range(self.root, float_key(lo), float_key(hi), compare_keys, attr="key"))
+
+    def delete_with_steps(self, val: Any) -> Tuple[Optional[AVLNode], List[AVLNode], List[Dict], AVLSnapshotLog]:
         """
         删除并返回丰富信息：
           - deleted_node: 被删除的节点引用 (在 current model 中)，若未找到则为 None
           - path_nodes: 查找过程中访问的节点（按顺序，便于可视化搜索路径）
           - rotations: list of rotation dicts: { type:'LL'|'RR'|'LR'|'RL', 'z':z_node, 'y':y_node, 'x':x_node, 'new_root':new_subroot }
-          - snapshots: list of tree-roots 的 clone：
+          - snapshots: AVLSnapshotLog，按下标访问时才重建对应的树 (clone)：
                 snapshots[0] = tree 在删除前的 clone (可为 None)
                 snapshots[1] = tree 在删除后但尚未旋转（clone）
                 snapshots[2..] = tree 每次旋转后对应的 clone（按 rotations 顺序）
@@ -260,16 +564,17 @@ class AVLModel:
         """
         rotations: List[Dict] = []
         path_nodes: List[AVLNode] = []
-        snapshots: List[Optional[AVLNode]] = []
+        log = self._new_log()
 
         # snapshot before any modification
-        snapshots.append(clone_tree(self.root))
+        log._checkpoint(self.root)
 
         # search for node
+        key = float_key(val)
         cur = self.root
         while cur:
             path_nodes.append(cur)
-            cmp = self._compare(val, cur.val)
+            cmp = compare_keys(key, cur.key)
             if cmp == 0:
                 break
             elif cmp < 0:
@@ -279,7 +584,7 @@ class AVLModel:
 
         if cur is None:
             # not found
-            return None, path_nodes, rotations, snapshots
+            return None, path_nodes, rotations, log
 
         # cur is the node to delete (may have two children)
         target = cur
@@ -292,6 +597,7 @@ class AVLModel:
                 succ = succ.left
                 path_nodes.append(succ)
             # swap values
+            self._touch(target, succ)
             target.val, succ.val = succ.val, target.val
             # now delete succ (which has at most one child)
             target = succ
@@ -299,6 +605,7 @@ class AVLModel:
         # Now target has at most one child
         child = target.left if target.left else target.right
         parent = target.parent
+        self._touch(child, parent)
 
         if child:
             child.parent = parent
@@ -313,7 +620,7 @@ class AVLModel:
                 parent.right = child
 
         # snapshot immediately after deletion (before rotations)
-        snapshots.append(clone_tree(self.root))
+        log._checkpoint(self.root)
 
         # Rebalance upwards from parent
         node = parent
@@ -330,7 +637,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'LL', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -344,7 +651,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'LR', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -357,7 +664,7 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'RR', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
@@ -371,10 +678,209 @@ class AVLModel:
                 if new_subroot.parent is None:
                     self.root = new_subroot
                 rotations.append({'type':'RL', 'z':z, 'y':y, 'x':x, 'new_root':new_subroot})
-                snapshots.append(clone_tree(self.root))
+                log._checkpoint(self.root)
                 node = new_subroot.parent
                 continue
 
             node = node.parent
 
-        return target, path_nodes, rotations, snapshots
\ No newline at end of file
+        return target, path_nodes, rotations, log
+    # ==================== join / split 与集合运算 ====================
+    #
+    # 以下方法直接复用并重新连接输入树的节点：参与运算的模型会被清空
+    # (它们之前返回的快照日志也不再反映原来的树)。
+    # _join / _split* 只处理游离的子树根 (parent 为 None)，在一个临时模型上调用，
+    # 借用它的 root 作为 _rebalance 的工作寄存器。
+
+    def _detach(self, node: AVLNode) -> Tuple[Optional[AVLNode], Optional[AVLNode]]:
+        """把 node 的两棵子树拆成独立的树，node 成为单个节点；返回 (left, right)"""
+        left, right = node.left, node.right
+        if left is not None:
+            left.parent = None
+        if right is not None:
+            right.parent = None
+        node.left = node.right = None
+        node.height = 1
+        return left, right
+
+    def _join(self, left: Optional[AVLNode], mid: AVLNode, right: Optional[AVLNode],
+              spine: Optional[List[AVLNode]] = None) -> AVLNode:
+        """
+        连接 left 中的键 <= mid <= right 中的键，O(|h(left) - h(right)| + 1)。
+        沿较高那棵树的脊 (右脊或左脊) 下降到高度 <= 较矮树高度 + 1 的节点 c，
+        用 mid 连接 c 和较矮的树并放回 c 的位置，再向上 _rebalance。
+        spine 不为 None 时追加下降经过的节点。
+        """
+        hl, hr = self._height(left), self._height(right)
+        if hl > hr + 1:
+            # 脊上相邻节点的高度差 1 或 2，因此停下时 c 的高度为 hr 或 hr + 1 (hr 为 0 时 c 可能为空)
+            parent, c, outer = None, left, "right"
+            while c is not None and c.height > hr + 1:
+                if spine is not None:
+                    spine.append(c)
+                parent, c = c, c.right
+            mid.left, mid.right = c, right
+        elif hr > hl + 1:
+            parent, c, outer = None, right, "left"
+            while c is not None and c.height > hl + 1:
+                if spine is not None:
+                    spine.append(c)
+                parent, c = c, c.left
+            mid.left, mid.right = left, c
+        else:
+            mid.left, mid.right = left, right
+            mid.parent = None
+            for child in (left, right):
+                if child is not None:
+                    child.parent = mid
+            self._update_height(mid)
+            return mid
+
+        for child in (mid.left, mid.right):
+            if child is not None:
+                child.parent = mid
+        mid.parent = parent
+        setattr(parent, outer, mid)
+        self._update_height(mid)
+        self.root = left if outer == "right" else right
+        self._rebalance(parent)
+        return self.root
+
+    def _split(self, node: Optional[AVLNode], key) -> Tuple[Optional[AVLNode], Optional[AVLNode]]:
+        """拆成 (键 < key 的树, 键 >= key 的树)，O(log n)"""
+        if node is None:
+            return None, None
+        left, right = self._detach(node)
+        if compare_keys(node.key, key) < 0:
+            lo, hi = self._split(right, key)
+            return self._join(left, node, lo), hi
+        lo, hi = self._split(left, key)
+        return lo, self._join(hi, node, right)
+
+    def _split3(self, node: Optional[AVLNode], key) -> Tuple[Optional[AVLNode], Optional[AVLNode], Optional[AVLNode]]:
+        """
+        拆成 (键 < key 的树, 一个等于 key 的节点或 None, 键 > key 的树)，O(log n)。
+        其余等于 key 的重复节点被丢弃 (集合运算使用)。
+        """
+        if node is None:
+            return None, None, None
+        left, right = self._detach(node)
+        cmp = compare_keys(key, node.key)
+        if cmp < 0:
+            lo, found, hi = self._split3(left, key)
+            return lo, found, self._join(hi, node, right)
+        if cmp > 0:
+            lo, found, hi = self._split3(right, key)
+            return self._join(left, node, lo), found, hi
+        # 重复的键可能在左子树的右端或右子树的左端
+        lo = self._split3(left, key)[0]
+        hi = self._split3(right, key)[2]
+        return lo, node, hi
+
+    def _split_last(self, node: AVLNode) -> Tuple[Optional[AVLNode], AVLNode]:
+        """拆下最大的节点：返回 (其余节点组成的树, 最大节点)"""
+        left, right = self._detach(node)
+        if right is None:
+            return left, node
+        rest, last = self._split_last(right)
+        return self._join(left, node, rest), last
+
+    def _join2(self, left: Optional[AVLNode], right: Optional[AVLNode]) -> Optional[AVLNode]:
+        """连接 left 中的键 <= right 中的键 (没有中间键)"""
+        if left is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def _union(self, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        left, right = self._detach(b)
+        lo, _, hi = self._split3(a, b.key)
+        return self._join(self._union(lo, left), b, self._union(hi, right))
+
+    def _intersection(self, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None or b is None:
+            return None
+        left, right = self._detach(b)
+        lo, found, hi = self._split3(a, b.key)
+        lo, hi = self._intersection(lo, left), self._intersection(hi, right)
+        return self._join(lo, found, hi) if found is not None else self._join2(lo, hi)
+
+    def _difference(self, a: Optional[AVLNode], b: Optional[AVLNode]) -> Optional[AVLNode]:
+        if a is None or b is None:
+            return a
+        left, right = self._detach(b)
+        lo, _, hi = self._split3(a, b.key)
+        return self._join2(self._difference(lo, left), self._difference(hi, right))
+
+    @classmethod
+    def _take_root(cls, tree: 'AVLModel') -> Optional[AVLNode]:
+        """取出 tree 的根并清空 tree"""
+        root, tree.root = tree.root, None
+        return root
+
+    @classmethod
+    def _wrap(cls, root: Optional[AVLNode]) -> 'AVLModel':
+        model = cls()
+        if root is not None:
+            root.parent = None
+        model.root = root
+        return model
+
+    @classmethod
+    def join(cls, t1: 'AVLModel', val: Any, t2: 'AVLModel',
+             events: Optional[List[Dict]] = None) -> 'AVLModel':
+        """
+        连接：t1 的所有键 <= val <= t2 的所有键，返回包含三者的新 AVL 树，O(log n)。
+        t1、t2 被清空。events 不为 None 时追加一个 'join_spine' 事件
+        (下降经过的脊节点、新节点 mid、挂接处的父节点)，供动画使用。
+
+        Raises:
+            ValueError: 键的顺序不满足要求
+        """
+        mid = AVLNode(val)
+        for tree, outer, bad in ((t1, "right", 1), (t2, "left", -1)):
+            node = tree.root
+            while node is not None and getattr(node, outer) is not None:
+                node = getattr(node, outer)
+            if node is not None and compare_keys(node.key, mid.key) == bad:
+                raise ValueError(f"join: {node.val!r} on the wrong side of {val!r}")
+        work = cls()
+        spine: Optional[List[AVLNode]] = [] if events is not None else None
+        left, right = cls._take_root(t1), cls._take_root(t2)
+        root = work._join(left, mid, right, spine)
+        if events is not None:
+            side = "root" if not spine else ("right" if spine[0] is left else "left")
+            events.append({'type': 'join_spine', 'side': side, 'spine': spine,
+                           'mid': mid, 'attach': spine[-1] if spine else None})
+        return cls._wrap(root)
+
+    def split(self, val: Any) -> Tuple['AVLModel', 'AVLModel']:
+        """拆分：返回 (键 < val 的树, 键 >= val 的树)，O(log n)；本树被清空"""
+        work = type(self)()
+        left, right = work._split(self._take_root(self), float_key(val))
+        return self._wrap(left), self._wrap(right)
+
+    @classmethod
+    def union(cls, t1: 'AVLModel', t2: 'AVLModel') -> 'AVLModel':
+        """
+        并集，O(m log(n/m + 1)) (m <= n 为两树大小)；两棵树中相等的键只保留一个 (取 t2 的节点)。
+        t1、t2 被清空。
+        """
+        work = cls()
+        return cls._wrap(work._union(cls._take_root(t1), cls._take_root(t2)))
+
+    @classmethod
+    def intersection(cls, t1: 'AVLModel', t2: 'AVLModel') -> 'AVLModel':
+        """交集 (保留 t1 的节点)，O(m log(n/m + 1))；t1、t2 被清空"""
+        work = cls()
+        return cls._wrap(work._intersection(cls._take_root(t1), cls._take_root(t2)))
+
+    @classmethod
+    def difference(cls, t1: 'AVLModel', t2: 'AVLModel') -> 'AVLModel':
+        """差集 t1 - t2，O(m log(n/m + 1))；t1、t2 被清空"""
+        work = cls()
+        return cls._wrap(work._difference(cls._take_root(t1), cls._take_root(t2)))
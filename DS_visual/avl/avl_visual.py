@@ -1,7 +1,9 @@
 from tkinter import *
 from tkinter import messagebox
 from typing import Dict, Tuple, List, Optional
-from avl.avl_model import AVLModel, AVLNode, clone_tree
+from avl.avl_model import AVLModel, AVLNode, AVLSnapshotLog, clone_tree
+from binary_tree.tree_iter import iter_inorder
+from binary_tree.tidy_layout import TidyLayout, fit_positions
 import storage as storage
 from tkinter import filedialog
 from datetime import datetime
@@ -652,7 +654,7 @@ class AVLVisualizer:
         self._create_pseudocode_panel()
 
         self.model = AVLModel()
-        self.node_vis: Dict[str, Dict] = {}
+        self.node_vis: Dict[int, Dict] = {}  # 键为 node.stable_id
         self.animating = False
         self.batch: List[str] = []
         self.current_pseudocode: List[str] = []  # 当前显示的伪代码
@@ -661,6 +663,9 @@ class AVLVisualizer:
         self.node_h = 44
         self.level_gap = 100
         self.margin_x = 40
+        self.layout_unit = self.node_w + 20  # 同层相邻节点中心的最大间距
+        # 按 stable_id 缓存子树形状：快照副本之间只重新计算插入 / 旋转改动过的路径
+        self.tidy = TidyLayout(key=lambda node: node.stable_id)
 
         self.input_var = StringVar()
         self.create_controls()
@@ -1218,7 +1223,14 @@ class AVLVisualizer:
             self.save_structure
         ).grid(row=1, column=3, padx=5, pady=2)
         
-        # 第三行：DSL命令
+        # 第三行：直接插入 (无动画) 和 DSL命令
+        self.create_button(
+            control_frame, 
+            "⚡ 直接插入", 
+            self.colors["accent_green"],
+            self.insert_direct
+        ).grid(row=2, column=0, padx=5, pady=2)
+
         dsl_label = Label(
             control_frame, 
             text="DSL:", 
@@ -1368,37 +1380,14 @@ class AVLVisualizer:
         l2 = self.canvas.create_line(cx, midy, tx, bot, arrow=LAST, width=2.5, fill=self.colors["edge_color"])
         return (l1, l2)
     # (保持不变)
-    def compute_positions_for_root(self, root: Optional[AVLNode]) -> Dict[str, Tuple[float, float]]:
-        res: Dict[str, Tuple[float,float]] = {}
-        if not root:
-            return res
-        inorder_nodes: List[AVLNode] = []
-        depths: Dict[AVLNode, int] = {}
-        def inorder(n: Optional[AVLNode], d: int):
-            if not n:
-                return
-            inorder(n.left, d+1)
-            inorder_nodes.append(n)
-            depths[n] = d
-            inorder(n.right, d+1)
-        inorder(root, 0)
-        n = len(inorder_nodes)
-        if n == 0:
-            return res
-        width = max(200, self.canvas_w - 2*self.margin_x)
-        counts: Dict[str,int] = {}
-        for i, node in enumerate(inorder_nodes):
-            base = str(node.val)
-            cnt = counts.get(base, 0)
-            counts[base] = cnt + 1
-            key = f"{base}#{cnt}" if cnt > 0 else base
-            if n == 1:
-                x = self.canvas_w/2
-            else:
-                x = self.margin_x + i * (width / (n-1))
-            y = 60 + depths[node] * self.level_gap
-            res[key] = (x, y)
-        return res
+    def compute_positions_for_root(self, root: Optional[AVLNode]) -> Dict[int, Tuple[float, float]]:
+        """
+        节点位置 (整洁布局，见 binary_tree.tidy_layout)，键为 node.stable_id
+        (快照与模型中的同一节点键相同，重复值也不会混淆)
+        """
+        layout = self.tidy.layout(root)
+        return fit_positions(layout, self.margin_x, self.canvas_w - self.margin_x,
+                             60, self.level_gap, self.layout_unit)
     # (保持不变)
     def draw_tree_from_root(self, root: Optional[AVLNode]):
         self.canvas.delete("all")
@@ -1412,24 +1401,9 @@ class AVLVisualizer:
             )
             return
         pos = self.compute_positions_for_root(root)
-        inorder_nodes: List[AVLNode] = []
-        def inorder_collect(n: Optional[AVLNode]):
-            if not n:
-                return
-            inorder_collect(n.left)
-            inorder_nodes.append(n)
-            inorder_collect(n.right)
-        inorder_collect(root)
-        node_to_key: Dict[AVLNode, str] = {}
-        counts: Dict[str,int] = {}
-        for node in inorder_nodes:
-            base = str(node.val)
-            cnt = counts.get(base, 0)
-            counts[base] = cnt + 1
-            key = f"{base}#{cnt}" if cnt > 0 else base
-            node_to_key[node] = key
         self.node_vis.clear()
-        for node, key in node_to_key.items():
+        for node in iter_inorder(root):
+            key = node.stable_id
             cx, cy = pos[key]
             left, top, right, bottom = cx - self.node_w/2, cy - self.node_h/2, cx + self.node_w/2, cy + self.node_h/2
             rect = self.canvas.create_rectangle(
@@ -1459,22 +1433,36 @@ class AVLVisualizer:
         def setup_edges(n: Optional[AVLNode]):
             if not n:
                 return
-            parent_key = node_to_key[n]
+            parent_key = n.stable_id
             parent_cx, parent_cy = pos[parent_key]
             if n.left:
-                child_key = node_to_key[n.left]
+                child_key = n.left.stable_id
                 child_cx, child_cy = pos[child_key]
                 line_ids = self._draw_connection(parent_cx, parent_cy, child_cx, child_cy)
                 self.node_vis[parent_key]['edges'][child_key] = line_ids
                 setup_edges(n.left)
             if n.right:
-                child_key = node_to_key[n.right]
+                child_key = n.right.stable_id
                 child_cx, child_cy = pos[child_key]
                 line_ids = self._draw_connection(parent_cx, parent_cy, child_cx, child_cy)
                 self.node_vis[parent_key]['edges'][child_key] = line_ids
                 setup_edges(n.right)
         setup_edges(root)
 
+    def insert_direct(self):
+        """直接插入输入框中的值 (无动画，不记录步骤和快照)"""
+        if self.animating:
+            self.update_status("⚠️ 正在执行动画，请稍候...")
+            return
+        s = self.input_var.get().strip()
+        batch = [p.strip() for p in s.split(",") if p.strip()!=""]
+        if not batch:
+            messagebox.showinfo("💡 提示", "请输入数字，例如：1,2,3")
+            return
+        self.model.insert_many(batch)
+        self.draw_tree_from_root(clone_tree(self.model.root))
+        self.update_status(f"⚡ 已直接插入 {len(batch)} 个节点")
+
     # ---------- 插入动画流程 (增加伪代码高亮) ----------
     def start_insert_animated(self):
         if self.animating:
@@ -1504,12 +1492,6 @@ class AVLVisualizer:
         inserted_node, path_nodes, rotations, snapshots = self.model.insert_with_steps(val)
         snap_pre = snapshots[0]
         snap_after_insert = snapshots[1] if len(snapshots) > 1 else None
-        pos_pre = self.compute_positions_for_root(snap_pre)
-        val_to_keys_pre: Dict[str, List[str]] = {}
-        for k in pos_pre.keys():
-            base = k.split('#')[0]
-            val_to_keys_pre.setdefault(base, []).append(k)
-
         # 检查是否是空树插入
         is_empty_tree = snap_pre is None
 
@@ -1523,21 +1505,20 @@ class AVLVisualizer:
                 else:
                     # 非空树：高亮插入新节点的行
                     self._show_pseudocode_for_operation('insert', 7)  # node.left = new Node(val)
-                self.animate_flyin_new(val, snap_after_insert, lambda: self._after_insert_rotations(rotations, snapshots, idx))
+                self.animate_flyin_new(val, snap_after_insert, lambda: self._after_insert_rotations(rotations, snapshots, idx),
+                                       node_id=inserted_node.id)
                 return
             
             node = path_nodes[i]
             v = str(node.val)
-            keylist = val_to_keys_pre.get(v, [])
-            if keylist:
-                key = keylist.pop(0)
-                self.draw_tree_from_root(snap_pre)
+            self.draw_tree_from_root(snap_pre)
+            # 快照节点的 orig_id 就是模型节点的 id，按节点标识直接定位 (O(1))
+            vis = self.node_vis.get(node.id)
+            if vis:
                 try:
-                    self.canvas.itemconfig(self.node_vis[key]['rect'], fill=self.colors["node_highlight"])
+                    self.canvas.itemconfig(vis['rect'], fill=self.colors["node_highlight"])
                 except Exception:
                     pass
-            else:
-                self.draw_tree_from_root(snap_pre)
             
             # 高亮伪代码中的搜索步骤
             if i == len(path_nodes) - 1:
@@ -1553,14 +1534,18 @@ class AVLVisualizer:
         highlight_path(0)
     
     # (保持不变)
-    def animate_flyin_new(self, val_str: str, snap_after_insert: Optional[AVLNode], on_complete):
+    def animate_flyin_new(self, val_str: str, snap_after_insert: Optional[AVLNode], on_complete,
+                          node_id: Optional[int] = None):
+        """新节点飞入动画；node_id 为新节点的 id (不给出时按值查找最后一个匹配的节点)"""
         if not snap_after_insert:
             on_complete(); return
         pos_after = self.compute_positions_for_root(snap_after_insert)
-        candidate_keys = [k for k in pos_after.keys() if k.split('#')[0] == str(val_str)]
-        if not candidate_keys:
+        target_key = node_id
+        if target_key is None:
+            matches = [n.stable_id for n in iter_inorder(snap_after_insert) if str(n.val) == str(val_str)]
+            target_key = matches[-1] if matches else None
+        if target_key not in pos_after:
             on_complete(); return
-        target_key = candidate_keys[-1]
         tx, ty = pos_after[target_key]
         sx, sy = self.canvas_w/2, 20
         left, top, right, bottom = sx - self.node_w/2, sy - self.node_h/2, sx + self.node_w/2, sy + self.node_h/2
@@ -1654,12 +1639,6 @@ class AVLVisualizer:
         # snap_after_delete 是删除后、旋转前的快照
         snap_after_delete = snapshots[1] if len(snapshots) > 1 else None
 
-        pos_pre = self.compute_positions_for_root(snap_pre)
-        val_to_keys_pre: Dict[str, List[str]] = {}
-        for k in pos_pre.keys():
-            base = k.split('#')[0]
-            val_to_keys_pre.setdefault(base, []).append(k)
-
         def highlight_path_for_delete(i=0):
             if i >= len(path_nodes):
                 # 路径高亮完成
@@ -1683,16 +1662,14 @@ class AVLVisualizer:
             # 高亮逻辑
             node = path_nodes[i]
             v = str(node.val)
-            keylist = val_to_keys_pre.get(v, [])
-            if keylist:
-                key = keylist.pop(0)
-                self.draw_tree_from_root(snap_pre)
+            self.draw_tree_from_root(snap_pre)
+            # 快照节点的 orig_id 就是模型节点的 id，按节点标识直接定位 (O(1))
+            vis = self.node_vis.get(node.id)
+            if vis:
                 try:
-                    self.canvas.itemconfig(self.node_vis[key]['rect'], fill=self.colors["node_highlight"])
+                    self.canvas.itemconfig(vis['rect'], fill=self.colors["node_highlight"])
                 except Exception:
                     pass
-            else:
-                self.draw_tree_from_root(snap_pre)
             
             # 高亮伪代码中的搜索步骤
             self._show_pseudocode_for_operation('delete', 1)  # node = SEARCH(...)
@@ -1773,12 +1750,6 @@ class AVLVisualizer:
         
         # 获取当前树的快照用于可视化
         snap = clone_tree(self.model.root)
-        pos = self.compute_positions_for_root(snap)
-        
-        val_to_keys: Dict[str, List[str]] = {}
-        for k in pos.keys():
-            base = k.split('#')[0]
-            val_to_keys.setdefault(base, []).append(k)
 
         def highlight_path_for_search(i=0):
             if i >= len(path_nodes):
@@ -1789,12 +1760,10 @@ class AVLVisualizer:
                     self._show_pseudocode_for_operation('search', 3)  # return node // 找到
                     # 高亮找到的节点为绿色
                     self.draw_tree_from_root(snap)
-                    v = str(found_node.val)
-                    keylist = val_to_keys.get(v, [])
-                    if keylist:
-                        key = keylist[0]  # 使用第一个匹配的key
+                    vis = self.node_vis.get(found_node.id)
+                    if vis:
                         try:
-                            self.canvas.itemconfig(self.node_vis[key]['rect'], 
+                            self.canvas.itemconfig(vis['rect'], 
                                                  fill=self.colors["node_new"],
                                                  outline=self.colors["accent_green"],
                                                  width=3)
@@ -1813,14 +1782,13 @@ class AVLVisualizer:
             # 高亮当前访问的节点
             node = path_nodes[i]
             v = str(node.val)
-            keylist = val_to_keys.get(v, [])
             
             self.draw_tree_from_root(snap)
             
-            if keylist:
-                key = keylist.pop(0)
+            vis = self.node_vis.get(node.id)
+            if vis:
                 try:
-                    self.canvas.itemconfig(self.node_vis[key]['rect'], 
+                    self.canvas.itemconfig(vis['rect'], 
                                          fill=self.colors["node_highlight"],
                                          outline=self.colors["accent_orange"],
                                          width=3)
@@ -1886,14 +1854,12 @@ class AVLVisualizer:
         # 显示对应旋转类型的伪代码
         self._show_pseudocode_for_operation(rtype, 0)
         
+        # z / y 是模型中的节点，before_root 中对应节点的 stable_id 就是它们的 id
         z = rotation_info.get('z'); y = rotation_info.get('y')
-        zkey = None; ykey = None
-        if z:
-            zkey = next((k for k in pos_before.keys() if k.split('#')[0]==str(z.val)), None)
-        if y:
-            ykey = next((k for k in pos_before.keys() if k.split('#')[0]==str(y.val)), None)
+        zkey = z.id if z is not None and z.id in pos_before else None
+        ykey = y.id if y is not None and y.id in pos_before else None
         arc_id = None; label_id = None
-        if zkey and ykey:
+        if zkey is not None and ykey is not None:
             zx, zy = pos_before[zkey]; yx, yy = pos_before[ykey]
             midx = (zx + yx)/2
             topy = min(zy, yy) - 30
@@ -1967,8 +1933,8 @@ class AVLVisualizer:
         frame_step(0)
 
     # (增加伪代码高亮)
-    def _animate_rotations_sequence(self, rotations: List[Dict], snapshots: List[Optional[AVLNode]], operation_index: int, on_all_done, is_insert: bool = True):
-        """通用旋转动画序列，适用于插入和删除"""
+    def _animate_rotations_sequence(self, rotations: List[Dict], snapshots: AVLSnapshotLog, operation_index: int, on_all_done, is_insert: bool = True):
+        """通用旋转动画序列，适用于插入和删除 (每次旋转前后的树在用到时才从快照日志重建)"""
         if not rotations:
             on_all_done(); return
         
@@ -2055,9 +2021,17 @@ class AVLVisualizer:
         )
         if not filepath: return
         tree_dict = storage.load_tree_from_file(filepath)
-        from avl.avl_model import AVLNode as AVLNodeClass
-        newroot = storage.tree_dict_to_nodes(tree_dict, AVLNodeClass)
-        self.model.root = newroot
+        if all("height" in item for item in tree_dict.get("nodes", [])):
+            from avl.avl_model import AVLNode as AVLNodeClass
+            self.model.root = storage.tree_dict_to_nodes(tree_dict, AVLNodeClass)
+        else:
+            # 文件没有保存高度 (例如普通 BST 的存档)：按中序取出值 O(n) 重建；
+            # 中序不是有序的 (按本模型的比较规则) 时，按先序无动画地逐个插入
+            try:
+                self.model = AVLModel.from_sorted(storage.tree_dict_values(tree_dict, inorder=True))
+            except ValueError:
+                self.model = AVLModel()
+                self.model.insert_many(storage.tree_dict_values(tree_dict))
         self.draw_tree_from_root(clone_tree(self.model.root))
         messagebox.showinfo("✅ 成功", f"AVL 已从文件加载并恢复结构：\n{filepath}")
         self.update_status("📂 已从文件加载结构")
@@ -1,4 +1,10 @@
-from typing import Any, Optional, List, Tuple
+from functools import cmp_to_key
+from typing import Any, Iterable, Iterator, Optional, List, Tuple
+
+try:
+    from binary_tree.tree_iter import iter_inorder, iter_range
+except ImportError:  # 以 DS_visual.binary_tree... 方式导入时 (测试)
+    from DS_visual.binary_tree.tree_iter import iter_inorder, iter_range
 
 class TreeNode:
     def __init__(self, val: Any):
@@ -6,10 +12,15 @@ class TreeNode:
         self.left: Optional['TreeNode'] = None
         self.right: Optional['TreeNode'] = None
         self.parent: Optional['TreeNode'] = None
+        self.size: int = 1  # 以该节点为根的子树中的节点数 (顺序统计)
 
     def __repr__(self):
         return f"TreeNode({self.val})"
 
+def _size(node: Optional[TreeNode]) -> int:
+    return node.size if node is not None else 0
+
+
 class BSTModel:
     def __init__(self):
         self.root: Optional[TreeNode] = None
@@ -32,14 +43,26 @@ class BSTModel:
                 return 0
             return -1 if sa < sb else 1
 
+    def _cmp(self, a: Any, b: Any) -> int:
+        """
+        热路径 (insert / search_with_path / _count_before) 共用的比较：同类型的值直接用原生比较
+        (3.11+ 中不抛异常的 try 没有开销)，只有类型不兼容时才调用 compare_values。
+        BST 不转换类型，AVL / RB 那样的预计算比较键 (binary_tree.tree_keys) 在这里反而更慢。
+        """
+        try:
+            return 0 if a == b else (-1 if a < b else 1)
+        except Exception:
+            return self.compare_values(a, b)
+
     def insert(self, val: Any) -> TreeNode:
         if self.root is None:
             self.root = TreeNode(val)
             return self.root
         cur = self.root
+        cmp = self._cmp
         while True:
-            cmp = self.compare_values(val, cur.val)
-            if cmp < 0:
+            cur.size += 1  # 插入总会成功，沿途每个祖先的子树都多一个节点
+            if cmp(val, cur.val) < 0:
                 if cur.left is None:
                     cur.left = TreeNode(val)
                     cur.left.parent = cur
@@ -55,10 +78,11 @@ class BSTModel:
 
     def search_with_path(self, val: Any) -> Tuple[Optional[TreeNode], List[TreeNode]]:
         path: List[TreeNode] = []
+        compare = self._cmp
         cur = self.root
         while cur:
             path.append(cur)
-            cmp = self.compare_values(val, cur.val)
+            cmp = compare(val, cur.val)
             if cmp == 0:
                 return cur, path
             elif cmp < 0:
@@ -83,6 +107,27 @@ class BSTModel:
                 u.parent.right = v
         if v:
             v.parent = u.parent
+        self._update_sizes_upward(u.parent)
+
+    def _update_sizes_upward(self, node: Optional[TreeNode]):
+        """从 node 开始向上重新计算子树大小 (子节点的 size 须已正确)，O(h)"""
+        while node is not None:
+            node.size = 1 + _size(node.left) + _size(node.right)
+            node = node.parent
+
+    def recompute_sizes(self):
+        """直接拼接节点 (例如从文件加载) 后，用迭代后序遍历重建所有子树大小"""
+        stack: List[Tuple[TreeNode, bool]] = [(self.root, False)] if self.root else []
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                node.size = 1 + _size(node.left) + _size(node.right)
+                continue
+            stack.append((node, True))
+            if node.left:
+                stack.append((node.left, False))
+            if node.right:
+                stack.append((node.right, False))
 
     def delete_node(self, node: Optional[TreeNode]) -> bool:
         if node is None:
@@ -96,6 +141,7 @@ class BSTModel:
                     node.parent.left = None
                 else:
                     node.parent.right = None
+                self._update_sizes_upward(node.parent)
         elif node.left is None:
             self.transplant(node, node.right)
         elif node.right is None:
@@ -111,6 +157,7 @@ class BSTModel:
             successor.left = node.left
             if successor.left:
                 successor.left.parent = successor
+            self._update_sizes_upward(successor)
         return True
 
     def delete(self, val: Any) -> Tuple[bool, List[TreeNode]]:
@@ -119,3 +166,182 @@ class BSTModel:
             return False, path
         ok = self.delete_node(node)
         return ok, path
+
+    # ==================== 顺序统计 (依赖子树大小，均为 O(h)) ====================
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def _count_before(self, val: Any, inclusive: bool, path: List[TreeNode]) -> int:
+        """统计 < val (inclusive 时 <= val) 的元素个数，并记录经过的节点"""
+        count = 0
+        compare = self._cmp
+        cur = self.root
+        while cur:
+            path.append(cur)
+            cmp = compare(val, cur.val)
+            if cmp < 0 or (cmp == 0 and not inclusive):
+                cur = cur.left
+            else:
+                count += _size(cur.left) + 1
+                cur = cur.right
+        return count
+
+    def rank(self, val: Any) -> Tuple[int, List[TreeNode]]:
+        """
+        返回 (比 val 小的元素个数, 查找路径)；
+        即 val 在中序序列中第一次出现的位置 (从 0 开始)，val 不在树中时为其插入位置
+        """
+        path: List[TreeNode] = []
+        return self._count_before(val, False, path), path
+
+    def select(self, k: int) -> Tuple[Optional[TreeNode], List[TreeNode]]:
+        """返回 (中序第 k 个节点 (从 0 开始), 查找路径)；k 越界时节点为 None"""
+        path: List[TreeNode] = []
+        if not 0 <= k < len(self):
+            return None, path
+        cur = self.root
+        while cur:
+            path.append(cur)
+            left = _size(cur.left)
+            if k < left:
+                cur = cur.left
+            elif k == left:
+                return cur, path
+            else:
+                k -= left + 1
+                cur = cur.right
+        return None, path
+
+    def count_range(self, lo: Any, hi: Any) -> Tuple[int, List[TreeNode]]:
+        """返回 (lo <= 值 <= hi 的元素个数, 两次下降经过的节点)"""
+        path: List[TreeNode] = []
+        if self.compare_values(lo, hi) > 0:
+            return 0, path
+        below = self._count_before(lo, False, path)
+        upto = self._count_before(hi, True, path)
+        return upto - below, path
+
+    def median(self) -> Tuple[Optional[TreeNode], List[TreeNode]]:
+        """返回 (下中位数节点, 查找路径)：节点数为偶数时取中间两个中较小的一个"""
+        return self.select((len(self) - 1) // 2)
+
+    # ==================== 惰性遍历 / 区间扫描 (沿 parent 指针，无递归) ====================
+
+    def iter_nodes(self) -> Iterator[TreeNode]:
+        """按中序惰性产出节点"""
+        return iter_inorder(self.root)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (node.val for node in iter_inorder(self.root))
+
+    def range(self, lo: Any, hi: Any) -> Iterator[Any]:
+        """按中序惰性产出 lo <= 值 <= hi 的值，区间外的子树不会访问"""
+        return (node.val for node in iter_range(self.root, lo, hi, self.compare_values))
+
+    # ==================== 平衡构建 / 重平衡 ====================
+
+    def _sorted(self, values: Iterable[Any]) -> List[Any]:
+        """按 compare_values 的顺序排序；类型不可直接比较时退回到 compare_values"""
+        items = list(values)
+        try:
+            return sorted(items)
+        except TypeError:
+            return sorted(items, key=cmp_to_key(self.compare_values))
+
+    def build_balanced(self, values: Iterable[Any], presorted: bool = False) -> Optional[TreeNode]:
+        """
+        用 values 替换整棵树，构建高度最小的 BST：排序一次 (presorted 时跳过)，
+        再以迭代的“取中间元素作根”在 O(n) 内连接节点，parent 和 size 同时设好。
+        重复值保持 insert 的约定 (相等的值在右子树)：区间中点落在一串相等值中间时，
+        改用这串相等值的第一个作根。
+
+        Returns:
+            新的根节点
+        """
+        items = list(values) if presorted else self._sorted(values)
+        n = len(items)
+        nodes = [TreeNode(v) for v in items]
+        # first[i]: 与 items[i] 相等的第一个元素下标
+        first = list(range(n))
+        for i in range(1, n):
+            if self.compare_values(items[i - 1], items[i]) == 0:
+                first[i] = first[i - 1]
+
+        self.root = None
+        stack: List[Tuple[int, int, Optional[TreeNode], bool]] = [(0, n - 1, None, False)] if n else []
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            mid = max(lo, first[(lo + hi) // 2])
+            node = nodes[mid]
+            node.size = hi - lo + 1
+            node.parent = parent
+            if parent is None:
+                self.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if lo < mid:
+                stack.append((lo, mid - 1, node, True))
+            if mid < hi:
+                stack.append((mid + 1, hi, node, False))
+        return self.root
+
+    def rebalance(self) -> None:
+        """
+        Day–Stout–Warren 重平衡：原地把树右旋成一条“藤” (按中序向右的链)，
+        再做若干轮左旋压缩成完全平衡的树，O(n) 时间、O(1) 额外空间；
+        最后重建 size。
+        """
+        if self.root is None:
+            return
+        pseudo = TreeNode(None)
+        pseudo.right = self.root
+        self.root.parent = pseudo
+
+        # 1. 树 -> 藤
+        count = 0
+        tail, rest = pseudo, pseudo.right
+        while rest is not None:
+            if rest.left is None:
+                tail, rest = rest, rest.right
+                count += 1
+            else:
+                child = rest.left  # 右旋 rest
+                rest.left = child.right
+                if child.right:
+                    child.right.parent = rest
+                child.right = rest
+                rest.parent = child
+                tail.right = child
+                child.parent = tail
+                rest = child
+
+        # 2. 藤 -> 平衡树：先把多出完全二叉树的部分压到最底层，再逐轮减半
+        full = (1 << (count + 1).bit_length() - 1) - 1
+        self._compress(pseudo, count - full)
+        while full > 1:
+            full //= 2
+            self._compress(pseudo, full)
+
+        self.root = pseudo.right
+        self.root.parent = None
+        self.recompute_sizes()
+
+    @staticmethod
+    def _compress(pseudo: TreeNode, count: int) -> None:
+        """沿藤从上到下做 count 次左旋 (每隔一个节点一次)"""
+        scanner = pseudo
+        for _ in range(count):
+            child = scanner.right
+            grand = child.right
+            scanner.right = grand
+            grand.parent = scanner
+            child.right = grand.left
+            if grand.left:
+                grand.left.parent = child
+            grand.left = child
+            child.parent = grand
+            scanner = grand
+
@@ -3,6 +3,7 @@ from tkinter import messagebox
 from tkinter import Toplevel, filedialog
 from typing import Dict, Tuple, List, Optional
 from binary_tree.bst.bst_model import BSTModel, TreeNode
+from binary_tree.tidy_layout import TidyLayout, fit_positions
 import storage as storage
 import json
 from datetime import datetime
@@ -74,6 +75,8 @@ class BSTVisualizer:
         self.right_cell_w = self.node_w - self.left_cell_w - self.center_cell_w
         self.level_gap = 80  # 减小垂直间距
         self.margin_x = 40
+        self.layout_unit = self.node_w + 20  # 同层相邻节点中心的最大间距
+        self.tidy = TidyLayout()  # 缓存子树形状，重绘时只重新计算改动过的路径
 
         # 动画和引导模式状态
         self.animating = False
@@ -162,6 +165,8 @@ class BSTVisualizer:
                          self.start_search_animated, self.colors["btn_primary"]).pack(side=LEFT, padx=2)
         self.create_button(btn_row1, "🗑️ 删除节点", 
                          self.start_delete_animated, self.colors["btn_danger"]).pack(side=LEFT, padx=2)
+        self.create_button(btn_row1, "📊 排名/第k小", 
+                         self.start_order_statistic_animated, "#3F51B5").pack(side=LEFT, padx=2)
         
         # 第二行按钮 - 辅助操作
         btn_row2 = Frame(btn_frame, bg=self.colors["bg_secondary"])
@@ -173,6 +178,10 @@ class BSTVisualizer:
                          self.load_tree, "#9C27B0").pack(side=LEFT, padx=2)
         self.create_button(btn_row2, "🧹 清空树", 
                          self.clear_canvas, self.colors["btn_warning"]).pack(side=LEFT, padx=2)
+        self.create_button(btn_row2, "⚖️ 平衡构建", 
+                         self.build_balanced_direct, "#00796B").pack(side=LEFT, padx=2)
+        self.create_button(btn_row2, "🔄 重平衡", 
+                         self.rebalance_tree, "#00796B").pack(side=LEFT, padx=2)
         self.create_button(btn_row2, "🚪 返回主界面", 
                          self.back_to_main, "#795548").pack(side=LEFT, padx=2)
         self.create_button(btn_row2, "⚡ 执行DSL", 
@@ -921,6 +930,7 @@ class BSTVisualizer:
             if hasattr(storage, "tree_dict_to_nodes"):
                 new_root = storage.tree_dict_to_nodes(tree_dict, TreeNode)
                 self.model.root = new_root
+                self.model.recompute_sizes()
                 self.redraw()
                 messagebox.showinfo("成功", "✅ 二叉树已成功加载并恢复")
                 self.update_status("📂 加载成功")
@@ -928,31 +938,10 @@ class BSTVisualizer:
             messagebox.showerror("错误", f"加载失败：{str(e)}")
 
     def compute_positions(self) -> Dict[TreeNode, Tuple[float,float]]:
-        pos: Dict[TreeNode, Tuple[float,float]] = {}
-        nodes_inorder: List[TreeNode] = []
-        depths: Dict[TreeNode, int] = {}
-
-        def inorder(n: Optional[TreeNode], d: int):
-            if n is None:
-                return
-            inorder(n.left, d+1)
-            nodes_inorder.append(n)
-            depths[n] = d
-            inorder(n.right, d+1)
-
-        inorder(self.model.root, 0)
-        n = len(nodes_inorder)
-        if n == 0:
-            return pos
-        width = self.canvas_width - 2*self.margin_x
-        for i, node in enumerate(nodes_inorder):
-            if n == 1:
-                x = self.canvas_width / 2
-            else:
-                x = self.margin_x + i * (width / (n-1))
-            y = 80 + depths[node] * self.level_gap
-            pos[node] = (x, y)
-        return pos
+        """整洁布局 (binary_tree.tidy_layout)，在画布内水平居中"""
+        layout = self.tidy.layout(self.model.root)
+        return fit_positions(layout, self.margin_x, self.canvas_width - self.margin_x,
+                             80, self.level_gap, self.layout_unit)
 
     def redraw(self):
         self.canvas.delete("all")
@@ -1081,6 +1070,15 @@ class BSTVisualizer:
             fill=right_color
         )
         
+        # 子树大小 (顺序统计用)
+        size_label = self.canvas.create_text(
+            cx, bottom + 8,
+            text=f"size={node.size}",
+            font=("Arial", 7),
+            fill=self.colors["text_secondary"]
+        )
+        self.node_items.append(size_label)
+        
         # 如果是根节点，添加标签
         if node == self.model.root:
             root_label = self.canvas.create_text(
@@ -1189,6 +1187,34 @@ class BSTVisualizer:
         except Exception as e:
             messagebox.showerror("错误", f"插入失败：{str(e)}")
 
+    def build_balanced_direct(self):
+        """用输入框中的值 (一次排序 + O(n) 连接) 直接构建高度最小的BST，替换当前树"""
+        if self.animating:
+            messagebox.showinfo("提示", "⏳ 当前正在执行动画，请稍候...")
+            return
+        text = self.input_var.get().strip()
+        if not text:
+            messagebox.showinfo("提示", "📝 请输入要构建的值（多个值用逗号分隔）")
+            return
+        items = [self.parse_value(s) for s in text.split(",") if s.strip() != ""]
+        self.model.build_balanced(items)
+        self.redraw()
+        self.update_status(f"✅ 已平衡构建 {len(items)} 个节点")
+        self.update_guide(f"⚖️ 排序后每次取中间元素作根，得到高度最小的BST（共 {len(items)} 个节点）")
+
+    def rebalance_tree(self):
+        """DSW 算法：先旋转成链，再压缩成平衡树"""
+        if self.animating:
+            messagebox.showinfo("提示", "⏳ 当前正在执行动画，请稍候...")
+            return
+        if self.model.root is None:
+            messagebox.showinfo("提示", "树为空，无需重平衡")
+            return
+        self.model.rebalance()
+        self.redraw()
+        self.update_status(f"✅ 已重平衡 {len(self.model)} 个节点")
+        self.update_guide("🔄 DSW重平衡：右旋成一条链（藤），再分轮左旋压缩成平衡树")
+
     def start_insert_animated(self):
         """开始动画插入"""
         if self.animating:
@@ -1785,6 +1811,103 @@ class BSTVisualizer:
         
         self.window.after(300, step)
 
+    def start_order_statistic_animated(self):
+        """
+        顺序统计查询动画 (利用子树大小，每步只看左子树的 size)
+        输入格式: "#k" 第 k 小 (从 1 开始)；"median" 或 "中位数"；"lo~hi" 区间计数；其他为排名
+        """
+        if self.animating:
+            messagebox.showinfo("提示", "⏳ 当前正在执行动画，请稍候...")
+            return
+        raw = self.input_var.get().strip()
+        if not raw:
+            messagebox.showinfo("提示", "📊 请输入查询：值 (排名)、#k (第k小)、median、lo~hi (区间计数)")
+            return
+        if self.model.root is None:
+            messagebox.showinfo("提示", "树为空，无法查询")
+            return
+
+        explanations: List[str] = []
+        target: Optional[TreeNode] = None
+        if raw.startswith("#") or raw.lower() in ("median", "中位数"):
+            if raw.startswith("#"):
+                try:
+                    k = int(raw[1:]) - 1
+                except ValueError:
+                    messagebox.showerror("错误", "第k小的格式为 #k，例如 #3")
+                    return
+                title = f"第 {k + 1} 小"
+                target, path = self.model.select(k)
+            else:
+                k = (len(self.model) - 1) // 2
+                title = "中位数"
+                target, path = self.model.median()
+            remaining = k
+            for node in path:
+                left = node.left.size if node.left else 0
+                if remaining < left:
+                    explanations.append(f"{title}: 左子树有 {left} 个节点 > {remaining}，进入左子树")
+                elif remaining == left:
+                    explanations.append(f"{title}: 左子树恰好有 {left} 个节点，就是 {node.val}")
+                else:
+                    explanations.append(f"{title}: 跳过左子树 {left} 个 + 当前节点，剩余 {remaining - left - 1}，进入右子树")
+                    remaining -= left + 1
+            summary = f"{title}: {target.val}" if target else f"{title}: 超出范围 (共 {len(self.model)} 个节点)"
+        elif "~" in raw:
+            lo_text, hi_text = raw.split("~", 1)
+            lo, hi = self.parse_value(lo_text), self.parse_value(hi_text)
+            count, path = self.model.count_range(lo, hi)
+            for node in path:
+                explanations.append(f"区间 [{lo}, {hi}]: 经过 {node.val}，左子树大小 {node.left.size if node.left else 0}")
+            summary = f"区间 [{lo}, {hi}] 内共有 {count} 个值"
+        else:
+            val = self.parse_value(raw)
+            rank, path = self.model.rank(val)
+            before = 0
+            for node in path:
+                left = node.left.size if node.left else 0
+                if self.model.compare_values(val, node.val) <= 0:
+                    explanations.append(f"排名 {val}: {val} ≤ {node.val}，进入左子树 (已计数 {before})")
+                else:
+                    before += left + 1
+                    explanations.append(f"排名 {val}: {val} > {node.val}，计入左子树 {left} 个 + 当前节点 → {before}")
+            summary = f"比 {val} 小的值有 {rank} 个 (排名第 {rank + 1})"
+
+        self.animating = True
+        self.clear_guide()
+        self._play_order_statistic_path(path, explanations, target, summary)
+
+    def _play_order_statistic_path(self, path: List[TreeNode], explanations: List[str],
+                                   target: Optional[TreeNode], summary: str):
+        """逐个高亮查询路径上的节点，最后显示结果"""
+        self.redraw()
+        pos_map = self.compute_positions()
+        i = 0
+
+        def step():
+            nonlocal i
+            self.clear_pointer()
+            if i > 0:
+                self._smooth_color_transition(path[i - 1], self.colors["node_visited"])
+            if i >= len(path):
+                if target is not None:
+                    self._smooth_color_transition(target, self.colors["node_success"])
+                self.animating = False
+                self.update_guide(f"📊 {summary}")
+                self.update_status(f"✅ {summary}")
+                return
+            node = path[i]
+            self._smooth_color_transition(node, self.colors["node_comparing"])
+            if node in pos_map:
+                cx, cy = pos_map[node]
+                self.draw_pointer(cx, cy - self.node_h/2)
+            self.update_guide(explanations[i])
+            self.update_status(f"查询步骤 {i + 1}/{len(path)}")
+            i += 1
+            self.window.after(900, step)
+
+        self.window.after(300, step)
+
     def start_delete_animated(self):
         """开始动画删除"""
         if self.animating:
@@ -1,7 +1,8 @@
 from tkinter import *
 from tkinter import messagebox, filedialog
 from binary_tree.linked_storage.linked_storage_model import BinaryTreeModel, TreeNode
-from typing import Dict, Tuple, List, Optional
+from typing import Any, Dict, Tuple, List, Optional
+from binary_tree.tidy_layout import TidyLayout, fit_positions
 import math
 import storage as storage
 import os
@@ -74,6 +75,9 @@ class BinaryTreeVisualizer:
         self.center_cell_w = 64
         self.right_cell_w = self.node_w - self.left_cell_w - self.center_cell_w
         self.level_gap = 100
+        self.layout_unit = self.node_w + 20  # 同层相邻节点 (或 NULL 占位) 中心的间距
+        # 整洁布局，NULL 也占一个位置；缓存子树形状，重绘时只重新计算改动过的路径
+        self.tidy = TidyLayout(null_slots=True)
         self.input_var = StringVar()
         self.dsl_var = StringVar()
         self.batch_queue: List[str] = []
@@ -552,10 +556,9 @@ class BinaryTreeVisualizer:
         # 计算需要的高度: start_y + (depth-1) * level_gap + node_h + 额外空间(NULL节点)
         required_height = 80 + depth * self.level_gap + self.node_h + 100
         
-        # 计算需要的宽度: 最底层可能有 2^(depth-1) 个节点
-        # 每个节点宽度 node_w，加上间距
-        max_nodes_bottom = 2 ** (depth - 1) if depth > 0 else 1
-        required_width = max(self.canvas_width, max_nodes_bottom * (self.node_w + 40))
+        # 计算需要的宽度: 整洁布局 (含 NULL 占位) 的实际宽度，两侧各留一个节点宽度
+        xs = [x for x, _ in self.tidy.layout(self.root_node).values()]
+        required_width = max(self.canvas_width, (max(xs) - min(xs)) * self.layout_unit + 2 * self.node_w)
         
         # 更新滚动区域
         scroll_width = max(self.canvas_scroll_width, required_width)
@@ -653,44 +656,20 @@ class BinaryTreeVisualizer:
                                    text="空树", font=("Segoe UI", 16), fill="#A0AEC0")
             return
         
-        # 根据树的深度动态计算参数
-        depth = self._get_tree_depth(self.root_node)
-        
-        # 计算中心位置和初始偏移
-        # 获取当前滚动区域
-        scroll_region = self.canvas.cget('scrollregion')
-        if scroll_region:
-            parts = scroll_region.split()
-            if len(parts) == 4:
-                scroll_width = float(parts[2])
-            else:
-                scroll_width = self.canvas_scroll_width
-        else:
-            scroll_width = self.canvas_scroll_width
-        
-        center_x = scroll_width / 2
-        
-        # 根据深度调整初始偏移，确保节点不会重叠
-        # 对于深层树，需要更大的初始偏移
-        if depth <= 4:
-            initial_offset = self.canvas_width / 4
-        else:
-            # 为深层树增加偏移量
-            initial_offset = max(self.canvas_width / 4, (2 ** (depth - 2)) * (self.node_w / 2 + 10))
-        
-        start_y = 80
-        self._draw_node(self.root_node, center_x, start_y, initial_offset)
+        pos = self.compute_positions(self.root_node)
+        center_x, start_y = pos[self.root_node]
+        self._draw_node(self.root_node, pos)
         
         # 自动滚动使树居中显示
         self._center_view_on_tree(center_x, start_y)
 
-    def compute_positions(self, root: Optional[TreeNode]) -> Dict[TreeNode, Tuple[float,float]]:
-        pos: Dict[TreeNode, Tuple[float,float]] = {}
+    def compute_positions(self, root: Optional[TreeNode]) -> Dict[Any, Tuple[float,float]]:
+        """
+        整洁布局 (binary_tree.tidy_layout)，在滚动区域内水平居中。
+        除节点外还包含 NULL 占位的位置，键为 (节点, "left") / (节点, "right")
+        """
         if not root:
-            return pos
-        
-        # 根据树的深度动态计算参数
-        depth = self._get_tree_depth(root)
+            return {}
         
         # 获取当前滚动区域
         scroll_region = self.canvas.cget('scrollregion')
@@ -703,26 +682,9 @@ class BinaryTreeVisualizer:
         else:
             scroll_width = self.canvas_scroll_width
         
-        center_x = scroll_width / 2
-        
-        # 根据深度调整初始偏移
-        if depth <= 4:
-            initial_offset = self.canvas_width / 4
-        else:
-            initial_offset = max(self.canvas_width / 4, (2 ** (depth - 2)) * (self.node_w / 2 + 10))
-        
-        start_y = 80
-
-        def _rec(node: TreeNode, cx: float, cy: float, offset: float):
-            pos[node] = (cx, cy)
-            child_y = cy + self.level_gap
-            child_offset = max(offset/2, 20)
-            if node.left:
-                _rec(node.left, cx - offset, child_y, child_offset)
-            if node.right:
-                _rec(node.right, cx + offset, child_y, child_offset)
-        _rec(root, center_x, start_y, initial_offset)
-        return pos
+        layout = self.tidy.layout(root)
+        return fit_positions(layout, self.node_w, scroll_width - self.node_w,
+                             80, self.level_gap, self.layout_unit)
 
     def start_animated_build(self):
         if self.animating:
@@ -900,7 +862,8 @@ class BinaryTreeVisualizer:
 
         step()
 
-    def _draw_node(self, node: TreeNode, cx: float, cy: float, offset: float):
+    def _draw_node(self, node: TreeNode, pos: Dict[Any, Tuple[float, float]]):
+        cx, cy = pos[node]
         left = cx - self.node_w/2
         top = cy - self.node_h/2
         right = cx + self.node_w/2
@@ -937,16 +900,12 @@ class BinaryTreeVisualizer:
         left_center_x = left + self.left_cell_w/2
         right_center_x = x2 + self.right_cell_w/2
 
-        child_y = cy + self.level_gap
-        child_offset = max(offset/2, 20)
-
         if node.left:
-            child_x = cx - offset
+            child_x, child_y = pos[node.left]
             self._draw_line_from_cell_to_child(left_center_x, bottom, child_x, child_y - self.node_h/2)
-            self._draw_node(node.left, child_x, child_y, child_offset)
+            self._draw_node(node.left, pos)
         else:
-            null_x = cx - offset
-            null_y = child_y
+            null_x, null_y = pos[(node, "left")]
             rect_null = self.canvas.create_rectangle(
                 null_x - 28, null_y - 14, null_x + 28, null_y + 14,
                 fill="#FFF5F5", outline="#FED7D7", width=1
@@ -959,12 +918,11 @@ class BinaryTreeVisualizer:
             self._draw_line_from_cell_to_child(left_center_x, bottom, null_x, null_y - 14)
 
         if node.right:
-            child_x = cx + offset
+            child_x, child_y = pos[node.right]
             self._draw_line_from_cell_to_child(right_center_x, bottom, child_x, child_y - self.node_h/2)
-            self._draw_node(node.right, child_x, child_y, child_offset)
+            self._draw_node(node.right, pos)
         else:
-            null_x = cx + offset
-            null_y = child_y
+            null_x, null_y = pos[(node, "right")]
             rect_null = self.canvas.create_rectangle(
                 null_x - 28, null_y - 14, null_x + 28, null_y + 14,
                 fill="#FFF5F5", outline="#FED7D7", width=1
@@ -0,0 +1,221 @@
+"""
+二叉树的整洁布局 (Reingold–Tilford)
+Reingold–Tilford tidy layout for binary trees, with incremental relayout
+
+BST / AVL / 红黑树 / 链式存储的可视化共用这里的布局：
+
+- 同一层相邻节点的水平距离至少为 sep；父节点位于两个孩子的正中间，
+  只有一个孩子时孩子偏向自己那一侧 sep / 2 (仍能看出是左孩子还是右孩子)；
+- 左右子树按轮廓 (每一层的最左 / 最右位置) 尽量靠拢，而不是按中序序号铺满整个宽度，
+  因此大树明显更窄 (退化成链时宽度只有中序铺开的一半)。
+
+每棵子树的"形状" (两个孩子相对于它的偏移和左右轮廓) 只依赖子树结构，与子树所在的
+位置无关。轮廓用不可变的链表单元 (到下一层的偏移, 下一层单元) 表示，两棵子树合并时
+只复制较矮一侧的 min(hl, hr) 个单元，较高一侧的轮廓直接共享 (相当于原算法中的轮廓线程，
+但不修改节点)；扫描也只走 min(hl, hr) 层，因此整棵树的布局是 O(n) 的。
+
+TidyLayout 缓存上一次布局中每棵子树的形状：下一次布局时，孩子的形状都没有重新计算
+(且孩子还是原来的节点) 的子树直接复用，只有插入 / 删除 / 旋转改动过的节点到根的路径
+会重新合并轮廓。节点的键默认是节点对象本身 (红黑树的持久化快照在版本间共享未改变的子树)，
+也可以给出 key 函数 (例如 AVL 快照副本的 node.stable_id)。
+
+null_slots=True 时空孩子也占一个叶子的位置 (链式存储的可视化要画 NULL 占位框)，
+结果中以 (键, "left") / (键, "right") 给出这些占位的位置。
+
+所有遍历都用显式栈，不受递归深度限制；节点只需要 left / right 属性。
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+
+__all__ = ["TidyLayout", "tidy_layout", "fit_positions"]
+
+# 轮廓单元：(到下一层轮廓位置的水平偏移, 下一层的单元或 None)
+Contour = Optional[Tuple[float, Any]]
+
+
+class _Shape:
+    """子树的形状：孩子的偏移 dl / dr、左右轮廓 (从子树根开始)、高度 (层数)"""
+    __slots__ = ("left", "right", "dl", "dr", "lc", "rc", "height")
+
+    def __init__(self, left: Optional['_Shape'], right: Optional['_Shape'],
+                 dl: float, dr: float, lc: Contour, rc: Contour, height: int):
+        self.left = left
+        self.right = right
+        self.dl = dl
+        self.dr = dr
+        self.lc = lc
+        self.rc = rc
+        self.height = height
+
+
+_LEAF_CONTOUR: Contour = (0.0, None)
+# null_slots 时空孩子的形状 (单例：缓存按对象比较孩子的形状)
+_NULL_SHAPE = _Shape(None, None, 0.0, 0.0, _LEAF_CONTOUR, _LEAF_CONTOUR, 1)
+
+
+def _descend(contour: Contour, levels: int) -> Tuple[Contour, float]:
+    """沿轮廓下降 levels 层：返回 (该层的单元, 相对于起点的水平位置)"""
+    x = 0.0
+    for _ in range(levels):
+        x += contour[0]
+        contour = contour[1]
+    return contour, x
+
+
+def _graft(prefix: Contour, levels: int, jump: float, tail: Contour) -> Contour:
+    """
+    复制 prefix 的前 levels 个单元，最后一个单元改为以偏移 jump 接到 tail 上
+    (较矮一侧的轮廓在它的最底层之后由较高一侧的轮廓接续)
+    """
+    deltas = []
+    cell = prefix
+    for _ in range(levels - 1):
+        deltas.append(cell[0])
+        cell = cell[1]
+    out: Contour = (jump, tail)
+    for delta in reversed(deltas):
+        out = (delta, out)
+    return out
+
+
+def _merge(sl: Optional[_Shape], sr: Optional[_Shape], sep: float) -> _Shape:
+    """由两个孩子的形状得到父节点的形状，O(min(hl, hr) + 1)"""
+    if sl is None and sr is None:
+        return _Shape(None, None, 0.0, 0.0, _LEAF_CONTOUR, _LEAF_CONTOUR, 1)
+    if sr is None:
+        d = -sep / 2
+        return _Shape(sl, None, d, 0.0, (d, sl.lc), (d, sl.rc), sl.height + 1)
+    if sl is None:
+        d = sep / 2
+        return _Shape(None, sr, 0.0, d, (d, sr.lc), (d, sr.rc), sr.height + 1)
+
+    # 同时沿左子树的右轮廓和右子树的左轮廓下降，求两个孩子之间需要的最小距离
+    a, b = sl.rc, sr.lc
+    xa = xb = 0.0
+    need = sep
+    while True:
+        gap = xa - xb + sep
+        if gap > need:
+            need = gap
+        if a[1] is None or b[1] is None:
+            break
+        xa += a[0]
+        a = a[1]
+        xb += b[0]
+        b = b[1]
+    dl, dr = -need / 2, need / 2
+    hl, hr = sl.height, sr.height
+
+    if hl >= hr:
+        lc = (dl, sl.lc)
+    else:
+        # 左轮廓：左子树的 hl 层之后接右子树左轮廓的第 hl 层
+        _, x_last = _descend(sl.lc, hl - 1)
+        tail, x_tail = _descend(sr.lc, hl)
+        lc = (dl, _graft(sl.lc, hl, (dr + x_tail) - (dl + x_last), tail))
+    if hr >= hl:
+        rc = (dr, sr.rc)
+    else:
+        _, x_last = _descend(sr.rc, hr - 1)
+        tail, x_tail = _descend(sl.rc, hr)
+        rc = (dr, _graft(sr.rc, hr, (dl + x_tail) - (dr + x_last), tail))
+    return _Shape(sl, sr, dl, dr, lc, rc, max(hl, hr) + 1)
+
+
+class TidyLayout:
+    """
+    带缓存的整洁布局
+
+    Args:
+        sep: 同一层相邻节点之间的最小水平距离 (布局单位)
+        key: 节点 -> 缓存 / 结果字典的键；None 表示用节点对象本身
+        null_slots: 空孩子也占位 (见模块说明)
+
+    rebuilt 为上一次 layout 重新计算形状的节点数 (其余节点复用了缓存)。
+    """
+
+    def __init__(self, sep: float = 1.0, key: Optional[Callable[[Any], Any]] = None,
+                 null_slots: bool = False):
+        self.sep = sep
+        self.key = key
+        self.null = _NULL_SHAPE if null_slots else None
+        self._cache: Dict[Any, _Shape] = {}
+        self.rebuilt = 0
+
+    def clear(self) -> None:
+        self._cache = {}
+
+    def layout(self, root) -> Dict[Any, Tuple[float, int]]:
+        """
+        返回 {键: (x, 深度)}；根的 x 为 0，同一层相邻节点至少相距 sep。
+        O(n) 遍历；只有形状改变的子树 (改动节点到根的路径) 重新合并轮廓。
+        """
+        pos: Dict[Any, Tuple[float, int]] = {}
+        if root is None:
+            self._cache = {}
+            return pos
+        key, sep, old, null = self.key, self.sep, self._cache, self.null
+        shapes: Dict[Any, _Shape] = {}
+        rebuilt = 0
+
+        # 后序：先算孩子的形状
+        stack = [(root, False)]
+        while stack:
+            node, ready = stack.pop()
+            left, right = node.left, node.right
+            if not ready:
+                stack.append((node, True))
+                if right is not None:
+                    stack.append((right, False))
+                if left is not None:
+                    stack.append((left, False))
+                continue
+            sl = shapes[left if key is None else key(left)] if left is not None else null
+            sr = shapes[right if key is None else key(right)] if right is not None else null
+            k = node if key is None else key(node)
+            shape = old.get(k)
+            if shape is None or shape.left is not sl or shape.right is not sr:
+                shape = _merge(sl, sr, sep)
+                rebuilt += 1
+            shapes[k] = shape
+
+        # 先序：累加偏移得到绝对位置
+        stack = [(root, 0.0, 0)]
+        while stack:
+            node, x, depth = stack.pop()
+            k = node if key is None else key(node)
+            shape = shapes[k]
+            pos[k] = (x, depth)
+            if node.right is not None:
+                stack.append((node.right, x + shape.dr, depth + 1))
+            elif null is not None:
+                pos[(k, "right")] = (x + shape.dr, depth + 1)
+            if node.left is not None:
+                stack.append((node.left, x + shape.dl, depth + 1))
+            elif null is not None:
+                pos[(k, "left")] = (x + shape.dl, depth + 1)
+
+        self._cache = shapes
+        self.rebuilt = rebuilt
+        return pos
+
+
+def tidy_layout(root, sep: float = 1.0, key: Optional[Callable[[Any], Any]] = None,
+                null_slots: bool = False) -> Dict[Any, Tuple[float, int]]:
+    """不带缓存的一次性布局 (见 TidyLayout.layout)"""
+    return TidyLayout(sep, key, null_slots).layout(root)
+
+
+def fit_positions(layout: Dict[Any, Tuple[float, int]], left: float, right: float,
+                  top: float, level_gap: float, max_unit: float) -> Dict[Any, Tuple[float, float]]:
+    """
+    把布局坐标映射到画布：整棵树在 [left, right] 内水平居中，
+    一个布局单位对应 max_unit 像素 (放不下时按比例缩小)，第 d 层的 y 为 top + d * level_gap
+    """
+    if not layout:
+        return {}
+    xs = [x for x, _ in layout.values()]
+    lo, hi = min(xs), max(xs)
+    span = hi - lo
+    unit = max_unit if span == 0 else min(max_unit, (right - left) / span)
+    center, mid = (left + right) / 2, (lo + hi) / 2
+    return {k: (center + (x - mid) * unit, top + depth * level_gap) for k, (x, depth) in layout.items()}
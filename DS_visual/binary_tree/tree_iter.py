@@ -0,0 +1,123 @@
+"""
+二叉搜索树的惰性中序遍历与区间扫描
+Lazy in-order iteration and pruned range scans over parent-linked trees
+
+BSTModel / AVLModel / RBModel 的节点都带 left / right / parent 指针，
+这里的生成器只沿这些指针移动：额外内存 O(1)，没有递归，不受递归深度限制
+(退化成链的 10^6 个节点也能遍历)。
+
+root 可以是任意子树的根 (或 clone_tree 得到的快照)：遍历不会越过 root 向上走。
+
+路径复制的持久化快照 (如 RBModel.snapshot) 在多个版本间共享子树，节点没有
+parent 指针，用 iter_inorder_stack 遍历 (显式栈，额外内存 O(h))。
+"""
+from typing import Any, Callable, Iterator
+
+__all__ = ["first_node", "next_node", "iter_inorder", "iter_inorder_stack", "lower_bound", "iter_range"]
+
+
+def first_node(root):
+    """子树中序序列的第一个节点 (最左节点)；root 为 None 时返回 None"""
+    node = root
+    if node is None:
+        return None
+    while node.left is not None:
+        node = node.left
+    return node
+
+
+def next_node(node, root=None):
+    """
+    node 的中序后继；不存在时返回 None。
+    给出 root 时只在以 root 为根的子树内查找 (不越过 root 向上)。
+    """
+    if node.right is not None:
+        return first_node(node.right)
+    while node is not root:
+        parent = node.parent
+        if parent is None:
+            return None
+        if parent.left is node:
+            return parent
+        node = parent
+    return None
+
+
+def iter_inorder(root, with_depth: bool = False) -> Iterator:
+    """
+    按中序惰性产出子树中的节点；with_depth 为 True 时产出 (节点, 相对 root 的深度)
+    """
+    node = root
+    if node is None:
+        return
+    depth = 0
+    while node.left is not None:
+        node = node.left
+        depth += 1
+    while True:
+        yield (node, depth) if with_depth else node
+        if node.right is not None:
+            node = node.right
+            depth += 1
+            while node.left is not None:
+                node = node.left
+                depth += 1
+            continue
+        # 没有右子树：向上走，直到从某个祖先的左子树返回
+        while True:
+            if node is root:
+                return
+            parent = node.parent
+            depth -= 1
+            if parent.left is node:
+                node = parent
+                break
+            node = parent
+
+
+def iter_inorder_stack(root, with_depth: bool = False) -> Iterator:
+    """
+    与 iter_inorder 相同，但只使用 left / right (不需要 parent 指针)；用显式栈，不递归
+    """
+    stack = []
+    node, depth = root, 0
+    while stack or node is not None:
+        while node is not None:
+            stack.append((node, depth))
+            node = node.left
+            depth += 1
+        node, depth = stack.pop()
+        yield (node, depth) if with_depth else node
+        node = node.right
+        depth += 1
+
+
+def lower_bound(root, lo: Any, cmp: Callable[[Any, Any], int], attr: str = "val"):
+    """
+    第一个值 >= lo 的节点 (O(h))；cmp(a, b) 为三路比较，返回负数 / 0 / 正数。
+    attr 为参与比较的节点属性 (例如预计算的比较键 "key"，此时 lo 也应是键)。
+    """
+    best = None
+    node = root
+    while node is not None:
+        if cmp(getattr(node, attr), lo) >= 0:
+            best = node
+            node = node.left
+        else:
+            node = node.right
+    return best
+
+
+def iter_range(root, lo: Any, hi: Any, cmp: Callable[[Any, Any], int], attr: str = "val") -> Iterator:
+    """
+    按中序惰性产出 lo <= 值 <= hi 的节点。
+    先 O(h) 下降找到第一个 >= lo 的节点，区间左侧的子树都不会访问；
+    之后逐个取后继，遇到第一个 > hi 的值即停止。总代价 O(h + k)，k 为结果个数。
+    """
+    if cmp(lo, hi) > 0:
+        return
+    node = lower_bound(root, lo, cmp, attr)
+    while node is not None and cmp(getattr(node, attr), hi) <= 0:
+        yield node
+        node = next_node(node, root)
+
@@ -0,0 +1,60 @@
+"""
+树节点的预计算比较键
+Precomputed, domain-tagged sort keys for AVL / RB tree nodes
+
+原来每次比较都要在 try 中对两个值做 float() / int() 转换。现在节点在设置 val 时
+计算一次键 key = (数值域的值 或 None, 字符串域的值)，插入 / 查找时只比较键：
+
+- 两个键都有数值部分时按数值比较；
+- 否则按字符串部分 (str(val)) 比较。
+
+这与各模型原有的比较规则逐对等价：
+- float_key: AVLModel._compare (两者都能 float() 时按数值，否则按 str)
+- int_key:   RBModel._compare_less (两者都能 int() 时按整数，否则按 str)
+
+(唯一的区别：int(inf)、float(10**400) 这类溢出原来会让比较抛出 OverflowError，
+现在按字符串域处理。)
+
+BSTModel 不做类型转换，直接用原生比较，因此不使用这里的键 (见 BSTModel.insert)。
+"""
+from typing import Any, Tuple
+
+__all__ = ["float_key", "int_key", "compare_keys", "key_less"]
+
+SortKey = Tuple[Any, str]
+
+
+def float_key(val: Any) -> SortKey:
+    """AVL 的键：能转换为 float 时带数值部分"""
+    try:
+        return float(val), str(val)
+    except (ValueError, TypeError, OverflowError):
+        return None, str(val)
+
+
+def int_key(val: Any) -> SortKey:
+    """红黑树的键：能转换为 int 时带数值部分 (与 int() 一样会截断小数)"""
+    try:
+        return int(val), str(val)
+    except (ValueError, TypeError, OverflowError):
+        return None, str(val)
+
+
+def compare_keys(a: SortKey, b: SortKey) -> int:
+    """三路比较两个键：返回 -1 / 0 / 1"""
+    x, y = a[0], b[0]
+    if x is None or y is None:
+        x, y = a[1], b[1]
+    if x < y:
+        return -1
+    if x > y:
+        return 1
+    return 0
+
+
+def key_less(a: SortKey, b: SortKey) -> bool:
+    """键 a < 键 b"""
+    x, y = a[0], b[0]
+    if x is None or y is None:
+        return a[1] < b[1]
+    return x < y
@@ -2,15 +2,24 @@
 # 循环队列模块
 
 from circular_queue.circular_queue_model import CircularQueueModel
+from circular_queue.concurrent_queue import SPSCRingQueue, MPMCRingQueue
+from circular_queue.async_queue import AsyncCircularQueue
 from circular_queue.graph_model import DirectedGraph, generate_random_graph, generate_bfs_friendly_graph, bfs_traversal
+from circular_queue.graph_model import multi_source_bfs_traversal, bidirectional_bfs_traversal, bidirectional_shortest_path
 from circular_queue.bfs_visual import BFSVisualizer, open_bfs_visualizer
 
 __all__ = [
     'CircularQueueModel',
+    'SPSCRingQueue',
+    'MPMCRingQueue',
+    'AsyncCircularQueue',
     'DirectedGraph', 
     'generate_random_graph',
     'generate_bfs_friendly_graph',
     'bfs_traversal',
+    'multi_source_bfs_traversal',
+    'bidirectional_bfs_traversal',
+    'bidirectional_shortest_path',
     'BFSVisualizer',
     'open_bfs_visualizer',
 ]
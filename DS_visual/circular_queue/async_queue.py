@@ -0,0 +1,159 @@
+"""
+asyncio 有界循环队列
+Asyncio bounded queue backed by CircularQueueModel
+
+await put() 在缓冲区满时挂起 (背压)，await get() 在缓冲区空时挂起。
+等待者保存在 future 的 deque 中，按到达顺序 (FIFO) 唤醒，没有任何轮询：
+每腾出一个空位 / 放入一个元素，只唤醒队首的一个等待者并为它预留该位置 / 元素；
+新来的协程只能使用未预留的位置，且有人排队时必须排在后面，因此不会插队。
+
+只能在单个事件循环中使用 (不是线程安全的)。on_change 回调在每次入队 / 出队后
+调用，可视化界面用它在 Tk 主线程中驱动 asyncio 时直接重绘。
+"""
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, Optional
+
+from circular_queue.circular_queue_model import CircularQueueModel
+
+__all__ = ["AsyncCircularQueue", "stream_to_queue"]
+
+
+class AsyncCircularQueue:
+    """
+    带背压的 asyncio 循环队列
+
+    Args:
+        capacity: 容量 (model 为 None 时使用)
+        model: 要包装的已有 CircularQueueModel (不能是 auto_grow)
+        on_change: 回调 on_change(op, value)，op 为 "enqueue" 或 "dequeue"
+    """
+
+    def __init__(self, capacity: int = 8, model: Optional[CircularQueueModel] = None,
+                 on_change: Optional[Callable[[str, Any], None]] = None):
+        self.model = model if model is not None else CircularQueueModel(capacity)
+        if self.model.auto_grow:
+            raise ValueError("AsyncCircularQueue needs a bounded (non auto_grow) model")
+        self.on_change = on_change
+        self._putters: Deque[asyncio.Future] = deque()
+        self._getters: Deque[asyncio.Future] = deque()
+        # 已被唤醒、尚未恢复运行的等待者数 (各自预留了一个空位 / 一个元素)
+        self._woken_putters = 0
+        self._woken_getters = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.model.capacity
+
+    def __len__(self) -> int:
+        return self.model.size
+
+    def qsize(self) -> int:
+        return self.model.size
+
+    def empty(self) -> bool:
+        return self.model.size == 0
+
+    def full(self) -> bool:
+        return self.model.size >= self.model.capacity
+
+    # ---------- 唤醒 ----------
+
+    def _wake_putters(self) -> None:
+        """按 FIFO 顺序唤醒等待者，直到未预留的空位用完；被唤醒者移出 deque"""
+        putters = self._putters
+        free = self.model.capacity - self.model.size - self._woken_putters
+        while free > 0 and putters:
+            fut = putters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                self._woken_putters += 1
+                free -= 1
+
+    def _wake_getters(self) -> None:
+        """按 FIFO 顺序唤醒等待者，直到未预留的元素用完；被唤醒者移出 deque"""
+        getters = self._getters
+        available = self.model.size - self._woken_getters
+        while available > 0 and getters:
+            fut = getters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                self._woken_getters += 1
+                available -= 1
+
+    async def _wait(self, waiters: Deque[asyncio.Future], woken_attr: str, wake: Callable[[], None]) -> None:
+        """排队等待被唤醒；返回时已为本协程预留了一个空位 / 一个元素"""
+        fut = asyncio.get_running_loop().create_future()
+        waiters.append(fut)
+        try:
+            await fut
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                # 已被唤醒却被取消：把预留的位置交给下一个等待者
+                setattr(self, woken_attr, getattr(self, woken_attr) - 1)
+                wake()
+            else:
+                waiters.remove(fut)
+            raise
+        setattr(self, woken_attr, getattr(self, woken_attr) - 1)
+
+    # ---------- 入队 / 出队 ----------
+
+    def _enqueue(self, item: Any) -> None:
+        self.model.enqueue(item)
+        if self.on_change is not None:
+            self.on_change("enqueue", item)
+        if self._getters:
+            self._wake_getters()
+
+    def _dequeue(self) -> Any:
+        item = self.model.dequeue()
+        if self.on_change is not None:
+            self.on_change("dequeue", item)
+        if self._putters:
+            self._wake_putters()
+        return item
+
+    async def put(self, item: Any) -> None:
+        """入队；没有未预留的空位 (或已有协程在排队) 时挂起，直到轮到自己"""
+        if self._putters or self.model.size + self._woken_putters >= self.model.capacity:
+            await self._wait(self._putters, "_woken_putters", self._wake_putters)
+        self._enqueue(item)
+
+    async def get(self) -> Any:
+        """出队；没有未预留的元素 (或已有协程在排队) 时挂起，直到轮到自己"""
+        if self._getters or self.model.size <= self._woken_getters:
+            await self._wait(self._getters, "_woken_getters", self._wake_getters)
+        return self._dequeue()
+
+    def put_nowait(self, item: Any) -> None:
+        """不等待的入队；需要排队时抛出 asyncio.QueueFull"""
+        if self._putters or self.model.size + self._woken_putters >= self.model.capacity:
+            raise asyncio.QueueFull
+        self._enqueue(item)
+
+    def get_nowait(self) -> Any:
+        """不等待的出队；需要排队时抛出 asyncio.QueueEmpty"""
+        if self._getters or self.model.size <= self._woken_getters:
+            raise asyncio.QueueEmpty
+        return self._dequeue()
+
+    def snapshot(self) -> CircularQueueModel:
+        """当前状态的 CircularQueueModel 副本"""
+        return CircularQueueModel.from_dict(self.model.to_dict())
+
+
+async def stream_to_queue(queue: AsyncCircularQueue, items: Iterable[Any], interval: float = 0.0) -> int:
+    """
+    把一个 (脚本化的) 数据流依次放入队列，每个元素之间等待 interval 秒
+
+    Returns:
+        放入的元素个数
+    """
+    count = 0
+    for item in items:
+        await queue.put(item)
+        count += 1
+        if interval:
+            await asyncio.sleep(interval)
+    return count
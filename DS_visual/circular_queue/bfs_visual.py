@@ -15,8 +15,12 @@ import math
 import time
 from typing import List, Tuple, Optional, Any, Dict, Set
 
-from circular_queue.graph_model import DirectedGraph, generate_random_graph, generate_bfs_friendly_graph, bfs_traversal
+from graph.directed_graph import DirectedGraph
+from graph.demo_graphs import generate_random_graph, generate_bfs_friendly_graph
+from circular_queue.graph_model import bidirectional_bfs_traversal
 from circular_queue.circular_queue_model import CircularQueueModel
+from graph.parallel_bfs import compute_layers
+from graph.force_layout import ForceLayout
 
 
 # ========== 动画配置 ==========
@@ -48,6 +52,12 @@ def get_layer_color(layer: int) -> str:
     return LAYER_COLORS[layer % len(LAYER_COLORS)]
 
 
+# ========== 双向BFS的两个方向 ==========
+DIRECTION_COLORS = {"forward": "#3498DB", "backward": "#E67E22"}
+DIRECTION_NAMES = {"forward": "正向", "backward": "反向"}
+PATH_COLOR = "#8E44AD"
+
+
 # ========== BFS 多语言伪代码 ==========
 LANG_PSEUDOCODE = "伪代码"
 LANG_C = "C语言"
@@ -172,6 +182,7 @@ class BFSVisualizer:
         self.current_layer = 0  # 当前正在处理的层
         self.max_layer = 0  # 最大层级
         self.processing_layer = -1  # 正在处理的层级
+        self.path_summary: Optional[str] = None  # 双向BFS的结果说明
         
         # 循环队列
         self.queue_capacity = 12
@@ -212,6 +223,11 @@ class BFSVisualizer:
         self.code_labels: List[Label] = []
         self.highlighted_line = -1
         self.edge_items: Dict[Tuple[Any, Any], int] = {}
+        
+        # 力导向布局 (after() 分片推进)
+        self.force_layout: Optional[ForceLayout] = None
+        self.layout_job: Optional[str] = None
+        self.layout_iterations_per_tick = 4
         self.layer_frames: List[Frame] = []
         
         self._create_ui()
@@ -614,8 +630,10 @@ class BFSVisualizer:
         Label(row1, text="起点:", font=("Microsoft YaHei", 10),
               bg="#FFFFFF", fg="#2C3E50").pack(side=LEFT, padx=(0, 3))
         self.start_vertex_var = StringVar(value="A")
-        Entry(row1, textvariable=self.start_vertex_var, width=3,
+        Entry(row1, textvariable=self.start_vertex_var, width=6,
               font=("Microsoft YaHei", 10), relief="solid", bd=1).pack(side=LEFT)
+        Label(row1, text="(A,C 多源 / A>E 双向)", font=("Microsoft YaHei", 8),
+              bg="#FFFFFF", fg="#7F8C8D").pack(side=LEFT, padx=(3, 0))
         
         Label(row1, text=" | ", bg="#FFFFFF", fg="#BDC3C7").pack(side=LEFT, padx=8)
         
@@ -641,6 +659,8 @@ class BFSVisualizer:
         self.speed_scale.pack(side=LEFT)
         
         self._create_button(row1, "关闭", "#95A5A6", self.window.destroy).pack(side=RIGHT, padx=3)
+        self.layout_btn = self._create_button(row1, "🧲 力导向布局", "#16A085", self._start_force_layout)
+        self.layout_btn.pack(side=RIGHT, padx=3)
     
     def _create_button(self, parent, text, color, command):
         btn = Button(parent, text=text, font=("Microsoft YaHei", 9),
@@ -714,6 +734,27 @@ class BFSVisualizer:
         self.queue_size -= 1
         return val
     
+    def _queue_remove(self, value):
+        """
+        双向BFS的两个方向共用显示队列：取出指定元素，返回它原来的下标
+        (在队首时与 _queue_dequeue 相同，否则其后的元素依次前移)
+        """
+        items = self._queue_to_list()
+        if value not in items:
+            return None
+        offset = items.index(value)
+        index = (self.queue_front + offset) % self.queue_capacity
+        if offset == 0:
+            self._queue_dequeue()
+            return index
+        del items[offset]
+        self.queue_buffer = [None] * self.queue_capacity
+        for i, item in enumerate(items):
+            self.queue_buffer[(self.queue_front + i) % self.queue_capacity] = item
+        self.queue_size = len(items)
+        self.queue_rear = (self.queue_front + self.queue_size) % self.queue_capacity
+        return index
+    
     def _queue_clear(self):
         self.queue_buffer = [None] * self.queue_capacity
         self.queue_front = self.queue_rear = self.queue_size = 0
@@ -746,9 +787,11 @@ class BFSVisualizer:
         if self.graph.get_vertices():
             self.start_vertex_var.set(self.graph.get_vertices()[0])
         
+        self._apply_circle_layout()
         self._reset_bfs()
         self._draw_graph()
         self._draw_queue()
+        self._start_force_layout()
         
         # 显示图的结构信息
         edge_info = []
@@ -772,12 +815,9 @@ class BFSVisualizer:
         if not self.graph:
             return
         
-        cx, cy, r = 240, 190, 140
         vertices = self.graph.get_vertices()
-        
-        for i, v in enumerate(vertices):
-            angle = 2 * math.pi * i / len(vertices) - math.pi / 2
-            self.graph.set_position(v, cx + r * math.cos(angle), cy + r * math.sin(angle))
+        if any(self.graph.get_position(v) is None for v in vertices):
+            self._apply_circle_layout()
         
         # 绘制边
         for u, v in self.graph.get_edges():
@@ -794,6 +834,40 @@ class BFSVisualizer:
                     color = self.colors["vertex_default"]
                 self._draw_vertex(v, pos[0], pos[1], color)
     
+    def _apply_circle_layout(self):
+        """环形初始布局"""
+        cx, cy, r = 240, 190, 140
+        vertices = self.graph.get_vertices()
+        for i, v in enumerate(vertices):
+            angle = 2 * math.pi * i / len(vertices) - math.pi / 2
+            self.graph.set_position(v, cx + r * math.cos(angle), cy + r * math.sin(angle))
+    
+    def _start_force_layout(self):
+        """从当前位置开始力导向布局，每次 after() 只推进几轮，图在界面上逐渐稳定"""
+        if not self.graph or self.animating:
+            return
+        self._stop_force_layout()
+        self.force_layout = ForceLayout(self.graph, width=480, height=380, margin=40, seed=0)
+        self._force_layout_tick()
+    
+    def _force_layout_tick(self):
+        self.layout_job = None
+        layout = self.force_layout
+        if layout is None or layout.graph is not self.graph:
+            return
+        layout.step(self.layout_iterations_per_tick)
+        self._draw_graph()
+        if layout.done:
+            self.force_layout = None
+            return
+        self.layout_job = self.window.after(30, self._force_layout_tick)
+    
+    def _stop_force_layout(self):
+        if self.layout_job is not None:
+            self.window.after_cancel(self.layout_job)
+            self.layout_job = None
+        self.force_layout = None
+    
     def _draw_vertex(self, label, x, y, color, is_current=False):
         r = 26
         outline = "#E74C3C" if is_current else "#2C3E50"
@@ -916,110 +990,155 @@ class BFSVisualizer:
     def _update_speed(self, val):
         self.animation_speed = 2900 - int(val)
     
+    def _parse_start(self):
+        """
+        解析起点输入: "A" 单源, "A,C" 多源 (都作为第0层), "A>E" 双向BFS求 A 到 E 的最短路径
+        
+        Returns:
+            (是否双向, 顶点列表)；输入有误时提示并返回 None
+        """
+        text = self.start_vertex_var.get().strip().upper().replace("，", ",")
+        bidirectional = ">" in text
+        parts = [p.strip() for p in text.split(">" if bidirectional else ",") if p.strip()]
+        if not parts or (bidirectional and len(parts) != 2):
+            messagebox.showerror("错误", "起点格式: A / A,C / A>E")
+            return None
+        for v in parts:
+            if not self.graph.has_vertex(v):
+                messagebox.showerror("错误", f"顶点'{v}'不存在")
+                return None
+        return bidirectional, list(dict.fromkeys(parts)) if not bidirectional else parts
+    
+    def _generate_steps(self, bidirectional, vertices):
+        if bidirectional:
+            self._generate_bidirectional_steps(vertices[0], vertices[1])
+        else:
+            self._generate_bfs_steps(vertices)
+    
     def _start_bfs(self):
         if not self.graph:
             messagebox.showwarning("提示", "请先生成图")
             return
         
-        start = self.start_vertex_var.get().strip().upper()
-        if not self.graph.has_vertex(start):
-            messagebox.showerror("错误", f"顶点'{start}'不存在")
+        parsed = self._parse_start()
+        if parsed is None:
             return
         
         if self.animating:
             return
         
         self._reset_bfs()
-        self._generate_bfs_steps(start)
+        self._generate_steps(*parsed)
         self.animating = True
         self._set_buttons_state()
         self._animate_step()
     
-    def _generate_bfs_steps(self, start):
-        """生成强调层级的BFS步骤 - 特别强调多个邻居依次入队"""
-        self.bfs_steps = []
-        
-        # 计算所有层级信息
-        self._compute_layers(start)
+    def _generate_bfs_steps(self, sources):
+        """
+        生成强调层级的BFS步骤 - 特别强调多个邻居依次入队
         
-        # 初始化
-        self.bfs_steps.append(("init", None, None))
-        self.bfs_steps.append(("new_layer", 0, [start]))  # 开始第0层
-        self.bfs_steps.append(("enqueue", start, 0))
-        self.bfs_steps.append(("mark", start, 0))
+        sources 为起点列表：多个起点时为多源BFS，所有起点同时作为第0层入队。
+        队列使用 CircularQueueModel (auto_grow)，每次出队 O(1)；层级在同一次遍历中得到。
+        """
+        self.bfs_steps = []
+        steps = self.bfs_steps
+        
+        vertex_layer: Dict[Any, int] = {}
+        layer_vertices: Dict[int, List[Any]] = {0: []}
+        queue = CircularQueueModel(max(8, len(sources)), auto_grow=True)
+        
+        # 初始化: 所有起点入队
+        steps.append(("init", None, None))
+        steps.append(("new_layer", 0, list(sources)))  # 开始第0层
+        for s in sources:
+            steps.append(("enqueue", s, 0))
+            steps.append(("mark", s, 0))
+            vertex_layer[s] = 0
+            layer_vertices[0].append(s)
+            queue.enqueue(s)
         
-        visited = {start}
-        queue = [(start, 0)]
         current_layer = 0
-        
-        while queue:
-            v, layer = queue.pop(0)
+        while not queue.is_empty():
+            v = queue.dequeue()
+            layer = vertex_layer[v]
             
-            # 检查是否进入新层
+            # 检查是否进入新层 (此时该层的顶点都已入队)
             if layer > current_layer:
-                next_layer_vertices = [x for x, l in self.vertex_layer.items() if l == layer]
-                self.bfs_steps.append(("new_layer", layer, next_layer_vertices))
+                steps.append(("new_layer", layer, list(layer_vertices[layer])))
                 current_layer = layer
             
-            self.bfs_steps.append(("dequeue", v, layer))
-            self.bfs_steps.append(("visit", v, layer))
+            steps.append(("dequeue", v, layer))
+            steps.append(("visit", v, layer))
             
             neighbors = self.graph.get_neighbors(v)
             
             if neighbors:
                 # 先收集未访问的邻居
-                unvisited_neighbors = [nb for nb in neighbors if nb not in visited]
+                unvisited_neighbors = [nb for nb in neighbors if nb not in vertex_layer]
                 
                 # 显示探索开始 - 强调发现了多少个新节点
-                self.bfs_steps.append(("explore_start", v, (neighbors, unvisited_neighbors)))
+                steps.append(("explore_start", v, (neighbors, unvisited_neighbors)))
                 
                 # 如果有多个未访问邻居，添加"准备依次入队"的提示
                 if len(unvisited_neighbors) >= 2:
-                    self.bfs_steps.append(("batch_enqueue_start", v, unvisited_neighbors))
+                    steps.append(("batch_enqueue_start", v, unvisited_neighbors))
                 
                 # 依次处理每个邻居
                 enqueue_index = 0
                 for nb in neighbors:
-                    self.bfs_steps.append(("check_edge", v, nb))
-                    if nb not in visited:
+                    steps.append(("check_edge", v, nb))
+                    if nb not in vertex_layer:
                         enqueue_index += 1
                         # 入队时带上序号信息 (第几个入队 / 总共几个)
-                        self.bfs_steps.append(("enqueue_animated", nb, 
-                                              (layer + 1, enqueue_index, len(unvisited_neighbors), v)))
-                        visited.add(nb)
-                        queue.append((nb, layer + 1))
+                        steps.append(("enqueue_animated", nb,
+                                      (layer + 1, enqueue_index, len(unvisited_neighbors), v)))
+                        vertex_layer[nb] = layer + 1
+                        layer_vertices.setdefault(layer + 1, []).append(nb)
+                        queue.enqueue(nb)
                     else:
-                        self.bfs_steps.append(("skip", nb, None))
+                        steps.append(("skip", nb, v))
                 
                 # 如果有多个未访问邻居，添加"入队完成"的提示
                 if len(unvisited_neighbors) >= 2:
-                    self.bfs_steps.append(("batch_enqueue_end", v, unvisited_neighbors))
+                    steps.append(("batch_enqueue_end", v, unvisited_neighbors))
                 
-                self.bfs_steps.append(("explore_end", v, None))
+                steps.append(("explore_end", v, None))
+        
+        steps.append(("done", None, None))
+        
+        self.vertex_layer, self.layer_vertices = vertex_layer, layer_vertices
+        self.max_layer = max(layer_vertices)
+        self._update_layer_progress()
+        self._update_layer_view()
+    
+    def _generate_bidirectional_steps(self, source, target):
+        """
+        双向BFS：把 bidirectional_bfs_traversal 的步骤转换为动画步骤
         
-        self.bfs_steps.append(("done", None, None))
+        入队 / 出队 / 访问 / 跳过带上方向 (bi_*)，检查边时按方向给出图中真实的边；
+        meet / path / no_path / done 原样保留。层级视图显示从 source 出发的层。
+        """
+        self._compute_layers(source)
+        steps = [("init", None, None)]
+        direction, current = "forward", None
+        for action, d1, d2 in bidirectional_bfs_traversal(self.graph, source, target):
+            if action in ("enqueue", "dequeue", "visit"):
+                if action == "dequeue":
+                    direction, current = d2, d1
+                steps.append(("bi_" + action, d1, d2))
+            elif action == "check_neighbor":
+                steps.append(("bi_check", (d1, d2), direction))
+            elif action == "skip":
+                steps.append(("bi_skip", (current, d1), d2))
+            else:
+                steps.append((action, d1, d2))
+        self.bfs_steps = steps
     
     def _compute_layers(self, start):
         """预计算所有顶点的层级"""
-        self.vertex_layer = {start: 0}
-        self.layer_vertices = {0: [start]}
-        self.max_layer = 0
-        
-        visited = {start}
-        queue = [(start, 0)]
-        
-        while queue:
-            v, layer = queue.pop(0)
-            for nb in self.graph.get_neighbors(v):
-                if nb not in visited:
-                    visited.add(nb)
-                    nb_layer = layer + 1
-                    self.vertex_layer[nb] = nb_layer
-                    if nb_layer not in self.layer_vertices:
-                        self.layer_vertices[nb_layer] = []
-                    self.layer_vertices[nb_layer].append(nb)
-                    self.max_layer = max(self.max_layer, nb_layer)
-                    queue.append((nb, nb_layer))
+        # 层同步BFS (双向BFS的层级视图用)；大图可改用 parallel_bfs_layers(self.graph.freeze(), start, workers)
+        self.vertex_layer, self.layer_vertices = compute_layers(self.graph, start)
+        self.max_layer = max(self.layer_vertices)
         
         self._update_layer_progress()
         self._update_layer_view()
@@ -1029,14 +1148,12 @@ class BFSVisualizer:
             messagebox.showwarning("提示", "请先生成图")
             return
         
-        start = self.start_vertex_var.get().strip().upper()
-        
         if not self.bfs_steps:
-            if not self.graph.has_vertex(start):
-                messagebox.showerror("错误", f"顶点'{start}'不存在")
+            parsed = self._parse_start()
+            if parsed is None:
                 return
             self._reset_bfs()
-            self._generate_bfs_steps(start)
+            self._generate_steps(*parsed)
         
         if self.current_step >= len(self.bfs_steps):
             return
@@ -1058,6 +1175,7 @@ class BFSVisualizer:
     
     def _reset_bfs(self):
         self.animating = False
+        self._stop_force_layout()
         self.paused = False
         self.bfs_steps = []
         self.current_step = 0
@@ -1069,6 +1187,7 @@ class BFSVisualizer:
         self.layer_vertices = {}
         self.max_layer = 0
         self.processing_layer = -1
+        self.path_summary = None
         self.highlighted_line = -1
         
         self._queue_clear()
@@ -1355,9 +1474,9 @@ class BFSVisualizer:
                      f"• {v} {'∉' if is_new else '∈'} visited")
         
         elif action == "skip":
-            v = d1
-            if self.current_vertex:
-                self._draw_edge(self.current_vertex, v, self.colors["edge_traversed"], 2)
+            v, u = d1, d2  # 被跳过的边 u -> v
+            if u is not None:
+                self._draw_edge(u, v, self.colors["edge_traversed"], 2)
             
             # 跳过节点的淡化效果
             pos = self.graph.get_position(v)
@@ -1378,6 +1497,38 @@ class BFSVisualizer:
                 self._draw_edge(v, nb, self.colors["edge_traversed"], 2)
             self._highlight_line(16, f"{v}的邻居探索完毕")
         
+        elif action.startswith("bi_"):
+            self._execute_bidirectional_step(action, d1, d2)
+        
+        elif action == "meet":
+            v = d1
+            self._animate_vertex_glow(v, PATH_COLOR, 1.5)
+            pos = self.graph.get_position(v)
+            if pos:
+                self._create_ripple_wave(pos[0], pos[1], 120, PATH_COLOR, 0)
+            self.action_label.config(
+                text=f"🤝 两侧搜索在 {v} 相遇!\n\n"
+                     f"• 正向与反向的已访问集合有交集\n"
+                     f"• 处理完这一层后取最短的路径")
+        
+        elif action == "path":
+            path, length = d1, d2
+            for u, v in zip(path, path[1:]):
+                self._draw_edge(u, v, PATH_COLOR, 5)
+            for v in path:
+                self._animate_vertex_glow(v, PATH_COLOR, 1.0)
+            path_str = " → ".join(str(v) for v in path)
+            self.result_label.config(text=path_str)
+            self.path_summary = (f"🎯 最短路径 ({length} 条边):\n{path_str}\n\n"
+                                 f"💡 双向BFS从两端同时按层扩展，\n"
+                                 f"每次扩展前沿较小的一侧")
+            self.action_label.config(text=self.path_summary)
+        
+        elif action == "no_path":
+            source, target = d1, d2
+            self.path_summary = f"❌ {source} 无法到达 {target}\n\n• 有一侧的队列已空，两侧没有相遇"
+            self.action_label.config(text=self.path_summary)
+        
         elif action == "done":
             self.animating = False
             self.processing_layer = self.max_layer + 1
@@ -1385,6 +1536,11 @@ class BFSVisualizer:
             self._update_layer_view()
             self._set_buttons_state()
             
+            if self.path_summary is not None:
+                self._highlight_line(17, "✅ 双向BFS完成!")
+                self.action_label.config(text=self.path_summary)
+                return
+            
             order = " → ".join(str(x) for x in self.traversal_order)
             
             # 构建层级统计
@@ -1408,6 +1564,68 @@ class BFSVisualizer:
                      f"• 同层节点按入队顺序访问\n"
                      f"• 像波浪一样逐层扩散")
     
+    def _execute_bidirectional_step(self, action, d1, d2):
+        """双向BFS的步骤：d2 为方向 ("forward" / "backward")，按方向着色"""
+        direction = d2
+        color = DIRECTION_COLORS[direction]
+        name = DIRECTION_NAMES[direction]
+        
+        if action == "bi_enqueue":
+            v = d1
+            target_index = self.queue_rear
+            self._queue_enqueue(v)
+            self.queued_vertices.add(v)
+            self._update_vertex(v, color)
+            self._animate_queue_enqueue(v, target_index, color)
+            self._highlight_line(14, f"{name}入队: {v}")
+            self.action_label.config(
+                text=f"📥 {name}入队: {v}\n\n"
+                     f"• 两个方向共用显示队列\n"
+                     f"• 颜色表示所属方向")
+        
+        elif action == "bi_dequeue":
+            v = d1
+            source_index = self._queue_remove(v)
+            if source_index is not None:
+                self._animate_queue_dequeue(v, source_index, color, callback=lambda: self._draw_queue())
+            self.current_vertex = v
+            self._update_vertex(v, color, is_current=True)
+            self._highlight_line(9, f"{name}出队: {v}")
+            self.action_label.config(
+                text=f"📤 {name}出队: {v}\n\n"
+                     f"• 扩展{name}搜索的一整层\n"
+                     f"• {'沿出边' if direction == 'forward' else '沿入边'}查找邻居")
+        
+        elif action == "bi_visit":
+            v = d1
+            self.visited_vertices.add(v)
+            self.queued_vertices.discard(v)
+            self.traversal_order.append(v)
+            self._update_vertex(v, color)
+            self._draw_queue()
+            order = " → ".join(str(x) for x in self.traversal_order)
+            self.result_label.config(text=order)
+            self._highlight_line(10, f"{name}访问: {v}")
+        
+        elif action in ("bi_check", "bi_skip"):
+            current, nb = d1
+            # 反向搜索沿入边扩展：图中的边是 nb -> current
+            u, v = (current, nb) if direction == "forward" else (nb, current)
+            if action == "bi_check":
+                self._draw_edge(u, v, color, 4)
+                self._animate_edge_pulse(u, v, color)
+                self._highlight_line(13, f"{name}检查边 {u}→{v}")
+                self.action_label.config(
+                    text=f"🔗 {name}检查边: {u} → {v}\n\n• 邻居: {nb}")
+            else:
+                self._draw_edge(u, v, self.colors["edge_traversed"], 2)
+                pos = self.graph.get_position(nb)
+                if pos:
+                    self._show_skip_indicator(pos[0], pos[1])
+                self._highlight_line(13, f"跳过{nb}({name}已访问)")
+                self.action_label.config(
+                    text=f"⏭ 跳过节点 {nb}\n\n• {nb} 已被{name}搜索发现")
+    
     # ==================== 增强动画效果 ====================
     
     def _create_ripple_wave(self, center_x: float, center_y: float, max_radius: float, 
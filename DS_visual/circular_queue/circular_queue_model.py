@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, Iterable, List, Optional, Dict
 
 class CircularQueueModel:
     """
@@ -8,8 +8,10 @@ class CircularQueueModel:
         head: index of the current front element (next to dequeue)
         tail: index of the next insertion slot (next to enqueue)
         size: current number of elements
+        auto_grow: when True, a full queue doubles its capacity instead of
+            rejecting enqueue (amortized O(1) per element)
     """
-    def __init__(self, capacity: int = 8):
+    def __init__(self, capacity: int = 8, auto_grow: bool = False):
         if capacity < 1:
             raise ValueError("capacity must be >= 1")
         self.capacity: int = int(capacity)
@@ -17,13 +19,17 @@ class CircularQueueModel:
         self.head: int = 0
         self.tail: int = 0
         self.size: int = 0
+        self.auto_grow: bool = bool(auto_grow)
 
     def enqueue(self, value: Any) -> bool:
         """
-        Insert value at tail. Returns True on success, False if the queue is full.
+        Insert value at tail. Returns True on success, False if the queue is full
+        (a full auto_grow queue doubles its capacity instead).
         """
         if self.size >= self.capacity:
-            return False
+            if not self.auto_grow:
+                return False
+            self.resize(self.capacity * 2)
         self.buffer[self.tail] = value
         self.tail = (self.tail + 1) % self.capacity
         self.size += 1
@@ -41,6 +47,66 @@ class CircularQueueModel:
         self.size -= 1
         return v
 
+    def enqueue_many(self, values: Iterable[Any]) -> int:
+        """
+        Insert values at tail in order with at most two slice copies
+        (tail -> end of buffer, then wrap to index 0).
+        Returns the number of values inserted: all of them for an auto_grow
+        queue, otherwise as many as fit in the free slots.
+        """
+        items = values if isinstance(values, list) else list(values)
+        count = len(items)
+        free = self.capacity - self.size
+        if count > free:
+            if self.auto_grow:
+                new_capacity = self.capacity
+                while new_capacity - self.size < count:
+                    new_capacity *= 2
+                self.resize(new_capacity)
+            else:
+                count = free
+        if count == 0:
+            return 0
+        tail = self.tail
+        first = min(count, self.capacity - tail)
+        self.buffer[tail:tail + first] = items[:first]
+        if first < count:
+            self.buffer[:count - first] = items[first:count]
+        self.tail = (tail + count) % self.capacity
+        self.size += count
+        return count
+
+    def dequeue_many(self, count: Optional[int] = None) -> List[Any]:
+        """
+        Remove and return up to count front elements (all when count is None)
+        with at most two slice copies. Returns an empty list if the queue is empty.
+        """
+        count = self.size if count is None else max(0, min(int(count), self.size))
+        if count == 0:
+            return []
+        head = self.head
+        first = min(count, self.capacity - head)
+        out = self.buffer[head:head + first]
+        self.buffer[head:head + first] = [None] * first
+        if first < count:
+            rest = count - first
+            out += self.buffer[:rest]
+            self.buffer[:rest] = [None] * rest
+        self.head = (head + count) % self.capacity
+        self.size -= count
+        return out
+
+    def items(self) -> List[Any]:
+        """
+        Return the queued elements in logical order (front -> back),
+        built from the two contiguous ring segments.
+        """
+        head, size = self.head, self.size
+        end = head + size
+        if end <= self.capacity:
+            return self.buffer[head:end]
+        return self.buffer[head:] + self.buffer[:end - self.capacity]
+
     def peek(self) -> Optional[Any]:
         """
         Return front element without removing it. None if empty.
@@ -81,6 +147,7 @@ class CircularQueueModel:
             "head": int(self.head),
             "tail": int(self.tail),
             "size": int(self.size),
+            "auto_grow": bool(self.auto_grow),
         }
 
     @classmethod
@@ -89,7 +156,7 @@ class CircularQueueModel:
         Restore a model instance from a dict produced by to_dict.
         """
         cap = int(data.get("capacity", 8))
-        inst = cls(cap)
+        inst = cls(cap, auto_grow=bool(data.get("auto_grow", False)))
         buf = data.get("buffer", [])
         # If buffer length differs, truncate or extend
         if not isinstance(buf, list):
@@ -126,17 +193,13 @@ class CircularQueueModel:
             self.size = 0
             return
 
-        # preserve elements in order
-        items = []
-        for _ in range(self.size):
-            items.append(self.dequeue())
+        # preserve elements in order: copy the two ring segments with slices
+        items = self.items()[:new_capacity]
         self.capacity = new_capacity
-        self.buffer = [None] * self.capacity
+        self.buffer = items + [None] * (new_capacity - len(items))
         self.head = 0
-        self.tail = 0
-        self.size = 0
-        for it in items[:self.capacity]:
-            self.enqueue(it)
+        self.size = len(items)
+        self.tail = self.size % new_capacity
 
     def __len__(self) -> int:
         return self.size
@@ -1,13 +1,17 @@
 from tkinter import *
 from tkinter import messagebox, filedialog
+import asyncio
 import json
 import os
 import random
 import math
+import threading
 from datetime import datetime
 from typing import Any, List, Optional, Tuple
 
 from circular_queue.circular_queue_model import CircularQueueModel
+from circular_queue.concurrent_queue import SPSCRingQueue, MPMCRingQueue, Empty, Full
+from circular_queue.async_queue import AsyncCircularQueue, stream_to_queue
 from circular_queue.bfs_visual import open_bfs_visualizer
 import storage
 from DSL_utils import circular_queue_dsl
@@ -230,6 +234,44 @@ MULTILANG_IDLE = {
     ]
 }
 
+# 生产者 / 消费者 - 多语言 (未单独给出的语言显示伪代码)
+MULTILANG_PRODUCER_CONSUMER = {
+    "伪代码": [
+        ("// 生产者 / 消费者 (有界缓冲区)", "comment"),
+        ("PRODUCER():", "code"),
+        ("  loop", "code"),
+        ("    lock(mutex)", "code"),
+        ("    while queue.size = capacity: wait(not_full)", "code"),
+        ("    ENQUEUE(queue, item)", "code"),
+        ("    signal(not_empty); unlock(mutex)", "code"),
+        ("CONSUMER():", "code"),
+        ("  loop", "code"),
+        ("    lock(mutex)", "code"),
+        ("    while queue.size = 0: wait(not_empty)", "code"),
+        ("    item ← DEQUEUE(queue)", "code"),
+        ("    signal(not_full); unlock(mutex)", "code"),
+        ("", "code"),
+        ("// SPSC: 只有生产者写 rear、只有消费者写 front，", "comment"),
+        ("// 先写槽位再移动指针，不需要锁", "comment"),
+    ],
+    "Python": [
+        ("# 生产者 / 消费者 (有界缓冲区)", "comment"),
+        ("def put(self, item):", "code"),
+        ("  with self.not_full:", "code"),
+        ("    while self.size == self.capacity:", "code"),
+        ("      self.not_full.wait()", "code"),
+        ("    self.enqueue(item)", "code"),
+        ("    self.not_empty.notify()", "code"),
+        ("def get(self):", "code"),
+        ("  with self.not_empty:", "code"),
+        ("    while self.size == 0:", "code"),
+        ("      self.not_empty.wait()", "code"),
+        ("    item = self.dequeue()", "code"),
+        ("    self.not_full.notify()", "code"),
+        ("    return item", "code"),
+    ],
+}
+
 # 保持向后兼容
 PSEUDOCODE_ENQUEUE = MULTILANG_ENQUEUE["伪代码"]
 PSEUDOCODE_DEQUEUE = MULTILANG_DEQUEUE["伪代码"]
@@ -323,6 +365,22 @@ class CircularQueueVisualizer:
         self.random_btn = None
         self.back_btn = None
         self.bfs_btn = None
+        self.pc_btn = None
+
+        # 生产者 / 消费者演示 (后台线程只访问并发队列，界面在主线程轮询快照)
+        self.pc_mode_var = StringVar()
+        self.pc_mode_var.set("MPMC")
+        self.pc_queue = None
+        self.pc_stop: Optional[threading.Event] = None
+        self.pc_threads: List[threading.Thread] = []
+        self.pc_stats = {"produced": 0, "consumed": 0}
+        self.pc_stats_lock = threading.Lock()
+
+        # 异步数据流演示 (asyncio 事件循环由 after() 在主线程中推进)
+        self.async_btn = None
+        self.async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.async_task: Optional[asyncio.Task] = None
+        self.async_stats = {"produced": 0, "consumed": 0}
 
         self.batch_queue: List[str] = []
         self.batch_index = 0
@@ -483,6 +541,7 @@ class CircularQueueVisualizer:
             'dequeue': MULTILANG_DEQUEUE,
             'clear': MULTILANG_CLEAR,
             'idle': MULTILANG_IDLE,
+            'producer_consumer': MULTILANG_PRODUCER_CONSUMER,
         }
         
         if operation in multilang_map:
@@ -644,6 +703,20 @@ class CircularQueueVisualizer:
         self.bfs_btn = self.create_modern_button(btn_row1, "BFS演示", "#16A085", 
                                                 self.open_bfs_demo, small=True)
         self.bfs_btn.pack(side=LEFT, padx=4, pady=2)
+
+        # 生产者 / 消费者演示
+        pc_mode_menu = OptionMenu(btn_row1, self.pc_mode_var, "SPSC", "MPMC")
+        pc_mode_menu.config(font=("Microsoft YaHei", 9), bg="#FFFFFF", relief="flat",
+                            highlightthickness=0)
+        pc_mode_menu.pack(side=LEFT, padx=(6, 2), pady=2)
+
+        self.pc_btn = self.create_modern_button(btn_row1, "生产消费", "#D35400",
+                                               self.toggle_producer_consumer, small=True)
+        self.pc_btn.pack(side=LEFT, padx=4, pady=2)
+
+        self.async_btn = self.create_modern_button(btn_row1, "异步流", "#2980B9",
+                                                  self.toggle_async_stream, small=True)
+        self.async_btn.pack(side=LEFT, padx=4, pady=2)
         
         # 第二行：批量构建 + DSL命令
         btn_row2 = Frame(control_frame, bg="#FFFFFF")
@@ -1406,7 +1479,194 @@ class CircularQueueVisualizer:
         # 打开BFS可视化窗口，传入当前代码语言
         open_bfs_visualizer(self.window, self.model, self.current_code_language)
 
+    # ==================== 生产者 / 消费者演示 ====================
+
+    def toggle_producer_consumer(self):
+        """启动或停止生产者 / 消费者线程演示"""
+        if self.pc_stop is not None:
+            self.stop_producer_consumer()
+            return
+        if self.animating:
+            messagebox.showwarning("提示", "动画进行中，请稍候")
+            return
+
+        mode = self.pc_mode_var.get()
+        if mode == "SPSC":
+            # 单生产者单消费者：无锁环形队列，保留当前队列中的元素
+            queue = SPSCRingQueue(self.capacity)
+            for v in self.model.items():
+                queue.try_put(v)
+            producers, consumers = 1, 1
+        else:
+            queue = MPMCRingQueue(model=CircularQueueModel(self.capacity))
+            queue.put_many(self.model.items())
+            producers, consumers = 2, 2
+
+        self.pc_queue = queue
+        self.pc_stop = threading.Event()
+        self.pc_stats = {"produced": 0, "consumed": 0}
+        self.pc_threads = []
+        for i in range(producers):
+            self.pc_threads.append(threading.Thread(
+                target=self._producer_worker, args=(queue, self.pc_stop, f"P{i + 1}"), daemon=True))
+        for i in range(consumers):
+            self.pc_threads.append(threading.Thread(
+                target=self._consumer_worker, args=(queue, self.pc_stop), daemon=True))
+
+        self.animating = True
+        self._set_buttons_state("disabled")
+        self.pc_btn.config(text="停止")
+        self._show_pseudocode_for_operation('producer_consumer')
+        for t in self.pc_threads:
+            t.start()
+        self._poll_producer_consumer()
+
+    def _producer_worker(self, queue, stop: threading.Event, name: str):
+        """生产者线程：不断生产 name-序号，队列满时阻塞 (带超时以便及时响应停止)"""
+        n = 0
+        rng = random.Random()
+        while not stop.is_set():
+            n += 1
+            item = f"{name}-{n}"
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.2)
+                    break
+                except Full:
+                    continue
+            else:
+                return
+            with self.pc_stats_lock:
+                self.pc_stats["produced"] += 1
+            stop.wait(rng.uniform(0.2, 0.7))
+
+    def _consumer_worker(self, queue, stop: threading.Event):
+        """消费者线程：队列空时阻塞，处理速度随机"""
+        rng = random.Random()
+        while not stop.is_set():
+            try:
+                queue.get(timeout=0.2)
+            except Empty:
+                continue
+            with self.pc_stats_lock:
+                self.pc_stats["consumed"] += 1
+            stop.wait(rng.uniform(0.3, 0.9))
+
+    def _poll_producer_consumer(self):
+        """主线程定时读取队列快照并重绘 (Tk 只在主线程中访问)"""
+        if self.pc_stop is None:
+            return
+        self.model = self.pc_queue.snapshot()
+        self.update_display()
+        with self.pc_stats_lock:
+            produced, consumed = self.pc_stats["produced"], self.pc_stats["consumed"]
+        self._set_code_status(f"{self.pc_mode_var.get()}: 已生产 {produced}  已消费 {consumed}  "
+                              f"队列中 {self.model.size}/{self.capacity}")
+        self.window.after(100, self._poll_producer_consumer)
+
+    def stop_producer_consumer(self):
+        """停止所有工作线程，保留最后的队列状态"""
+        if self.pc_stop is None:
+            return
+        self.pc_stop.set()
+        for t in self.pc_threads:
+            t.join(timeout=1.0)
+        self.model = self.pc_queue.snapshot()
+        self.pc_stop = None
+        self.pc_queue = None
+        self.pc_threads = []
+        self.animating = False
+        self.pc_btn.config(text="生产消费")
+        self._set_buttons_state("normal")
+        self.update_display()
+        self._show_pseudocode_for_operation('idle')
+        self._set_code_status("生产者 / 消费者演示已停止")
+
+    # ==================== 异步数据流演示 ====================
+
+    def toggle_async_stream(self):
+        """
+        启动或停止异步数据流演示：批量输入框中的值按轮转分给 3 个脚本化的
+        async 生产者 (发送间隔不同)，一个 async 消费者较慢地取出，
+        队列满时生产者被 await put() 挂起 (背压)
+        """
+        if self.async_loop is not None:
+            self.stop_async_stream()
+            return
+        if self.animating:
+            messagebox.showwarning("提示", "动画进行中，请稍候")
+            return
+        values = [v.strip() for v in self.batch_var.get().split(",") if v.strip()]
+        if not values:
+            messagebox.showinfo("提示", "请在批量输入框中输入数据流的值，例如：1,2,3")
+            return
+
+        self.async_loop = asyncio.new_event_loop()
+        queue = AsyncCircularQueue(model=self.model, on_change=self._on_async_change)
+        self.async_stats = {"produced": 0, "consumed": 0}
+        self.async_task = self.async_loop.create_task(self._async_stream_demo(queue, values))
+        self.animating = True
+        self._set_buttons_state("disabled")
+        self.async_btn.config(text="停止")
+        self._show_pseudocode_for_operation('producer_consumer')
+        self._pump_async_loop()
+
+    async def _async_stream_demo(self, queue: AsyncCircularQueue, values: List[str]):
+        streams = [(values[k::3], interval) for k, interval in enumerate((0.3, 0.5, 0.8))]
+        producers = [asyncio.ensure_future(stream_to_queue(queue, items, interval))
+                     for items, interval in streams if items]
+        try:
+            for _ in range(len(values)):
+                await queue.get()
+                await asyncio.sleep(0.9)
+            await asyncio.gather(*producers)
+        finally:
+            for task in producers:
+                task.cancel()
+
+    def _on_async_change(self, op: str, value: Any):
+        """队列每次变化时重绘 (回调发生在主线程)"""
+        key = "produced" if op == "enqueue" else "consumed"
+        self.async_stats[key] += 1
+        self.update_display()
+        self._set_code_status(f"异步流: {'入队' if op == 'enqueue' else '出队'} {value}  "
+                              f"已生产 {self.async_stats['produced']}  已消费 {self.async_stats['consumed']}")
+
+    def _pump_async_loop(self):
+        """执行一轮事件循环中已就绪的回调，然后交还给 Tk"""
+        loop = self.async_loop
+        if loop is None:
+            return
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+        if self.async_task.done():
+            self.stop_async_stream()
+        else:
+            self.window.after(30, self._pump_async_loop)
+
+    def stop_async_stream(self):
+        """取消异步任务并关闭事件循环"""
+        loop = self.async_loop
+        if loop is None:
+            return
+        self.async_loop = None
+        task = self.async_task
+        self.async_task = None
+        if not task.done():
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        loop.close()
+        self.animating = False
+        self.async_btn.config(text="异步流")
+        self._set_buttons_state("normal")
+        self.update_display()
+        self._show_pseudocode_for_operation('idle')
+        self._set_code_status(f"异步流结束: 已生产 {self.async_stats['produced']}  "
+                              f"已消费 {self.async_stats['consumed']}")
+
     def back_to_main(self):
+        self.stop_producer_consumer()
+        self.stop_async_stream()
         if self.animating:
             messagebox.showinfo("提示", "动画尚在进行，无法返回")
             return
@@ -0,0 +1,234 @@
+"""
+线程安全的循环队列
+Thread-safe ring buffers for producer / consumer scenarios
+
+- SPSCRingQueue: 单生产者单消费者。head 只由消费者写，tail 只由生产者写，
+  两端不共享锁；依赖 CPython 的 GIL 保证单个属性读写是原子且按程序顺序可见的
+  (先写槽位，再发布 tail / head)。阻塞的 put / get 以退避方式等待。
+- MPMCRingQueue: 多生产者多消费者。在 CircularQueueModel 外加一把锁和两个条件变量
+  (not_empty / not_full)，put / get 可阻塞并支持超时。
+
+两者都提供 snapshot()，返回一个 CircularQueueModel 副本，供可视化界面在主线程绘制。
+满 / 空时抛出标准库的 queue.Full / queue.Empty，与 queue.Queue 的用法一致。
+"""
+import threading
+import time
+from queue import Empty, Full
+from typing import Any, Iterable, List, Optional
+
+from circular_queue.circular_queue_model import CircularQueueModel
+
+__all__ = ["SPSCRingQueue", "MPMCRingQueue", "Empty", "Full"]
+
+# 退避等待的最长休眠时间 (秒)
+_MAX_BACKOFF = 0.001
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    if timeout is None:
+        return None
+    if timeout < 0:
+        raise ValueError("'timeout' must be a non-negative number")
+    return time.monotonic() + timeout
+
+
+class SPSCRingQueue:
+    """
+    单生产者单消费者环形队列
+
+    head / tail 是单调递增的计数，槽位下标为 计数 % capacity，
+    元素个数 = tail - head，因此不需要由两端共同修改的 size 字段。
+    只能有一个线程调用 put 系列方法、一个线程调用 get 系列方法。
+    """
+
+    def __init__(self, capacity: int = 8):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity: int = int(capacity)
+        self.buffer: List[Optional[Any]] = [None] * self.capacity
+        self.head: int = 0  # 消费者拥有
+        self.tail: int = 0  # 生产者拥有
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def qsize(self) -> int:
+        return self.tail - self.head
+
+    def try_put(self, value: Any) -> bool:
+        """非阻塞入队 (仅生产者线程)；队列满时返回 False"""
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            return False
+        self.buffer[tail % self.capacity] = value
+        self.tail = tail + 1  # 写完槽位后再发布
+        return True
+
+    def try_get(self) -> tuple:
+        """非阻塞出队 (仅消费者线程)；返回 (是否成功, 值)"""
+        head = self.head
+        if head == self.tail:
+            return False, None
+        i = head % self.capacity
+        value = self.buffer[i]
+        self.buffer[i] = None
+        self.head = head + 1  # 读完槽位后再释放
+        return True, value
+
+    def put(self, value: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """入队；队列满时等待，超时或 block=False 时抛出 queue.Full"""
+        if self.try_put(value):
+            return
+        if not block:
+            raise Full
+        deadline = _deadline(timeout)
+        delay = 0.0
+        while not self.try_put(value):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise Full
+            time.sleep(delay)
+            delay = min(_MAX_BACKOFF, delay * 2 or 1e-5)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """出队；队列空时等待，超时或 block=False 时抛出 queue.Empty"""
+        ok, value = self.try_get()
+        if ok:
+            return value
+        if not block:
+            raise Empty
+        deadline = _deadline(timeout)
+        delay = 0.0
+        while True:
+            ok, value = self.try_get()
+            if ok:
+                return value
+            if deadline is not None and time.monotonic() >= deadline:
+                raise Empty
+            time.sleep(delay)
+            delay = min(_MAX_BACKOFF, delay * 2 or 1e-5)
+
+    def put_nowait(self, value: Any) -> None:
+        self.put(value, block=False)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def snapshot(self) -> CircularQueueModel:
+        """当前状态的 CircularQueueModel 副本 (任意线程可调用，结果可能稍有滞后)"""
+        head, tail = self.head, self.tail
+        model = CircularQueueModel(self.capacity)
+        model.buffer = list(self.buffer)
+        model.size = max(0, min(self.capacity, tail - head))
+        model.head = head % self.capacity
+        model.tail = (head + model.size) % self.capacity
+        return model
+
+
+class MPMCRingQueue:
+    """
+    多生产者多消费者环形队列：CircularQueueModel + 锁 + 条件变量
+
+    Args:
+        capacity: 容量 (model 为 None 时使用)
+        model: 要包装的已有 CircularQueueModel (例如界面当前的队列)；
+            包装后只能通过本对象访问它
+    """
+
+    def __init__(self, capacity: int = 8, model: Optional[CircularQueueModel] = None):
+        self.model = model if model is not None else CircularQueueModel(capacity)
+        if self.model.auto_grow:
+            raise ValueError("MPMCRingQueue needs a bounded (non auto_grow) model")
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+
+    @property
+    def capacity(self) -> int:
+        return self.model.capacity
+
+    def __len__(self) -> int:
+        with self.mutex:
+            return self.model.size
+
+    def qsize(self) -> int:
+        return len(self)
+
+    def _wait(self, condition: threading.Condition, ready, block: bool,
+              timeout: Optional[float], error) -> None:
+        """在持有锁时等待 ready() 成立，失败时抛出 error"""
+        if ready():
+            return
+        if not block:
+            raise error
+        deadline = _deadline(timeout)
+        while not ready():
+            if deadline is None:
+                condition.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise error
+                condition.wait(remaining)
+
+    def put(self, value: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """入队；队列满时等待，超时或 block=False 时抛出 queue.Full"""
+        model = self.model
+        with self.not_full:
+            if model.size >= model.capacity:
+                self._wait(self.not_full, lambda: model.size < model.capacity, block, timeout, Full)
+            model.enqueue(value)
+            self.not_empty.notify()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """出队；队列空时等待，超时或 block=False 时抛出 queue.Empty"""
+        model = self.model
+        with self.not_empty:
+            if model.size == 0:
+                self._wait(self.not_empty, lambda: model.size > 0, block, timeout, Empty)
+            value = model.dequeue()
+            self.not_full.notify()
+            return value
+
+    def put_many(self, values: Iterable[Any], timeout: Optional[float] = None) -> int:
+        """
+        按顺序入队 values；每次有空位就用 enqueue_many 尽量多放 (其他生产者的元素可能穿插其中)
+
+        Returns:
+            入队的元素个数。超时时不抛出异常，已入队的前缀保留，返回值小于 len(values)，
+            调用方可以从 values[返回值:] 继续
+        """
+        items = list(values)
+        model = self.model
+        start = 0
+        deadline = _deadline(timeout)
+        with self.not_full:
+            while start < len(items):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    self._wait(self.not_full, lambda: model.size < model.capacity, True, remaining, Full)
+                except Full:
+                    break
+                added = model.enqueue_many(items[start:start + model.capacity - model.size])
+                start += added
+                self.not_empty.notify(added)
+        return start
+
+    def get_many(self, max_items: int, block: bool = True, timeout: Optional[float] = None) -> List[Any]:
+        """取出 1..max_items 个元素 (至少等到一个)；队列空且超时时抛出 queue.Empty"""
+        model = self.model
+        with self.not_empty:
+            self._wait(self.not_empty, lambda: model.size > 0, block, timeout, Empty)
+            out = model.dequeue_many(max_items)
+            self.not_full.notify(len(out))
+            return out
+
+    def put_nowait(self, value: Any) -> None:
+        self.put(value, block=False)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def snapshot(self) -> CircularQueueModel:
+        """当前状态的 CircularQueueModel 副本"""
+        with self.mutex:
+            return CircularQueueModel.from_dict(self.model.to_dict())
@@ -0,0 +1,12 @@
+"""graph package init
+
+图算法的公共部分（与具体可视化窗口无关）放在这里，
+DFS (stack) 与 BFS (circular_queue) 演示都从这里导入：
+DirectedGraph 在 graph.directed_graph，演示图在 graph.demo_graphs，
+DFS 类算法在 graph.traversal；stack.graph_model 与
+circular_queue.graph_model 保留为兼容模块。
+"""
+
+__all__ = [
+    # keep this list small; modules are imported explicitly where needed
+]
@@ -0,0 +1,259 @@
+"""
+压缩稀疏行 (CSR) 只读有向图
+Frozen CSR graph for read-only traversal of large graphs
+
+顶点被映射为 0..n-1 的下标，第 i 个顶点的出边目标保存在
+targets[offsets[i]:offsets[i + 1]] 中，顺序与原图邻居顺序一致。
+offsets / targets 使用 array 存储，每条边只占 4 字节。
+"""
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class CSRGraph:
+    """
+    只读有向图 (CSR 表示)
+
+    Attributes:
+        ids: 下标 -> 顶点 (顶点恰好是 0..n-1 时为 range，不额外占内存)
+        offsets: array('q')，长度 n + 1
+        targets: array('i')，长度 m，存放目标顶点下标
+        vertex_positions: 顶点位置 (用于可视化)
+    """
+
+    def __init__(self, ids: Sequence[Any], offsets: array, targets: array):
+        if len(offsets) != len(ids) + 1:
+            raise ValueError("offsets must have len(ids) + 1 entries")
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.vertex_positions: Dict[Any, Tuple[float, float]] = {}
+        # 顶点就是 0..n-1 时不需要反查表
+        self._index: Optional[Dict[Any, int]] = None
+        if not isinstance(ids, range) or ids.start != 0 or ids.step != 1:
+            self._index = {v: i for i, v in enumerate(ids)}
+
+    @classmethod
+    def from_graph(cls, graph) -> "CSRGraph":
+        """由 DirectedGraph (或任何提供 get_vertices/get_neighbors 的图) 构建"""
+        ids = graph.get_vertices()
+        index = {v: i for i, v in enumerate(ids)}
+        offsets = array('q', [0])
+        targets = array('i')
+        for v in ids:
+            targets.extend([index[w] for w in graph.get_neighbors(v)])
+            offsets.append(len(targets))
+        csr = cls(ids, offsets, targets)
+        csr.vertex_positions.update(getattr(graph, "vertex_positions", {}))
+        return csr
+
+    @classmethod
+    def from_edges(cls, num_vertices: int, sources: Iterable[int], dests: Iterable[int],
+                   ids: Optional[Sequence[Any]] = None) -> "CSRGraph":
+        """
+        由下标形式的边列表构建 (计数排序，O(n + m))
+
+        同一起点的边保持输入顺序；重复边不会被去除。
+        """
+        src = sources if isinstance(sources, array) else array('i', sources)
+        dst = dests if isinstance(dests, array) else array('i', dests)
+        if len(src) != len(dst):
+            raise ValueError("sources and dests must have the same length")
+        n = int(num_vertices)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for s in src:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        cursor = offsets[:-1]
+        targets = array('i', bytes(4 * len(dst)))
+        for s, d in zip(src, dst):
+            targets[cursor[s]] = d
+            cursor[s] += 1
+        return cls(ids if ids is not None else range(n), offsets, targets)
+
+    # ---- 与 DirectedGraph 相同的只读接口 ----
+
+    def index_of(self, v: Any) -> int:
+        """顶点 -> 下标，不存在时抛出 KeyError"""
+        if self._index is not None:
+            return self._index[v]
+        if isinstance(v, int) and 0 <= v < len(self.ids):
+            return v
+        raise KeyError(v)
+
+    def has_vertex(self, v: Any) -> bool:
+        try:
+            self.index_of(v)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def has_edge(self, u: Any, v: Any) -> bool:
+        if not self.has_vertex(u) or not self.has_vertex(v):
+            return False
+        i, j = self.index_of(u), self.index_of(v)
+        return j in self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_vertices(self) -> List[Any]:
+        return list(self.ids)
+
+    def get_neighbors(self, v: Any) -> List[Any]:
+        if not self.has_vertex(v):
+            return []
+        i = self.index_of(v)
+        ids = self.ids
+        return [ids[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def get_edges(self) -> List[Tuple[Any, Any]]:
+        ids, offsets, targets = self.ids, self.offsets, self.targets
+        return [(ids[i], ids[targets[k]])
+                for i in range(len(ids)) for k in range(offsets[i], offsets[i + 1])]
+
+    def vertex_count(self) -> int:
+        return len(self.ids)
+
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def out_degree(self, v: Any) -> int:
+        if not self.has_vertex(v):
+            return 0
+        i = self.index_of(v)
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def get_position(self, v: Any) -> Optional[Tuple[float, float]]:
+        return self.vertex_positions.get(v)
+
+    def nbytes(self) -> int:
+        """offsets + targets 数组占用的字节数 (不含顶点标签)"""
+        return (self.offsets.itemsize * len(self.offsets)
+                + self.targets.itemsize * len(self.targets))
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(V={self.vertex_count()}, E={self.edge_count()})"
+
+
+def bfs_order(csr: CSRGraph, start: Any) -> List[Any]:
+    """无步骤记录的 BFS，返回访问顺序 (用于大图的无界面遍历)"""
+    s = csr.index_of(start)
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(csr.vertex_count())
+    visited[s] = 1
+    # 每个顶点最多入队一次，用数组 + 头指针实现 O(1) 出队
+    queue = array('i', [s])
+    head = 0
+    while head < len(queue):
+        i = queue[head]
+        head += 1
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if not visited[j]:
+                visited[j] = 1
+                queue.append(j)
+    ids = csr.ids
+    return [ids[i] for i in queue]
+
+
+def dfs_order(csr: CSRGraph, start: Any) -> List[Any]:
+    """无步骤记录的 DFS，访问顺序与 dfs_traversal 一致"""
+    s = csr.index_of(start)
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(csr.vertex_count())
+    order = array('i')
+    stack = array('i', [s])
+    while stack:
+        i = stack.pop()
+        if visited[i]:
+            continue
+        visited[i] = 1
+        order.append(i)
+        # 逆序入栈，保证按邻居顺序访问
+        for k in range(offsets[i + 1] - 1, offsets[i] - 1, -1):
+            j = targets[k]
+            if not visited[j]:
+                stack.append(j)
+    ids = csr.ids
+    return [ids[i] for i in order]
+
+
+def bfs_traversal(csr: CSRGraph, start: Any) -> List[Tuple[str, Any, Any]]:
+    """
+    在 CSR 图上执行 BFS，步骤格式与 circular_queue.graph_model.bfs_traversal 相同
+    """
+    if not csr.has_vertex(start):
+        return [("error", "起始顶点不存在", None)]
+
+    ids, offsets, targets = csr.ids, csr.offsets, csr.targets
+    s = csr.index_of(start)
+    steps = []
+    visited = bytearray(csr.vertex_count())
+    queue = array('i', [s])
+    head = 0
+    visited[s] = 1
+    steps.append(("enqueue", start, None))
+
+    while head < len(queue):
+        i = queue[head]
+        head += 1
+        current = ids[i]
+        steps.append(("dequeue", current, None))
+        steps.append(("visit", current, None))
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            neighbor = ids[j]
+            steps.append(("check_neighbor", current, neighbor))
+            if not visited[j]:
+                visited[j] = 1
+                queue.append(j)
+                steps.append(("enqueue", neighbor, None))
+            else:
+                steps.append(("skip", neighbor, None))
+
+    steps.append(("done", None, None))
+    return steps
+
+
+def dfs_traversal(csr: CSRGraph, start: Any) -> List[Tuple[str, Any, Any]]:
+    """
+    在 CSR 图上执行 DFS，步骤格式与 stack.graph_model.dfs_traversal 相同
+    """
+    if not csr.has_vertex(start):
+        return [("error", "起始顶点不存在", None)]
+
+    ids, offsets, targets = csr.ids, csr.offsets, csr.targets
+    steps = []
+    visited = bytearray(csr.vertex_count())
+    stack: List[Tuple[int, int]] = [(csr.index_of(start), 0)]
+    steps.append(("push", start, 0))
+
+    while stack:
+        i, depth = stack.pop()
+        current = ids[i]
+        steps.append(("pop", current, depth))
+        if visited[i]:
+            steps.append(("skip", current, None))
+            continue
+        visited[i] = 1
+        steps.append(("visit", current, depth))
+
+        to_push = []
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            neighbor = ids[j]
+            steps.append(("check_neighbor", current, neighbor))
+            if not visited[j]:
+                to_push.append(j)
+                steps.append(("will_push", neighbor, depth + 1))
+            else:
+                steps.append(("skip", neighbor, None))
+
+        for j in reversed(to_push):
+            steps.append(("push", ids[j], depth + 1))
+            stack.append((j, depth + 1))
+
+        if not to_push and stack:
+            steps.append(("backtrack", current, ids[stack[-1][0]]))
+
+    steps.append(("done", None, None))
+    return steps
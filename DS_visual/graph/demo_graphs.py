@@ -0,0 +1,309 @@
+"""
+演示用的小型随机图 (3-12 个字母命名的顶点，带初始布局)
+Small demo graphs for the DFS / BFS visualizers
+
+大规模的基准测试用图见 graph.generators。
+"""
+from typing import Any, Dict
+import random
+import math
+
+from graph.directed_graph import DirectedGraph
+
+
+def generate_random_graph(
+    num_vertices: int = 6,
+    edge_probability: float = 0.3,
+    ensure_connected: bool = True,
+    vertex_prefix: str = ""
+) -> DirectedGraph:
+    """
+    生成随机有向图
+    
+    Args:
+        num_vertices: 顶点数量 (3-12)
+        edge_probability: 边的生成概率 (0.0-1.0)
+        ensure_connected: 是否确保图是弱连通的
+        vertex_prefix: 顶点名称前缀
+    
+    Returns:
+        DirectedGraph: 随机生成的有向图
+    """
+    num_vertices = max(3, min(12, num_vertices))
+    edge_probability = max(0.1, min(0.8, edge_probability))
+    
+    graph = DirectedGraph()
+    
+    # 创建顶点 (使用字母或数字命名)
+    vertices = []
+    for i in range(num_vertices):
+        if vertex_prefix:
+            v = f"{vertex_prefix}{i}"
+        else:
+            # 使用字母A, B, C...
+            v = chr(ord('A') + i)
+        vertices.append(v)
+        graph.add_vertex(v)
+    
+    # 如果需要确保连通，先创建一条路径
+    if ensure_connected and len(vertices) > 1:
+        # 随机打乱顶点顺序
+        shuffled = vertices.copy()
+        random.shuffle(shuffled)
+        # 创建一条路径确保弱连通
+        for i in range(len(shuffled) - 1):
+            graph.add_edge(shuffled[i], shuffled[i + 1])
+    
+    # 随机添加额外的边
+    for u in vertices:
+        for v in vertices:
+            if u != v and not graph.has_edge(u, v):
+                if random.random() < edge_probability:
+                    graph.add_edge(u, v)
+    
+    # 计算顶点位置 (环形布局)
+    center_x, center_y = 200, 180
+    radius = 120
+    
+    for i, v in enumerate(vertices):
+        angle = 2 * math.pi * i / num_vertices - math.pi / 2  # 从顶部开始
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        graph.set_position(v, x, y)
+    
+    return graph
+
+
+def generate_dfs_friendly_graph(
+    num_vertices: int = 7,
+    branching_factor: int = 2,
+    max_depth: int = 4
+) -> DirectedGraph:
+    """
+    生成适合DFS演示的有向图 - 树状结构，有明显的深度路径
+    
+    特点:
+    1. 从起点开始，有一条明显的深度路径
+    2. 在某些节点有分支，展示DFS的回溯
+    3. 适合演示DFS的"先深入再回溯"特性
+    
+    Args:
+        num_vertices: 顶点数量 (5-12)
+        branching_factor: 分支因子（每个节点最多多少个子节点）
+        max_depth: 最大深度
+    
+    Returns:
+        DirectedGraph: 适合DFS演示的有向图
+    """
+    num_vertices = max(5, min(12, num_vertices))
+    branching_factor = max(1, min(3, branching_factor))
+    
+    graph = DirectedGraph()
+    
+    # 创建顶点
+    vertices = [chr(ord('A') + i) for i in range(num_vertices)]
+    for v in vertices:
+        graph.add_vertex(v)
+    
+    # 构建树状结构 - 有明显的深度路径
+    root = vertices[0]
+    assigned = {root}
+    unassigned = set(vertices[1:])
+    
+    # 使用队列构建树，但确保有一条主深度路径
+    parent_queue = [(root, 0)]  # (节点, 深度)
+    depth_map = {root: 0}
+    
+    # 首先创建一条主路径（深度优先）
+    current = root
+    depth = 0
+    main_path = [root]
+    
+    while unassigned and depth < max_depth - 1:
+        # 选择一个未分配的节点作为主路径的下一个节点
+        if unassigned:
+            next_node = min(unassigned)  # 选择字母序最小的
+            graph.add_edge(current, next_node)
+            assigned.add(next_node)
+            unassigned.discard(next_node)
+            depth += 1
+            depth_map[next_node] = depth
+            main_path.append(next_node)
+            current = next_node
+    
+    # 然后为主路径上的节点添加分支
+    for node in main_path[:-1]:  # 除了最后一个节点
+        node_depth = depth_map[node]
+        if node_depth < max_depth - 1:
+            # 添加1-2个分支
+            num_branches = min(branching_factor - 1, len(unassigned))
+            branches = random.sample(list(unassigned), num_branches) if num_branches > 0 else []
+            
+            for branch in branches:
+                graph.add_edge(node, branch)
+                assigned.add(branch)
+                unassigned.discard(branch)
+                depth_map[branch] = node_depth + 1
+    
+    # 处理剩余未分配的节点
+    while unassigned:
+        # 找一个已分配的非叶子节点
+        available_parents = [v for v in assigned if depth_map.get(v, 0) < max_depth - 1]
+        if not available_parents:
+            available_parents = list(assigned)
+        
+        parent = random.choice(available_parents)
+        child = min(unassigned)
+        graph.add_edge(parent, child)
+        assigned.add(child)
+        unassigned.discard(child)
+        depth_map[child] = depth_map.get(parent, 0) + 1
+    
+    # 计算顶点位置 - 树形布局
+    _layout_tree(graph, root, depth_map)
+    
+    return graph
+
+
+def _layout_tree(graph: DirectedGraph, root: Any, depth_map: Dict[Any, int]):
+    """为树形图计算布局位置"""
+    # 按深度分组
+    depth_groups = {}
+    for v, d in depth_map.items():
+        if d not in depth_groups:
+            depth_groups[d] = []
+        depth_groups[d].append(v)
+    
+    max_depth = max(depth_groups.keys()) if depth_groups else 0
+    
+    # 计算每层的位置
+    center_x = 240
+    start_y = 50
+    layer_height = 70
+    
+    for depth in range(max_depth + 1):
+        vertices_at_depth = depth_groups.get(depth, [])
+        if not vertices_at_depth:
+            continue
+        
+        width = len(vertices_at_depth)
+        spacing = min(90, 400 / max(width, 1))
+        start_x = center_x - (width - 1) * spacing / 2
+        
+        for i, v in enumerate(sorted(vertices_at_depth)):
+            x = start_x + i * spacing
+            y = start_y + depth * layer_height
+            graph.set_position(v, x, y)
+
+
+def generate_bfs_friendly_graph(
+    num_vertices: int = 7,
+    min_children: int = 2,
+    max_children: int = 3
+) -> DirectedGraph:
+    """
+    生成适合BFS演示的有向图 - 树状结构，每个节点有多个子节点
+    
+    特点:
+    1. 从起点开始，每层节点都有多个出边
+    2. 形成明显的层级结构，便于观察BFS的层序遍历
+    3. 可能有一些交叉边增加复杂性
+    
+    Args:
+        num_vertices: 顶点数量 (5-12)
+        min_children: 每个节点最少子节点数
+        max_children: 每个节点最多子节点数
+    
+    Returns:
+        DirectedGraph: 适合BFS演示的有向图
+    """
+    num_vertices = max(5, min(12, num_vertices))
+    min_children = max(1, min(4, min_children))
+    max_children = max(min_children, min(5, max_children))
+    
+    graph = DirectedGraph()
+    
+    # 创建顶点
+    vertices = [chr(ord('A') + i) for i in range(num_vertices)]
+    for v in vertices:
+        graph.add_vertex(v)
+    
+    # 构建层级结构
+    # 第一个顶点是根节点（Layer 0）
+    root = vertices[0]
+    assigned = {root}
+    unassigned = set(vertices[1:])
+    
+    # 按层构建 - 当前层的节点会连接到下一层
+    current_layer = [root]
+    layer_assignment = {root: 0}  # 记录每个顶点的层级
+    layer_num = 0
+    
+    while unassigned and current_layer:
+        next_layer = []
+        layer_num += 1
+        
+        for parent in current_layer:
+            if not unassigned:
+                break
+            
+            # 为每个父节点分配子节点
+            upper = min(max_children, len(unassigned))
+            num_children = random.randint(min(min_children, upper), upper)
+            children = random.sample(list(unassigned), min(num_children, len(unassigned)))
+            
+            for child in children:
+                graph.add_edge(parent, child)
+                assigned.add(child)
+                unassigned.discard(child)
+                next_layer.append(child)
+                layer_assignment[child] = layer_num
+        
+        current_layer = next_layer
+    
+    # 添加一些同层之间的边（可选，增加复杂性）
+    layers = {}
+    for v, l in layer_assignment.items():
+        if l not in layers:
+            layers[l] = []
+        layers[l].append(v)
+    
+    # 随机添加少量交叉边（从低层到高层）
+    for layer in range(len(layers) - 1):
+        if layer + 2 < len(layers):  # 可以跳过一层连接
+            for v in layers[layer]:
+                if random.random() < 0.2:  # 20%概率
+                    targets = layers.get(layer + 2, [])
+                    if targets:
+                        target = random.choice(targets)
+                        if not graph.has_edge(v, target):
+                            graph.add_edge(v, target)
+    
+    # 计算顶点位置 - 按层级布局
+    max_layer = max(layer_assignment.values()) if layer_assignment else 0
+    
+    # 计算每层的宽度
+    layer_widths = {}
+    for l in range(max_layer + 1):
+        layer_widths[l] = len(layers.get(l, []))
+    
+    # 设置位置 - 层级布局
+    center_x = 240
+    start_y = 50
+    layer_height = 80
+    
+    for layer in range(max_layer + 1):
+        layer_vertices = layers.get(layer, [])
+        if not layer_vertices:
+            continue
+        
+        width = len(layer_vertices)
+        spacing = min(100, 400 / max(width, 1))
+        start_x = center_x - (width - 1) * spacing / 2
+        
+        for i, v in enumerate(layer_vertices):
+            x = start_x + i * spacing
+            y = start_y + layer * layer_height
+            graph.set_position(v, x, y)
+    
+    return graph
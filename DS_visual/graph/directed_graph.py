@@ -0,0 +1,192 @@
+"""
+有向图模型 (DFS / BFS 演示共用)
+Directed Graph Model shared by the DFS and BFS demonstrations
+"""
+from typing import Any, List, Dict, Optional, Tuple
+
+from graph.csr_graph import CSRGraph
+
+
+class DirectedGraph:
+    """
+    有向图数据结构
+    使用邻接表存储：出边与入边都用插入有序的 dict 充当有序集合，
+    因此 has_edge / in_degree / out_degree 为 O(1)，remove_vertex 为 O(deg)，
+    邻居顺序与边的插入顺序一致（遍历动画依赖这一点）。
+    出边 dict 的值是边权 (默认为 1)，供最短路径算法使用。
+    """
+    
+    def __init__(self):
+        self.vertices: Dict[Any, Dict[Any, float]] = {}  # 邻接表: 顶点 -> 有序邻居集合 (值为边权)
+        self.reverse: Dict[Any, Dict[Any, None]] = {}  # 逆邻接表: 顶点 -> 有序前驱集合
+        self.vertex_positions: Dict[Any, Tuple[float, float]] = {}  # 顶点位置 (用于可视化)
+        self._edge_count = 0
+        self.version = 0  # 每次结构修改递增，布局缓存据此判断是否失效
+    
+    def add_vertex(self, v: Any) -> bool:
+        """添加顶点"""
+        if v in self.vertices:
+            return False
+        self.vertices[v] = {}
+        self.reverse[v] = {}
+        self.version += 1
+        return True
+    
+    def add_edge(self, u: Any, v: Any, weight: float = 1) -> bool:
+        """添加有向边 u -> v (边已存在时不修改其权值)"""
+        if u not in self.vertices:
+            self.add_vertex(u)
+        if v not in self.vertices:
+            self.add_vertex(v)
+        out = self.vertices[u]
+        if v in out:
+            return False
+        out[v] = weight
+        self.reverse[v][u] = None
+        self._edge_count += 1
+        self.version += 1
+        return True
+    
+    def remove_vertex(self, v: Any) -> bool:
+        """删除顶点及其相关的边 (O(deg))"""
+        if v not in self.vertices:
+            return False
+        # 删除所有指向v的边
+        for u in self.reverse[v]:
+            if u != v:
+                del self.vertices[u][v]
+        # 删除v发出的边在后继的逆邻接表中的记录
+        for w in self.vertices[v]:
+            if w != v:
+                del self.reverse[w][v]
+        self._edge_count -= len(self.vertices[v]) + len(self.reverse[v])
+        if v in self.vertices[v]:
+            self._edge_count += 1  # 自环被计算了两次
+        del self.vertices[v]
+        del self.reverse[v]
+        if v in self.vertex_positions:
+            del self.vertex_positions[v]
+        self.version += 1
+        return True
+    
+    def remove_edge(self, u: Any, v: Any) -> bool:
+        """删除有向边 u -> v"""
+        if u not in self.vertices or v not in self.vertices[u]:
+            return False
+        del self.vertices[u][v]
+        del self.reverse[v][u]
+        self._edge_count -= 1
+        self.version += 1
+        return True
+    
+    def get_weight(self, u: Any, v: Any) -> Optional[float]:
+        """获取边 u -> v 的权值，边不存在时返回 None"""
+        out = self.vertices.get(u)
+        return out.get(v) if out is not None else None
+    
+    def set_weight(self, u: Any, v: Any, weight: float) -> bool:
+        """修改已有边 u -> v 的权值"""
+        out = self.vertices.get(u)
+        if out is None or v not in out:
+            return False
+        out[v] = weight
+        self.version += 1
+        return True
+    
+    def get_neighbors(self, v: Any) -> List[Any]:
+        """获取顶点v的所有邻居（出边指向的顶点），按边的插入顺序"""
+        return list(self.vertices.get(v, ()))
+    
+    def get_predecessors(self, v: Any) -> List[Any]:
+        """获取所有指向顶点v的顶点（入边的起点），按边的插入顺序"""
+        return list(self.reverse.get(v, ()))
+    
+    def get_vertices(self) -> List[Any]:
+        """获取所有顶点"""
+        return list(self.vertices.keys())
+    
+    def get_edges(self) -> List[Tuple[Any, Any]]:
+        """获取所有边"""
+        edges = []
+        for u, neighbors in self.vertices.items():
+            for v in neighbors:
+                edges.append((u, v))
+        return edges
+    
+    def vertex_count(self) -> int:
+        """顶点数量"""
+        return len(self.vertices)
+    
+    def edge_count(self) -> int:
+        """边的数量"""
+        return self._edge_count
+    
+    def has_vertex(self, v: Any) -> bool:
+        """检查顶点是否存在"""
+        return v in self.vertices
+    
+    def has_edge(self, u: Any, v: Any) -> bool:
+        """检查边是否存在"""
+        out = self.vertices.get(u)
+        return out is not None and v in out
+    
+    def clear(self):
+        """清空图"""
+        self.vertices.clear()
+        self.reverse.clear()
+        self.vertex_positions.clear()
+        self._edge_count = 0
+        self.version += 1
+    
+    def set_position(self, v: Any, x: float, y: float):
+        """设置顶点位置"""
+        self.vertex_positions[v] = (x, y)
+    
+    def get_position(self, v: Any) -> Optional[Tuple[float, float]]:
+        """获取顶点位置"""
+        return self.vertex_positions.get(v)
+    
+    def in_degree(self, v: Any) -> int:
+        """计算入度"""
+        return len(self.reverse.get(v, ()))
+    
+    def out_degree(self, v: Any) -> int:
+        """计算出度"""
+        return len(self.vertices.get(v, ()))
+    
+    def to_dict(self) -> Dict:
+        """序列化为字典"""
+        return {
+            "vertices": {str(k): [str(x) for x in v] for k, v in self.vertices.items()},
+            "positions": {str(k): list(v) for k, v in self.vertex_positions.items()},
+            # 只保存非默认的边权
+            "weights": {str(u): {str(v): w for v, w in out.items() if w != 1}
+                        for u, out in self.vertices.items() if any(w != 1 for w in out.values())}
+        }
+    
+    def freeze(self) -> CSRGraph:
+        """冻结为只读的 CSR 图，适合大图的只读遍历 (不保留边权；图之后的修改不会反映到结果中)"""
+        return CSRGraph.from_graph(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DirectedGraph":
+        """从字典反序列化"""
+        graph = cls()
+        vertices = data.get("vertices", {})
+        positions = data.get("positions", {})
+        weights = data.get("weights", {})
+        
+        for v in vertices:
+            graph.add_vertex(v)
+        for v, neighbors in vertices.items():
+            for nb in neighbors:
+                graph.add_edge(v, nb, weights.get(v, {}).get(nb, 1))
+        
+        for v, pos in positions.items():
+            if len(pos) >= 2:
+                graph.vertex_positions[v] = (pos[0], pos[1])
+        
+        return graph
+    
+    def __repr__(self) -> str:
+        return f"DirectedGraph(V={self.vertex_count()}, E={self.edge_count()})"
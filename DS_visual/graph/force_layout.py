@@ -0,0 +1,192 @@
+"""
+力导向布局 (Fruchterman–Reingold + Barnes–Hut 四叉树近似)
+Force-directed layout with Barnes–Hut approximation
+
+斥力通过四叉树近似，每轮迭代 O(n log n)；引力沿边计算，O(m)。
+布局结果等比缩放到画布内后写入 graph.vertex_positions，可以一次跑完 (run)，
+也可以在界面里用 after() 每次推进几轮 (step)，让图“实时”稳定下来。
+"""
+import math
+import random
+from array import array
+from typing import Any, List, Optional
+
+# 四叉树节点字段下标
+_CX, _CY, _MASS, _SIZE, _CHILDREN, _POINTS, _X0, _Y0 = range(8)
+_MAX_DEPTH = 24
+
+
+def _build_quadtree(xs: array, ys: array, points: List[int], x0: float, y0: float,
+                    size: float, depth: int = 0) -> list:
+    """
+    构建四叉树，返回 [质心x, 质心y, 质量, 边长, 子节点列表|None, 叶子中的点|None, 左上角x, 左上角y]
+    """
+    mass = len(points)
+    cx = sum(xs[i] for i in points) / mass
+    cy = sum(ys[i] for i in points) / mass
+    if mass == 1 or depth >= _MAX_DEPTH:
+        return [cx, cy, mass, size, None, points, x0, y0]
+    half = size / 2
+    mx, my = x0 + half, y0 + half
+    quads: List[List[int]] = [[], [], [], []]
+    for i in points:
+        quads[(xs[i] >= mx) + 2 * (ys[i] >= my)].append(i)
+    children = []
+    for q, sub in enumerate(quads):
+        if sub:
+            children.append(_build_quadtree(xs, ys, sub, x0 + half * (q & 1), y0 + half * (q >> 1),
+                                            half, depth + 1))
+    return [cx, cy, mass, size, children, None, x0, y0]
+
+
+class ForceLayout:
+    """
+    增量式力导向布局
+
+    Args:
+        graph: DirectedGraph 或 CSRGraph (需要 get_vertices / get_edges / vertex_positions)
+        width, height: 画布尺寸，顶点限制在 margin 以内
+        margin: 边距 (通常取顶点半径)
+        theta: Barnes–Hut 阈值，越小越精确 (0 表示精确计算)
+        iterations: 冷却所需的总迭代次数
+        seed: 没有初始位置的顶点使用的随机种子
+    """
+
+    def __init__(self, graph, width: float = 480, height: float = 380, margin: float = 30,
+                 theta: float = 0.8, iterations: int = 300, seed: Optional[int] = None):
+        self.graph = graph
+        self.vertices: List[Any] = graph.get_vertices()
+        index = {v: i for i, v in enumerate(self.vertices)}
+        self.edges = [(index[u], index[v]) for u, v in graph.get_edges() if u != v]
+        self.width, self.height, self.margin = width, height, margin
+        self.theta = theta
+        self.iterations = max(1, int(iterations))
+        self.iteration = 0
+        self.rng = random.Random(seed)
+
+        n = len(self.vertices)
+        inner_w, inner_h = width - 2 * margin, height - 2 * margin
+        self.k = math.sqrt(max(1.0, inner_w * inner_h) / max(1, n))  # 理想边长
+        self.temperature = inner_w / 10
+        self._cooling = self.temperature / self.iterations
+
+        self.xs = array('d', [0.0]) * n
+        self.ys = array('d', [0.0]) * n
+        positions = graph.vertex_positions
+        for i, v in enumerate(self.vertices):
+            pos = positions.get(v)
+            if pos is None:
+                pos = (self.rng.uniform(margin, width - margin), self.rng.uniform(margin, height - margin))
+            self.xs[i], self.ys[i] = pos[0], pos[1]
+
+    @property
+    def done(self) -> bool:
+        """温度降到 0 (迭代预算用完) 即视为稳定"""
+        return self.iteration >= self.iterations or len(self.vertices) < 2
+
+    def _repulsion(self, root: list, i: int, theta2: float, k2: float):
+        """用四叉树近似计算顶点 i 受到的斥力"""
+        xs, ys = self.xs, self.ys
+        xi, yi = xs[i], ys[i]
+        fx = fy = 0.0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            points = node[_POINTS]
+            if points is not None:
+                for j in points:
+                    if j == i:
+                        continue
+                    dx, dy = xi - xs[j], yi - ys[j]
+                    d2 = dx * dx + dy * dy
+                    if d2 < 1e-6:
+                        # 重合的点随机推开
+                        dx, dy = self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)
+                        d2 = dx * dx + dy * dy + 1e-6
+                    fx += dx * k2 / d2
+                    fy += dy * k2 / d2
+                continue
+            dx, dy = xi - node[_CX], yi - node[_CY]
+            d2 = dx * dx + dy * dy
+            size = node[_SIZE]
+            # theta > 1/√2 时，包含顶点 i 自己的格子也可能满足阈值 (i 在角上、质量集中在对角)；
+            # 这样的格子必须展开，否则 i 会受到包含自身质量的质心的斥力
+            if size * size < theta2 * d2 and not (node[_X0] <= xi < node[_X0] + size
+                                                  and node[_Y0] <= yi < node[_Y0] + size):
+                # 足够远：把整个子树看成位于质心的一个质点
+                f = k2 * node[_MASS] / d2
+                fx += dx * f
+                fy += dy * f
+            else:
+                stack.extend(node[_CHILDREN])
+        return fx, fy
+
+    def step(self, iterations: int = 1) -> float:
+        """
+        推进若干轮迭代并把位置写回 graph.vertex_positions
+
+        Returns:
+            最后一轮中顶点的最大位移
+        """
+        n = len(self.vertices)
+        xs, ys = self.xs, self.ys
+        k, k2 = self.k, self.k * self.k
+        theta2 = self.theta * self.theta
+        moved = 0.0
+        for _ in range(iterations):
+            if self.done:
+                break
+            x0, y0 = min(xs), min(ys)
+            size = max(max(xs) - x0, max(ys) - y0, 1e-3)
+            root = _build_quadtree(xs, ys, list(range(n)), x0, y0, size * (1 + 1e-9))
+            disp_x = array('d', [0.0]) * n
+            disp_y = array('d', [0.0]) * n
+            for i in range(n):
+                disp_x[i], disp_y[i] = self._repulsion(root, i, theta2, k2)
+            for u, v in self.edges:
+                dx, dy = xs[u] - xs[v], ys[u] - ys[v]
+                d = math.sqrt(dx * dx + dy * dy) or 1e-3
+                f = d / k  # 引力 d²/k，再乘以单位向量 (dx/d)
+                disp_x[u] -= dx * f
+                disp_y[u] -= dy * f
+                disp_x[v] += dx * f
+                disp_y[v] += dy * f
+            t = self.temperature
+            moved = 0.0
+            for i in range(n):
+                dx, dy = disp_x[i], disp_y[i]
+                d = math.sqrt(dx * dx + dy * dy)
+                if d > 0:
+                    limit = min(d, t) / d
+                    dx, dy = dx * limit, dy * limit
+                    xs[i] += dx
+                    ys[i] += dy
+                    moved = max(moved, abs(dx), abs(dy))
+            self.temperature = max(0.0, t - self._cooling)
+            self.iteration += 1
+        self._write_positions()
+        return moved
+
+    def _write_positions(self) -> None:
+        """
+        把模拟坐标等比缩放、居中到画布内再写回图中
+        (模拟本身不受边界约束，避免顶点堆积在画布边缘)
+        """
+        xs, ys = self.xs, self.ys
+        if not xs:
+            return
+        x0, y0 = min(xs), min(ys)
+        bw, bh = max(xs) - x0, max(ys) - y0
+        inner_w = self.width - 2 * self.margin
+        inner_h = self.height - 2 * self.margin
+        scale = min(inner_w / bw if bw > 0 else 1.0, inner_h / bh if bh > 0 else 1.0)
+        off_x = self.margin + (inner_w - bw * scale) / 2
+        off_y = self.margin + (inner_h - bh * scale) / 2
+        positions = self.graph.vertex_positions
+        for i, v in enumerate(self.vertices):
+            positions[v] = (off_x + (xs[i] - x0) * scale, off_y + (ys[i] - y0) * scale)
+
+    def run(self) -> None:
+        """不分片，直接迭代到稳定 (无界面使用)"""
+        while not self.done:
+            self.step(self.iterations)
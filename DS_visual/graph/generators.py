@@ -0,0 +1,146 @@
+"""
+大规模随机图生成器 (线性时间)
+Scalable graph generators for BFS/DFS benchmarks and demos
+
+所有生成器的顶点都是 0..n-1 的整数，耗时与 O(n + m) 成正比：
+    - erdos_renyi:     G(n, p) 随机有向图，几何分布跳跃采样 (Batagelj & Brandes)
+    - barabasi_albert: 优先连接 (无标度) 图，每个新顶点连向 m 个已有顶点
+    - grid_graph:      rows x cols 网格，边指向右方和下方
+    - tree_graph:      完全 k 叉树，边由父节点指向子节点
+
+传入 graph (例如 DirectedGraph()) 时边直接写入该图并返回它；
+否则返回 CSRGraph，不经过字典邻接表。相同的 seed 总是生成相同的图。
+"""
+import math
+import random
+from array import array
+from typing import Any, Optional
+
+from graph.csr_graph import CSRGraph
+
+
+def _emit(num_vertices: int, src: array, dst: array, graph: Optional[Any]):
+    """把边列表写入目标图；graph 为 None 时构建 CSRGraph"""
+    if graph is None:
+        return CSRGraph.from_edges(num_vertices, src, dst)
+    for v in range(num_vertices):
+        graph.add_vertex(v)
+    add_edge = graph.add_edge
+    for u, v in zip(src, dst):
+        add_edge(u, v)
+    return graph
+
+
+def erdos_renyi(num_vertices: int, p: float, seed: Optional[int] = None, graph: Optional[Any] = None):
+    """
+    生成 G(n, p) 随机有向图 (无自环)
+
+    不逐对掷骰子，而是按几何分布直接跳到下一条被选中的边，
+    期望耗时 O(n + m)，适合 10^5 - 10^6 个顶点的稀疏图。
+
+    Args:
+        num_vertices: 顶点数
+        p: 每条有向边 (u, v), u != v 出现的概率
+        seed: 随机种子
+        graph: 写入的目标图，None 时返回 CSRGraph
+    """
+    n = int(num_vertices)
+    rng = random.Random(seed)
+    src, dst = array('i'), array('i')
+    total = n * (n - 1)  # 候选有向边数
+    if n > 1 and p > 0:
+        if p >= 1:
+            for u in range(n):
+                for v in range(n):
+                    if u != v:
+                        src.append(u)
+                        dst.append(v)
+        else:
+            log_q = math.log(1.0 - p)
+            k = -1
+            while True:
+                # 跳过的候选边数服从几何分布
+                k += 1 + int(math.log(1.0 - rng.random()) / log_q)
+                if k >= total:
+                    break
+                u, r = divmod(k, n - 1)
+                src.append(u)
+                dst.append(r if r < u else r + 1)
+    return _emit(n, src, dst, graph)
+
+
+def barabasi_albert(num_vertices: int, m: int = 2, seed: Optional[int] = None, graph: Optional[Any] = None):
+    """
+    生成 Barabási–Albert 优先连接图
+
+    前 m 个顶点作为初始核心；之后每个新顶点向 m 个不同的已有顶点连边，
+    被选中的概率与其度数成正比 (通过“重复顶点表”均匀抽样实现，O(1) 每次)。
+
+    Args:
+        num_vertices: 顶点数 (至少 m + 1)
+        m: 每个新顶点的出边数
+        seed: 随机种子
+        graph: 写入的目标图，None 时返回 CSRGraph
+    """
+    n = int(num_vertices)
+    m = max(1, int(m))
+    if n <= m:
+        raise ValueError("num_vertices must be greater than m")
+    rng = random.Random(seed)
+    src, dst = array('i'), array('i')
+    repeated = array('i')  # 每个顶点按度数出现多次
+    targets = list(range(m))
+    for source in range(m, n):
+        for t in targets:
+            src.append(source)
+            dst.append(t)
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+        chosen = set()
+        targets = []
+        while len(targets) < m:
+            t = rng.choice(repeated)
+            if t not in chosen:
+                chosen.add(t)
+                targets.append(t)
+    return _emit(n, src, dst, graph)
+
+
+def grid_graph(rows: int, cols: int, graph: Optional[Any] = None):
+    """
+    生成 rows x cols 网格图，顶点编号 r * cols + c，边指向右方与下方
+
+    Args:
+        rows: 行数
+        cols: 列数
+        graph: 写入的目标图，None 时返回 CSRGraph
+    """
+    rows, cols = int(rows), int(cols)
+    src, dst = array('i'), array('i')
+    for r in range(rows):
+        base = r * cols
+        for c in range(cols):
+            v = base + c
+            if c + 1 < cols:
+                src.append(v)
+                dst.append(v + 1)
+            if r + 1 < rows:
+                src.append(v)
+                dst.append(v + cols)
+    return _emit(rows * cols, src, dst, graph)
+
+
+def tree_graph(num_vertices: int, branching: int = 2, graph: Optional[Any] = None):
+    """
+    生成完全 k 叉树 (按层序编号，顶点 i 的子节点为 k*i+1 .. k*i+k)
+
+    Args:
+        num_vertices: 顶点数
+        branching: 每个节点的子节点数
+        graph: 写入的目标图，None 时返回 CSRGraph
+    """
+    n = int(num_vertices)
+    k = max(1, int(branching))
+    src = array('i', [(v - 1) // k for v in range(1, n)])
+    dst = array('i', range(1, n))
+    return _emit(n, src, dst, graph)
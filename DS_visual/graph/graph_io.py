@@ -0,0 +1,329 @@
+"""
+流式边表读写
+Streaming edge-list import/export for DirectedGraph / CSRGraph
+
+相比 to_dict / from_dict (整张图转成嵌套 JSON)，这里按行或按定长记录
+逐条读写，读入时边直接加入图中，除图本身外只占用固定大小的缓冲区。
+
+文本格式 (兼容常见的 "u v" 边表文件):
+    # 注释
+    @ label [x y]        声明顶点 (可带位置)，保证孤立顶点和顶点顺序不丢失
+    u v [weight]         有向边，权值省略时为 1
+    顶点名中的空白字符、"%" 以及开头的 "#" / "@" 写成 %XX (UTF-8 字节，与 URL 编码相同)，
+    读入时还原，因此任意字符串顶点名都能往返。
+
+二进制格式 (小端):
+    头部    "<4sBBxxQQ": b"DGEL", 版本, 标志 (1: 带权, 2: 带位置), 顶点数, 边数
+    顶点表  每个顶点: 类型 B (0: int64, 1: UTF-8 字符串 "<I" 长度 + 内容)，
+            带位置时再跟 B (是否有位置) 和 "<dd"
+    边记录  "<II" 或 "<IId" (起点下标, 终点下标[, 权值])，分块写入
+"""
+import os
+import re
+import struct
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import unquote
+
+from graph.csr_graph import CSRGraph
+
+MAGIC = b"DGEL"
+FORMAT_VERSION = 1
+FLAG_WEIGHTED = 1
+FLAG_POSITIONS = 2
+CHUNK_EDGES = 1 << 16  # 二进制读写时每块的边数
+
+_HEADER = struct.Struct("<4sBBxxQQ")
+_INT_LABEL = struct.Struct("<q")
+_STR_LEN = struct.Struct("<I")
+_POSITION = struct.Struct("<dd")
+_EDGE = struct.Struct("<II")
+_WEIGHTED_EDGE = struct.Struct("<IId")
+
+
+@contextmanager
+def _opened(target, mode: str):
+    """target 是路径时负责打开与关闭，是文件对象时直接使用"""
+    if isinstance(target, (str, bytes, os.PathLike)):
+        kwargs = {} if "b" in mode else {"encoding": "utf-8", "newline": "\n"}
+        with open(target, mode, **kwargs) as f:
+            yield f
+    else:
+        yield target
+
+
+def _number(token: str):
+    """权值 / 坐标：整数保持为 int，其余按 float 解析"""
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+# 需要转义的字符：空白、转义符本身、会被当成注释 / 顶点声明的开头字符
+_NEEDS_ESCAPE = re.compile(r"[\s%]|^[#@]")
+
+
+def _escape_char(match) -> str:
+    return "".join(f"%{b:02X}" for b in match.group().encode("utf-8"))
+
+
+def _escape(label: Any) -> str:
+    """顶点名 -> 文本格式中的一个字段"""
+    text = str(label)
+    return _NEEDS_ESCAPE.sub(_escape_char, text) if _NEEDS_ESCAPE.search(text) else text
+
+
+def _unescape(token: str) -> str:
+    return unquote(token) if "%" in token else token
+
+
+def _out_edges(graph) -> Iterator[Tuple[Any, Iterator[Tuple[Any, Any]]]]:
+    """逐个顶点给出 (顶点, [(邻居, 权值), ...])；CSRGraph 没有边权，视为 1"""
+    adjacency = getattr(graph, "vertices", None)
+    if isinstance(adjacency, dict):
+        for v, out in adjacency.items():
+            yield v, out.items()
+    else:
+        for v in graph.get_vertices():
+            yield v, ((w, 1) for w in graph.get_neighbors(v))
+
+
+class _Builder:
+    """把流式读到的顶点和边加入目标图；graph 为 None 时累积下标数组，最后构建 CSRGraph"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.positions: Dict[Any, Tuple[float, float]] = {}
+        if graph is None:
+            self.index: Dict[Any, int] = {}
+            self.labels: List[Any] = []
+            self.src, self.dst = array('i'), array('i')
+
+    def vertex(self, v: Any) -> None:
+        if self.graph is not None:
+            self.graph.add_vertex(v)
+        elif v not in self.index:
+            self.index[v] = len(self.labels)
+            self.labels.append(v)
+
+    def edge(self, u: Any, v: Any, weight=1) -> None:
+        if self.graph is not None:
+            self.graph.add_edge(u, v, weight)
+            return
+        index = self.index
+        if u not in index:
+            self.vertex(u)
+        if v not in index:
+            self.vertex(v)
+        self.src.append(index[u])
+        self.dst.append(index[v])
+
+    def finish(self):
+        graph = self.graph
+        if graph is None:
+            graph = CSRGraph.from_edges(len(self.labels), self.src, self.dst, ids=self.labels)
+        graph.vertex_positions.update(self.positions)
+        return graph
+
+
+# ==================== 文本格式 ====================
+
+def write_edge_list(graph, target, positions: bool = True) -> None:
+    """
+    以文本边表写出图 (逐行写入，不构造整个字符串)
+
+    Args:
+        graph: DirectedGraph 或 CSRGraph
+        target: 路径或文本文件对象
+        positions: 是否写出顶点位置
+    """
+    vertex_positions = graph.vertex_positions if positions else {}
+    names = {v: _escape(v) for v in graph.get_vertices()}
+    with _opened(target, "w") as f:
+        f.write(f"# directed graph: {graph.vertex_count()} vertices, {graph.edge_count()} edges\n")
+        write = f.write
+        for v, name in names.items():
+            pos = vertex_positions.get(v)
+            write(f"@ {name} {pos[0]!r} {pos[1]!r}\n" if pos is not None else f"@ {name}\n")
+        for u, out in _out_edges(graph):
+            un = names[u]
+            f.writelines(f"{un} {names[v]}\n" if w == 1 else f"{un} {names[v]} {w!r}\n" for v, w in out)
+
+
+def iter_edge_list(source, vertex_type: Callable[[str], Any] = str) -> Iterator[Tuple[str, Any, Any, Any]]:
+    """
+    逐行解析文本边表
+
+    Yields:
+        ("vertex", label, position 或 None, None) 或 ("edge", u, v, weight)
+    """
+    with _opened(source, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            parts = line.split()
+            if len(parts) == 2 and parts[0][0] not in "#@":  # 最常见的情况放在最前面
+                u, v = parts
+                if "%" in line:
+                    u, v = unquote(u), unquote(v)
+                yield "edge", vertex_type(u), vertex_type(v), 1
+                continue
+            if not parts or parts[0].startswith("#"):
+                continue
+            if parts[0] == "@":
+                if len(parts) not in (2, 4):
+                    raise ValueError(f"line {line_no}: expected '@ label [x y]'")
+                pos = (_number(parts[2]), _number(parts[3])) if len(parts) == 4 else None
+                yield "vertex", vertex_type(_unescape(parts[1])), pos, None
+            elif len(parts) in (2, 3):
+                weight = _number(parts[2]) if len(parts) == 3 else 1
+                yield "edge", vertex_type(_unescape(parts[0])), vertex_type(_unescape(parts[1])), weight
+            else:
+                raise ValueError(f"line {line_no}: expected 'u v [weight]'")
+
+
+def read_edge_list(source, graph=None, vertex_type: Callable[[str], Any] = str):
+    """
+    读取文本边表
+
+    Args:
+        source: 路径或文本文件对象
+        graph: 写入的目标图 (例如 DirectedGraph())；None 时返回 CSRGraph (不保留权值)
+        vertex_type: 顶点名的转换函数，例如 int
+
+    Returns:
+        填充后的图
+    """
+    builder = _Builder(graph)
+    vertex, edge, positions = builder.vertex, builder.edge, builder.positions
+    for kind, a, b, c in iter_edge_list(source, vertex_type):
+        if kind == "edge":
+            edge(a, b, c)
+        else:
+            vertex(a)
+            if b is not None:
+                positions[a] = b
+    return builder.finish()
+
+
+# ==================== 二进制格式 ====================
+
+def write_binary(graph, target, positions: bool = True) -> None:
+    """
+    以二进制 (struct) 格式写出图
+
+    Args:
+        graph: DirectedGraph 或 CSRGraph
+        target: 路径或二进制文件对象
+        positions: 是否写出顶点位置
+    """
+    vertices = graph.get_vertices()
+    index = {v: i for i, v in enumerate(vertices)}
+    weighted = any(w != 1 for _, out in _out_edges(graph) for _, w in out)
+    vertex_positions = graph.vertex_positions if positions else {}
+    flags = (FLAG_WEIGHTED if weighted else 0) | (FLAG_POSITIONS if vertex_positions else 0)
+    with _opened(target, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(vertices), graph.edge_count()))
+        buf = bytearray()
+        for v in vertices:
+            if isinstance(v, int) and not isinstance(v, bool):
+                buf.append(0)
+                buf += _INT_LABEL.pack(v)
+            else:
+                data = str(v).encode("utf-8")
+                buf.append(1)
+                buf += _STR_LEN.pack(len(data))
+                buf += data
+            if flags & FLAG_POSITIONS:
+                pos = vertex_positions.get(v)
+                buf.append(pos is not None)
+                if pos is not None:
+                    buf += _POSITION.pack(pos[0], pos[1])
+            if len(buf) >= CHUNK_EDGES * 8:
+                f.write(buf)
+                buf.clear()
+        record = _WEIGHTED_EDGE if weighted else _EDGE
+        pack = record.pack
+        pending = 0
+        for u, out in _out_edges(graph):
+            i = index[u]
+            for v, w in out:
+                buf += pack(i, index[v], w) if weighted else pack(i, index[v])
+                pending += 1
+                if pending >= CHUNK_EDGES:
+                    f.write(buf)
+                    buf.clear()
+                    pending = 0
+        f.write(buf)
+
+
+def _read_exact(f, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("unexpected end of file")
+    return data
+
+
+def read_binary(source, graph=None):
+    """
+    读取二进制格式，边按块 (CHUNK_EDGES 条) 解码后加入图
+
+    Args:
+        source: 路径或二进制文件对象
+        graph: 写入的目标图；None 时返回 CSRGraph (不保留权值)
+
+    Returns:
+        填充后的图
+    """
+    with _opened(source, "rb") as f:
+        magic, version, flags, num_vertices, num_edges = _HEADER.unpack(_read_exact(f, _HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("not a DGEL binary edge list")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported DGEL version {version}")
+
+        labels: List[Any] = []
+        positions: Dict[Any, Tuple[float, float]] = {}
+        for _ in range(num_vertices):
+            tag = _read_exact(f, 1)[0]
+            if tag == 0:
+                label = _INT_LABEL.unpack(_read_exact(f, _INT_LABEL.size))[0]
+            elif tag == 1:
+                length = _STR_LEN.unpack(_read_exact(f, _STR_LEN.size))[0]
+                label = _read_exact(f, length).decode("utf-8")
+            else:
+                raise ValueError(f"unknown vertex label tag {tag}")
+            labels.append(label)
+            if flags & FLAG_POSITIONS and _read_exact(f, 1)[0]:
+                positions[label] = _POSITION.unpack(_read_exact(f, _POSITION.size))
+
+        record = _WEIGHTED_EDGE if flags & FLAG_WEIGHTED else _EDGE
+        if graph is None:
+            # 直接按下标累积，最后一次性构建 CSR
+            src, dst = array('i'), array('i')
+            remaining = num_edges
+            while remaining:
+                count = min(remaining, CHUNK_EDGES)
+                for rec in record.iter_unpack(_read_exact(f, count * record.size)):
+                    src.append(rec[0])
+                    dst.append(rec[1])
+                remaining -= count
+            result = CSRGraph.from_edges(num_vertices, src, dst, ids=labels)
+        else:
+            for label in labels:
+                graph.add_vertex(label)
+            add_edge = graph.add_edge
+            remaining = num_edges
+            while remaining:
+                count = min(remaining, CHUNK_EDGES)
+                chunk = _read_exact(f, count * record.size)
+                if record is _EDGE:
+                    for u, v in record.iter_unpack(chunk):
+                        add_edge(labels[u], labels[v])
+                else:
+                    for u, v, w in record.iter_unpack(chunk):
+                        add_edge(labels[u], labels[v], w)
+                remaining -= count
+            result = graph
+    result.vertex_positions.update(positions)
+    return result
@@ -0,0 +1,280 @@
+"""
+分层布局 (Sugiyama 框架)
+Layered layout for DFS trees and DAGs
+
+流水线:
+    1. 去环:     迭代 DFS 找出回边并把它们临时反向，得到 DAG
+    2. 分层:     最长路径分层 (拓扑序)，树的层号就是深度
+    3. 虚拟顶点: 跨越多层的边拆成一串虚拟顶点，使每条边只连相邻两层
+    4. 减少交叉: 上下交替的重心 (barycenter) 排序，用树状数组统计交叉数并保留最好的一次
+    5. 坐标分配: 每层按相邻层邻居的平均 x 定位，用保序回归 (PAV) 保证最小间距
+
+除排序外每一步都与 (顶点数 + 虚拟顶点数) 成线性，虚拟顶点总数有上限，
+几千个顶点也能在交互时间内完成。
+结果按 (图, graph.version, 参数) 缓存，图未修改时再次布局直接返回缓存。
+"""
+import weakref
+from typing import Any, Dict, List, Tuple
+
+# 虚拟顶点数上限 = DUMMY_BUDGET * (顶点数 + 边数)，防止稠密的随机图层数过多时爆炸
+DUMMY_BUDGET = 2
+
+# graph -> (version, 参数, 位置)；图被回收后缓存自动失效
+_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def clear_layout_cache() -> None:
+    """清空布局缓存"""
+    _cache.clear()
+
+
+def _remove_cycles(n: int, out: List[List[int]], indeg: List[int]) -> List[Tuple[int, int]]:
+    """迭代 DFS 去环，返回 DAG 的边 (回边被反向，自环被丢弃)"""
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color = [WHITE] * n
+    edges: List[Tuple[int, int]] = []
+    # 先从入度为 0 的顶点出发，这样树和 DAG 不会有边被反向
+    roots = [v for v in range(n) if indeg[v] == 0] + list(range(n))
+    for root in roots:
+        if color[root] != WHITE:
+            continue
+        color[root] = GRAY
+        stack = [(root, iter(out[root]))]
+        while stack:
+            u, it = stack[-1]
+            for w in it:
+                if w == u:
+                    continue
+                if color[w] == GRAY:
+                    edges.append((w, u))  # 回边反向
+                else:
+                    edges.append((u, w))
+                    if color[w] == WHITE:
+                        color[w] = GRAY
+                        stack.append((w, iter(out[w])))
+                        break
+            else:
+                color[u] = BLACK
+                stack.pop()
+    return edges
+
+
+def _assign_layers(n: int, edges: List[Tuple[int, int]]) -> List[int]:
+    """最长路径分层：layer[v] = max(layer[u] + 1)，按拓扑序计算"""
+    succ: List[List[int]] = [[] for _ in range(n)]
+    indeg = [0] * n
+    for u, v in edges:
+        succ[u].append(v)
+        indeg[v] += 1
+    layer = [0] * n
+    queue = [v for v in range(n) if indeg[v] == 0]
+    for u in queue:  # queue 在遍历时增长，相当于 Kahn 算法
+        lu = layer[u] + 1
+        for v in succ[u]:
+            if layer[v] < lu:
+                layer[v] = lu
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+    return layer
+
+
+def _count_crossings(upper_pos: List[int], lower_pos: List[int], pairs: List[Tuple[int, int]],
+                     width: int) -> int:
+    """两层之间的边交叉数：按上端位置排序后统计下端位置的逆序对 (树状数组)"""
+    keys = sorted((upper_pos[u], lower_pos[v]) for u, v in pairs)
+    tree = [0] * (width + 1)
+    crossings = 0
+    for seen, (_, p) in enumerate(keys):
+        # 已插入的下端位置中严格大于 p 的个数
+        i, le = p + 1, 0
+        while i > 0:
+            le += tree[i]
+            i -= i & -i
+        crossings += seen - le
+        i = p + 1
+        while i <= width:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def _isotonic(targets: List[float]) -> List[float]:
+    """
+    在 x[i+1] >= x[i] + 1 约束下求最接近 targets 的 x (最小二乘)
+    令 y[i] = x[i] - i 转化为单调回归，用 PAV 线性求解
+    """
+    blocks: List[List[float]] = []  # [和, 个数]
+    for i, t in enumerate(targets):
+        blocks.append([t - i, 1])
+        while len(blocks) > 1 and blocks[-2][0] * blocks[-1][1] > blocks[-1][0] * blocks[-2][1]:
+            s, c = blocks.pop()
+            blocks[-1][0] += s
+            blocks[-1][1] += c
+    result: List[float] = []
+    for s, c in blocks:
+        mean = s / c
+        result.extend([mean] * int(c))
+    return [y + i for i, y in enumerate(result)]
+
+
+def _compute(graph, width: float, height: float, margin: float, sweeps: int,
+             max_spacing: float) -> Dict[Any, Tuple[float, float]]:
+    vertices = graph.get_vertices()
+    n = len(vertices)
+    if n == 0:
+        return {}
+    index = {v: i for i, v in enumerate(vertices)}
+    out = [[index[w] for w in graph.get_neighbors(v)] for v in vertices]
+    indeg = [0] * n
+    for targets in out:
+        for w in targets:
+            indeg[w] += 1
+
+    dag_edges = _remove_cycles(n, out, indeg)
+    layer = _assign_layers(n, dag_edges)
+
+    # 拆分长边，down/up 只连接相邻两层；
+    # 虚拟顶点总数有上限，按跨度从短到长拆分，超出预算的长边不参与排序 (直接画直线)
+    down: List[List[int]] = [[] for _ in range(n)]
+    up: List[List[int]] = [[] for _ in range(n)]
+    budget = DUMMY_BUDGET * (n + len(dag_edges))
+    seen_pairs = set()
+    for u, v in sorted(dag_edges, key=lambda e: layer[e[1]] - layer[e[0]]):
+        if (u, v) in seen_pairs:  # 反向后可能与已有边重合
+            continue
+        seen_pairs.add((u, v))
+        span = layer[v] - layer[u]
+        if span - 1 > budget:
+            break
+        budget -= span - 1
+        prev = u
+        for lv in range(layer[u] + 1, layer[v]):
+            layer.append(lv)
+            down.append([])
+            up.append([])
+            dummy = len(layer) - 1
+            down[prev].append(dummy)
+            up[dummy].append(prev)
+            prev = dummy
+        down[prev].append(v)
+        up[v].append(prev)
+    total = len(layer)
+    num_layers = max(layer) + 1
+
+    # 初始顺序：沿 down 边做 DFS 的先序，树在这一步就没有交叉
+    layers: List[List[int]] = [[] for _ in range(num_layers)]
+    visited = [False] * total
+    for root in range(n):
+        if up[root] or visited[root]:
+            continue
+        visited[root] = True
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            layers[layer[u]].append(u)
+            for w in reversed(down[u]):
+                if not visited[w]:
+                    visited[w] = True
+                    stack.append(w)
+
+    pos = [0] * total
+    for nodes in layers:
+        for i, u in enumerate(nodes):
+            pos[u] = i
+
+    def total_crossings() -> int:
+        count = 0
+        for li in range(num_layers - 1):
+            pairs = [(u, w) for u in layers[li] for w in down[u]]
+            if pairs:
+                count += _count_crossings(pos, pos, pairs, len(layers[li + 1]))
+        return count
+
+    def reorder(li: int, neighbors: List[List[int]]) -> None:
+        nodes = layers[li]
+        keys = []
+        for u in nodes:
+            nbrs = neighbors[u]
+            bary = sum(pos[w] for w in nbrs) / len(nbrs) if nbrs else pos[u]
+            keys.append((bary, pos[u], u))
+        keys.sort()
+        nodes[:] = [u for _, _, u in keys]
+        for i, u in enumerate(nodes):
+            pos[u] = i
+
+    best = total_crossings()
+    best_layers = [list(nodes) for nodes in layers]
+    for sweep in range(sweeps):
+        if best == 0:
+            break
+        if sweep % 2 == 0:
+            for li in range(1, num_layers):
+                reorder(li, up)
+        else:
+            for li in range(num_layers - 2, -1, -1):
+                reorder(li, down)
+        crossings = total_crossings()
+        if crossings < best:
+            best = crossings
+            best_layers = [list(nodes) for nodes in layers]
+    layers = best_layers
+
+    # 坐标分配：向相邻层邻居的平均位置靠拢，同时保持至少 1 个单位的间距
+    x = [0.0] * total
+    for nodes in layers:
+        for i, u in enumerate(nodes):
+            x[u] = float(i)
+    for rounds in range(4):
+        order = range(1, num_layers) if rounds % 2 == 0 else range(num_layers - 2, -1, -1)
+        neighbors = up if rounds % 2 == 0 else down
+        for li in order:
+            nodes = layers[li]
+            targets = []
+            for u in nodes:
+                nbrs = neighbors[u]
+                targets.append(sum(x[w] for w in nbrs) / len(nbrs) if nbrs else x[u])
+            for u, xu in zip(nodes, _isotonic(targets)):
+                x[u] = xu
+
+    # 缩放到画布：横向间距不超过 max_spacing，整体水平居中
+    xs = x[:n]
+    lo, hi = min(x), max(x)
+    span = hi - lo
+    inner_w = width - 2 * margin
+    inner_h = height - 2 * margin
+    scale_x = min(max_spacing, inner_w / span) if span > 0 else 0.0
+    off_x = margin + (inner_w - span * scale_x) / 2
+    layer_height = min(max_spacing, inner_h / (num_layers - 1)) if num_layers > 1 else 0.0
+    return {v: (off_x + (xs[i] - lo) * scale_x, margin + layer[i] * layer_height)
+            for i, v in enumerate(vertices)}
+
+
+def layered_layout(graph, width: float = 480, height: float = 380, margin: float = 40,
+                   sweeps: int = 8, max_spacing: float = 90, use_cache: bool = True
+                   ) -> Dict[Any, Tuple[float, float]]:
+    """
+    计算分层布局并写入 graph.vertex_positions
+
+    Args:
+        graph: DirectedGraph 或 CSRGraph
+        width, height: 画布尺寸
+        margin: 边距 (通常取顶点半径)
+        sweeps: 重心排序的最大轮数 (上下各算一轮)
+        max_spacing: 相邻顶点 / 相邻层的最大间距
+        use_cache: 图未修改时复用上一次的结果
+
+    Returns:
+        顶点 -> (x, y)
+    """
+    params = (width, height, margin, sweeps, max_spacing)
+    version = getattr(graph, "version", None)
+    cached = _cache.get(graph) if use_cache else None
+    if cached is not None and cached[0] == version and cached[1] == params:
+        positions = cached[2]
+    else:
+        positions = _compute(graph, width, height, margin, sweeps, max_spacing)
+        if use_cache:
+            _cache[graph] = (version, params, positions)
+    graph.vertex_positions.update(positions)
+    return dict(positions)
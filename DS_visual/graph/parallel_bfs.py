@@ -0,0 +1,159 @@
+"""
+层同步 (level-synchronous) BFS
+Level-synchronous BFS, optionally partitioned across a process pool
+
+每一轮把当前层 (frontier) 切分成若干块，交给进程池中的 worker 扫描出边；
+CSR 的 offsets / targets 以及 visited 标记放在共享内存里，worker 只读，
+由主进程按块的顺序合并结果，因此每层顶点的顺序与串行 BFS 完全一致。
+
+输出格式与 BFSVisualizer._update_layer_view 使用的一致：
+    vertex_layer:  顶点 -> 层号
+    layer_vertices: 层号 -> 该层顶点列表 (按发现顺序)
+"""
+from array import array
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from graph.csr_graph import CSRGraph
+
+# 层的规模小于该值时由主进程直接处理，避免进程间通信的开销
+PARALLEL_THRESHOLD = 4096
+
+# worker 进程内的共享内存视图 (由 _init_worker 设置)
+_shared: Dict[str, Any] = {}
+
+
+def compute_layers(graph, start: Any) -> Tuple[Dict[Any, int], Dict[int, List[Any]]]:
+    """
+    串行计算 BFS 层级，适用于 DirectedGraph 或 CSRGraph
+
+    Returns:
+        (vertex_layer, layer_vertices)
+    """
+    vertex_layer = {start: 0}
+    layer_vertices = {0: [start]}
+    frontier = [start]
+    layer = 0
+    while frontier:
+        next_frontier = []
+        for v in frontier:
+            for nb in graph.get_neighbors(v):
+                if nb not in vertex_layer:
+                    vertex_layer[nb] = layer + 1
+                    next_frontier.append(nb)
+        layer += 1
+        if next_frontier:
+            layer_vertices[layer] = next_frontier
+        frontier = next_frontier
+    return vertex_layer, layer_vertices
+
+
+def _init_worker(offsets_name: str, targets_name: str, visited_name: str):
+    for key, name, fmt in (("offsets", offsets_name, 'q'),
+                           ("targets", targets_name, 'i'),
+                           ("visited", visited_name, 'B')):
+        shm = SharedMemory(name=name)
+        _shared[key + "_shm"] = shm  # 保持引用，防止被回收
+        _shared[key] = shm.buf.cast(fmt)
+
+
+def _expand_chunk(chunk: bytes) -> bytes:
+    """扫描一块 frontier 的出边，返回尚未访问的邻居 (块内去重，保持发现顺序)"""
+    offsets, targets, visited = _shared["offsets"], _shared["targets"], _shared["visited"]
+    frontier = array('i')
+    frontier.frombytes(chunk)
+    found = array('i')
+    seen = set()
+    for i in frontier:
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if not visited[j] and j not in seen:
+                seen.add(j)
+                found.append(j)
+    return found.tobytes()
+
+
+def _copy_to_shared(data, size: int) -> SharedMemory:
+    shm = SharedMemory(create=True, size=max(1, size))
+    if size:
+        shm.buf[:size] = memoryview(data).cast('B')
+    return shm
+
+
+def parallel_bfs_layers(csr: CSRGraph, start: Any, workers: int = 4,
+                        threshold: Optional[int] = None) -> Tuple[Dict[Any, int], Dict[int, List[Any]]]:
+    """
+    在 CSR 图上做层同步 BFS，大的层由进程池并行扩展
+
+    Args:
+        csr: 冻结后的图 (DirectedGraph.freeze())
+        start: 起始顶点
+        workers: 进程数；为 1 时完全在主进程内执行
+        threshold: 层规模达到多少时才分给进程池 (默认 PARALLEL_THRESHOLD)
+
+    Returns:
+        (vertex_layer, layer_vertices)，与 compute_layers 的结果相同
+    """
+    s = csr.index_of(start)
+    n = csr.vertex_count()
+    threshold = PARALLEL_THRESHOLD if threshold is None else threshold
+    visited_local = bytearray(n)
+    levels: List[array] = []
+
+    blocks: List[SharedMemory] = []
+    pool = None
+    visited = visited_local
+    try:
+        if workers > 1:
+            offsets_shm = _copy_to_shared(csr.offsets, csr.offsets.itemsize * len(csr.offsets))
+            targets_shm = _copy_to_shared(csr.targets, csr.targets.itemsize * len(csr.targets))
+            visited_shm = _copy_to_shared(visited_local, n)
+            blocks = [offsets_shm, targets_shm, visited_shm]
+            visited = visited_shm.buf
+            pool = Pool(workers, initializer=_init_worker,
+                        initargs=(offsets_shm.name, targets_shm.name, visited_shm.name))
+
+        offsets, targets = csr.offsets, csr.targets
+        visited[s] = 1
+        frontier = array('i', [s])
+        while frontier:
+            levels.append(frontier)
+            next_frontier = array('i')
+            if pool is not None and len(frontier) >= threshold:
+                step = -(-len(frontier) // (workers * 4))  # 每个 worker 约 4 块，平衡负载
+                chunks = [frontier[i:i + step].tobytes() for i in range(0, len(frontier), step)]
+                # 按块的顺序合并，保证与串行 BFS 的发现顺序一致
+                for found_bytes in pool.imap(_expand_chunk, chunks):
+                    found = array('i')
+                    found.frombytes(found_bytes)
+                    for j in found:
+                        if not visited[j]:
+                            visited[j] = 1
+                            next_frontier.append(j)
+            else:
+                for i in frontier:
+                    for k in range(offsets[i], offsets[i + 1]):
+                        j = targets[k]
+                        if not visited[j]:
+                            visited[j] = 1
+                            next_frontier.append(j)
+            frontier = next_frontier
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        visited = None
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    ids = csr.ids
+    vertex_layer: Dict[Any, int] = {}
+    layer_vertices: Dict[int, List[Any]] = {}
+    for layer, level in enumerate(levels):
+        labels = [ids[i] for i in level]
+        layer_vertices[layer] = labels
+        for v in labels:
+            vertex_layer[v] = layer
+    return vertex_layer, layer_vertices
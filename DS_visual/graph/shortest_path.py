@@ -0,0 +1,333 @@
+"""
+带权最短路径 (Dijkstra / A*)
+Weighted shortest paths driven by an indexed binary heap
+
+IndexedMinHeap 记录每个键在堆数组中的下标，decrease_key 为 O(log n)，
+因此每个顶点在堆中最多出现一次 (不同于 heapq 的“惰性删除”写法)。
+record=True 时堆的每次比较 / 交换都记录为 HeapOperation (与哈夫曼树的
+MinHeapWithSteps 相同)，可以和图上的步骤一起播放。
+
+边权取自 DirectedGraph 出边 dict 的值 (默认 1)，不允许负权。
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from binary_tree.huffman_tree.huffman_model import HeapOperation
+
+Heuristic = Callable[[Any, Any], float]
+
+
+class IndexedMinHeap:
+    """
+    索引最小堆: 键 -> 优先级，支持 O(log n) 的 push / pop / decrease_key
+
+    Args:
+        record: 是否记录 HeapOperation (用于动画，会为每一步保存堆快照)
+    """
+
+    def __init__(self, record: bool = False):
+        self.keys: List[Any] = []
+        self.priorities: List[float] = []
+        self.position: Dict[Any, int] = {}  # 键 -> 在堆数组中的下标
+        self.record = record
+        self.operations: List[HeapOperation] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.position
+
+    def priority_of(self, key: Any) -> float:
+        return self.priorities[self.position[key]]
+
+    def peek(self) -> Tuple[Any, float]:
+        if not self.keys:
+            raise IndexError("peek from empty heap")
+        return self.keys[0], self.priorities[0]
+
+    def _record(self, op_type: str, index: int, value: float, swap_with: int = -1, description: str = ""):
+        self.operations.append(HeapOperation(op_type, index, value, swap_with,
+                                             self.priorities, description))
+
+    def push(self, key: Any, priority: float) -> None:
+        """插入新键"""
+        if key in self.position:
+            raise ValueError(f"key {key!r} already in heap")
+        i = len(self.keys)
+        self.keys.append(key)
+        self.priorities.append(priority)
+        self.position[key] = i
+        if self.record:
+            self._record('insert', i, priority, description=f"将 {key}({priority:g}) 插入到堆的位置 {i}")
+        self._sift_up(i)
+
+    def decrease_key(self, key: Any, priority: float) -> None:
+        """降低已有键的优先级"""
+        i = self.position[key]
+        old = self.priorities[i]
+        if priority > old:
+            raise ValueError(f"new priority {priority!r} is greater than current {old!r}")
+        self.priorities[i] = priority
+        if self.record:
+            self._record('decrease_key', i, priority,
+                         description=f"{key} 的优先级 {old:g} → {priority:g}，从位置 {i} 开始上浮")
+        self._sift_up(i)
+
+    def push_or_decrease(self, key: Any, priority: float) -> bool:
+        """键不存在则插入，存在且新优先级更小则 decrease_key；返回堆是否被修改"""
+        i = self.position.get(key)
+        if i is None:
+            self.push(key, priority)
+            return True
+        if priority < self.priorities[i]:
+            self.decrease_key(key, priority)
+            return True
+        return False
+
+    def pop(self) -> Tuple[Any, float]:
+        """弹出优先级最小的键"""
+        keys, priorities = self.keys, self.priorities
+        if not keys:
+            raise IndexError("pop from empty heap")
+        key, priority = keys[0], priorities[0]
+        if self.record:
+            self._record('extract', 0, priority, description=f"取出堆顶最小元素: {key}({priority:g})")
+        del self.position[key]
+        last_key, last_priority = keys.pop(), priorities.pop()
+        if keys:
+            keys[0], priorities[0] = last_key, last_priority
+            self.position[last_key] = 0
+            if self.record:
+                self._record('move_to_top', 0, last_priority,
+                             description=f"将末尾元素 {last_key}({last_priority:g}) 移动到堆顶")
+            self._sift_down(0)
+        return key, priority
+
+    def _swap(self, i: int, j: int) -> None:
+        keys, priorities, position = self.keys, self.priorities, self.position
+        keys[i], keys[j] = keys[j], keys[i]
+        priorities[i], priorities[j] = priorities[j], priorities[i]
+        position[keys[i]] = i
+        position[keys[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        if self.record:
+            self._sift_up_recorded(i)
+            return
+        # 空穴法：只在最后写入一次被移动的元素
+        keys, priorities, position = self.keys, self.priorities, self.position
+        key, priority = keys[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if priority < priorities[parent]:
+                keys[i] = keys[parent]
+                priorities[i] = priorities[parent]
+                position[keys[i]] = i
+                i = parent
+            else:
+                break
+        keys[i] = key
+        priorities[i] = priority
+        position[key] = i
+
+    def _sift_down(self, i: int) -> None:
+        if self.record:
+            self._sift_down_recorded(i)
+            return
+        keys, priorities, position = self.keys, self.priorities, self.position
+        n = len(keys)
+        key, priority = keys[i], priorities[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priorities[child] < priority:
+                keys[i] = keys[child]
+                priorities[i] = priorities[child]
+                position[keys[i]] = i
+                i = child
+            else:
+                break
+        keys[i] = key
+        priorities[i] = priority
+        position[key] = i
+
+    def _sift_up_recorded(self, i: int) -> None:
+        priorities = self.priorities
+        while i > 0:
+            parent = (i - 1) // 2
+            self._record('compare', i, priorities[i], parent,
+                         description=f"比较: 节点[{i}]={priorities[i]:g} 与 父节点[{parent}]={priorities[parent]:g}")
+            if priorities[i] < priorities[parent]:
+                self._record('sift_up', i, priorities[i], parent,
+                             description=f"上浮: {priorities[i]:g} < {priorities[parent]:g}, 交换位置")
+                self._swap(i, parent)
+                self._record('swap', parent, priorities[parent], i,
+                             description=f"交换完成: 位置 {i} ↔ 位置 {parent}")
+                i = parent
+            else:
+                self._record('sift_up_done', i, priorities[i],
+                             description=f"上浮完成: {priorities[i]:g} ≥ 父节点, 停止")
+                return
+        self._record('sift_up_done', 0, priorities[0], description="上浮完成: 已到达堆顶")
+
+    def _sift_down_recorded(self, i: int) -> None:
+        priorities = self.priorities
+        n = len(priorities)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    self._record('compare', smallest, priorities[smallest], child,
+                                 description=f"比较: [{smallest}]={priorities[smallest]:g} 与 子节点[{child}]={priorities[child]:g}")
+                    if priorities[child] < priorities[smallest]:
+                        smallest = child
+            if smallest == i:
+                self._record('sift_down_done', i, priorities[i], description="下沉完成: 当前节点 ≤ 所有子节点")
+                return
+            self._record('sift_down', i, priorities[i], smallest,
+                         description=f"下沉: {priorities[i]:g} > 子节点 {priorities[smallest]:g}, 交换位置")
+            self._swap(i, smallest)
+            self._record('swap', smallest, priorities[smallest], i,
+                         description=f"交换完成: 位置 {i} ↔ 位置 {smallest}")
+            i = smallest
+
+
+def _search(graph, source: Any, target: Any, heuristic: Optional[Heuristic],
+            steps: Optional[List[Tuple[str, Any, Any]]]) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    """Dijkstra / A* 的公共实现；steps 不为 None 时记录动画步骤"""
+    adj = graph.vertices
+    heap = IndexedMinHeap(record=steps is not None)
+    dist: Dict[Any, float] = {source: 0}
+    parent: Dict[Any, Any] = {source: None}
+    settled = set()
+
+    def flush(mark: int) -> None:
+        if heap.operations[mark:]:
+            steps.append(("heap", heap.operations[mark:], None))
+
+    heap.push(source, heuristic(source, target) if heuristic else 0)
+    if steps is not None:
+        flush(0)
+    while heap:
+        mark = len(heap.operations)
+        u, _ = heap.pop()
+        settled.add(u)
+        du = dist[u]
+        if steps is not None:
+            flush(mark)
+            steps.append(("pop", u, du))
+        if u == target:
+            break
+        for v, w in adj[u].items():
+            if w < 0:
+                raise ValueError(f"negative edge weight {u!r} -> {v!r}: {w!r}")
+            if steps is not None:
+                steps.append(("check_edge", u, v))
+            if v in settled:
+                if steps is not None:
+                    steps.append(("skip", v, None))
+                continue
+            nd = du + w
+            old = dist.get(v)
+            if old is None or nd < old:
+                dist[v] = nd
+                parent[v] = u
+                priority = nd + heuristic(v, target) if heuristic else nd
+                mark = len(heap.operations)
+                if old is None:
+                    heap.push(v, priority)
+                else:
+                    heap.decrease_key(v, priority)
+                if steps is not None:
+                    steps.append(("relax", v, (old, nd)))
+                    flush(mark)
+            elif steps is not None:
+                steps.append(("skip", v, None))
+    return dist, parent
+
+
+def dijkstra(graph, source: Any, target: Any = None) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    """
+    单源最短路径
+
+    Args:
+        graph: DirectedGraph (边权为出边 dict 的值)
+        source: 起点
+        target: 终点；给出时弹出终点后立即停止
+
+    Returns:
+        (dist, parent)；停止时仍在堆中的顶点的 dist 只是上界
+    """
+    if not graph.has_vertex(source):
+        raise ValueError(f"source vertex {source!r} not in graph")
+    return _search(graph, source, target, None, None)
+
+
+def astar(graph, source: Any, target: Any, heuristic: Heuristic) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    """
+    A* 搜索；heuristic(v, target) 需要是一致的 (不高估且满足三角不等式)
+
+    Returns:
+        (dist, parent)，同 dijkstra
+    """
+    if not graph.has_vertex(source):
+        raise ValueError(f"source vertex {source!r} not in graph")
+    return _search(graph, source, target, heuristic, None)
+
+
+def reconstruct_path(parent: Dict[Any, Any], target: Any) -> Optional[List[Any]]:
+    """沿 parent 回溯出起点到 target 的路径，不可达时返回 None"""
+    if target not in parent:
+        return None
+    path = []
+    v = target
+    while v is not None:
+        path.append(v)
+        v = parent[v]
+    path.reverse()
+    return path
+
+
+def shortest_path(graph, source: Any, target: Any,
+                  heuristic: Optional[Heuristic] = None) -> Tuple[Optional[List[Any]], Optional[float]]:
+    """
+    返回 (路径, 长度)；不可达时返回 (None, None)
+    给出 heuristic 时使用 A*，否则使用 Dijkstra
+    """
+    if not graph.has_vertex(source):
+        raise ValueError(f"source vertex {source!r} not in graph")
+    dist, parent = _search(graph, source, target, heuristic, None)
+    path = reconstruct_path(parent, target)
+    return (path, dist[target]) if path else (None, None)
+
+
+def dijkstra_traversal(graph, source: Any, target: Any = None,
+                       heuristic: Optional[Heuristic] = None) -> List[Tuple[str, Any, Any]]:
+    """
+    Dijkstra / A* 的动画步骤
+
+    Returns:
+        List of (action, data1, data2) tuples:
+        - ("heap", [HeapOperation, ...], None): 紧接着的一次堆操作的详细过程
+        - ("pop", vertex, dist): 顶点出堆，其最短距离确定
+        - ("check_edge", u, v): 检查边 u -> v
+        - ("relax", vertex, (old_dist, new_dist)): 松弛成功 (old_dist 为 None 表示首次入堆)
+        - ("skip", vertex, None): 顶点已确定或没有变短
+        - ("path", path, length) / ("no_path", source, target): 给出 target 时的结果
+        - ("done", dist, None): 完成
+    """
+    if not graph.has_vertex(source):
+        return [("error", "起始顶点不存在", None)]
+    steps: List[Tuple[str, Any, Any]] = []
+    dist, parent = _search(graph, source, target, heuristic, steps)
+    if target is not None:
+        path = reconstruct_path(parent, target)
+        if path:
+            steps.append(("path", path, dist[target]))
+        else:
+            steps.append(("no_path", source, target))
+    steps.append(("done", dist, None))
+    return steps
@@ -0,0 +1,378 @@
+"""
+深度优先类算法 (显式栈实现，不受递归深度限制)
+DFS-style traversals shared by the visualizers
+
+    iter_dfs / iter_bfs:   惰性的顶点迭代器，适合大图的无界面遍历
+    dfs_traversal:         DFSVisualizer 使用的动画步骤
+    topological_sort / strongly_connected_components / kosaraju_scc
+    topological_sort_traversal / tarjan_scc_traversal: 对应的动画步骤
+
+队列实现的 BFS 动画步骤依赖 CircularQueueModel，仍在 circular_queue.graph_model 中。
+"""
+from collections import deque
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from graph.directed_graph import DirectedGraph
+
+
+def iter_dfs(graph: DirectedGraph, start: Any) -> Iterator[Any]:
+    """
+    按 DFS 先序惰性地给出从 start 可达的顶点
+    (邻居按插入顺序访问，与 dfs_traversal 的访问顺序一致)
+    """
+    if not graph.has_vertex(start):
+        return
+    visited: Set[Any] = set()
+    stack = [start]
+    while stack:
+        v = stack.pop()
+        if v in visited:
+            continue
+        visited.add(v)
+        yield v
+        stack.extend(w for w in reversed(graph.get_neighbors(v)) if w not in visited)
+
+
+def iter_bfs(graph: DirectedGraph, start: Any) -> Iterator[Any]:
+    """按 BFS 层序惰性地给出从 start 可达的顶点 (与 bfs_traversal 的访问顺序一致)"""
+    if not graph.has_vertex(start):
+        return
+    visited = {start}
+    queue = deque([start])
+    while queue:
+        v = queue.popleft()
+        yield v
+        for w in graph.get_neighbors(v):
+            if w not in visited:
+                visited.add(w)
+                queue.append(w)
+
+
+def dfs_traversal(graph: DirectedGraph, start: Any) -> List[Tuple[str, Any, Any]]:
+    """
+    DFS遍历生成器，返回每一步的操作
+    
+    Args:
+        graph: 有向图
+        start: 起始顶点
+    
+    Returns:
+        List of (action, data1, data2) tuples:
+        - ("push", vertex, depth): 入栈
+        - ("pop", vertex, depth): 出栈
+        - ("visit", vertex, depth): 访问顶点
+        - ("check_neighbor", current, neighbor): 检查邻居
+        - ("skip", neighbor, None): 跳过已访问的邻居
+        - ("backtrack", from_vertex, to_vertex): 回溯
+        - ("done", None, None): 完成
+    """
+    if not graph.has_vertex(start):
+        return [("error", "起始顶点不存在", None)]
+    
+    steps = []
+    visited: Set[Any] = set()
+    stack: List[Tuple[Any, int]] = []  # (顶点, 深度)
+    
+    # 起始顶点入栈
+    steps.append(("push", start, 0))
+    stack.append((start, 0))
+    
+    while stack:
+        # 出栈
+        current, depth = stack.pop()
+        steps.append(("pop", current, depth))
+        
+        if current in visited:
+            steps.append(("skip", current, None))
+            continue
+        
+        visited.add(current)
+        steps.append(("visit", current, depth))
+        
+        # 遍历邻居（逆序入栈，保证字母序遍历）
+        neighbors = graph.get_neighbors(current)
+        neighbors_to_push = []
+        
+        for neighbor in neighbors:
+            steps.append(("check_neighbor", current, neighbor))
+            if neighbor not in visited:
+                neighbors_to_push.append(neighbor)
+                steps.append(("will_push", neighbor, depth + 1))
+            else:
+                steps.append(("skip", neighbor, None))
+        
+        # 逆序入栈
+        for neighbor in reversed(neighbors_to_push):
+            steps.append(("push", neighbor, depth + 1))
+            stack.append((neighbor, depth + 1))
+        
+        # 如果没有新邻居入栈且栈不为空，说明要回溯
+        if not neighbors_to_push and stack:
+            steps.append(("backtrack", current, stack[-1][0]))
+    
+    steps.append(("done", None, None))
+    return steps
+
+
+def topological_sort(graph: DirectedGraph) -> List[Any]:
+    """
+    拓扑排序 (迭代 DFS 的逆后序，不受递归深度限制)
+    
+    Returns:
+        顶点的拓扑序列
+    
+    Raises:
+        ValueError: 图中存在环
+    """
+    adj = graph.vertices
+    state: Dict[Any, int] = {}  # 1: 在DFS栈上, 2: 已完成
+    postorder: List[Any] = []
+    for root in adj:
+        if root in state:
+            continue
+        state[root] = 1
+        frames = [(root, iter(adj[root]))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                s = state.get(w)
+                if s is None:
+                    state[w] = 1
+                    frames.append((w, iter(adj[w])))
+                    break
+                if s == 1:
+                    raise ValueError(f"graph contains a cycle through {v!r} -> {w!r}")
+            else:
+                frames.pop()
+                state[v] = 2
+                postorder.append(v)
+    postorder.reverse()
+    return postorder
+
+
+def strongly_connected_components(graph: DirectedGraph) -> List[List[Any]]:
+    """
+    Tarjan 强连通分量 (迭代实现，用显式的帧栈代替递归)
+    
+    Returns:
+        分量列表；分量按缩点图的逆拓扑序给出 (Tarjan 算法的性质)
+    """
+    adj = graph.vertices
+    index: Dict[Any, int] = {}
+    low: Dict[Any, int] = {}
+    on_stack: Set[Any] = set()
+    stack: List[Any] = []
+    components: List[List[Any]] = []
+    counter = 0
+    for root in adj:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(adj[root]))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    frames.append((w, iter(adj[w])))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+def kosaraju_scc(graph: DirectedGraph) -> List[List[Any]]:
+    """
+    Kosaraju 强连通分量：正向图求完成顺序，再按完成时间倒序在逆邻接表上收集分量
+    
+    Returns:
+        分量列表；分量按缩点图的拓扑序给出
+    """
+    adj = graph.vertices
+    seen: Set[Any] = set()
+    order: List[Any] = []
+    for root in adj:
+        if root in seen:
+            continue
+        seen.add(root)
+        frames = [(root, iter(adj[root]))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                if w not in seen:
+                    seen.add(w)
+                    frames.append((w, iter(adj[w])))
+                    break
+            else:
+                frames.pop()
+                order.append(v)
+    
+    reverse = graph.reverse
+    assigned: Set[Any] = set()
+    components: List[List[Any]] = []
+    for root in reversed(order):
+        if root in assigned:
+            continue
+        assigned.add(root)
+        component = [root]
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            for w in reverse[v]:
+                if w not in assigned:
+                    assigned.add(w)
+                    component.append(w)
+                    stack.append(w)
+        components.append(component)
+    return components
+
+
+def topological_sort_traversal(graph: DirectedGraph) -> List[Tuple[str, Any, Any]]:
+    """
+    拓扑排序的动画步骤 (与 DFSVisualizer 的步骤格式一致)
+    
+    Returns:
+        List of (action, data1, data2) tuples:
+        - ("init", None, None): 初始化
+        - ("push", vertex, depth) / ("visit", vertex, depth): 进入顶点
+        - ("check_edge", u, v) / ("skip", v, u): 检查出边 u -> v / 跳过已完成的顶点 v
+        - ("cycle", u, v): 发现回边 u -> v，图中有环，排序终止
+        - ("finish", vertex, k): 顶点完成，是第 k 个完成的顶点 (后序)
+        - ("pop", vertex, depth): 顶点出栈
+        - ("backtrack", from_vertex, (to_vertex, depth)): 回溯到父顶点
+        - ("topo_order", order, None): 拓扑序列 (逆后序)
+        - ("done", None, None): 完成
+    """
+    adj = graph.vertices
+    steps: List[Tuple[str, Any, Any]] = [("init", None, None)]
+    state: Dict[Any, int] = {}
+    postorder: List[Any] = []
+    for root in adj:
+        if root in state:
+            continue
+        state[root] = 1
+        steps.append(("push", root, 0))
+        steps.append(("visit", root, 0))
+        frames = [(root, iter(adj[root]))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                steps.append(("check_edge", v, w))
+                s = state.get(w)
+                if s is None:
+                    state[w] = 1
+                    depth = len(frames)
+                    steps.append(("push", w, depth))
+                    steps.append(("visit", w, depth))
+                    frames.append((w, iter(adj[w])))
+                    break
+                if s == 1:
+                    steps.append(("cycle", v, w))
+                    steps.append(("done", None, None))
+                    return steps
+                steps.append(("skip", w, v))
+            else:
+                frames.pop()
+                state[v] = 2
+                postorder.append(v)
+                steps.append(("finish", v, len(postorder)))
+                steps.append(("pop", v, len(frames)))
+                if frames:
+                    steps.append(("backtrack", v, (frames[-1][0], len(frames) - 1)))
+    steps.append(("topo_order", postorder[::-1], None))
+    steps.append(("done", None, None))
+    return steps
+
+
+def tarjan_scc_traversal(graph: DirectedGraph) -> List[Tuple[str, Any, Any]]:
+    """
+    Tarjan 强连通分量的动画步骤 (与 DFSVisualizer 的步骤格式一致)
+    
+    Returns:
+        List of (action, data1, data2) tuples:
+        - ("init", None, None): 初始化
+        - ("push", vertex, depth) / ("visit", vertex, depth): 进入顶点 (同时压入 Tarjan 栈)
+        - ("check_edge", u, v) / ("skip", v, u): 检查出边 u -> v / 跳过已属于某个分量的顶点 v
+        - ("lowlink", vertex, low): 顶点的 low 值被更新
+        - ("scc", component, k): 找到第 k 个强连通分量 (从 0 开始)
+        - ("pop", vertex, depth): 顶点的 DFS 帧结束
+        - ("backtrack", from_vertex, (to_vertex, depth)): 回溯到父顶点
+        - ("done", None, None): 完成
+    """
+    adj = graph.vertices
+    steps: List[Tuple[str, Any, Any]] = [("init", None, None)]
+    index: Dict[Any, int] = {}
+    low: Dict[Any, int] = {}
+    on_stack: Set[Any] = set()
+    stack: List[Any] = []
+    count = 0
+
+    def enter(v: Any, depth: int):
+        index[v] = low[v] = len(index)
+        stack.append(v)
+        on_stack.add(v)
+        steps.append(("push", v, depth))
+        steps.append(("visit", v, depth))
+
+    for root in adj:
+        if root in index:
+            continue
+        enter(root, 0)
+        frames = [(root, iter(adj[root]))]
+        while frames:
+            v, it = frames[-1]
+            for w in it:
+                steps.append(("check_edge", v, w))
+                if w not in index:
+                    enter(w, len(frames))
+                    frames.append((w, iter(adj[w])))
+                    break
+                if w in on_stack:
+                    if index[w] < low[v]:
+                        low[v] = index[w]
+                        steps.append(("lowlink", v, low[v]))
+                else:
+                    steps.append(("skip", w, v))
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                        steps.append(("lowlink", parent, low[parent]))
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    steps.append(("scc", component, count))
+                    count += 1
+                steps.append(("pop", v, len(frames)))
+                if frames:
+                    steps.append(("backtrack", v, (frames[-1][0], len(frames) - 1)))
+    steps.append(("done", None, None))
+    return steps
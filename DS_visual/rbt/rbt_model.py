@@ -1,20 +1,88 @@
-from typing import Any, Optional, List, Dict, Tuple
+from typing import Any, Iterable, Iterator, Optional, List, Dict, Tuple
+
+try:
+    from binary_tree.tree_iter import iter_inorder, iter_range
+    from binary_tree.tree_keys import int_key, compare_keys, key_less
+except ImportError:  # 以 DS_visual.rbt... 方式导入时 (测试)
+    from DS_visual.binary_tree.tree_iter import iter_inorder, iter_range
+    from DS_visual.binary_tree.tree_keys import int_key, compare_keys, key_less
 
 
 class RBNode:
     def __init__(self, val: Any, color: str = "R"):
-        self.val = val
+        # 最近一次快照中对应的持久化节点 (见 RBModel.snapshot)；None 表示已失效
+        self._snap: Optional['RBSnapshotNode'] = None
+        self.parent: Optional['RBNode'] = None
+        self.val = val  # 同时算出比较键 key
         self.left: Optional['RBNode'] = None
         self.right: Optional['RBNode'] = None
-        self.parent: Optional['RBNode'] = None
-        self.color: str = color  # 是红节点还是黑节点
+        self._color: str = color  # 是红节点还是黑节点
         self.id = id(self)    
         self.orig_id: Optional[int] = None
 
+    @property
+    def val(self) -> Any:
+        return self._val
+
+    @val.setter
+    def val(self, value: Any):
+        # 比较键只在值改变时计算一次 (删除时与后继交换值也会经过这里)
+        self._val = value
+        self.key = int_key(value)
+        if self._snap is not None:
+            _invalidate(self)
+
+    @property
+    def color(self) -> str:
+        return self._color
+
+    @color.setter
+    def color(self, value: str):
+        if value != self._color:
+            self._color = value
+            if self._snap is not None:
+                _invalidate(self)
+
     def __repr__(self):
         return f"RBNode({self.val},{self.color})"
 
 
+class RBSnapshotNode:
+    """
+    路径复制的持久化快照节点 (创建后不再修改)
+
+    相邻的快照共享所有未改变的子树，因此节点没有 parent 指针
+    (用 tree_iter.iter_inorder_stack 遍历)。orig_id 为对应的实时节点的 id。
+    """
+    __slots__ = ("val", "key", "color", "left", "right", "orig_id")
+
+    def __init__(self, node: RBNode, left: Optional['RBSnapshotNode'], right: Optional['RBSnapshotNode']):
+        self.val = node.val
+        self.key = node.key
+        self.color = node.color
+        self.left = left
+        self.right = right
+        self.orig_id = node.id
+
+    @property
+    def id(self) -> int:
+        return id(self)
+
+    def __repr__(self):
+        return f"RBSnapshotNode({self.val},{self.color})"
+
+
+def _invalidate(node: Optional[RBNode]):
+    """
+    node 的值 / 颜色 / 孩子改变：它和祖先的快照节点都要重建。
+    不变式：失效节点的祖先都已失效，因此遇到已失效的节点即可停止
+    (从未做过快照的树上这里是 O(1))。
+    """
+    while node is not None and node._snap is not None:
+        node._snap = None
+        node = node.parent
+
+
 def clone_tree(node: Optional[RBNode]) -> Optional[RBNode]:
     if node is None:
         return None
@@ -33,13 +101,39 @@ class RBModel:
     def __init__(self):
         self.root: Optional[RBNode] = None
 
+    def snapshot(self) -> Optional[RBSnapshotNode]:
+        """
+        当前树的持久化快照 (路径复制)
+
+        与上一次快照共享所有未改变的子树，只为上次快照之后改动过的节点及其祖先
+        新建 RBSnapshotNode：一次插入 / 删除之后为 O(log n) 个新节点。
+        第一次调用 (或整棵树被替换后) 为 O(n)。
+        """
+        root = self.root
+        if root is None:
+            return None
+        if root._snap is None:
+            # 后序重建失效的节点；失效的节点构成包含根的连通块，只需下降到失效的孩子
+            stack = [root]
+            while stack:
+                node = stack[-1]
+                left, right = node.left, node.right
+                if left is not None and left._snap is None:
+                    stack.append(left)
+                elif right is not None and right._snap is None:
+                    stack.append(right)
+                else:
+                    stack.pop()
+                    node._snap = RBSnapshotNode(node,
+                                                left._snap if left is not None else None,
+                                                right._snap if right is not None else None)
+        return root._snap
+
     def _compare_less(self, val1: Any, val2: Any) -> bool:
-        """比较 val1 < val2，优先使用整数比较"""
-        try:
-            return int(val1) < int(val2)
-        except (ValueError, TypeError):
-            # 如果转换失败，回退到字符串比较
-            return str(val1) < str(val2)
+        """比较 val1 < val2，优先使用整数比较，失败则按字符串比较
+        (树内的比较直接使用节点上预计算的 key，见 binary_tree.tree_keys)
+        """
+        return key_less(int_key(val1), int_key(val2))
 
     def _rotate_left(self, x: RBNode) -> RBNode:
         y = x.right
@@ -60,6 +154,9 @@ class RBModel:
                 parent.left = y
             else:
                 parent.right = y
+        # x、y 的孩子改变；parent 的孩子也改变，经 y 向上失效
+        _invalidate(x)
+        _invalidate(y)
         return y
 
     def _rotate_right(self, x: RBNode) -> RBNode:
@@ -82,36 +179,86 @@ class RBModel:
                 parent.left = y
             else:
                 parent.right = y
-
+        # x、y 的孩子改变；parent 的孩子也改变，经 y 向上失效
+        _invalidate(x)
+        _invalidate(y)
         return y
     
-    def insert(self, val: Any):
-        """简单插入方法（无步骤记录）"""
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any]) -> 'RBModel':
+        """
+        O(n) 批量构建：keys 已按 _compare_less 的顺序排好 (允许重复)，每个区间取中点作根。
+        这样所有空链接都在深度 D 或 D+1 (D 为最大深度)，把深度 D 的一层染红、其余染黑，
+        每条路径的黑节点数都是 D，且红节点都是叶子，满足红黑性质。parent 同时设好。
+
+        Raises:
+            ValueError: keys 没有排好序
+        """
+        model = cls()
+        nodes = [RBNode(k, color="B") for k in keys]
+        for i in range(1, len(nodes)):
+            if key_less(nodes[i].key, nodes[i - 1].key):
+                raise ValueError(f"from_sorted: keys not sorted at index {i} "
+                                 f"({nodes[i - 1].val!r} > {nodes[i].val!r})")
+        n = len(nodes)
+        bottom = n.bit_length() - 1  # 最大深度 D (根的深度为 0，根保持黑色)
+        stack: List[Tuple[int, int, Optional[RBNode], bool, int]] = [(0, n - 1, None, False, 0)] if n else []
+        while stack:
+            lo, hi, parent, is_left, depth = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            if depth == bottom and depth > 0:
+                node.color = "R"
+            node.parent = parent
+            if parent is None:
+                model.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if lo < mid:
+                stack.append((lo, mid - 1, node, True, depth + 1))
+            if mid < hi:
+                stack.append((mid + 1, hi, node, False, depth + 1))
+        return model
+
+    def insert(self, val: Any) -> RBNode:
+        """简单插入方法（无步骤记录），返回新节点"""
         if self.root is None:
             self.root = RBNode(val, color="B")
-            return
+            return self.root
         
+        key = int_key(val)
         cur = self.root
         parent = None
+        go_left = False
         while cur:
             parent = cur
-            if self._compare_less(val, cur.val):
-                cur = cur.left
-            else:
-                cur = cur.right
+            go_left = key_less(key, cur.key)
+            cur = cur.left if go_left else cur.right
         
         new_node = RBNode(val, color="R")
         new_node.parent = parent
-        if self._compare_less(val, parent.val):
+        if go_left:
             parent.left = new_node
         else:
             parent.right = new_node
+        _invalidate(parent)
         
         # 修复红黑树性质
         self._insert_fixup(new_node)
+        return new_node
+
+    def insert_many(self, values: Iterable[Any]) -> int:
+        """依次插入多个值（无步骤记录，批量 / 加载时使用），返回插入的个数"""
+        count = 0
+        for val in values:
+            self.insert(val)
+            count += 1
+        return count
     
-    def _insert_fixup(self, node: RBNode):
-        """插入后修复红黑树性质"""
+    def _insert_fixup(self, node: RBNode) -> bool:
+        """插入后修复红黑树性质；根由红变黑 (整棵树的黑高度加 1) 时返回 True"""
         while node is not self.root and node.parent and node.parent.color == "R":
             p = node.parent
             g = p.parent
@@ -135,7 +282,8 @@ class RBModel:
                         if new_subroot.parent is None:
                             if g.parent is None:
                                 self.root = new_subroot
-                        p = node.parent
+                        # 旋转后原来的父节点成为下面的孩子：两者交换角色进入 Case 3
+                        node, p = p, node
                     # Case 3: node 是左孩子
                     p.color = "B"
                     g.color = "R"
@@ -158,7 +306,8 @@ class RBModel:
                         if new_subroot.parent is None:
                             if g.parent is None:
                                 self.root = new_subroot
-                        p = node.parent
+                        # 旋转后原来的父节点成为下面的孩子：两者交换角色进入 Case 3
+                        node, p = p, node
                     p.color = "B"
                     g.color = "R"
                     new_subroot = self._rotate_left(g)
@@ -167,42 +316,145 @@ class RBModel:
                     break
         
         # 确保根节点是黑色
-        if self.root:
+        if self.root and self.root.color == "R":
             self.root.color = "B"
+            return True
+        return False
     
-    def insert_with_steps(self, val: Any) -> Tuple[RBNode, List[RBNode], List[Dict], List[Optional[RBNode]]]:
+    def delete(self, val: Any) -> bool:
+        """简单删除方法（无步骤记录，与 delete_with_steps 的结果相同），返回是否找到"""
+        key = int_key(val)
+        z = self.root
+        while z:
+            if key_less(key, z.key):
+                z = z.left
+            elif key_less(z.key, key):
+                z = z.right
+            else:
+                break
+        if z is None:
+            return False
+
+        y = z
+        if z.left and z.right:
+            y = z.right
+            while y.left:
+                y = y.left
+            z.val, y.val = y.val, z.val
+        x = y.left if y.left else y.right
+        x_parent = y.parent
+        if x:
+            x.parent = x_parent
+        if x_parent is None:
+            self.root = x
+        else:
+            if x_parent.left is y:
+                x_parent.left = x
+            else:
+                x_parent.right = x
+            _invalidate(x_parent)
+
+        if y.color == "B":
+            self._delete_fixup(x, x_parent)
+        if self.root:
+            self.root.color = "B"
+        return True
+
+    def _delete_fixup(self, node: Optional[RBNode], parent: Optional[RBNode]):
+        """删除黑节点后修复红黑树性质；node 可能为 None (NIL)，因此同时传入其父节点"""
+        while node is not self.root and (node is None or node.color == "B"):
+            if parent.left is node:
+                w = parent.right
+                if w.color == "R":
+                    # Case 1: 兄弟是红色
+                    w.color = "B"
+                    parent.color = "R"
+                    if self._rotate_left(parent).parent is None:
+                        self.root = parent.parent
+                    w = parent.right
+                if (w.left is None or w.left.color == "B") and (w.right is None or w.right.color == "B"):
+                    # Case 2: 兄弟的两个孩子都是黑色
+                    w.color = "R"
+                    node, parent = parent, parent.parent
+                    continue
+                if w.right is None or w.right.color == "B":
+                    # Case 3: 兄弟的右孩子是黑色
+                    w.left.color = "B"
+                    w.color = "R"
+                    self._rotate_right(w)
+                    w = parent.right
+                # Case 4: 兄弟的右孩子是红色
+                w.color = parent.color
+                parent.color = "B"
+                w.right.color = "B"
+                if self._rotate_left(parent).parent is None:
+                    self.root = w
+                node = self.root
+            else:
+                w = parent.left
+                if w.color == "R":
+                    w.color = "B"
+                    parent.color = "R"
+                    if self._rotate_right(parent).parent is None:
+                        self.root = parent.parent
+                    w = parent.left
+                if (w.left is None or w.left.color == "B") and (w.right is None or w.right.color == "B"):
+                    w.color = "R"
+                    node, parent = parent, parent.parent
+                    continue
+                if w.left is None or w.left.color == "B":
+                    w.right.color = "B"
+                    w.color = "R"
+                    self._rotate_left(w)
+                    w = parent.left
+                w.color = parent.color
+                parent.color = "B"
+                w.left.color = "B"
+                if self._rotate_right(parent).parent is None:
+                    self.root = w
+                node = self.root
+        if node:
+            node.color = "B"
+
+    def insert_with_steps(self, val: Any) -> Tuple[RBNode, List[RBNode], List[Dict], List[Optional[RBSnapshotNode]]]:
+        """
+        插入并返回步骤信息 (new_node, path_nodes, events, snapshots)。
+        snapshots[0] 为插入前，snapshots[1] 为挂上新节点后，之后每个事件后一个；
+        快照是共享子树的持久化树 (见 snapshot)，每个只新建 O(log n) 个节点。
+        """
         events: List[Dict] = []
         path_nodes: List[RBNode] = []
         snapshots: List[Optional[RBNode]] = []
 
-        snapshots.append(clone_tree(self.root))
+        snapshots.append(self.snapshot())
 
         if self.root is None:
             new_node = RBNode(val, color="B")  # 根节点必须是黑的
             self.root = new_node
             path_nodes.append(new_node)
-            snapshots.append(clone_tree(self.root))
+            snapshots.append(self.snapshot())
             return new_node, path_nodes, events, snapshots
 
+        key = int_key(val)
         cur = self.root
         parent = None
+        go_left = False
         while cur:
             parent = cur
             path_nodes.append(cur)
-            if self._compare_less(val, cur.val):
-                cur = cur.left
-            else:
-                cur = cur.right
+            go_left = key_less(key, cur.key)
+            cur = cur.left if go_left else cur.right
 
         new_node = RBNode(val, color="R")
         new_node.parent = parent
-        if self._compare_less(val, parent.val):
+        if go_left:
             parent.left = new_node
         else:
             parent.right = new_node
+        _invalidate(parent)
         path_nodes.append(new_node)
 
-        snapshots.append(clone_tree(self.root))
+        snapshots.append(self.snapshot())
 
         node = new_node
         while node is not self.root and node.parent and node.parent.color == "R":
@@ -222,7 +474,7 @@ class RBModel:
                         'uncle_id': uncle.id,
                         'grand_id': g.id
                     })
-                    snapshots.append(clone_tree(self.root))
+                    snapshots.append(self.snapshot())
                     node = g
                     continue
                 else:
@@ -238,8 +490,9 @@ class RBModel:
                             'z_id': g.id,
                             'new_root_id': new_subroot.id
                         })
-                        snapshots.append(clone_tree(self.root))
-                        p = node.parent
+                        snapshots.append(self.snapshot())
+                        # 旋转后原来的父节点成为下面的孩子：两者交换角色进入 Case 3
+                        node, p = p, node
                     p.color = "B"
                     g.color = "R"
                     new_subroot = self._rotate_right(g)
@@ -252,7 +505,7 @@ class RBModel:
                         'z_id': node.id,
                         'new_root_id': new_subroot.id
                     })
-                    snapshots.append(clone_tree(self.root))
+                    snapshots.append(self.snapshot())
                     break
             else:
                 # symmetric: parent is right child of grand
@@ -267,7 +520,7 @@ class RBModel:
                         'uncle_id': uncle.id,
                         'grand_id': g.id
                     })
-                    snapshots.append(clone_tree(self.root))
+                    snapshots.append(self.snapshot())
                     node = g
                     continue
                 else:
@@ -284,8 +537,9 @@ class RBModel:
                             'z_id': g.id,
                             'new_root_id': new_subroot.id
                         })
-                        snapshots.append(clone_tree(self.root))
-                        p = node.parent
+                        snapshots.append(self.snapshot())
+                        # 旋转后原来的父节点成为下面的孩子：两者交换角色进入 Case 3
+                        node, p = p, node
                     # recolor and rotate left at grand
                     p.color = "B"
                     g.color = "R"
@@ -299,14 +553,14 @@ class RBModel:
                         'z_id': node.id,
                         'new_root_id': new_subroot.id
                     })
-                    snapshots.append(clone_tree(self.root))
+                    snapshots.append(self.snapshot())
                     break
 
         # ensure root black
         if self.root and self.root.color != "B":
             self.root.color = "B"
             events.append({'type': 'root_recolor', 'node_id': self.root.id})
-            snapshots.append(clone_tree(self.root))
+            snapshots.append(self.snapshot())
 
         return new_node, path_nodes, events, snapshots
 
@@ -319,12 +573,13 @@ class RBModel:
         """
         path_nodes: List[RBNode] = []
         
+        key = int_key(val)
         cur = self.root
         while cur:
             path_nodes.append(cur)
-            if self._compare_less(val, cur.val):
+            if key_less(key, cur.key):
                 cur = cur.left
-            elif self._compare_less(cur.val, val):
+            elif key_less(cur.key, key):
                 cur = cur.right
             else:
                 # 找到了 (val == cur.val)
@@ -333,27 +588,42 @@ class RBModel:
         # 未找到
         return None, path_nodes, False
 
-    def delete_with_steps(self, val: Any) -> Tuple[Optional[RBNode], List[RBNode], List[Dict], List[Optional[RBNode]]]:
+    # ==================== 惰性遍历 / 区间扫描 (沿 parent 指针，无递归) ====================
+
+    def iter_nodes(self) -> Iterator[RBNode]:
+        """按中序惰性产出节点"""
+        return iter_inorder(self.root)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (node.val for node in iter_inorder(self.root))
+
+    def range(self, lo: Any, hi: Any) -> Iterator[Any]:
+        """按中序惰性产出 lo <= 值 <= hi 的值 (按 _compare_less 的顺序)，区间外的子树不会访问"""
+        return (node.val for node in
+                iter_range(self.root, int_key(lo), int_key(hi), compare_keys, attr="key"))
+
+    def delete_with_steps(self, val: Any) -> Tuple[Optional[RBNode], List[RBNode], List[Dict], List[Optional[RBSnapshotNode]]]:
         """
         删除并返回步骤信息：
          - deleted_node: 被删除的节点引用（真实节点，或 None 如果未找到）
          - path_nodes: 查找路径节点列表（用于可视化搜索路径）
          - events: 旋转/重染事件列表，事件为 dict，type 可为 'recolor'|'rotate_left'|'rotate_right' 等
-         - snapshots: 快照列表（clone_tree(root)）: snapshots[0]=删除前, snapshots[1]=删除后(旋转前), 后续为每次事件后的快照
+         - snapshots: 快照列表（snapshot()，共享子树的持久化树）: snapshots[0]=删除前, snapshots[1]=删除后(旋转前), 后续为每次事件后的快照
         """
         events: List[Dict] = []
         path_nodes: List[RBNode] = []
         snapshots: List[Optional[RBNode]] = []
 
-        snapshots.append(clone_tree(self.root))
+        snapshots.append(self.snapshot())
 
         # find node
+        key = int_key(val)
         z = self.root
         while z:
             path_nodes.append(z)
-            if self._compare_less(val, z.val):
+            if key_less(key, z.key):
                 z = z.left
-            elif self._compare_less(z.val, val):
+            elif key_less(z.key, key):
                 z = z.right
             else:
                 break
@@ -389,9 +659,10 @@ class RBModel:
                 x_parent.left = x
             else:
                 x_parent.right = x
+            _invalidate(x_parent)
 
         # record snapshot after physical deletion (before fixups)
-        snapshots.append(clone_tree(self.root))
+        snapshots.append(self.snapshot())
 
         # if removed node was black, need fixup
         if y.color == "B":
@@ -417,7 +688,7 @@ class RBModel:
                         if new_subroot.parent is None:
                             self.root = new_subroot
                         events.append({'type': 'rotate_left', 'x_id': parent.id, 'new_root_id': new_subroot.id})
-                        snapshots.append(clone_tree(self.root))
+                        snapshots.append(self.snapshot())
                         w = parent.right
 
                     # Case 2: sibling's both children black
@@ -425,7 +696,7 @@ class RBModel:
                         if w:
                             w.color = "R"
                             events.append({'type': 'recolor', 'node_id': w.id, 'new_color': 'R'})
-                            snapshots.append(clone_tree(self.root))
+                            snapshots.append(self.snapshot())
                         node = parent
                         parent = node.parent
                     else:
@@ -434,17 +705,17 @@ class RBModel:
                             if w.left:
                                 w.left.color = "B"
                                 events.append({'type': 'recolor', 'node_id': w.left.id, 'new_color': 'B'})
-                                snapshots.append(clone_tree(self.root))
+                                snapshots.append(self.snapshot())
                             if w:
                                 w.color = "R"
                                 events.append({'type': 'recolor', 'node_id': w.id, 'new_color': 'R'})
-                                snapshots.append(clone_tree(self.root))
+                                snapshots.append(self.snapshot())
                             new_subroot = self._rotate_right(w)
                             # rotation at w
                             if new_subroot.parent is None:
                                 self.root = new_subroot
                             events.append({'type': 'rotate_right', 'x_id': w.id, 'new_root_id': new_subroot.id})
-                            snapshots.append(clone_tree(self.root))
+                            snapshots.append(self.snapshot())
                             w = parent.right
 
                         # Case 4: sibling's right child is red
@@ -460,7 +731,7 @@ class RBModel:
                         if new_subroot.parent is None:
                             self.root = new_subroot
                         events.append({'type': 'rotate_left', 'x_id': parent.id, 'new_root_id': new_subroot.id})
-                        snapshots.append(clone_tree(self.root))
+                        snapshots.append(self.snapshot())
                         node = self.root
                         parent = None
                 else:
@@ -475,14 +746,14 @@ class RBModel:
                         if new_subroot.parent is None:
                             self.root = new_subroot
                         events.append({'type': 'rotate_right', 'x_id': parent.id, 'new_root_id': new_subroot.id})
-                        snapshots.append(clone_tree(self.root))
+                        snapshots.append(self.snapshot())
                         w = parent.left
 
                     if node_color(w.left) == "B" and node_color(w.right) == "B":
                         if w:
                             w.color = "R"
                             events.append({'type': 'recolor', 'node_id': w.id, 'new_color': 'R'})
-                            snapshots.append(clone_tree(self.root))
+                            snapshots.append(self.snapshot())
                         node = parent
                         parent = node.parent
                     else:
@@ -490,16 +761,16 @@ class RBModel:
                             if w.right:
                                 w.right.color = "B"
                                 events.append({'type': 'recolor', 'node_id': w.right.id, 'new_color': 'B'})
-                                snapshots.append(clone_tree(self.root))
+                                snapshots.append(self.snapshot())
                             if w:
                                 w.color = "R"
                                 events.append({'type': 'recolor', 'node_id': w.id, 'new_color': 'R'})
-                                snapshots.append(clone_tree(self.root))
+                                snapshots.append(self.snapshot())
                             new_subroot = self._rotate_left(w)
                             if new_subroot.parent is None:
                                 self.root = new_subroot
                             events.append({'type': 'rotate_left', 'x_id': w.id, 'new_root_id': new_subroot.id})
-                            snapshots.append(clone_tree(self.root))
+                            snapshots.append(self.snapshot())
                             w = parent.left
 
                         if w:
@@ -514,7 +785,7 @@ class RBModel:
                         if new_subroot.parent is None:
                             self.root = new_subroot
                         events.append({'type': 'rotate_right', 'x_id': parent.id, 'new_root_id': new_subroot.id})
-                        snapshots.append(clone_tree(self.root))
+                        snapshots.append(self.snapshot())
                         node = self.root
                         parent = None
 
@@ -522,12 +793,246 @@ class RBModel:
             if node:
                 node.color = "B"
                 events.append({'type': 'recolor', 'node_id': node.id, 'new_color': 'B'})
-                snapshots.append(clone_tree(self.root))
+                snapshots.append(self.snapshot())
 
         # ensure root is black
         if self.root and self.root.color != "B":
             self.root.color = "B"
             events.append({'type': 'recolor', 'node_id': self.root.id, 'new_color': 'B'})
-            snapshots.append(clone_tree(self.root))
+            snapshots.append(self.snapshot())
+
+        return y, path_nodes, events, snapshots
+
+    # ==================== join / split 与集合运算 ====================
+    #
+    # 以下方法直接复用并重新连接输入树的节点：参与运算的模型会被清空。
+    # 游离的子树总是先把根染黑，并带着自己的黑高度 bh (从该节点到 NIL 路径上的
+    # 黑节点数，不含 NIL) 一起传递，不必重新计算。_join / _split* 在一个临时模型上
+    # 调用，借用它的 root 作为 _insert_fixup 的工作寄存器。
+    # 重新连接时对改动了孩子的节点调用 _invalidate，快照缓存保持正确。
+
+    @staticmethod
+    def _black_height(node: Optional[RBNode]) -> int:
+        bh = 0
+        while node is not None:
+            if node.color == "B":
+                bh += 1
+            node = node.left
+        return bh
+
+    def _detach(self, node: RBNode, bh: int) -> Tuple[Optional[RBNode], int, Optional[RBNode], int]:
+        """
+        把黑色的游离根 node (黑高度 bh) 的两棵子树拆成独立的树 (根染黑)，node 成为单个节点；
+        返回 (left, left 的黑高度, right, right 的黑高度)
+        """
+        out: List[Any] = []
+        for child in (node.left, node.right):
+            child_bh = bh - 1
+            if child is not None:
+                child.parent = None
+                if child.color == "R":
+                    child.color = "B"
+                    child_bh += 1
+            out += [child, child_bh]
+        node.left = node.right = None
+        return out[0], out[1], out[2], out[3]
+
+    def _join(self, left: Optional[RBNode], bhl: int, mid: RBNode, right: Optional[RBNode], bhr: int,
+              spine: Optional[List[RBNode]] = None) -> Tuple[RBNode, int]:
+        """
+        连接 left 中的键 <= mid <= right 中的键 (两棵树的根为黑色或为空)，返回 (新根, 黑高度)。
+        黑高度相同时 mid 作为黑色的根；否则沿较高那棵树的脊 (右脊或左脊) 下降到黑高度
+        与较矮的树相同的黑节点 c，用红色的 mid 连接 c 和较矮的树并放回 c 的位置，
+        再按插入的方式修复可能出现的红-红冲突。O(|bhl - bhr| + 1)。
+        spine 不为 None 时追加下降经过的节点。
+        """
+        mid._snap = None
+        mid.parent = None
+        if bhl == bhr:
+            mid.left, mid.right = left, right
+            for child in (left, right):
+                if child is not None:
+                    child.parent = mid
+            mid.color = "B"
+            return mid, bhl + 1
+
+        if bhl > bhr:
+            tall, short, target, outer = left, right, bhr, "right"
+        else:
+            tall, short, target, outer = right, left, bhl, "left"
+        parent, c, bh = None, tall, max(bhl, bhr)
+        while c is not None and not (c.color == "B" and bh == target):
+            if spine is not None:
+                spine.append(c)
+            if c.color == "B":
+                bh -= 1
+            parent, c = c, getattr(c, outer)
+        if outer == "right":
+            mid.left, mid.right = c, short
+        else:
+            mid.left, mid.right = short, c
+        for child in (c, short):
+            if child is not None:
+                child.parent = mid
+        mid.color = "R"
+        mid.parent = parent
+        setattr(parent, outer, mid)
+        _invalidate(parent)
+
+        self.root = tall
+        grew = self._insert_fixup(mid) if parent.color == "R" else False
+        return self.root, max(bhl, bhr) + (1 if grew else 0)
+
+    def _split(self, node: Optional[RBNode], bh: int, key) -> Tuple[Optional[RBNode], int, Optional[RBNode], int]:
+        """拆成 (键 < key 的树, 黑高度, 键 >= key 的树, 黑高度)，O(log n)"""
+        if node is None:
+            return None, 0, None, 0
+        left, bl, right, br = self._detach(node, bh)
+        if key_less(node.key, key):
+            lo, blo, hi, bhi = self._split(right, br, key)
+            lo, blo = self._join(left, bl, node, lo, blo)
+            return lo, blo, hi, bhi
+        lo, blo, hi, bhi = self._split(left, bl, key)
+        hi, bhi = self._join(hi, bhi, node, right, br)
+        return lo, blo, hi, bhi
+
+    def _split3(self, node: Optional[RBNode], bh: int, key) -> Tuple[Optional[RBNode], int, Optional[RBNode], Optional[RBNode], int]:
+        """
+        拆成 (键 < key 的树, 黑高度, 一个等于 key 的节点或 None, 键 > key 的树, 黑高度)，O(log n)。
+        其余等于 key 的重复节点被丢弃 (集合运算使用)。
+        """
+        if node is None:
+            return None, 0, None, None, 0
+        left, bl, right, br = self._detach(node, bh)
+        if key_less(key, node.key):
+            lo, blo, found, hi, bhi = self._split3(left, bl, key)
+            hi, bhi = self._join(hi, bhi, node, right, br)
+            return lo, blo, found, hi, bhi
+        if key_less(node.key, key):
+            lo, blo, found, hi, bhi = self._split3(right, br, key)
+            lo, blo = self._join(left, bl, node, lo, blo)
+            return lo, blo, found, hi, bhi
+        # 重复的键可能在左子树的右端或右子树的左端
+        lo, blo = self._split3(left, bl, key)[:2]
+        hi, bhi = self._split3(right, br, key)[3:]
+        return lo, blo, node, hi, bhi
+
+    def _split_last(self, node: RBNode, bh: int) -> Tuple[Optional[RBNode], int, RBNode]:
+        """拆下最大的节点：返回 (其余节点组成的树, 黑高度, 最大节点)"""
+        left, bl, right, br = self._detach(node, bh)
+        if right is None:
+            return left, bl, node
+        rest, brest, last = self._split_last(right, br)
+        rest, brest = self._join(left, bl, node, rest, brest)
+        return rest, brest, last
+
+    def _join2(self, left: Optional[RBNode], bhl: int, right: Optional[RBNode], bhr: int) -> Tuple[Optional[RBNode], int]:
+        """连接 left 中的键 <= right 中的键 (没有中间键)"""
+        if left is None:
+            return right, bhr
+        rest, brest, last = self._split_last(left, bhl)
+        return self._join(rest, brest, last, right, bhr)
+
+    def _union(self, a, ba: int, b, bb: int) -> Tuple[Optional[RBNode], int]:
+        if a is None:
+            return b, bb
+        if b is None:
+            return a, ba
+        left, bl, right, br = self._detach(b, bb)
+        lo, blo, _, hi, bhi = self._split3(a, ba, b.key)
+        lo, blo = self._union(lo, blo, left, bl)
+        hi, bhi = self._union(hi, bhi, right, br)
+        return self._join(lo, blo, b, hi, bhi)
+
+    def _intersection(self, a, ba: int, b, bb: int) -> Tuple[Optional[RBNode], int]:
+        if a is None or b is None:
+            return None, 0
+        left, bl, right, br = self._detach(b, bb)
+        lo, blo, found, hi, bhi = self._split3(a, ba, b.key)
+        lo, blo = self._intersection(lo, blo, left, bl)
+        hi, bhi = self._intersection(hi, bhi, right, br)
+        if found is not None:
+            return self._join(lo, blo, found, hi, bhi)
+        return self._join2(lo, blo, hi, bhi)
+
+    def _difference(self, a, ba: int, b, bb: int) -> Tuple[Optional[RBNode], int]:
+        if a is None or b is None:
+            return a, ba
+        left, bl, right, br = self._detach(b, bb)
+        lo, blo, _, hi, bhi = self._split3(a, ba, b.key)
+        lo, blo = self._difference(lo, blo, left, bl)
+        hi, bhi = self._difference(hi, bhi, right, br)
+        return self._join2(lo, blo, hi, bhi)
+
+    @classmethod
+    def _take_root(cls, tree: 'RBModel') -> Tuple[Optional[RBNode], int]:
+        """取出 tree 的根 (黑色) 及其黑高度，并清空 tree"""
+        root, tree.root = tree.root, None
+        return root, cls._black_height(root)
+
+    @classmethod
+    def _wrap(cls, root: Optional[RBNode]) -> 'RBModel':
+        model = cls()
+        if root is not None:
+            root.parent = None
+            root.color = "B"
+        model.root = root
+        return model
+
+    @classmethod
+    def join(cls, t1: 'RBModel', val: Any, t2: 'RBModel',
+             events: Optional[List[Dict]] = None) -> 'RBModel':
+        """
+        连接：t1 的所有键 <= val <= t2 的所有键，返回包含三者的新红黑树，O(log n)。
+        t1、t2 被清空。events 不为 None 时追加一个 'join_spine' 事件
+        (下降经过的脊节点、新节点、挂接处父节点的 id)，供动画使用。
+
+        Raises:
+            ValueError: 键的顺序不满足要求
+        """
+        mid = RBNode(val)
+        for tree, outer, wrong in ((t1, "right", lambda a, b: key_less(b, a)),
+                                   (t2, "left", key_less)):
+            node = tree.root
+            while node is not None and getattr(node, outer) is not None:
+                node = getattr(node, outer)
+            if node is not None and wrong(node.key, mid.key):
+                raise ValueError(f"join: {node.val!r} on the wrong side of {val!r}")
+        work = cls()
+        spine: Optional[List[RBNode]] = [] if events is not None else None
+        (left, bhl), (right, bhr) = cls._take_root(t1), cls._take_root(t2)
+        root, _ = work._join(left, bhl, mid, right, bhr, spine)
+        if events is not None:
+            side = "root" if not spine else ("right" if spine[0] is left else "left")
+            events.append({'type': 'join_spine', 'side': side,
+                           'spine_ids': [n.id for n in spine], 'mid_id': mid.id,
+                           'attach_id': spine[-1].id if spine else None})
+        return cls._wrap(root)
+
+    def split(self, val: Any) -> Tuple['RBModel', 'RBModel']:
+        """拆分：返回 (键 < val 的树, 键 >= val 的树)，O(log n)；本树被清空"""
+        work = type(self)()
+        root, bh = self._take_root(self)
+        left, _, right, _ = work._split(root, bh, int_key(val))
+        return self._wrap(left), self._wrap(right)
+
+    @classmethod
+    def union(cls, t1: 'RBModel', t2: 'RBModel') -> 'RBModel':
+        """
+        并集，O(m log(n/m + 1)) (m <= n 为两树大小)；两棵树中相等的键只保留一个 (取 t2 的节点)。
+        t1、t2 被清空。
+        """
+        work = cls()
+        return cls._wrap(work._union(*cls._take_root(t1), *cls._take_root(t2))[0])
+
+    @classmethod
+    def intersection(cls, t1: 'RBModel', t2: 'RBModel') -> 'RBModel':
+        """交集 (保留 t1 的节点)，O(m log(n/m + 1))；t1、t2 被清空"""
+        work = cls()
+        return cls._wrap(work._intersection(*cls._take_root(t1), *cls._take_root(t2))[0])
 
-        return y, path_nodes, events, snapshots
\ No newline at end of file
+    @classmethod
+    def difference(cls, t1: 'RBModel', t2: 'RBModel') -> 'RBModel':
+        """差集 t1 - t2，O(m log(n/m + 1))；t1、t2 被清空"""
+        work = cls()
+        return cls._wrap(work._difference(*cls._take_root(t1), *cls._take_root(t2))[0])
@@ -2,7 +2,9 @@ from tkinter import *
 from tkinter import ttk
 from tkinter import messagebox, filedialog
 from typing import Dict, Tuple, List, Optional
-from rbt.rbt_model import RBModel, RBNode, clone_tree
+from rbt.rbt_model import RBModel, RBNode, RBSnapshotNode
+from binary_tree.tree_iter import iter_inorder_stack
+from binary_tree.tidy_layout import TidyLayout, fit_positions
 import storage as storage
 from DSL_utils import process_command 
 import time
@@ -819,6 +821,9 @@ class RBTVisualizer:
         self.node_h = 40
         self.level_gap = 85
         self.margin_x = 40
+        self.layout_unit = self.node_w + 20  # 同层相邻节点中心的最大间距
+        # 持久化快照在版本间共享未改变的子树：按节点对象缓存形状，只重新计算改动过的路径
+        self.tidy = TidyLayout()
         
         # 临时动画对象存储
         self.temp_objects = []
@@ -1156,19 +1161,19 @@ class RBTVisualizer:
         """切换NIL节点显示"""
         self.show_nil_nodes = bool(self.nil_var.get())
         if self.model.root:
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
     
     def _toggle_parent_links(self):
         """切换父指针显示"""
         self.show_parent_links = bool(self.parent_var.get())
         if self.model.root:
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
     
     def _toggle_black_height(self):
         """切换黑高度显示"""
         self.show_black_height = bool(self.bh_var.get())
         if self.model.root:
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
     
     def update_operation_info(self, text: str):
         """更新操作说明面板"""
@@ -1667,7 +1672,7 @@ class RBTVisualizer:
             return
         
         # 找到被删除节点的可视化键
-        snap_before = clone_tree(self.model.root) if self.model.root else None
+        snap_before = self.model.snapshot()
         if not snap_before:
             on_complete()
             return
@@ -1747,7 +1752,7 @@ class RBTVisualizer:
         """删除后的修复事件处理"""
         if not events or len(snapshots) <= 2:
             # 没有修复事件,直接完成
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self.animating = False
             self.update_status(f"完成删除: {val}")
             self.update_operation_info(f"✅ 节点 {val} 删除完成（无需修复）")
@@ -1761,7 +1766,7 @@ class RBTVisualizer:
         self.update_operation_info(f"⚠️ 删除了黑色节点 {val}，需要修复红黑树性质")
         
         def done_all():
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self.animating = False
             self.update_status(f"完成删除并修复平衡: {val}")
             self.update_operation_info(f"✅ 节点 {val} 删除完成，树已重新平衡")
@@ -1870,7 +1875,7 @@ class RBTVisualizer:
         found_node, path_nodes, found = self.model.search_with_steps(val)
         
         # 获取当前树的快照用于可视化
-        snap = clone_tree(self.model.root)
+        snap = self.model.snapshot()
         pos = self.compute_positions_for_root(snap)
         
         # 建立 val -> key 映射
@@ -2050,7 +2055,7 @@ class RBTVisualizer:
     def _after_insert_events_single(self, events, snapshots, val):
         """单节点插入后的事件处理"""
         if not events:
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self.animating = False
             self.update_status(f"完成单节点插入: {val}")
             self.update_operation_info(f"✅ 节点 {val} 插入完成（无需修复）")
@@ -2064,7 +2069,7 @@ class RBTVisualizer:
         self.update_operation_info(f"⚠️ 插入红色节点 {val} 后需要修复性质4")
         
         def done_all():
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self.animating = False
             self.update_status(f"完成单节点插入: {val}")
             self.update_operation_info(f"✅ 节点 {val} 插入完成，树已重新平衡")
@@ -2087,42 +2092,22 @@ class RBTVisualizer:
         return line
 
     def compute_positions_for_root(self, root: Optional[RBNode]) -> Dict[str, Tuple[float, float]]:
-        """计算节点位置"""
+        """计算节点位置 (整洁布局，见 binary_tree.tidy_layout)"""
         res: Dict[str, Tuple[float,float]] = {}
         if not root:
             return res
 
-        inorder_nodes: List[RBNode] = []
-        depths: Dict[RBNode, int] = {}
-        
-        def inorder(n: Optional[RBNode], d: int):
-            if not n:
-                return
-            inorder(n.left, d+1)
-            inorder_nodes.append(n)
-            depths[n] = d
-            inorder(n.right, d+1)
-            
-        inorder(root, 0)
-        n = len(inorder_nodes)
-        if n == 0:
-            return res
-            
-        width = max(200, self.canvas_w - 2*self.margin_x)
+        layout = self.tidy.layout(root)
+        pos = fit_positions(layout, self.margin_x, self.canvas_w - self.margin_x,
+                            80, self.level_gap, self.layout_unit)
         counts: Dict[str,int] = {}
         
-        for i, node in enumerate(inorder_nodes):
+        for node in iter_inorder_stack(root):
             base = str(node.val)
             cnt = counts.get(base, 0)
             counts[base] = cnt + 1
             key = f"{base}#{cnt}" if cnt > 0 else base
-            
-            if n == 1:
-                x = self.canvas_w/2
-            else:
-                x = self.margin_x + i * (width / (n-1))
-            y = 80 + depths[node] * self.level_gap
-            res[key] = (x, y)
+            res[key] = pos[node]
             
         return res
 
@@ -2133,17 +2118,8 @@ class RBTVisualizer:
         if not root:
             return orig_id_to_key, key_to_node
 
-        inorder_nodes: List[RBNode] = []
-        def inorder_collect(n: Optional[RBNode]):
-            if not n:
-                return
-            inorder_collect(n.left)
-            inorder_nodes.append(n)
-            inorder_collect(n.right)
-        inorder_collect(root)
-
         counts: Dict[str,int] = {}
-        for node in inorder_nodes:
+        for node in iter_inorder_stack(root):
             base = str(node.val)
             cnt = counts.get(base, 0)
             counts[base] = cnt + 1
@@ -2170,18 +2146,9 @@ class RBTVisualizer:
 
         pos = self.compute_positions_for_root(root)
 
-        inorder_nodes: List[RBNode] = []
-        def inorder_collect(n: Optional[RBNode]):
-            if not n:
-                return
-            inorder_collect(n.left)
-            inorder_nodes.append(n)
-            inorder_collect(n.right)
-        inorder_collect(root)
-
         node_to_key: Dict[RBNode, str] = {}
         counts: Dict[str,int] = {}
-        for node in inorder_nodes:
+        for node in iter_inorder_stack(root):
             base = str(node.val)
             cnt = counts.get(base, 0)
             counts[base] = cnt + 1
@@ -2246,13 +2213,18 @@ class RBTVisualizer:
         self.canvas.create_line(cx, top, tx, ty - 8, 
                                width=1, fill="#B0BEC5", dash=(3, 3))
     
-    def _draw_parent_links(self, root: RBNode, node_to_key: Dict, pos: Dict):
-        """绘制父指针（虚线向上指向父节点）"""
-        def draw_parent_link(n: Optional[RBNode]):
-            if not n or not n.parent:
+    def _draw_parent_links(self, root: RBSnapshotNode, node_to_key: Dict, pos: Dict):
+        """绘制父指针（虚线向上指向父节点）
+        快照节点在版本间共享、没有 parent 指针，父节点在向下递归时传入"""
+        def draw_parent_link(n: Optional[RBSnapshotNode], parent: Optional[RBSnapshotNode] = None):
+            if not n:
+                return
+            if not parent:
+                draw_parent_link(n.left, n)
+                draw_parent_link(n.right, n)
                 return
             k = node_to_key.get(n)
-            pk = node_to_key.get(n.parent)
+            pk = node_to_key.get(parent)
             if k and pk and k in pos and pk in pos:
                 cx, cy = pos[k]
                 px, py = pos[pk]
@@ -2270,8 +2242,8 @@ class RBTVisualizer:
                                           px + offset, py + self.node_h/2 + 3,
                                           fill=self.colors["parent_link"], width=1, 
                                           dash=(2, 2), arrow=LAST, arrowshape=(6, 8, 4))
-            draw_parent_link(n.left)
-            draw_parent_link(n.right)
+            draw_parent_link(n.left, n)
+            draw_parent_link(n.right, n)
         draw_parent_link(root)
     
     def _calc_black_height(self, node: Optional[RBNode]) -> int:
@@ -2364,10 +2336,9 @@ class RBTVisualizer:
             return
             
         values = [p.strip() for p in self.input_var.get().split(",") if p.strip()]
-        for val in values:
-            self.model.insert(val)
+        self.model.insert_many(values)
             
-        self.draw_tree_from_root(clone_tree(self.model.root))
+        self.draw_tree_from_root(self.model.snapshot())
         self.update_status(f"已直接插入节点: {', '.join(values)}")
 
     def validate_input(self):
@@ -2388,11 +2359,8 @@ class RBTVisualizer:
         return True
     
     def _compare_values(self, val1, val2):
-        """比较两个值的大小(按整数比较)"""
-        try:
-            return int(val1) < int(val2)
-        except (ValueError, TypeError):
-            return str(val1) < str(val2)
+        """比较两个值的大小(按整数比较)，与模型的 _compare_less 一致"""
+        return self.model._compare_less(val1, val2)
 
     def _insert_seq(self, idx: int):
         """插入序列"""
@@ -2697,7 +2665,7 @@ class RBTVisualizer:
     def _after_insert_events(self, events, snapshots, insertion_idx):
         """插入后的事件处理"""
         if not events:
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self._show_pseudocode_for_operation('insert', 20, "插入完成，调用修复函数")
             self.window.after(max(100, self.animation_speed), lambda: self._insert_seq(insertion_idx+1))
             return
@@ -2706,7 +2674,7 @@ class RBTVisualizer:
         self._show_pseudocode_for_operation('insert_fixup', 0, "开始修复红黑树性质")
 
         def done_all():
-            self.draw_tree_from_root(clone_tree(self.model.root))
+            self.draw_tree_from_root(self.model.snapshot())
             self.update_status(f"完成插入: {self.batch[insertion_idx]}")
             # 高亮根节点变黑
             self._show_pseudocode_for_operation('insert_fixup', 31, "确保根节点为黑色")
@@ -2756,11 +2724,18 @@ class RBTVisualizer:
             messagebox.showinfo("提示", "没有找到保存的树结构文件")
             return
             
-        from rbt.rbt_model import RBNode as RBNodeClass
-        newroot = storage.tree_dict_to_nodes(tree_dict, RBNodeClass)
-        self.model.root = newroot
+        if all("color" in item for item in tree_dict.get("nodes", [])):
+            self.model.root = storage.tree_dict_to_nodes(tree_dict, RBNode)
+        else:
+            # 旧文件没有保存颜色，不能直接恢复结构：按中序取出值 O(n) 重建；
+            # 中序不是有序的 (按本模型的比较规则) 时，按先序无动画地逐个插入
+            try:
+                self.model = RBModel.from_sorted(storage.tree_dict_values(tree_dict, inorder=True))
+            except ValueError:
+                self.model = RBModel()
+                self.model.insert_many(storage.tree_dict_values(tree_dict))
         self.showing_welcome = False  # 加载结构后不显示欢迎文字
-        self.draw_tree_from_root(clone_tree(self.model.root))
+        self.draw_tree_from_root(self.model.snapshot())
         self.update_status("已从文件加载红黑树结构")
 
     # ===== 新增的动画效果方法 =====
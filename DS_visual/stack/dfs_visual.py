@@ -15,8 +15,12 @@ import math
 import time
 from typing import List, Tuple, Optional, Any, Dict, Set
 
-from stack.graph_model import DirectedGraph, generate_random_graph, generate_dfs_friendly_graph, dfs_traversal
+from graph.directed_graph import DirectedGraph
+from graph.demo_graphs import generate_random_graph, generate_dfs_friendly_graph
+from graph.traversal import dfs_traversal, topological_sort_traversal, tarjan_scc_traversal
 from stack.stack_model import StackModel
+from graph.force_layout import ForceLayout
+from graph.layered_layout import layered_layout
 
 
 # ========== 动画配置 ==========
@@ -211,6 +215,14 @@ class DFSVisualizer:
         self.highlighted_line = -1
         self.edge_items: Dict[Tuple[Any, Any], int] = {}
         
+        # 力导向布局 (after() 分片推进)
+        self.force_layout: Optional[ForceLayout] = None
+        self.layout_job: Optional[str] = None
+        self.layout_iterations_per_tick = 4
+        
+        # 拓扑排序 / 强连通分量的结果摘要 (done 步骤显示)
+        self.algorithm_summary: Optional[str] = None
+        
         self._create_ui()
         self._generate_graph()
     
@@ -596,6 +608,20 @@ class DFSVisualizer:
         self.speed_scale.pack(side=LEFT)
         
         self._create_button(row1, "关闭", "#95A5A6", self.window.destroy).pack(side=RIGHT, padx=3)
+        self.layout_btn = self._create_button(row1, "🧲 力导向布局", "#16A085", self._start_force_layout)
+        self.layout_btn.pack(side=RIGHT, padx=3)
+        self.layered_btn = self._create_button(row1, "📐 分层布局", "#8E44AD", self._apply_layered_layout)
+        self.layered_btn.pack(side=RIGHT, padx=3)
+        
+        row2 = Frame(control, bg="#FFFFFF")
+        row2.pack(fill=X, padx=15, pady=(0, 8))
+        
+        Label(row2, text="DFS应用:", font=("Microsoft YaHei", 10),
+              bg="#FFFFFF", fg="#2C3E50").pack(side=LEFT, padx=(3, 3))
+        self.topo_btn = self._create_button(row2, "📑 拓扑排序", "#2980B9", self._start_topological_sort)
+        self.topo_btn.pack(side=LEFT, padx=3)
+        self.scc_btn = self._create_button(row2, "🧩 强连通分量", "#D35400", self._start_scc)
+        self.scc_btn.pack(side=LEFT, padx=3)
     
     def _create_button(self, parent, text, color, command):
         btn = Button(parent, text=text, font=("Microsoft YaHei", 9),
@@ -671,8 +697,7 @@ class DFSVisualizer:
             self.start_vertex_var.set(self.graph.get_vertices()[0])
         
         self._reset_dfs()
-        self._draw_graph()
-        self._draw_stack()
+        self._apply_layered_layout()
         
         # 显示图的结构信息
         edge_info = []
@@ -696,12 +721,9 @@ class DFSVisualizer:
         if not self.graph:
             return
         
-        cx, cy, r = 240, 190, 140
         vertices = self.graph.get_vertices()
-        
-        for i, v in enumerate(vertices):
-            angle = 2 * math.pi * i / len(vertices) - math.pi / 2
-            self.graph.set_position(v, cx + r * math.cos(angle), cy + r * math.sin(angle))
+        if any(self.graph.get_position(v) is None for v in vertices):
+            self._apply_circle_layout()
         
         # 绘制边
         for u, v in self.graph.get_edges():
@@ -718,6 +740,48 @@ class DFSVisualizer:
                     color = self.colors["vertex_default"]
                 self._draw_vertex(v, pos[0], pos[1], color)
     
+    def _apply_circle_layout(self):
+        """环形初始布局"""
+        cx, cy, r = 240, 190, 140
+        vertices = self.graph.get_vertices()
+        for i, v in enumerate(vertices):
+            angle = 2 * math.pi * i / len(vertices) - math.pi / 2
+            self.graph.set_position(v, cx + r * math.cos(angle), cy + r * math.sin(angle))
+    
+    def _apply_layered_layout(self):
+        """分层布局 (DFS 树 / DAG 的默认布局)，图未修改时直接使用缓存结果"""
+        if not self.graph or self.animating:
+            return
+        self._stop_force_layout()
+        layered_layout(self.graph, width=480, height=380, margin=40)
+        self._draw_graph()
+    
+    def _start_force_layout(self):
+        """从当前位置开始力导向布局，每次 after() 只推进几轮，图在界面上逐渐稳定"""
+        if not self.graph or self.animating:
+            return
+        self._stop_force_layout()
+        self.force_layout = ForceLayout(self.graph, width=480, height=380, margin=40, seed=0)
+        self._force_layout_tick()
+    
+    def _force_layout_tick(self):
+        self.layout_job = None
+        layout = self.force_layout
+        if layout is None or layout.graph is not self.graph:
+            return
+        layout.step(self.layout_iterations_per_tick)
+        self._draw_graph()
+        if layout.done:
+            self.force_layout = None
+            return
+        self.layout_job = self.window.after(30, self._force_layout_tick)
+    
+    def _stop_force_layout(self):
+        if self.layout_job is not None:
+            self.window.after_cancel(self.layout_job)
+            self.layout_job = None
+        self.force_layout = None
+    
     def _draw_vertex(self, label, x, y, color, is_current=False):
         r = 26
         outline = "#9B59B6" if is_current else "#2C3E50"
@@ -858,6 +922,25 @@ class DFSVisualizer:
         self._set_buttons_state()
         self._animate_step()
     
+    def _start_algorithm(self, steps: List[Tuple[str, Any, Any]]):
+        """播放整图算法 (拓扑排序 / 强连通分量) 的步骤"""
+        if not self.graph:
+            messagebox.showwarning("提示", "请先生成图")
+            return
+        if self.animating:
+            return
+        self._reset_dfs()
+        self.dfs_steps = steps
+        self.animating = True
+        self._set_buttons_state()
+        self._animate_step()
+    
+    def _start_topological_sort(self):
+        self._start_algorithm(topological_sort_traversal(self.graph) if self.graph else [])
+    
+    def _start_scc(self):
+        self._start_algorithm(tarjan_scc_traversal(self.graph) if self.graph else [])
+    
     def _generate_dfs_steps(self, start):
         """生成DFS步骤"""
         self.dfs_steps = []
@@ -896,7 +979,7 @@ class DFSVisualizer:
                         unvisited_neighbors.append(nb)
                         self.dfs_steps.append(("will_push", nb, depth + 1))
                     else:
-                        self.dfs_steps.append(("skip", nb, None))
+                        self.dfs_steps.append(("skip", nb, current))
                 
                 # 逆序入栈（保证按顺序访问）
                 for nb in reversed(unvisited_neighbors):
@@ -948,6 +1031,7 @@ class DFSVisualizer:
     
     def _reset_dfs(self):
         self.animating = False
+        self._stop_force_layout()
         self.paused = False
         self.dfs_steps = []
         self.current_step = 0
@@ -961,6 +1045,7 @@ class DFSVisualizer:
         self.dfs_path = []
         self.visual_stack = []
         self.highlighted_line = -1
+        self.algorithm_summary = None
         
         self._render_pseudocode()
         self._draw_graph()
@@ -980,6 +1065,8 @@ class DFSVisualizer:
         self.gen_btn.config(state=state)
         self.dfs_btn.config(state=state)
         self.step_btn.config(state=state)
+        self.topo_btn.config(state=state)
+        self.scc_btn.config(state=state)
     
     def _animate_step(self):
         if not self.animating:
@@ -1140,9 +1227,9 @@ class DFSVisualizer:
             self._animate_vertex_glow(v, get_depth_color(depth), 0.8)
         
         elif action == "skip":
-            v = d1
-            if self.current_vertex:
-                self._draw_edge(self.current_vertex, v, self.colors["edge_traversed"], 2)
+            v, u = d1, d2  # 被跳过的边 u -> v
+            if u is not None:
+                self._draw_edge(u, v, self.colors["edge_traversed"], 2)
             
             self._highlight_line(14, f"跳过{v}(已访问)")
             self.action_label.config(
@@ -1170,6 +1257,50 @@ class DFSVisualizer:
                      f"• 下一个: {to_v} (深度{to_depth})\n"
                      f"• 遇到死胡同，尝试其他分支")
         
+        elif action == "finish":
+            v, k = d1, d2
+            self._animate_vertex_glow(v, "#2ECC71", 1.0)
+            self.action_label.config(
+                text=f"🏁 {v} 完成 (第{k}个完成)\n\n"
+                     f"• 所有后继都已处理\n"
+                     f"• 逆后序即拓扑序")
+        
+        elif action == "cycle":
+            u, v = d1, d2
+            self._draw_edge(u, v, "#E74C3C", 4)
+            self.algorithm_summary = f"❌ 发现回边 {u} → {v}\n图中存在环，无法拓扑排序"
+            self.action_label.config(text=self.algorithm_summary)
+        
+        elif action == "topo_order":
+            order = " → ".join(str(x) for x in d1)
+            self.result_label.config(text=order)
+            self.algorithm_summary = f"📑 拓扑排序完成!\n\n拓扑序:\n{order}"
+            self.action_label.config(text=self.algorithm_summary)
+        
+        elif action == "lowlink":
+            v, low = d1, d2
+            self.action_label.config(
+                text=f"🔻 更新 low[{v}] = {low}\n\n"
+                     f"• 经由栈中顶点可回到更早的祖先")
+        
+        elif action == "scc":
+            component, k = d1, d2
+            color = get_depth_color(k)
+            for v in component:
+                self._update_vertex(v, color)
+            names = ", ".join(str(v) for v in component)
+            self.path_label.config(text=f"SCC{k}: {{{names}}}")
+            self.algorithm_summary = (self.algorithm_summary or "🧩 强连通分量:\n") + f"• SCC{k}: {{{names}}}\n"
+            self.action_label.config(
+                text=f"🧩 找到强连通分量 #{k}\n\n{{{names}}}\n\n"
+                     f"• low == index，弹出 Tarjan 栈直到该顶点")
+        
+        elif action == "done" and self.algorithm_summary:
+            self.animating = False
+            self._set_buttons_state()
+            self._highlight_line(18, "✅ 完成!")
+            self.action_label.config(text=self.algorithm_summary)
+        
         elif action == "done":
             self.animating = False
             self._update_depth_progress()
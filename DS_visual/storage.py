@@ -37,6 +37,8 @@ def tree_to_dict(root) -> Dict[str, Any]:
         }
         if hasattr(node, "height"):
             node_dict["height"] = getattr(node, "height")
+        if hasattr(node, "color"):
+            node_dict["color"] = getattr(node, "color")
         nodes.append(node_dict)
         return nid
 
@@ -131,6 +133,9 @@ def tree_dict_to_nodes(tree_dict, NodeClass):
                 node.height = item.get("height")
             except Exception:
                 pass
+        # 红黑树节点的颜色
+        if "color" in item and hasattr(node, "color"):
+            node.color = item.get("color")
         id_to_obj[nid] = node
     # second pass: wire children and parents
     for item in nodes:
@@ -147,6 +152,36 @@ def tree_dict_to_nodes(tree_dict, NodeClass):
     root_id = tree_dict.get("root")
     return id_to_obj.get(root_id)
 
+def tree_dict_values(tree_dict, inorder: bool = False) -> List[Any]:
+    """
+    tree_dict 中的值，默认按先序 (根先于子树) 排列，inorder 为 True 时按中序 (搜索树即有序)。
+    用于文件缺少平衡信息 (AVL 的 height / 红黑树的 color) 时重建树
+    (from_sorted 或逐个 insert_many)。
+    """
+    if not tree_dict or not tree_dict.get("nodes"):
+        return []
+    nodes = tree_dict["nodes"]
+    by_id = {item["id"]: item for item in nodes}
+    values = []
+    # 栈中的 (节点 id, 子树是否已展开)；中序时节点在左子树之后输出
+    stack = [(tree_dict.get("root"), False)]
+    while stack:
+        nid, expanded = stack.pop()
+        item = by_id.get(nid)
+        if item is None:
+            continue
+        if expanded or not inorder:
+            values.append(item.get("val"))
+            if expanded:
+                continue
+            stack.append((item.get("right"), False))
+            stack.append((item.get("left"), False))
+        else:
+            stack.append((item.get("right"), False))
+            stack.append((nid, True))
+            stack.append((item.get("left"), False))
+    return values
+
 def _ensure_default_folder():
     """确保默认保存/打开目录存在，返回绝对路径"""
     base_dir = os.path.dirname(os.path.abspath(__file__))  # storage.py 所在目录
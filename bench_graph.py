@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+图模型基准测试 (不属于单元测试，需手动运行)
+
+    python bench_graph.py            # 默认 10^6 条边
+    python bench_graph.py --edges 200000
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DS_visual"))
+
+from graph.directed_graph import DirectedGraph
+from graph.traversal import (iter_dfs, iter_bfs, dfs_traversal, topological_sort,
+                             strongly_connected_components, kosaraju_scc)
+from circular_queue.graph_model import bfs_traversal
+from graph import csr_graph
+from graph.generators import erdos_renyi, barabasi_albert, grid_graph, tree_graph
+from graph.parallel_bfs import parallel_bfs_layers
+from graph.force_layout import ForceLayout
+from graph.layered_layout import layered_layout
+from graph.shortest_path import dijkstra, astar
+from graph import graph_io
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _measure(build):
+    """返回 (build 的结果, 构建耗时, 峰值内存 MB)；开启 tracemalloc 时耗时会偏大"""
+    tracemalloc.start()
+    result, elapsed = _timed(build)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def _edge_probability(num_vertices: int, num_edges: int) -> float:
+    return num_edges / (num_vertices * (num_vertices - 1))
+
+
+def bench_csr(num_edges: int):
+    """对比 DirectedGraph 与冻结后的 CSR 图的内存与遍历耗时"""
+    num_vertices = max(2, num_edges // 8)
+    p = _edge_probability(num_vertices, num_edges)
+
+    graph, t_graph, mem_graph = _measure(lambda: erdos_renyi(num_vertices, p, seed=42, graph=DirectedGraph()))
+    csr, t_csr, mem_csr = _measure(graph.freeze)
+
+    print(f"== CSR vs DirectedGraph  (V={graph.vertex_count()}, E={graph.edge_count()}) ==")
+    print(f"build   DirectedGraph {t_graph:7.2f}s  {mem_graph:8.1f} MB")
+    print(f"freeze  CSRGraph      {t_csr:7.2f}s  {mem_csr:8.1f} MB  (arrays {csr.nbytes() / 1e6:.1f} MB)")
+
+    _, t = _timed(dfs_traversal, graph, 0)
+    print(f"dfs_traversal  DirectedGraph {t:7.2f}s")
+    _, t = _timed(csr_graph.dfs_traversal, csr, 0)
+    print(f"dfs_traversal  CSRGraph      {t:7.2f}s")
+    _, t = _timed(bfs_traversal, graph, 0)
+    print(f"bfs_traversal  DirectedGraph {t:7.2f}s")
+    _, t = _timed(csr_graph.bfs_traversal, csr, 0)
+    print(f"bfs_traversal  CSRGraph      {t:7.2f}s")
+    _, t = _timed(csr_graph.bfs_order, csr, 0)
+    print(f"bfs_order      CSRGraph      {t:7.2f}s")
+    _, t = _timed(csr_graph.dfs_order, csr, 0)
+    print(f"dfs_order      CSRGraph      {t:7.2f}s")
+
+
+def bench_traversal_styles(num_edges: int):
+    """同一张图上 DFS / BFS 的两种用法：惰性顶点迭代器 (无界面) 与动画步骤列表"""
+    num_vertices = max(2, num_edges // 8)
+    graph = erdos_renyi(num_vertices, _edge_probability(num_vertices, num_edges), seed=2, graph=DirectedGraph())
+    print(f"== traversal styles  ({graph}) ==")
+    for name, fn in (("iter_dfs", lambda: sum(1 for _ in iter_dfs(graph, 0))),
+                     ("dfs_traversal", lambda: len(dfs_traversal(graph, 0))),
+                     ("iter_bfs", lambda: sum(1 for _ in iter_bfs(graph, 0))),
+                     ("bfs_traversal", lambda: len(bfs_traversal(graph, 0)))):
+        count, t = _timed(fn)
+        print(f"{name:14s} {t:7.2f}s  ({count} items)")
+
+
+def bench_parallel_bfs(num_edges: int, worker_counts=(1, 2, 4, 8)):
+    """层同步BFS在不同进程数下的耗时 (含进程池启动与共享内存拷贝)"""
+    num_vertices = max(2, num_edges // 8)
+    csr = erdos_renyi(num_vertices, _edge_probability(num_vertices, num_edges), seed=7)
+
+    print(f"== parallel BFS  (V={csr.vertex_count()}, E={csr.edge_count()}, cpus={os.cpu_count()}) ==")
+    baseline = None
+    for workers in worker_counts:
+        (vertex_layer, layer_vertices), t = _timed(parallel_bfs_layers, csr, 0, workers)
+        baseline = baseline or t
+        print(f"workers={workers}  {t:7.2f}s  speedup x{baseline / t:4.2f}  "
+              f"layers={len(layer_vertices)} reached={len(vertex_layer)}")
+
+
+def bench_generators(num_edges: int):
+    """各生成器直接生成 CSR 图的耗时"""
+    n = max(4, num_edges // 2)
+    side = max(2, int((num_edges // 2) ** 0.5))
+    print(f"== generators  (~{num_edges} edges) ==")
+    cases = [
+        ("erdos_renyi", lambda: erdos_renyi(n, _edge_probability(n, num_edges), seed=1)),
+        ("barabasi_albert", lambda: barabasi_albert(n, 2, seed=1)),
+        ("grid_graph", lambda: grid_graph(side, side)),
+        ("tree_graph", lambda: tree_graph(num_edges + 1, 3)),
+    ]
+    for name, build in cases:
+        g, t = _timed(build)
+        print(f"{name:16s} {t:7.2f}s  {g}")
+
+
+def bench_force_layout(vertex_counts=(500, 2000, 8000), iterations=3):
+    """Barnes-Hut 近似 (theta=0.8) 与精确斥力 (theta=0) 每轮迭代的耗时"""
+    print("== force layout  (seconds per iteration) ==")
+    for n in vertex_counts:
+        g = barabasi_albert(n, 2, seed=5, graph=DirectedGraph())
+        row = [f"V={n:6d}"]
+        for theta in (0.8, 0.0):
+            if theta == 0.0 and n > 2000:
+                row.append("theta=0.0       skipped")
+                continue
+            layout = ForceLayout(g, width=4000, height=4000, theta=theta, seed=0)
+            _, t = _timed(layout.step, iterations)
+            row.append(f"theta={theta:.1f} {t / iterations:9.3f}s")
+        print("  ".join(row))
+
+
+def bench_layered_layout(num_vertices: int = 5000):
+    """分层布局首次计算与命中缓存的耗时"""
+    print(f"== layered layout  (V~{num_vertices}) ==")
+    cases = [
+        ("tree_graph", lambda: tree_graph(num_vertices, 3, graph=DirectedGraph())),
+        ("barabasi_albert", lambda: barabasi_albert(num_vertices, 2, seed=1, graph=DirectedGraph())),
+        ("erdos_renyi", lambda: erdos_renyi(num_vertices, _edge_probability(num_vertices, 2 * num_vertices),
+                                            seed=1, graph=DirectedGraph())),
+    ]
+    for name, build in cases:
+        g = build()
+        _, t = _timed(layered_layout, g, 8000, 8000)
+        _, t_cached = _timed(layered_layout, g, 8000, 8000)
+        print(f"{name:16s} {t:7.2f}s  cached {t_cached * 1e3:6.2f}ms  {g}")
+
+
+def _recursive_topological_sort(graph):
+    """朴素递归版本 (对照组)"""
+    state, postorder = {}, []
+
+    def visit(v):
+        state[v] = 1
+        for w in graph.vertices[v]:
+            if w not in state:
+                visit(w)
+            elif state[w] == 1:
+                raise ValueError("graph contains a cycle")
+        state[v] = 2
+        postorder.append(v)
+
+    for v in graph.vertices:
+        if v not in state:
+            visit(v)
+    return postorder[::-1]
+
+
+def _recursive_tarjan(graph):
+    """朴素递归版本 (对照组)"""
+    index, low, on_stack, stack, components = {}, {}, set(), [], []
+
+    def connect(v):
+        index[v] = low[v] = len(index)
+        stack.append(v)
+        on_stack.add(v)
+        for w in graph.vertices[v]:
+            if w not in index:
+                connect(w)
+                low[v] = min(low[v], low[w])
+            elif w in on_stack:
+                low[v] = min(low[v], index[w])
+        if low[v] == index[v]:
+            component = []
+            while True:
+                w = stack.pop()
+                on_stack.discard(w)
+                component.append(w)
+                if w == v:
+                    break
+            components.append(component)
+
+    for v in graph.vertices:
+        if v not in index:
+            connect(v)
+    return components
+
+
+def _run_deep(fn, *args):
+    """在大栈线程里运行递归版本；仍然失败时返回异常"""
+    result = {}
+
+    def target():
+        try:
+            result["value"] = _timed(fn, *args)
+        except (RecursionError, MemoryError) as exc:
+            result["error"] = exc
+
+    old_limit = sys.getrecursionlimit()
+    old_size = threading.stack_size(512 * 1024 * 1024)
+    sys.setrecursionlimit(10 ** 7)
+    try:
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(old_size)
+        sys.setrecursionlimit(old_limit)
+    return result
+
+
+def bench_dfs_applications(num_edges: int):
+    """迭代版拓扑排序 / SCC 与朴素递归版本对比"""
+    n = max(4, num_edges // 2)
+    dag = barabasi_albert(n, 2, seed=3, graph=DirectedGraph())  # 边总是指向更早的顶点，无环
+    cyclic = erdos_renyi(n, _edge_probability(n, num_edges), seed=3, graph=DirectedGraph())
+    print(f"== topological sort / SCC  (DAG {dag}, cyclic {cyclic}) ==")
+    cases = [
+        ("topological_sort", topological_sort, _recursive_topological_sort, dag),
+        ("tarjan_scc", strongly_connected_components, _recursive_tarjan, cyclic),
+        ("kosaraju_scc", kosaraju_scc, None, cyclic),
+    ]
+    for name, iterative, recursive, graph in cases:
+        _, t = _timed(iterative, graph)
+        row = f"{name:16s} iterative {t:7.2f}s"
+        if recursive is not None:
+            outcome = _run_deep(recursive, graph)
+            if "value" in outcome:
+                row += f"  recursive {outcome['value'][1]:7.2f}s (512 MB stack)"
+            else:
+                row += f"  recursive failed: {type(outcome['error']).__name__}"
+            try:
+                recursive(graph)
+            except RecursionError:
+                row += "  RecursionError at default limit"
+        print(row)
+
+
+def _lazy_dijkstra(graph, source):
+    """heapq + 惰性删除的 Dijkstra (对照组)：同一顶点可能多次入堆，出堆时跳过过期项"""
+    adj = graph.vertices
+    dist = {source: 0}
+    heap = [(0, source)]
+    done = set()
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in adj[u].items():
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def bench_shortest_path(num_edges: int):
+    """索引堆 (decrease-key) Dijkstra / A* 与 heapq 惰性删除版本在带权网格上的对比"""
+    side = max(2, int((num_edges // 4) ** 0.5))
+    rng = random.Random(11)
+    graph = grid_graph(side, side, graph=DirectedGraph())
+    for u in range(side * side):  # 网格补上反向边，路径可以绕行
+        for v in list(graph.vertices[u]):
+            graph.add_edge(v, u)
+    for u, out in graph.vertices.items():
+        for v in out:
+            out[v] = rng.randint(1, 9)
+    target = side * side - 1
+
+    def manhattan(v, t):
+        return abs(v // side - t // side) + abs(v % side - t % side)
+
+    print(f"== shortest paths on {side}x{side} weighted grid  ({graph}) ==")
+    (dist, _), t = _timed(dijkstra, graph, 0)
+    print(f"dijkstra  indexed heap      {t:7.2f}s")
+    lazy, t = _timed(_lazy_dijkstra, graph, 0)
+    print(f"dijkstra  heapq lazy delete {t:7.2f}s  (same distances: {lazy == dist})")
+    (dist_t, _), t = _timed(dijkstra, graph, 0, target)
+    print(f"dijkstra  to corner         {t:7.2f}s")
+    (astar_dist, _), t = _timed(astar, graph, 0, target, manhattan)
+    print(f"astar     to corner         {t:7.2f}s  (same length: {astar_dist[target] == dist[target]})")
+
+
+def bench_graph_io(num_edges: int):
+    """文本 / 二进制边表与 to_dict + JSON 的读写耗时和文件大小"""
+    num_vertices = max(2, num_edges // 8)
+    graph = erdos_renyi(num_vertices, _edge_probability(num_vertices, num_edges), seed=5, graph=DirectedGraph())
+    print(f"== graph I/O  ({graph}) ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("text", "g.txt", graph_io.write_edge_list, lambda p: graph_io.read_edge_list(p, DirectedGraph(), int)),
+            ("binary", "g.bin", graph_io.write_binary, lambda p: graph_io.read_binary(p, DirectedGraph())),
+            ("binary->CSR", "g.bin", graph_io.write_binary, graph_io.read_binary),
+        ]
+        for name, filename, write, read in cases:
+            path = os.path.join(tmp, filename)
+            _, t_write = _timed(write, graph, path)
+            _, t_read = _timed(read, path)
+            print(f"{name:12s} write {t_write:6.2f}s  read {t_read:6.2f}s  {os.path.getsize(path) / 1e6:7.1f} MB")
+
+        path = os.path.join(tmp, "g.json")
+
+        def write_json(g, p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(g.to_dict(), f)
+
+        def read_json(p):
+            with open(p, encoding="utf-8") as f:
+                return DirectedGraph.from_dict(json.load(f))
+
+        _, t_write = _timed(write_json, graph, path)
+        _, t_read = _timed(read_json, path)
+        print(f"{'to_dict+json':12s} write {t_write:6.2f}s  read {t_read:6.2f}s  {os.path.getsize(path) / 1e6:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="graph model benchmarks")
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    args = parser.parse_args()
+    bench_generators(args.edges)
+    bench_dfs_applications(args.edges)
+    bench_shortest_path(args.edges)
+    bench_graph_io(args.edges)
+    bench_csr(args.edges)
+    bench_traversal_styles(args.edges)
+    bench_parallel_bfs(args.edges)
+    bench_force_layout()
+    bench_layered_layout()
+
+
+if __name__ == "__main__":
+    main()
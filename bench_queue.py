@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+循环队列基准测试 (不属于单元测试，需手动运行)
+
+    python bench_queue.py             # 默认 10^7 次操作
+    python bench_queue.py --ops 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from queue import Queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DS_visual"))
+
+from circular_queue.circular_queue_model import CircularQueueModel
+from circular_queue.concurrent_queue import SPSCRingQueue, MPMCRingQueue
+from circular_queue.async_queue import AsyncCircularQueue
+
+
+def _report(name: str, ops: int, elapsed: float):
+    print(f"{name:34s} {elapsed:7.2f}s  {ops / elapsed / 1e6:7.2f} M ops/s")
+
+
+def bench_single(ops: int, capacity: int = 1024):
+    """逐个入队 / 出队，队列保持半满 (每次操作算一次)"""
+    half = ops // 2
+    q = CircularQueueModel(capacity)
+    enqueue, dequeue = q.enqueue, q.dequeue
+    for i in range(capacity // 2):
+        enqueue(i)
+    t0 = time.perf_counter()
+    for i in range(half):
+        enqueue(i)
+        dequeue()
+    _report("enqueue/dequeue (single)", 2 * half, time.perf_counter() - t0)
+
+    d = deque(range(capacity // 2))
+    append, popleft = d.append, d.popleft
+    t0 = time.perf_counter()
+    for i in range(half):
+        append(i)
+        popleft()
+    _report("collections.deque (reference)", 2 * half, time.perf_counter() - t0)
+
+
+def bench_batch(ops: int, capacity: int = 1 << 16, batch: int = 1000):
+    """批量入队 / 出队，每批 batch 个元素，最多两次切片拷贝"""
+    q = CircularQueueModel(capacity)
+    values = list(range(batch))
+    q.enqueue_many(range(capacity // 2 + 7))  # 让批次跨越缓冲区末尾
+    rounds = max(1, ops // (2 * batch))
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        q.enqueue_many(values)
+        q.dequeue_many(batch)
+    _report(f"enqueue_many/dequeue_many ({batch})", 2 * batch * rounds, time.perf_counter() - t0)
+
+
+def bench_growth(ops: int):
+    """自动扩容：从容量 1 开始持续入队，最后一次性出队"""
+    count = ops // 2
+    q = CircularQueueModel(1, auto_grow=True)
+    enqueue = q.enqueue
+    t0 = time.perf_counter()
+    for i in range(count):
+        enqueue(i)
+    q.dequeue_many()
+    _report(f"auto_grow enqueue (final cap {q.capacity})", count, time.perf_counter() - t0)
+
+    # 对照：旧的 resize 逐个出队再逐个入队
+    def resize_by_element(queue, new_capacity):
+        items = [queue.dequeue() for _ in range(queue.size)]
+        queue.capacity = new_capacity
+        queue.buffer = [None] * new_capacity
+        queue.head = queue.tail = queue.size = 0
+        for it in items:
+            queue.enqueue(it)
+
+    n = max(2, min(count, 1_000_000))
+    for name, resize in (("resize (two slices)", CircularQueueModel.resize),
+                         ("resize (element by element)", resize_by_element)):
+        q = CircularQueueModel(n)
+        q.enqueue_many(range(n))
+        q.dequeue_many(n // 2)
+        q.enqueue_many(range(n // 2))  # 满且环绕
+        t0 = time.perf_counter()
+        resize(q, 2 * n)
+        _report(f"{name} of {n}", n, time.perf_counter() - t0)
+
+
+def _run_threads(queue, producers: int, consumers: int, items: int) -> float:
+    """producers 个线程共放入 items 个元素，consumers 个线程取完为止；返回耗时"""
+    per_producer = items // producers
+    total = per_producer * producers
+    quotas = [total // consumers + (1 if c < total % consumers else 0) for c in range(consumers)]
+    put, get = queue.put, queue.get
+
+    def produce():
+        for i in range(per_producer):
+            put(i)
+
+    def consume(quota):
+        for _ in range(quota):
+            get()
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    threads += [threading.Thread(target=consume, args=(q,)) for q in quotas]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0
+
+
+def bench_threads(items: int, capacity: int = 1024):
+    """多线程吞吐量：每个元素算一次 put + 一次 get"""
+    print(f"-- producer/consumer threads ({items} items, capacity {capacity}) --")
+    _report("SPSCRingQueue 1P/1C", 2 * items, _run_threads(SPSCRingQueue(capacity), 1, 1, items))
+    for n in (1, 2, 4, 8):
+        _report(f"MPMCRingQueue {n}P/{n}C", 2 * items, _run_threads(MPMCRingQueue(capacity), n, n, items))
+        _report(f"queue.Queue {n}P/{n}C (reference)", 2 * items, _run_threads(Queue(capacity), n, n, items))
+
+
+async def _run_async(queue, producers: int, messages: int) -> float:
+    """producers 个协程共放入 messages 条消息，一个消费者协程取完；返回耗时"""
+    per_producer = messages // producers
+    total = per_producer * producers
+    put, get = queue.put, queue.get
+
+    async def produce():
+        for i in range(per_producer):
+            await put(i)
+
+    async def consume():
+        for _ in range(total):
+            await get()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(consume(), *(produce() for _ in range(producers)))
+    return time.perf_counter() - t0
+
+
+def bench_async(messages: int, capacity: int = 64):
+    """asyncio 吞吐量 (messages/s)：1 / 10 / 100 个并发生产者，一个消费者"""
+    print(f"-- asyncio producers ({messages} messages, capacity {capacity}) --")
+    for n in (1, 10, 100):
+        elapsed = asyncio.run(_run_async(AsyncCircularQueue(capacity), n, messages))
+        _report(f"AsyncCircularQueue {n} producers", messages, elapsed)
+        elapsed = asyncio.run(_run_async(asyncio.Queue(capacity), n, messages))
+        _report(f"asyncio.Queue {n} producers (ref)", messages, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="circular queue benchmarks")
+    parser.add_argument("--ops", type=int, default=10_000_000)
+    parser.add_argument("--thread-items", type=int, default=200_000,
+                        help="items passed through the threaded queues")
+    args = parser.parse_args()
+    print(f"== CircularQueueModel  ({args.ops} operations) ==")
+    bench_single(args.ops)
+    bench_batch(args.ops)
+    bench_growth(args.ops)
+    bench_threads(args.thread_items)
+    bench_async(args.thread_items)
+
+
+if __name__ == "__main__":
+    main()
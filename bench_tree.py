@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+树模型基准测试 (不属于单元测试，需手动运行)
+
+    python bench_tree.py             # 默认 10^5 个键
+    python bench_tree.py --n 20000
+"""
+
+import argparse
+import bisect
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DS_visual"))
+
+from binary_tree.bst.bst_model import BSTModel, TreeNode
+from binary_tree.tree_iter import iter_inorder, iter_inorder_stack
+from binary_tree.tidy_layout import TidyLayout, tidy_layout
+from avl.avl_model import AVLModel, clone_tree as avl_clone_tree
+from rbt.rbt_model import RBModel, clone_tree as rb_clone_tree
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _report(name: str, count: int, elapsed: float):
+    print(f"{name:38s} {elapsed:7.3f}s  {elapsed / count * 1e6:8.2f} us/op")
+
+
+def bench_order_statistics(n: int, queries: int = 20000, seed: int = 1):
+    """BSTModel 的 rank / select / count_range 与排序列表 + bisect 对比"""
+    print(f"-- order statistics ({n} random keys, {queries} queries) --")
+    rng = random.Random(seed)
+    keys = [rng.randrange(n * 10) for _ in range(n)]
+    probes = [rng.randrange(n * 10) for _ in range(queries)]
+    ks = [rng.randrange(n) for _ in range(queries)]
+
+    bst = BSTModel()
+    _, t = _timed(lambda: [bst.insert(k) for k in keys])
+    _report("BSTModel.insert", n, t)
+    ordered = []
+    _, t = _timed(lambda: [bisect.insort(ordered, k) for k in keys])
+    _report("bisect.insort (sorted list)", n, t)
+
+    _, t = _timed(lambda: [bst.rank(q) for q in probes])
+    _report("BSTModel.rank", queries, t)
+    _, t = _timed(lambda: [bisect.bisect_left(ordered, q) for q in probes])
+    _report("bisect_left (sorted list)", queries, t)
+
+    _, t = _timed(lambda: [bst.select(k) for k in ks])
+    _report("BSTModel.select", queries, t)
+    _, t = _timed(lambda: [ordered[k] for k in ks])
+    _report("list index (sorted list)", queries, t)
+
+    spans = [(q, q + n) for q in probes]
+    _, t = _timed(lambda: [bst.count_range(lo, hi) for lo, hi in spans])
+    _report("BSTModel.count_range", queries, t)
+    _, t = _timed(lambda: [bisect.bisect_right(ordered, hi) - bisect.bisect_left(ordered, lo)
+                           for lo, hi in spans])
+    _report("bisect count (sorted list)", queries, t)
+
+    deletions = keys[: n // 2]
+    _, t = _timed(lambda: [bst.delete(k) for k in deletions])
+    _report("BSTModel.delete (sizes kept)", len(deletions), t)
+    _, t = _timed(lambda: [ordered.pop(bisect.bisect_left(ordered, k)) for k in deletions])
+    _report("list.pop (sorted list)", len(deletions), t)
+
+
+def bench_compare_keys(n: int, avl_size: int = 1000, seed: int = 4):
+    """比较代价：BST / RB 逐个插入 n 个键，AVL 在 avl_size 个节点的树上查找 n 次 (整数键与字符串键)"""
+    print(f"-- comparisons ({n} inserts / lookups) --")
+    rng = random.Random(seed)
+    for label, keys in (("int", [rng.randrange(n * 10) for _ in range(n)]),
+                        ("str", [f"k{rng.randrange(n * 10)}" for _ in range(n)])):
+        bst = BSTModel()
+        _, t = _timed(lambda: [bst.insert(k) for k in keys])
+        _report(f"BSTModel.insert ({label})", n, t)
+        rbt = RBModel()
+        _, t = _timed(lambda: [rbt.insert(k) for k in keys])
+        _report(f"RBModel.insert ({label})", n, t)
+        avl = AVLModel()
+        for k in keys[:avl_size]:
+            avl.insert_with_steps(k)
+        _, t = _timed(lambda: [avl.search_with_steps(k) for k in keys])
+        _report(f"AVLModel.search_with_steps ({label})", n, t)
+
+
+def bench_avl_steps(n: int, extra: int = 1000, seed: int = 5):
+    """AVLModel.insert_with_steps：增量快照日志 (O(log n)) 与原来每个检查点 clone_tree 对比"""
+    print(f"-- AVL insert_with_steps / delete_with_steps ({n} keys) --")
+    rng = random.Random(seed)
+    keys = [rng.random() for _ in range(n + extra)]
+    avl = AVLModel()
+
+    def run(op, values):
+        for v in values:
+            op(v)  # 与可视化界面一样，每次的结果用完即丢
+
+    _, t = _timed(run, avl.insert_with_steps, keys[:n])
+    _report(f"insert_with_steps (build {n})", n, t)
+    _, t = _timed(run, avl.insert_with_steps, keys[n:])
+    _report(f"insert_with_steps (at {n} nodes)", extra, t)
+    _, t = _timed(run, avl.delete_with_steps, keys[n:])
+    _report(f"delete_with_steps (at {n} nodes)", extra, t)
+    _, _, rotations, log = avl.insert_with_steps(-1.0)
+    _, t = _timed(lambda: [log[i] for i in range(len(log))])
+    _report(f"reconstruct {len(log)} snapshots on demand", len(log), t)
+    # 对照：原来每次操作至少在 2 个检查点各 clone_tree 一次
+    _, t = _timed(lambda: [avl_clone_tree(avl.root) for _ in range(4)])
+    _report(f"2 x clone_tree per op (old, {n} nodes)", 2, t)
+
+
+def bench_rb_steps(n: int, extra: int = 1000):
+    """RBModel.insert_with_steps：路径复制的持久化快照与原来每个事件后 clone_tree 对比"""
+    print(f"-- RB insert_with_steps / delete_with_steps ({n} keys) --")
+    rbt = RBModel()
+    for v in range(n):
+        rbt.insert(v)
+    _, t = _timed(rbt.snapshot)
+    _report(f"first snapshot ({n} nodes)", 1, t)
+    snapshots = 0
+    t0 = time.perf_counter()
+    for v in range(n, n + extra):
+        snapshots += len(rbt.insert_with_steps(v)[3])
+    _report(f"insert_with_steps (at {n} nodes)", extra, time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    for v in range(n, n + extra):
+        snapshots += len(rbt.delete_with_steps(v)[3])
+    _report(f"delete_with_steps (at {n} nodes)", extra, time.perf_counter() - t0)
+    print(f"{'snapshots per op':38s} {snapshots / (2 * extra):7.2f}")
+    _, t = _timed(lambda: [rb_clone_tree(rbt.root) for _ in range(3)])
+    _report(f"clone_tree per snapshot (old, {n} nodes)", 3, t)
+
+
+def bench_fast_paths(n: int, seed: int = 6):
+    """无动画的 insert_many / delete 与 *_with_steps 对比 (批量插入 / 加载时使用前者)；有序输入的 from_sorted"""
+    print(f"-- fast paths vs *_with_steps ({n} random keys) --")
+    rng = random.Random(seed)
+    keys = [rng.randrange(n * 10) for _ in range(n)]
+    doomed = keys[: n // 2]
+
+    def run(op, values):
+        for v in values:
+            op(v)
+
+    for name, cls in (("AVLModel", AVLModel), ("RBModel", RBModel)):
+        fast, steps = cls(), cls()
+        _, t = _timed(fast.insert_many, keys)
+        _report(f"{name}.insert_many", n, t)
+        _, t = _timed(run, steps.insert_with_steps, keys)
+        _report(f"{name}.insert_with_steps", n, t)
+        _, t = _timed(run, fast.delete, doomed)
+        _report(f"{name}.delete", len(doomed), t)
+        _, t = _timed(run, steps.delete_with_steps, doomed)
+        _report(f"{name}.delete_with_steps", len(doomed), t)
+        ordered = sorted(keys)
+        _, t = _timed(cls.from_sorted, ordered)
+        _report(f"{name}.from_sorted", n, t)
+        _, t = _timed(cls().insert_many, ordered)
+        _report(f"{name}.insert_many (sorted)", n, t)
+
+
+def bench_set_ops(n: int, small: int = 100, seed: int = 7):
+    """基于 join / split 的并 / 交 / 差 (两棵树大小相同 / 相差悬殊)，与展开合并后重建对比；反复 split + join"""
+    print(f"-- set operations via join/split ({n} keys) --")
+    rng = random.Random(seed)
+    for name, cls in (("AVLModel", AVLModel), ("RBModel", RBModel)):
+        for size_b in (n, small):
+            a = sorted(rng.sample(range(n * 10), n))
+            b = sorted(rng.sample(range(n * 10), size_b))
+            label = f"{n} | {size_b}"
+            for op in ("union", "intersection", "difference"):
+                t1, t2 = cls.from_sorted(a), cls.from_sorted(b)
+                _, t = _timed(getattr(cls, op), t1, t2)
+                _report(f"{name}.{op} ({label})", n + size_b, t)
+            # 对照：中序展开两棵树，合并后 from_sorted 重建 (O(n + m))
+            t1, t2 = cls.from_sorted(a), cls.from_sorted(b)
+            _, t = _timed(lambda: cls.from_sorted(sorted(set(t1) | set(t2))))
+            _report(f"{name} merge+rebuild ({label})", n + size_b, t)
+        t1 = cls.from_sorted(range(n))
+        pivots = [rng.randrange(n) for _ in range(small)]
+
+        def split_join(tree):
+            for k in pivots:
+                left, right = tree.split(k)
+                tree = cls.join(left, k, right)  # 每轮多一个重复的 k
+            return tree
+
+        _, t = _timed(split_join, t1)
+        _report(f"{name} split + join ({n} nodes)", 2 * len(pivots), t)
+
+
+def bench_layout(n: int, edits: int = 20, seed: int = 8):
+    """整洁布局：从头布局、插入后增量重新布局，与原来按中序序号铺开对比 (宽度以相邻节点间距为单位)"""
+    print(f"-- tidy layout ({n} nodes) --")
+    rng = random.Random(seed)
+    rbt = RBModel()
+    rbt.insert_many(rng.sample(range(n * 10), n))
+    snap = rbt.snapshot()
+
+    def inorder_spread(root):
+        return {node: (i, d) for i, (node, d) in enumerate(iter_inorder_stack(root, with_depth=True))}
+
+    for name, fn in (("in-order spread (old)", inorder_spread), ("tidy_layout", tidy_layout)):
+        pos, t = _timed(fn, snap)
+        xs = [x for x, _ in pos.values()]
+        _report(f"{name} (width {max(xs) - min(xs):.0f})", n, t)
+
+    layout = TidyLayout()
+    layout.layout(snap)
+    rebuilt = 0
+    t0 = time.perf_counter()
+    for v in rng.sample(range(n * 10, n * 20), edits):
+        rbt.insert(v)
+        layout.layout(rbt.snapshot())
+        rebuilt += layout.rebuilt
+    _report(f"insert + snapshot + relayout ({rebuilt // edits}/op)", edits, time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    for v in rng.sample(range(n * 20, n * 30), edits):
+        rbt.insert(v)
+        tidy_layout(rbt.snapshot())
+    _report("insert + snapshot + full layout", edits, time.perf_counter() - t0)
+
+
+def _height(node) -> int:
+    """迭代计算树高 (退化的链也不会递归溢出)"""
+    best = 0
+    stack = [(node, 1)] if node else []
+    while stack:
+        n, d = stack.pop()
+        best = max(best, d)
+        if n.left:
+            stack.append((n.left, d + 1))
+        if n.right:
+            stack.append((n.right, d + 1))
+    return best
+
+
+def bench_bulk_build(n: int, chain: int = 3000):
+    """有序输入：逐个插入 (退化成链，O(n^2)) 与 build_balanced / rebalance 对比"""
+    print("-- bulk build (sorted input) --")
+    bst = BSTModel()
+    _, t = _timed(lambda: [bst.insert(k) for k in range(chain)])
+    _report(f"insert one by one ({chain}, h={_height(bst.root)})", chain, t)
+    _, t = _timed(bst.rebalance)
+    _report(f"rebalance (DSW) ({chain}, h={_height(bst.root)})", chain, t)
+    for size in (chain, n, 10 * n):
+        _, t = _timed(bst.build_balanced, range(size))
+        _report(f"build_balanced ({size}, h={_height(bst.root)})", size, t)
+    rng = random.Random(2)
+    keys = [rng.random() for _ in range(n)]
+    _, t = _timed(bst.build_balanced, keys)
+    _report(f"build_balanced unsorted ({n})", n, t)
+    _, t = _timed(bst.rebalance)
+    _report(f"rebalance (DSW) ({n})", n, t)
+
+
+def _recursive_inorder(node, out):
+    """旧的可视化代码中使用的递归中序收集 (对照)"""
+    if node is None:
+        return
+    _recursive_inorder(node.left, out)
+    out.append(node)
+    _recursive_inorder(node.right, out)
+
+
+def bench_iterators(n: int, ranges: int = 2000, span: int = 100):
+    """沿 parent 指针的惰性中序遍历 / 区间扫描 (n 个节点的平衡树和退化链)"""
+    print(f"-- in-order iteration and range scans ({n} nodes) --")
+    bst = BSTModel()
+    bst.build_balanced(range(n), presorted=True)
+    _, t = _timed(lambda: sum(1 for _ in iter_inorder(bst.root)))
+    _report("iter_inorder (balanced)", n, t)
+    _, t = _timed(lambda: sum(1 for _ in iter_inorder(bst.root, with_depth=True)))
+    _report("iter_inorder with_depth (balanced)", n, t)
+    _, t = _timed(_recursive_inorder, bst.root, [])
+    _report("recursive collect (balanced)", n, t)
+
+    rng = random.Random(3)
+    starts = [rng.randrange(n) for _ in range(ranges)]
+    _, t = _timed(lambda: [sum(1 for _ in bst.range(lo, lo + span)) for lo in starts])
+    _report(f"range scan ({ranges} x {span + 1} keys)", ranges, t)
+    few = starts[:5]
+    _, t = _timed(lambda: [sum(1 for v in bst if lo <= v <= lo + span) for lo in few])
+    _report(f"full scan + filter ({len(few)} ranges)", len(few), t)
+
+    # 有序插入得到的退化链：直接连接节点，避免 O(n^2) 的逐个插入
+    chain = BSTModel()
+    prev = None
+    for v in range(n):
+        node = TreeNode(v)
+        if prev is None:
+            chain.root = node
+        else:
+            prev.right, node.parent = node, prev
+        prev = node
+    _, t = _timed(lambda: sum(1 for _ in iter_inorder(chain.root)))
+    _report(f"iter_inorder (chain, depth {n})", n, t)
+    try:
+        _recursive_inorder(chain.root, [])
+    except RecursionError:
+        print(f"{'recursive collect (chain)':38s} RecursionError")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tree model benchmarks")
+    parser.add_argument("--n", type=int, default=100_000, help="number of keys")
+    args = parser.parse_args()
+    print(f"== tree models  (n = {args.n}) ==")
+    bench_order_statistics(args.n)
+    bench_compare_keys(args.n)
+    bench_avl_steps(args.n)
+    bench_rb_steps(args.n)
+    bench_fast_paths(args.n)
+    bench_set_ops(args.n)
+    bench_layout(args.n)
+    bench_bulk_build(args.n)
+    bench_iterators(10 * args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from DS_visual.avl.avl_model import AVLModel, AVLNode, clone_tree
+from DS_visual.avl.avl_model import AVLModel, AVLNode, AVLSnapshotLog, clone_tree
 
 
 class TestAVLNode(unittest.TestCase):
@@ -264,6 +264,97 @@ class TestAVLSnapshots(unittest.TestCase):
         self.assertEqual(cloned.left.val, self.avl.root.left.val)
         self.assertIsNot(cloned.left, self.avl.root.left)
 
+    def test_stable_ids_survive_snapshots(self):
+        """测试克隆 / 快照重建的节点通过 stable_id 对应到模型中的节点 (重复值也能区分)"""
+        from DS_visual.binary_tree.tree_iter import iter_inorder
+        self.avl.insert_many([7, 7, 7, 3, 9, 7])
+        live = {n.id: n for n in iter_inorder(self.avl.root)}
+        self.assertEqual(len(live), 6)
+        _, _, rotations, log = self.avl.insert_with_steps(7)
+        live = {n.id: n for n in iter_inorder(self.avl.root)}
+        for snap in (clone_tree(self.avl.root), clone_tree(clone_tree(self.avl.root)), log[-1]):
+            copies = {n.stable_id: n for n in iter_inorder(snap)}
+            self.assertEqual(set(copies), set(live))
+            for key, node in copies.items():
+                self.assertIsNot(node, live[key])
+                self.assertEqual(node.val, live[key].val)
+        before = {n.stable_id for n in iter_inorder(log[0])}
+        self.assertTrue(before < set(live))
+        for rot in rotations:
+            self.assertIn(rot['z'].id, before)
+
+
+class TestAVLSnapshotLog(unittest.TestCase):
+    """AVL增量快照日志测试：重建结果与逐步 clone_tree 完全一致"""
+
+    def _shape(self, node, parent=None):
+        """(值, 高度, 左, 右)，同时检查 parent 指针"""
+        if node is None:
+            return None
+        self.assertIs(node.parent, parent)
+        return (node.val, node.height, self._shape(node.left, node), self._shape(node.right, node))
+
+    def test_reconstruction_matches_eager_clones(self):
+        """测试随机插入 / 删除后 (包括之后树又被修改)，每个检查点都能准确重建"""
+        import random
+        rng = random.Random(8)
+        avl = AVLModel()
+        eager = {}
+
+        class EagerLog(AVLSnapshotLog):
+            def _checkpoint(log, root):
+                super()._checkpoint(root)
+                eager.setdefault(id(log), []).append(self._shape(clone_tree(root)))
+
+        model_new_log = avl._new_log
+
+        def new_log():
+            log = model_new_log()
+            log.__class__ = EagerLog  # 检查点时额外保存一份完整的 clone 作为对照
+            return log
+
+        avl._new_log = new_log
+        logs = []
+        for _ in range(300):
+            v = rng.randint(0, 60)
+            if rng.random() < 0.6:
+                result = avl.insert_with_steps(v)
+            else:
+                result = avl.delete_with_steps(v)
+            logs.append(result[3])
+        self.assertGreater(sum(len(r) > 2 for r in logs), 10)  # 有带旋转的操作
+        for log in logs[::7] + logs[-5:]:
+            expected = eager[id(log)]
+            self.assertEqual(len(log), len(expected))
+            self.assertEqual([self._shape(snap) for snap in log], expected)
+
+    def test_log_records_only_touched_nodes(self):
+        """测试大树上一次插入只记录路径附近 O(log n) 个节点"""
+        avl = AVLModel()
+        for v in range(2000):
+            avl.insert_with_steps(v)
+        _, path, rotations, log = avl.insert_with_steps(2000)
+        touched = sum(len(log.touched(i)) for i in range(len(log)))
+        self.assertLessEqual(touched, 4 * len(path))
+        self.assertEqual(len(log), 2 + len(rotations))
+        from DS_visual.binary_tree.tree_iter import iter_inorder
+        self.assertEqual([n.val for n in iter_inorder(log[-1])], list(range(2001)))
+        self.assertIsNone(AVLModel().insert_with_steps(1)[3][0])
+
+    def test_released_logs_stop_recording(self):
+        """测试快照日志被丢弃后，模型的修改日志被裁掉，不再记录"""
+        avl = AVLModel()
+        for v in range(50):
+            avl.insert_with_steps(v)  # 结果立即丢弃
+        self.assertIsNone(avl._journal)
+        kept = avl.insert_with_steps(100)[3]
+        for v in range(50, 60):
+            avl.insert_with_steps(v)
+        self.assertGreaterEqual(len(avl._journal.segments), 10)  # 仍被引用的日志之后的记录都保留
+        self.assertEqual(kept[-1] is not None, True)
+        del kept
+        self.assertIsNone(avl._journal)
+
 
 class TestAVLEdgeCases(unittest.TestCase):
     """AVL边界情况测试"""
@@ -310,6 +401,196 @@ class TestAVLEdgeCases(unittest.TestCase):
         # 验证根节点
         self.assertIsNotNone(self.avl.root)
 
+    def test_mixed_values_keep_compare_order(self):
+        """测试预计算比较键与 _compare 的顺序一致 (数字字符串按数值，其余按字符串)"""
+        values = [10, "9", 2.5, "abc", "100", "Abc", -1, "1e1"]
+        for v in values:
+            self.avl.insert_with_steps(v)
+        got = list(self.avl)
+        for a, b in zip(got, got[1:]):
+            self.assertLessEqual(self.avl._compare(a, b), 0)
+        self.assertEqual(self.avl.root.key, (float(self.avl.root.val), str(self.avl.root.val)))
+
+    def test_key_follows_value_swap(self):
+        """测试删除时与后继交换值后，节点的比较键随之更新"""
+        for v in [50, 30, 70, 20, 40, 60, 80]:
+            self.avl.insert_with_steps(v)
+        self.avl.delete_with_steps(50)
+        for node in self.avl.iter_nodes():
+            self.assertEqual(node.key[0], float(node.val))
+        self.assertTrue(self.avl.search_with_steps(60)[2])
+        self.assertFalse(self.avl.search_with_steps(50)[2])
+
+
+class TestAVLIterators(unittest.TestCase):
+    """AVL树惰性中序遍历与区间扫描测试"""
+
+    def setUp(self):
+        self.avl = AVLModel()
+
+    def test_iteration_matches_sorted(self):
+        """测试中序迭代结果有序"""
+        import random
+        rng = random.Random(7)
+        values = [rng.randint(0, 100) for _ in range(200)]
+        for v in values:
+            self.avl.insert_with_steps(v)
+        self.assertEqual(list(self.avl), sorted(values))
+        self.assertEqual(len(list(self.avl.iter_nodes())), len(values))
+
+    def test_range(self):
+        """测试区间扫描 (含重复值与边界)"""
+        for v in [10, 20, 30, 20, 40, 50, 25, 5]:
+            self.avl.insert_with_steps(v)
+        self.assertEqual(list(self.avl.range(20, 40)), [20, 20, 25, 30, 40])
+        self.assertEqual(list(self.avl.range(21, 24)), [])
+        self.assertEqual(list(self.avl.range(0, 5)), [5])
+
+    def test_snapshot_iteration(self):
+        """测试对 clone_tree 快照的遍历"""
+        for v in range(1, 16):
+            self.avl.insert_with_steps(v)
+        snap = clone_tree(self.avl.root)
+        from DS_visual.binary_tree.tree_iter import iter_inorder
+        self.assertEqual([n.val for n in iter_inorder(snap)], list(range(1, 16)))
+        self.assertEqual(max(d for _, d in iter_inorder(snap, with_depth=True)), self.avl.root.height - 1)
+
+
+class TestAVLFastPaths(unittest.TestCase):
+    """AVL树无动画插入 / 删除测试"""
+
+    @staticmethod
+    def _dump(node):
+        if node is None:
+            return None
+        for child in (node.left, node.right):
+            if child is not None:
+                assert child.parent is node
+        return (node.val, node.height, TestAVLFastPaths._dump(node.left), TestAVLFastPaths._dump(node.right))
+
+    def test_match_step_versions(self):
+        """测试 insert / delete 与 insert_with_steps / delete_with_steps 得到完全相同的树"""
+        import random
+        rng = random.Random(21)
+        values = [rng.randint(0, 80) for _ in range(300)]
+        fast, steps = AVLModel(), AVLModel()
+        self.assertEqual(fast.insert_many(values), len(values))
+        for v in values:
+            steps.insert_with_steps(v)
+        self.assertEqual(self._dump(fast.root), self._dump(steps.root))
+        for v in rng.sample(values, 200) + [1000]:
+            self.assertEqual(fast.delete(v), steps.delete_with_steps(v)[0] is not None)
+            self.assertEqual(self._dump(fast.root), self._dump(steps.root))
+
+    def test_live_log_sees_fast_paths(self):
+        """测试快照日志存活时，无动画的修改也会被记录，旧快照不变"""
+        avl = AVLModel()
+        avl.insert_many(range(20))
+        log = avl.insert_with_steps(20)[3]
+        expected = [self._dump(clone_tree(root)) for root in (log[0], log[-1])]
+        avl.insert_many(range(21, 60))
+        for v in range(0, 60, 3):
+            avl.delete(v)
+        self.assertEqual([self._dump(log[0]), self._dump(log[-1])], expected)
+
+    def test_discarded_log_stops_journal(self):
+        """测试丢弃 insert_with_steps 的结果后，无动画的修改不再记录修改日志"""
+        avl = AVLModel()
+        avl.insert_with_steps(0)
+        avl.insert_many(range(1, 500))
+        for v in range(0, 500, 7):
+            avl.delete(v)
+        self.assertIsNone(avl._journal)
+        self.assertEqual(avl._live_logs, [])
+
+    @staticmethod
+    def _check(node):
+        """检查 AVL 性质、height 和 parent 指针，返回高度"""
+        if node is None:
+            return 0
+        for child in (node.left, node.right):
+            if child is not None:
+                assert child.parent is node
+        left, right = TestAVLFastPaths._check(node.left), TestAVLFastPaths._check(node.right)
+        assert abs(left - right) <= 1, "unbalanced"
+        assert node.height == 1 + max(left, right), "stale height"
+        return node.height
+
+    def test_from_sorted(self):
+        """测试 from_sorted 构建完全平衡的合法 AVL 树 (含重复值)，之后可以继续插入 / 删除"""
+        for n in range(70):
+            avl = AVLModel.from_sorted(range(n))
+            self.assertEqual(self._check(avl.root), n.bit_length())
+            self.assertEqual(list(avl), list(range(n)))
+        avl = AVLModel.from_sorted([1, 2, 2, 2, 2, 3, "a", "b"])
+        self._check(avl.root)
+        self.assertTrue(avl.search_with_steps(2)[2])
+        avl.insert_many([2, 0, 5])
+        self.assertTrue(avl.delete(3))
+        self._check(avl.root)
+        self.assertEqual(list(avl), [0, 1, 2, 2, 2, 2, 2, 5, "a", "b"])
+        with self.assertRaises(ValueError):
+            AVLModel.from_sorted([1, 3, 2])
+
+
+class TestAVLJoinSplit(unittest.TestCase):
+    """AVL树 join / split 与集合运算测试"""
+
+    _check = staticmethod(TestAVLFastPaths._check)
+
+    def _tree(self, values):
+        avl = AVLModel.from_sorted(sorted(values))
+        return avl
+
+    def test_set_operations(self):
+        """测试并 / 交 / 差与 Python 集合一致，结果是合法的 AVL 树"""
+        import random
+        rng = random.Random(31)
+        for _ in range(60):
+            a = set(rng.sample(range(300), rng.randint(0, 120)))
+            b = set(rng.sample(range(300), rng.randint(0, 120)))
+            for op, expected in ((AVLModel.union, a | b), (AVLModel.intersection, a & b),
+                                 (AVLModel.difference, a - b)):
+                t1, t2 = self._tree(a), self._tree(b)
+                result = op(t1, t2)
+                self._check(result.root)
+                self.assertEqual(list(result), sorted(expected))
+                self.assertIsNone(t1.root)
+                self.assertIsNone(t2.root)
+
+    def test_split_and_join(self):
+        """测试 split 按 < / >= 拆分，join 可以连接高度相差很大的树"""
+        avl = AVLModel()
+        avl.insert_many([5] * 6 + list(range(10)))
+        left, right = avl.split(5)
+        self.assertIsNone(avl.root)
+        self._check(left.root)
+        self._check(right.root)
+        self.assertEqual(list(left), [0, 1, 2, 3, 4])
+        self.assertEqual(list(right), [5] * 7 + [6, 7, 8, 9])
+        for small in range(4):
+            big = self._tree(range(100, 600))
+            joined = AVLModel.join(self._tree(range(small)), 50, big)
+            self._check(joined.root)
+            self.assertEqual(list(joined), list(range(small)) + [50] + list(range(100, 600)))
+            joined = AVLModel.join(big if small else self._tree(range(100, 600)), 1000,
+                                   self._tree(range(2000, 2000 + small)))
+            self._check(joined.root)
+        with self.assertRaises(ValueError):
+            AVLModel.join(self._tree([1, 9]), 5, self._tree([7]))
+
+    def test_join_spine_event(self):
+        """测试 join 记录下降经过的脊节点和挂接位置"""
+        events = []
+        joined = AVLModel.join(self._tree(range(64)), 100, self._tree([200]), events=events)
+        self._check(joined.root)
+        event = events[0]
+        self.assertEqual(event['type'], 'join_spine')
+        self.assertEqual(event['side'], 'right')
+        self.assertEqual(event['mid'].val, 100)
+        self.assertIs(event['spine'][-1], event['attach'])
+        self.assertTrue(all(n.val < 100 for n in event['spine']))
+
 
 def run_avl_tests():
     """运行所有AVL树测试"""
@@ -321,7 +602,11 @@ def run_avl_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestAVLRotations))
     suite.addTests(loader.loadTestsFromTestCase(TestAVLBalance))
     suite.addTests(loader.loadTestsFromTestCase(TestAVLSnapshots))
+    suite.addTests(loader.loadTestsFromTestCase(TestAVLSnapshotLog))
     suite.addTests(loader.loadTestsFromTestCase(TestAVLEdgeCases))
+    suite.addTests(loader.loadTestsFromTestCase(TestAVLIterators))
+    suite.addTests(loader.loadTestsFromTestCase(TestAVLFastPaths))
+    suite.addTests(loader.loadTestsFromTestCase(TestAVLJoinSplit))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -342,6 +627,7 @@ def run_avl_tests():
 # ============================================================
 
 from DS_visual.rbt.rbt_model import RBModel, RBNode, clone_tree as rb_clone_tree
+from DS_visual.binary_tree.tree_iter import iter_inorder_stack
 
 
 class TestRBNode(unittest.TestCase):
@@ -546,6 +832,56 @@ class TestRBSnapshots(unittest.TestCase):
         if cloned.left:
             self.assertEqual(cloned.left.color, self.rbt.root.left.color)
 
+    @staticmethod
+    def _dump(node):
+        """树的结构 / 值 / 颜色 / 对应的实时节点，用于比较"""
+        if node is None:
+            return None
+        return (node.val, node.color, node.orig_id,
+                TestRBSnapshots._dump(node.left), TestRBSnapshots._dump(node.right))
+
+    def test_persistent_snapshots_match_eager_clones(self):
+        """测试路径复制的快照与每次 clone_tree 的结果一致，且之后的操作不会改变旧快照"""
+        import random
+        rng = random.Random(11)
+        eager = []
+        snapshot = self.rbt.snapshot
+
+        def recording_snapshot():
+            eager.append(self._dump(rb_clone_tree(self.rbt.root)))
+            return snapshot()
+
+        self.rbt.snapshot = recording_snapshot
+        persistent = []
+        for v in range(120):
+            persistent.extend(self.rbt.insert_with_steps(v)[3])
+        for v in rng.sample(range(120), 60):
+            persistent.extend(self.rbt.delete_with_steps(v)[3])
+        for v in rng.sample(range(1000), 60):
+            persistent.extend(self.rbt.insert_with_steps(v + 0.5)[3])
+        self.assertEqual(len(persistent), len(eager))
+        self.assertEqual([self._dump(s) for s in persistent], eager)
+
+    def test_snapshots_share_unchanged_subtrees(self):
+        """测试相邻快照之间只新建 O(log n) 个节点，未改变的树不新建节点"""
+        for v in range(500):
+            self.rbt.insert(v)
+        self.assertIs(self.rbt.snapshot(), self.rbt.snapshot())
+
+        def height(node):
+            return 0 if node is None else 1 + max(height(node.left), height(node.right))
+
+        for i in range(40):
+            if i % 2:
+                snapshots = self.rbt.delete_with_steps(self.rbt.root.left.val)[3]
+            else:
+                snapshots = self.rbt.insert_with_steps(500 + i)[3]
+            bound = 2 * (height(self.rbt.root) + 1)
+            for before, after in zip(snapshots, snapshots[1:]):
+                old = {id(n) for n in iter_inorder_stack(before)}
+                fresh = sum(1 for n in iter_inorder_stack(after) if id(n) not in old)
+                self.assertLessEqual(fresh, bound)
+
 
 class TestRBEdgeCases(unittest.TestCase):
     """红黑树边界情况测试"""
@@ -593,6 +929,216 @@ class TestRBEdgeCases(unittest.TestCase):
         # 验证根节点是黑色
         self.assertEqual(self.rbt.root.color, "B")
 
+    def test_key_follows_value_swap(self):
+        """测试删除时与后继交换值后，节点的比较键随之更新，查找仍然正确"""
+        for v in range(1, 32):
+            self.rbt.insert(v)
+        removed = self.rbt.root.val  # 根有两个孩子，删除时与后继交换值
+        self.rbt.delete_with_steps(removed)
+        for node in self.rbt.iter_nodes():
+            self.assertEqual(node.key, (int(node.val), str(node.val)))
+        for v in range(1, 32):
+            found = self.rbt.search_with_steps(v)[2]
+            self.assertEqual(found, v != removed)
+
+    def test_int_compare_truncates_like_before(self):
+        """测试整数比较语义保持不变 (int() 截断小数，非整数字符串按字符串比较)"""
+        self.assertFalse(self.rbt._compare_less(3.7, 3.2))
+        self.assertTrue(self.rbt._compare_less(9, 10))
+        self.assertTrue(self.rbt._compare_less("10", "9.5"))
+        self.assertTrue(self.rbt._compare_less(2, "abc"))
+
+
+class TestRBIterators(unittest.TestCase):
+    """红黑树惰性中序遍历与区间扫描测试"""
+
+    def setUp(self):
+        self.rbt = RBModel()
+
+    def test_iteration_and_range(self):
+        """测试中序迭代有序，区间扫描按 _compare_less 的顺序裁剪"""
+        import random
+        rng = random.Random(3)
+        values = [rng.randint(0, 60) for _ in range(150)]
+        for v in values:
+            self.rbt.insert(v)
+        self.assertEqual(list(self.rbt), sorted(values))
+        self.assertEqual(list(self.rbt.range(10, 20)), sorted(v for v in values if 10 <= v <= 20))
+        self.assertEqual(list(self.rbt.range(20, 10)), [])
+
+    def test_string_values(self):
+        """测试字符串值的区间扫描"""
+        for w in ["pear", "apple", "fig", "kiwi", "banana"]:
+            self.rbt.insert(w)
+        self.assertEqual(list(self.rbt.range("b", "g")), ["banana", "fig"])
+
+
+class TestRBFastPaths(unittest.TestCase):
+    """红黑树无动画插入 / 删除测试"""
+
+    @staticmethod
+    def _check(node):
+        """检查红黑性质和 parent 指针，返回黑高度"""
+        if node is None:
+            return 1
+        for child in (node.left, node.right):
+            if child is not None:
+                assert child.parent is node
+                assert not (node.color == "R" and child.color == "R"), "red-red"
+        left, right = TestRBFastPaths._check(node.left), TestRBFastPaths._check(node.right)
+        assert left == right, "black height"
+        return left + (1 if node.color == "B" else 0)
+
+    @staticmethod
+    def _dump(node):
+        if node is None:
+            return None
+        return (node.val, node.color, TestRBFastPaths._dump(node.left), TestRBFastPaths._dump(node.right))
+
+    def test_match_step_versions(self):
+        """测试 insert / delete 与带步骤的版本得到相同的树，且始终满足红黑性质"""
+        import random
+        rng = random.Random(22)
+        values = [rng.randint(0, 80) for _ in range(300)]
+        fast, steps = RBModel(), RBModel()
+        self.assertEqual(fast.insert_many(values), len(values))
+        for v in values:
+            steps.insert_with_steps(v)
+        self.assertEqual(self._dump(fast.root), self._dump(steps.root))
+        self._check(fast.root)
+        for v in rng.sample(values, 200) + [1000]:
+            self.assertEqual(fast.delete(v), steps.delete_with_steps(v)[0] is not None)
+            self.assertEqual(self._dump(fast.root), self._dump(steps.root))
+            self._check(fast.root)
+            self.assertEqual(fast.root.color, "B")
+
+    def test_zigzag_insert_fixup(self):
+        """测试需要两次旋转的插入 (父节点与新节点方向相反)"""
+        for values in ([30, 10, 20], [10, 30, 20]):
+            rbt = RBModel()
+            rbt.insert_many(values)
+            self.assertEqual(self._dump(rbt.root), (20, "B", (10, "R", None, None), (30, "R", None, None)))
+            rbt = RBModel()
+            for v in values:
+                rbt.insert_with_steps(v)
+            self.assertEqual(self._dump(rbt.root), (20, "B", (10, "R", None, None), (30, "R", None, None)))
+
+    def test_snapshots_after_fast_paths(self):
+        """测试无动画的修改之后，旧快照不变，新快照与当前树一致"""
+        rbt = RBModel()
+        rbt.insert_many(range(40))
+        old = rbt.snapshot()
+        expected = self._dump(old)
+        rbt.insert_many(range(40, 80))
+        for v in range(0, 80, 3):
+            rbt.delete(v)
+        self.assertEqual(self._dump(old), expected)
+        self.assertEqual(self._dump(rbt.snapshot()), self._dump(rbt.root))
+
+    def test_from_sorted(self):
+        """测试 from_sorted 的着色 (最底层为红) 满足红黑性质 (含重复值)，之后可以继续插入 / 删除"""
+        for n in range(70):
+            rbt = RBModel.from_sorted(range(n))
+            self._check(rbt.root)
+            self.assertEqual(list(rbt), list(range(n)))
+            if rbt.root:
+                self.assertEqual(rbt.root.color, "B")
+        rbt = RBModel.from_sorted([1, 2, 2, 2, 2, 3, "a", "b"])
+        self._check(rbt.root)
+        rbt.insert_many([2, 0, 5])
+        self.assertTrue(rbt.delete(3))
+        self._check(rbt.root)
+        self.assertEqual(list(rbt), [0, 1, 2, 2, 2, 2, 2, 5, "a", "b"])
+        with self.assertRaises(ValueError):
+            RBModel.from_sorted([1, 3, 2])
+
+    def test_load_from_tree_dict(self):
+        """测试存档恢复：有颜色时恢复原结构，没有颜色时按先序重新插入"""
+        from DS_visual import storage
+        rbt = RBModel()
+        rbt.insert_many(range(25))
+        tree_dict = storage.tree_to_dict(rbt.root)
+        restored = storage.tree_dict_to_nodes(tree_dict, RBNode)
+        self.assertEqual(self._dump(restored), self._dump(rbt.root))
+        for item in tree_dict["nodes"]:
+            del item["color"]
+        values = storage.tree_dict_values(tree_dict)
+        self.assertEqual(values[0], rbt.root.val)
+        self.assertEqual(storage.tree_dict_values(tree_dict, inorder=True), list(range(25)))
+        rebuilt = RBModel()
+        rebuilt.insert_many(values)
+        self._check(rebuilt.root)
+        self.assertEqual(list(rebuilt), list(range(25)))
+
+
+class TestRBJoinSplit(unittest.TestCase):
+    """红黑树 join / split 与集合运算测试"""
+
+    _check = staticmethod(TestRBFastPaths._check)
+    _dump = staticmethod(TestRBFastPaths._dump)
+
+    def _valid(self, model):
+        if model.root is not None:
+            self.assertEqual(model.root.color, "B")
+            self.assertIsNone(model.root.parent)
+        self._check(model.root)
+
+    def test_set_operations(self):
+        """测试并 / 交 / 差与 Python 集合一致，结果满足红黑性质，快照与结果一致"""
+        import random
+        rng = random.Random(32)
+        for _ in range(60):
+            a = set(rng.sample(range(300), rng.randint(0, 120)))
+            b = set(rng.sample(range(300), rng.randint(0, 120)))
+            for op, expected in ((RBModel.union, a | b), (RBModel.intersection, a & b),
+                                 (RBModel.difference, a - b)):
+                t1 = RBModel()
+                t1.insert_many(a)
+                t1.snapshot()
+                t2 = RBModel.from_sorted(sorted(b))
+                result = op(t1, t2)
+                self._valid(result)
+                self.assertEqual(list(result), sorted(expected))
+                self.assertEqual(self._dump(result.snapshot()), self._dump(result.root))
+                self.assertIsNone(t1.root)
+
+    def test_split_and_join(self):
+        """测试 split 按 < / >= 拆分，join 可以连接黑高度相差很大的树"""
+        rbt = RBModel()
+        rbt.insert_many([5] * 6 + list(range(10)))
+        left, right = rbt.split(5)
+        self.assertIsNone(rbt.root)
+        self._valid(left)
+        self._valid(right)
+        self.assertEqual(list(left), [0, 1, 2, 3, 4])
+        self.assertEqual(list(right), [5] * 7 + [6, 7, 8, 9])
+        for small in range(4):
+            joined = RBModel.join(RBModel.from_sorted(range(small)), 50, RBModel.from_sorted(range(100, 600)))
+            self._valid(joined)
+            self.assertEqual(list(joined), list(range(small)) + [50] + list(range(100, 600)))
+            joined = RBModel.join(RBModel.from_sorted(range(100, 600)), 1000,
+                                  RBModel.from_sorted(range(2000, 2000 + small)))
+            self._valid(joined)
+        with self.assertRaises(ValueError):
+            RBModel.join(RBModel.from_sorted([1, 9]), 5, RBModel.from_sorted([7]))
+
+    def test_join_spine_event(self):
+        """测试 join 记录下降经过的脊节点 id 和挂接位置"""
+        events = []
+        t1 = RBModel.from_sorted(range(64))
+        spine = []
+        node = t1.root
+        while node is not None:
+            spine.append(node.id)
+            node = node.right
+        joined = RBModel.join(t1, 100, RBModel.from_sorted([200]), events=events)
+        self._valid(joined)
+        event = events[0]
+        self.assertEqual(event['type'], 'join_spine')
+        self.assertEqual(event['side'], 'right')
+        self.assertEqual(event['spine_ids'], spine[:len(event['spine_ids'])])
+        self.assertEqual(event['attach_id'], event['spine_ids'][-1])
+
 
 def run_rbt_tests():
     """运行所有红黑树测试"""
@@ -605,6 +1151,9 @@ def run_rbt_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestRBOperations))
     suite.addTests(loader.loadTestsFromTestCase(TestRBSnapshots))
     suite.addTests(loader.loadTestsFromTestCase(TestRBEdgeCases))
+    suite.addTests(loader.loadTestsFromTestCase(TestRBIterators))
+    suite.addTests(loader.loadTestsFromTestCase(TestRBFastPaths))
+    suite.addTests(loader.loadTestsFromTestCase(TestRBJoinSplit))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -419,6 +419,316 @@ class TestEdgeCases(unittest.TestCase):
         self.assertIsNone(node)
 
 
+class TestOrderStatistics(unittest.TestCase):
+    """测试子树大小与顺序统计查询"""
+
+    def setUp(self):
+        self.bst = BSTModel()
+
+    def _check_sizes(self, node):
+        if node is None:
+            return 0
+        size = 1 + self._check_sizes(node.left) + self._check_sizes(node.right)
+        self.assertEqual(node.size, size)
+        return size
+
+    def test_sizes_maintained_by_insert_and_delete(self):
+        """测试插入、三种删除情况后子树大小保持正确"""
+        import random
+        rng = random.Random(7)
+        values = [rng.randint(0, 60) for _ in range(120)]
+        for v in values:
+            self.bst.insert(v)
+            self._check_sizes(self.bst.root)
+        rng.shuffle(values)
+        for v in values[:90]:
+            ok, _ = self.bst.delete(v)
+            self.assertTrue(ok)
+            self._check_sizes(self.bst.root)
+        self.assertEqual(len(self.bst), 30)
+
+    def test_rank_select_count_range(self):
+        """测试 rank / select / count_range 与排序列表一致 (含重复值)"""
+        import bisect
+        import random
+        rng = random.Random(11)
+        values = [rng.randint(0, 40) for _ in range(80)]
+        for v in values:
+            self.bst.insert(v)
+        ordered = sorted(values)
+        for k in range(len(ordered)):
+            node, path = self.bst.select(k)
+            self.assertEqual(node.val, ordered[k])
+            self.assertIs(path[-1], node)
+        for q in range(-2, 44):
+            rank, path = self.bst.rank(q)
+            self.assertEqual(rank, bisect.bisect_left(ordered, q))
+            self.assertTrue(path)
+        for lo, hi in [(0, 40), (5, 5), (10, 20), (30, 100), (20, 10)]:
+            count, _ = self.bst.count_range(lo, hi)
+            expected = max(0, bisect.bisect_right(ordered, hi) - bisect.bisect_left(ordered, lo))
+            self.assertEqual(count, expected)
+        self.assertEqual(self.bst.select(len(ordered)), (None, []))
+        self.assertEqual(self.bst.select(-1), (None, []))
+
+    def test_median(self):
+        """测试中位数 (偶数个时取下中位数)"""
+        self.assertEqual(self.bst.median(), (None, []))
+        for v in [15, 6, 23, 4, 7, 71, 5]:
+            self.bst.insert(v)
+        self.assertEqual(self.bst.median()[0].val, 7)
+        self.bst.insert(16)
+        self.assertEqual(self.bst.median()[0].val, 7)
+
+    def test_recompute_sizes(self):
+        """测试直接拼接节点后重建子树大小"""
+        root = TreeNode(5)
+        root.left, root.right = TreeNode(3), TreeNode(8)
+        root.left.parent = root.right.parent = root
+        root.right.left = TreeNode(7)
+        root.right.left.parent = root.right
+        self.bst.root = root
+        self.bst.recompute_sizes()
+        self._check_sizes(root)
+        self.assertEqual(self.bst.rank(8)[0], 3)
+
+
+class TestBalancedBuild(unittest.TestCase):
+    """测试平衡构建与 DSW 重平衡"""
+
+    def _height(self, node):
+        """迭代计算树高 (退化的链也不会递归溢出)"""
+        best, stack = 0, [(node, 1)] if node else []
+        while stack:
+            n, d = stack.pop()
+            best = max(best, d)
+            stack.extend((c, d + 1) for c in (n.left, n.right) if c)
+        return best
+
+    def _check(self, bst):
+        """检查 parent 指针、size 和中序有序 (相等值不在左子树)"""
+        values = []
+
+        def walk(node, parent):
+            if node is None:
+                return 0
+            self.assertIs(node.parent, parent)
+            left = walk(node.left, node)
+            values.append(node.val)
+            right = walk(node.right, node)
+            self.assertEqual(node.size, 1 + left + right)
+            return 1 + left + right
+
+        walk(bst.root, None)
+        self.assertEqual(values, sorted(values))
+        return values
+
+    def test_build_balanced_sorted_input(self):
+        """测试有序输入不再退化成链"""
+        bst = BSTModel()
+        for n in (0, 1, 2, 7, 8, 1000):
+            bst.build_balanced(range(n))
+            self.assertEqual(self._check(bst), list(range(n)))
+            self.assertEqual(self._height(bst.root), n.bit_length())
+
+    def test_build_balanced_unsorted_with_duplicates(self):
+        """测试乱序含重复值的输入：与逐个插入得到相同的中序序列，且相等值在右子树"""
+        import random
+        rng = random.Random(5)
+        values = [rng.randint(0, 30) for _ in range(200)]
+        bst = BSTModel()
+        bst.build_balanced(values)
+        self.assertEqual(self._check(bst), sorted(values))
+
+        def no_equal_on_left(node):
+            if node is None:
+                return
+            cur = node.left
+            while cur:
+                self.assertLess(cur.val, node.val)
+                cur = cur.right
+            no_equal_on_left(node.left)
+            no_equal_on_left(node.right)
+
+        no_equal_on_left(bst.root)
+        for v in set(values):
+            self.assertIsNotNone(bst.search_with_path(v)[0])
+        self.assertEqual(bst.rank(15)[0], sum(1 for v in values if v < 15))
+
+    def test_rebalance_degenerate_chain(self):
+        """测试 DSW 把有序插入产生的链重平衡到最小高度"""
+        bst = BSTModel()
+        for v in range(1, 1001):
+            bst.insert(v)
+        self.assertEqual(self._height(bst.root), 1000)
+        bst.rebalance()
+        self.assertEqual(self._check(bst), list(range(1, 1001)))
+        self.assertEqual(self._height(bst.root), 10)
+        bst.insert(0)
+        bst.delete(500)
+        self._check(bst)
+
+    def test_rebalance_small_trees(self):
+        """测试空树和小树的重平衡"""
+        bst = BSTModel()
+        bst.rebalance()
+        self.assertIsNone(bst.root)
+        for values in ([1], [2, 1], [3, 2, 1], ["b", "a", "c", "d"]):
+            bst = BSTModel()
+            for v in values:
+                bst.insert(v)
+            bst.rebalance()
+            self.assertEqual(self._check(bst), sorted(values))
+            self.assertEqual(self._height(bst.root), len(values).bit_length())
+
+
+class TestTreeIterators(unittest.TestCase):
+    """测试沿 parent 指针的惰性中序遍历与区间扫描"""
+
+    def test_iteration_matches_sorted(self):
+        """测试中序迭代与排序结果一致，且可以只遍历子树"""
+        import random
+        rng = random.Random(11)
+        values = [rng.randint(0, 50) for _ in range(300)]
+        bst = BSTModel()
+        for v in values:
+            bst.insert(v)
+        self.assertEqual(list(bst), sorted(values))
+        self.assertEqual([n.val for n in bst.iter_nodes()], sorted(values))
+        from DS_visual.binary_tree.tree_iter import iter_inorder
+        sub = bst.root.left
+        self.assertEqual([n.val for n in iter_inorder(sub)], sorted(v for v in values if v < bst.root.val))
+        depths = dict((id(n), d) for n, d in iter_inorder(bst.root, with_depth=True))
+        self.assertEqual(depths[id(bst.root)], 0)
+        self.assertEqual(depths[id(sub)], 1)
+        self.assertEqual(list(BSTModel()), [])
+
+    def test_range_with_duplicates_and_bounds(self):
+        """测试闭区间扫描：重复值、边界不在树中、空区间"""
+        bst = BSTModel()
+        values = [5, 3, 8, 3, 5, 5, 9, 1, 7]
+        for v in values:
+            bst.insert(v)
+        self.assertEqual(list(bst.range(3, 7)), [3, 3, 5, 5, 5, 7])
+        self.assertEqual(list(bst.range(4, 6)), [5, 5, 5])
+        self.assertEqual(list(bst.range(10, 20)), [])
+        self.assertEqual(list(bst.range(0, 100)), sorted(values))
+        self.assertEqual(list(bst.range(7, 3)), [])
+        self.assertEqual(len(list(bst.range(3, 7))), bst.count_range(3, 7)[0])
+
+    def test_deep_chain_does_not_recurse(self):
+        """测试退化成链的深树也能遍历 (超过递归深度限制)"""
+        bst = BSTModel()
+        depth = sys.getrecursionlimit() + 500
+        for v in range(depth):
+            bst.insert(v)
+        self.assertEqual(sum(1 for _ in bst), depth)
+        self.assertEqual(list(bst.range(depth - 3, depth + 3)), [depth - 3, depth - 2, depth - 1])
+
+
+class TestTidyLayout(unittest.TestCase):
+    """测试共用的整洁布局 (Reingold-Tilford) 与增量重新布局"""
+
+    @staticmethod
+    def _levels(root, pos, with_nulls=False):
+        """按中序 (含 NULL 占位) 收集每一层的 x 坐标"""
+        levels = {}
+        stack, node = [], root
+        items = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if with_nulls and node.left is None:
+                items.append((node, "left"))
+            items.append(node)
+            if with_nulls and node.right is None:
+                items.append((node, "right"))
+            node = node.right
+        for item in items:
+            x, depth = pos[item]
+            levels.setdefault(depth, []).append(x)
+        return levels
+
+    def _check(self, root, pos, with_nulls=False):
+        for xs in self._levels(root, pos, with_nulls).values():
+            for a, b in zip(xs, xs[1:]):
+                self.assertGreaterEqual(b - a, 1 - 1e-9)
+
+    def test_layout_properties(self):
+        """测试同层间距、父节点居中、单个孩子偏向自己一侧，宽度小于中序铺开"""
+        import random
+        from DS_visual.binary_tree.tidy_layout import tidy_layout
+        rng = random.Random(12)
+        bst = BSTModel()
+        for v in rng.sample(range(1000), 200):
+            bst.insert(v)
+        pos = tidy_layout(bst.root)
+        self.assertEqual(len(pos), 200)
+        self.assertEqual(pos[bst.root], (0.0, 0))
+        self._check(bst.root, pos)
+        for node in bst.iter_nodes():
+            x, depth = pos[node]
+            if node.left and node.right:
+                self.assertAlmostEqual((pos[node.left][0] + pos[node.right][0]) / 2, x)
+            elif node.left:
+                self.assertEqual(pos[node.left], (x - 0.5, depth + 1))
+            elif node.right:
+                self.assertEqual(pos[node.right], (x + 0.5, depth + 1))
+        xs = [x for x, _ in pos.values()]
+        self.assertLess(max(xs) - min(xs), 199)
+
+    def test_incremental_relayout(self):
+        """测试增量布局与从头布局结果相同，插入 / 删除后只重新计算改动的路径"""
+        import random
+        from DS_visual.binary_tree.tidy_layout import TidyLayout, tidy_layout
+        rng = random.Random(13)
+        bst = BSTModel()
+        bst.build_balanced(range(0, 2000, 2), presorted=True)
+        layout = TidyLayout()
+        layout.layout(bst.root)
+        self.assertEqual(layout.rebuilt, 1000)
+        for v in rng.sample(range(1, 2000, 2), 20):
+            bst.insert(v)
+            pos = layout.layout(bst.root)
+            self.assertEqual(pos, tidy_layout(bst.root))
+            self.assertLessEqual(layout.rebuilt, 15)
+        for v in rng.sample(range(0, 2000, 2), 20):
+            bst.delete(v)
+            self.assertEqual(layout.layout(bst.root), tidy_layout(bst.root))
+        self.assertEqual(layout.layout(None), {})
+
+    def test_null_slots_and_fit(self):
+        """测试 NULL 占位也保持间距；fit_positions 居中并在放不下时缩小"""
+        from DS_visual.binary_tree.tidy_layout import tidy_layout, fit_positions
+        bst = BSTModel()
+        for v in [50, 30, 70, 20, 40, 80, 35]:
+            bst.insert(v)
+        pos = tidy_layout(bst.root, null_slots=True)
+        self._check(bst.root, pos, with_nulls=True)
+        self.assertIn((bst.root.right, "left"), pos)
+        fitted = fit_positions(pos, 0, 1000, 80, 100, 140)
+        xs = [x for x, _ in fitted.values()]
+        self.assertAlmostEqual((min(xs) + max(xs)) / 2, 500)
+        self.assertEqual(fitted[bst.root][1], 80)
+        narrow = fit_positions(pos, 0, 100, 80, 100, 140)
+        xs = [x for x, _ in narrow.values()]
+        self.assertAlmostEqual(max(xs) - min(xs), 100)
+
+    def test_deep_chain_does_not_recurse(self):
+        """测试退化成链的深树也能布局 (超过递归深度限制)"""
+        from DS_visual.binary_tree.tidy_layout import tidy_layout
+        root = prev = TreeNode(0)
+        depth = sys.getrecursionlimit() + 500
+        for v in range(1, depth):
+            node = TreeNode(v)
+            prev.right, node.parent = node, prev
+            prev = node
+        pos = tidy_layout(root)
+        self.assertEqual(pos[prev], ((depth - 1) * 0.5, depth - 1))
+
+
 def run_bst_tests():
     """运行所有BST测试"""
     # 创建测试套件
@@ -430,6 +740,10 @@ def run_bst_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestBSTModel))
     suite.addTests(loader.loadTestsFromTestCase(TestBSTProperties))
     suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderStatistics))
+    suite.addTests(loader.loadTestsFromTestCase(TestBalancedBuild))
+    suite.addTests(loader.loadTestsFromTestCase(TestTreeIterators))
+    suite.addTests(loader.loadTestsFromTestCase(TestTidyLayout))
     
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
@@ -449,4 +763,4 @@ def run_bst_tests():
 
 if __name__ == '__main__':
     success = run_bst_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+循环队列模型测试程序
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# circular_queue 包按应用内方式导入（与 bfs_visual / circular_queue_visual 一致）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DS_visual"))
+
+from circular_queue.circular_queue_model import CircularQueueModel
+from circular_queue.concurrent_queue import SPSCRingQueue, MPMCRingQueue, Empty, Full
+from circular_queue.async_queue import AsyncCircularQueue, stream_to_queue
+
+
+class TestCircularQueueModel(unittest.TestCase):
+    """测试循环队列的基本操作"""
+
+    def test_basic_operations(self):
+        """测试入队、出队与满/空判断"""
+        q = CircularQueueModel(5)
+        self.assertTrue(q.is_empty())
+        for i in range(5):
+            self.assertTrue(q.enqueue(i))
+        self.assertTrue(q.is_full())
+        self.assertFalse(q.enqueue(99))
+        self.assertEqual([q.dequeue() for _ in range(5)], [0, 1, 2, 3, 4])
+        self.assertIsNone(q.dequeue())
+
+    def test_resize_preserves_wrapped_order(self):
+        """测试环绕后扩容与缩容保持逻辑顺序"""
+        q = CircularQueueModel(4)
+        q.enqueue_many([1, 2, 3, 4])
+        q.dequeue_many(2)
+        q.enqueue_many([5, 6])  # 已环绕: head=2, tail=2
+        self.assertEqual(q.items(), [3, 4, 5, 6])
+        q.resize(8)
+        self.assertEqual((q.head, q.tail, q.size), (0, 4, 4))
+        self.assertEqual(q.to_list(), [3, 4, 5, 6, None, None, None, None])
+        q.resize(3)
+        self.assertEqual(q.items(), [3, 4, 5])
+        self.assertTrue(q.is_full())
+        self.assertEqual(q.tail, 0)
+
+    def test_auto_grow(self):
+        """测试自动扩容模式下入队不会失败"""
+        q = CircularQueueModel(2, auto_grow=True)
+        for i in range(100):
+            self.assertTrue(q.enqueue(i))
+        self.assertEqual(q.capacity, 128)
+        self.assertEqual(q.dequeue_many(), list(range(100)))
+        restored = CircularQueueModel.from_dict(q.to_dict())
+        self.assertTrue(restored.auto_grow)
+
+    def test_enqueue_many_wraps(self):
+        """测试批量入队跨越缓冲区末尾以及容量不足时的部分入队"""
+        q = CircularQueueModel(6)
+        q.enqueue_many("abcd")
+        self.assertEqual(q.dequeue_many(3), ["a", "b", "c"])
+        self.assertEqual(q.enqueue_many(range(10)), 5)
+        self.assertEqual(q.items(), ["d", 0, 1, 2, 3, 4])
+        self.assertEqual(q.to_list(), [2, 3, 4, "d", 0, 1])
+        self.assertEqual(q.enqueue_many([]), 0)
+
+    def test_dequeue_many_wraps(self):
+        """测试批量出队跨越缓冲区末尾并清空槽位"""
+        q = CircularQueueModel(5)
+        q.enqueue_many([1, 2, 3, 4])
+        q.dequeue_many(3)
+        q.enqueue_many([5, 6, 7])
+        self.assertEqual(q.dequeue_many(10), [4, 5, 6, 7])
+        self.assertEqual(q.to_list(), [None] * 5)
+        self.assertEqual(q.dequeue_many(), [])
+        self.assertTrue(q.is_empty())
+
+    def test_batch_matches_single(self):
+        """测试批量操作与逐个操作的结果一致"""
+        import random
+        rng = random.Random(3)
+        batch, single = CircularQueueModel(7, auto_grow=True), CircularQueueModel(7, auto_grow=True)
+        counter = 0
+        for _ in range(300):
+            if rng.random() < 0.55:
+                values = list(range(counter, counter + rng.randint(0, 9)))
+                counter += len(values)
+                batch.enqueue_many(values)
+                for v in values:
+                    single.enqueue(v)
+            else:
+                k = rng.randint(0, 9)
+                expected = [single.dequeue() for _ in range(min(k, len(single)))]
+                self.assertEqual(batch.dequeue_many(k), expected)
+            self.assertEqual(batch.items(), single.items())
+
+
+class TestConcurrentQueues(unittest.TestCase):
+    """测试线程安全的 SPSC / MPMC 环形队列"""
+
+    def test_spsc_preserves_order_across_threads(self):
+        """测试单生产者单消费者在小容量下保持 FIFO 顺序"""
+        q = SPSCRingQueue(4)
+        n = 5000
+        received = []
+
+        def consume():
+            for _ in range(n):
+                received.append(q.get(timeout=5))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for i in range(n):
+            q.put(i, timeout=5)
+        consumer.join(10)
+        self.assertEqual(received, list(range(n)))
+        self.assertEqual(len(q), 0)
+
+    def test_mpmc_delivers_every_item_once(self):
+        """测试多生产者多消费者时每个元素恰好被取出一次，且每个生产者内部有序"""
+        q = MPMCRingQueue(5)
+        producers, consumers, per_producer = 3, 3, 2000
+        results = [[] for _ in range(consumers)]
+
+        def produce(p):
+            for i in range(per_producer):
+                q.put((p, i), timeout=5)
+
+        def consume(c):
+            while True:
+                item = q.get(timeout=5)
+                if item is None:
+                    return
+                results[c].append(item)
+
+        threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        threads += [threading.Thread(target=consume, args=(c,)) for c in range(consumers)]
+        for t in threads:
+            t.start()
+        for t in threads[:producers]:
+            t.join(10)
+        for _ in range(consumers):
+            q.put(None, timeout=5)
+        for t in threads[producers:]:
+            t.join(10)
+
+        everything = [item for r in results for item in r]
+        self.assertEqual(sorted(everything), [(p, i) for p in range(producers) for i in range(per_producer)])
+        for r in results:
+            for p in range(producers):
+                seq = [i for pp, i in r if pp == p]
+                self.assertEqual(seq, sorted(seq))
+
+    def test_timeouts_and_nowait(self):
+        """测试满 / 空时的非阻塞调用与超时"""
+        for q in (SPSCRingQueue(2), MPMCRingQueue(2)):
+            self.assertRaises(Empty, q.get_nowait)
+            q.put("a")
+            q.put("b")
+            self.assertRaises(Full, q.put_nowait, "c")
+            t0 = time.monotonic()
+            self.assertRaises(Full, q.put, "c", timeout=0.05)
+            self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+            self.assertEqual(q.snapshot().items(), ["a", "b"])
+            self.assertEqual([q.get(), q.get()], ["a", "b"])
+            self.assertRaises(Empty, q.get, timeout=0.05)
+
+    def test_put_many_timeout_reports_count(self):
+        """测试 put_many 在几乎满的队列上超时时返回已入队的个数"""
+        q = MPMCRingQueue(4)
+        q.put("x")
+        t0 = time.monotonic()
+        self.assertEqual(q.put_many(["a", "b", "c", "d", "e"], timeout=0.05), 3)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+        self.assertEqual(q.snapshot().items(), ["x", "a", "b", "c"])
+        self.assertEqual(q.get(), "x")
+        self.assertEqual(q.put_many(["d", "e"], timeout=0.05), 1)
+        self.assertEqual(q.get_many(10), ["a", "b", "c", "d"])
+        self.assertEqual(q.put_many(["e"]), 1)
+
+    def test_blocking_put_wakes_on_get(self):
+        """测试队列满时阻塞的 put 在消费者取出后被唤醒"""
+        q = MPMCRingQueue(1)
+        q.put(1)
+        done = threading.Event()
+
+        def produce():
+            q.put(2, timeout=5)
+            done.set()
+
+        t = threading.Thread(target=produce)
+        t.start()
+        self.assertFalse(done.wait(0.05))
+        self.assertEqual(q.get(), 1)
+        self.assertTrue(done.wait(5))
+        t.join(5)
+        self.assertEqual(q.get_many(10), [2])
+
+    def test_snapshot_of_wrapped_spsc(self):
+        """测试 SPSC 快照的 head / tail 与环形缓冲区一致"""
+        q = SPSCRingQueue(4)
+        for i in range(6):
+            q.put(i)
+            if i >= 2:
+                q.get()
+        model = q.snapshot()
+        self.assertEqual(model.items(), [4, 5])
+        self.assertEqual((model.head, model.tail, model.size), (0, 2, 2))
+
+
+class TestAsyncCircularQueue(unittest.TestCase):
+    """测试 asyncio 循环队列的背压与 FIFO 唤醒"""
+
+    def test_back_pressure_and_order(self):
+        """测试缓冲区满时 put 挂起，多个生产者的元素全部按各自顺序到达"""
+        async def main():
+            q = AsyncCircularQueue(3)
+            producers = [asyncio.ensure_future(stream_to_queue(q, [(p, i) for i in range(50)]))
+                         for p in range(4)]
+            await asyncio.sleep(0)
+            self.assertTrue(q.full())
+            received = [await q.get() for _ in range(200)]
+            self.assertEqual(await asyncio.gather(*producers), [50] * 4)
+            return received
+
+        received = asyncio.run(main())
+        for p in range(4):
+            self.assertEqual([i for pp, i in received if pp == p], list(range(50)))
+
+    def test_waiters_wake_in_fifo_order(self):
+        """测试阻塞的 put / get 按到达顺序被唤醒，新来的协程不能插队"""
+        async def main():
+            q = AsyncCircularQueue(1)
+            await q.put("x")
+            order = []
+
+            async def putter(name):
+                await q.put(name)
+                order.append(name)
+
+            tasks = [asyncio.ensure_future(putter(n)) for n in "abc"]
+            await asyncio.sleep(0)
+            self.assertEqual(await q.get(), "x")
+            # a 已被唤醒但还没运行，此时 put_nowait 也必须排队
+            self.assertRaises(asyncio.QueueFull, q.put_nowait, "late")
+            got = [await q.get() for _ in range(3)]
+            await asyncio.gather(*tasks)
+            self.assertEqual(order, ["a", "b", "c"])
+            self.assertEqual(got, ["a", "b", "c"])
+
+            results = []
+
+            async def getter(name):
+                results.append((name, await q.get()))
+
+            tasks = [asyncio.ensure_future(getter(n)) for n in range(3)]
+            await asyncio.sleep(0)
+            for v in "uvw":
+                await q.put(v)
+            await asyncio.gather(*tasks)
+            self.assertEqual(results, [(0, "u"), (1, "v"), (2, "w")])
+
+        asyncio.run(main())
+
+    def test_cancelled_waiter_passes_wakeup_on(self):
+        """测试被唤醒后取消的等待者把预留位置交给下一个"""
+        async def main():
+            q = AsyncCircularQueue(1)
+            await q.put(0)
+            first = asyncio.ensure_future(q.put(1))
+            second = asyncio.ensure_future(q.put(2))
+            await asyncio.sleep(0)
+            self.assertEqual(q.get_nowait(), 0)  # 唤醒 first
+            first.cancel()
+            await asyncio.sleep(0)
+            await asyncio.wait_for(second, 1)
+            self.assertEqual(q.model.items(), [2])
+            self.assertEqual((q._woken_putters, len(q._putters)), (0, 0))
+
+        asyncio.run(main())
+
+    def test_on_change_callback(self):
+        """测试 on_change 在每次入队 / 出队后被调用"""
+        events = []
+
+        async def main():
+            q = AsyncCircularQueue(2, on_change=lambda op, v: events.append((op, v)))
+            await q.put(1)
+            await q.get()
+
+        asyncio.run(main())
+        self.assertEqual(events, [("enqueue", 1), ("dequeue", 1)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
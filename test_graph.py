@@ -0,0 +1,726 @@
+#!/usr/bin/env python3
+"""
+有向图模型测试程序 (DFS/BFS 演示所用的 DirectedGraph)
+"""
+
+import unittest
+import sys
+import os
+
+# 图模型按应用内方式导入（与 dfs_visual / bfs_visual 一致）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DS_visual"))
+
+from stack.graph_model import DirectedGraph as DFSGraph, dfs_traversal
+from stack.graph_model import (topological_sort, strongly_connected_components, kosaraju_scc,
+                                topological_sort_traversal, tarjan_scc_traversal)
+from circular_queue.graph_model import DirectedGraph as BFSGraph, bfs_traversal
+from circular_queue.graph_model import (multi_source_bfs_traversal, bidirectional_bfs_traversal,
+                                        bidirectional_shortest_path)
+from graph import csr_graph
+from graph.csr_graph import CSRGraph
+from graph.parallel_bfs import compute_layers, parallel_bfs_layers
+from graph.generators import erdos_renyi, barabasi_albert, grid_graph, tree_graph
+from graph.force_layout import ForceLayout
+from graph import layered_layout as layered
+from graph.shortest_path import (IndexedMinHeap, dijkstra, astar, shortest_path, reconstruct_path,
+                                 dijkstra_traversal)
+from graph import graph_io
+from graph.directed_graph import DirectedGraph
+from graph.traversal import iter_dfs, iter_bfs
+from graph.demo_graphs import generate_dfs_friendly_graph, generate_bfs_friendly_graph
+
+
+class TestIndexedAdjacency(unittest.TestCase):
+    """测试带逆邻接表的有向图"""
+
+    graph_cls = DFSGraph
+
+    def setUp(self):
+        self.g = self.graph_cls()
+        for u, v in [("A", "C"), ("A", "B"), ("B", "C"), ("C", "A"), ("D", "C")]:
+            self.g.add_edge(u, v)
+
+    def test_neighbor_order_is_insertion_order(self):
+        """测试邻居顺序与边的插入顺序一致"""
+        self.assertEqual(self.g.get_neighbors("A"), ["C", "B"])
+        self.assertEqual(self.g.get_predecessors("C"), ["A", "B", "D"])
+
+    def test_duplicate_edge(self):
+        """测试重复边不会被添加"""
+        self.assertFalse(self.g.add_edge("A", "B"))
+        self.assertEqual(self.g.edge_count(), 5)
+
+    def test_degrees(self):
+        """测试入度与出度"""
+        self.assertEqual(self.g.in_degree("C"), 3)
+        self.assertEqual(self.g.out_degree("A"), 2)
+        self.assertEqual(self.g.in_degree("D"), 0)
+        self.assertEqual(self.g.in_degree("Z"), 0)
+
+    def test_remove_edge(self):
+        """测试删除边后逆邻接表同步更新"""
+        self.assertTrue(self.g.remove_edge("B", "C"))
+        self.assertFalse(self.g.has_edge("B", "C"))
+        self.assertEqual(self.g.get_predecessors("C"), ["A", "D"])
+        self.assertEqual(self.g.edge_count(), 4)
+        self.assertFalse(self.g.remove_edge("B", "C"))
+
+    def test_remove_vertex(self):
+        """测试删除顶点会删除所有相关的边"""
+        self.g.set_position("C", 1, 2)
+        self.assertTrue(self.g.remove_vertex("C"))
+        self.assertFalse(self.g.has_vertex("C"))
+        self.assertEqual(self.g.get_neighbors("A"), ["B"])
+        self.assertEqual(self.g.get_predecessors("A"), [])
+        self.assertEqual(self.g.edge_count(), 1)
+        self.assertIsNone(self.g.get_position("C"))
+
+    def test_remove_vertex_with_self_loop(self):
+        """测试删除带自环的顶点"""
+        self.g.add_edge("B", "B")
+        self.assertEqual(self.g.edge_count(), 6)
+        self.g.remove_vertex("B")
+        self.assertEqual(self.g.edge_count(), 3)
+        self.assertEqual(len(self.g.get_edges()), 3)
+
+    def test_dict_round_trip(self):
+        """测试序列化与反序列化"""
+        g2 = self.graph_cls.from_dict(self.g.to_dict())
+        self.assertEqual(g2.get_edges(), self.g.get_edges())
+        self.assertEqual(g2.in_degree("C"), 3)
+
+
+class TestBFSGraphAdjacency(TestIndexedAdjacency):
+    """BFS 演示使用的有向图应具有相同行为"""
+
+    graph_cls = BFSGraph
+
+
+class TestTraversalSteps(unittest.TestCase):
+    """测试遍历步骤"""
+
+    def test_dfs_order(self):
+        """测试DFS访问顺序"""
+        g = DFSGraph()
+        for u, v in [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")]:
+            g.add_edge(u, v)
+        visits = [s[1] for s in dfs_traversal(g, "A") if s[0] == "visit"]
+        self.assertEqual(visits, ["A", "B", "D", "C"])
+
+    def test_bfs_order(self):
+        """测试BFS访问顺序"""
+        g = BFSGraph()
+        for u, v in [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")]:
+            g.add_edge(u, v)
+        visits = [s[1] for s in bfs_traversal(g, "A") if s[0] == "visit"]
+        self.assertEqual(visits, ["A", "B", "C", "D"])
+
+
+class TestBFSVariants(unittest.TestCase):
+    """测试多源BFS与双向BFS"""
+
+    def setUp(self):
+        self.g = BFSGraph()
+        for u, v in [("A", "B"), ("B", "C"), ("C", "D"), ("D", "E"), ("A", "F"),
+                     ("F", "E"), ("G", "D"), ("X", "A")]:
+            self.g.add_edge(u, v)
+
+    def test_bfs_queue_grows(self):
+        """测试BFS在队列超过初始容量时仍然正确"""
+        g = BFSGraph()
+        for i in range(1, 50):
+            g.add_edge(0, i)
+        visits = [s[1] for s in bfs_traversal(g, 0) if s[0] == "visit"]
+        self.assertEqual(visits, list(range(50)))
+
+    def test_multi_source(self):
+        """测试多源BFS按源点顺序作为第0层"""
+        steps = multi_source_bfs_traversal(self.g, ["G", "B", "G"])
+        visits = [s[1] for s in steps if s[0] == "visit"]
+        self.assertEqual(visits, ["G", "B", "D", "C", "E"])
+        self.assertEqual(steps[-1], ("done", None, None))
+        self.assertEqual(multi_source_bfs_traversal(self.g, ["Z"])[0][0], "error")
+
+    def test_bidirectional_path(self):
+        """测试双向BFS找到最短路径"""
+        self.assertEqual(bidirectional_shortest_path(self.g, "A", "E"), ["A", "F", "E"])
+        self.assertEqual(bidirectional_shortest_path(self.g, "X", "D"), ["X", "A", "B", "C", "D"])
+        self.assertEqual(bidirectional_shortest_path(self.g, "C", "C"), ["C"])
+        self.assertIsNone(bidirectional_shortest_path(self.g, "E", "A"))
+
+    def test_bidirectional_steps(self):
+        """测试双向BFS步骤带有方向信息"""
+        steps = bidirectional_bfs_traversal(self.g, "A", "E")
+        directions = {s[2] for s in steps if s[0] == "visit"}
+        self.assertEqual(directions, {"forward", "backward"})
+        self.assertIn(("path", ["A", "F", "E"], 2), steps)
+        no_path = bidirectional_bfs_traversal(self.g, "E", "A")
+        self.assertIn(("no_path", "E", "A"), no_path)
+
+
+class TestCSRGraph(unittest.TestCase):
+    """测试冻结后的 CSR 图"""
+
+    def setUp(self):
+        self.g = DFSGraph()
+        for u, v in [("A", "C"), ("A", "B"), ("B", "D"), ("C", "D"), ("D", "A"), ("E", "A")]:
+            self.g.add_edge(u, v)
+        self.csr = self.g.freeze()
+
+    def test_structure(self):
+        """测试冻结后的结构与原图一致"""
+        self.assertEqual(self.csr.vertex_count(), 5)
+        self.assertEqual(self.csr.edge_count(), 6)
+        self.assertEqual(self.csr.get_edges(), self.g.get_edges())
+        for v in self.g.get_vertices():
+            self.assertEqual(self.csr.get_neighbors(v), self.g.get_neighbors(v))
+        self.assertTrue(self.csr.has_edge("A", "B"))
+        self.assertFalse(self.csr.has_edge("B", "A"))
+        self.assertFalse(self.csr.has_vertex("Z"))
+
+    def test_traversal_steps_match(self):
+        """测试 CSR 上的遍历步骤与原实现完全一致"""
+        for start in self.g.get_vertices():
+            self.assertEqual(csr_graph.dfs_traversal(self.csr, start), dfs_traversal(self.g, start))
+        bfs_g = BFSGraph.from_dict(self.g.to_dict())
+        for start in bfs_g.get_vertices():
+            self.assertEqual(csr_graph.bfs_traversal(bfs_g.freeze(), start), bfs_traversal(bfs_g, start))
+
+    def test_orders(self):
+        """测试无步骤记录的遍历顺序"""
+        self.assertEqual(csr_graph.bfs_order(self.csr, "E"), ["E", "A", "C", "B", "D"])
+        self.assertEqual(csr_graph.dfs_order(self.csr, "E"), ["E", "A", "C", "D", "B"])
+
+    def test_from_edges(self):
+        """测试由下标边列表构建 (保持同一起点的边的顺序)"""
+        csr = CSRGraph.from_edges(4, [2, 0, 2, 1], [3, 1, 0, 2])
+        self.assertEqual(csr.get_neighbors(2), [3, 0])
+        self.assertEqual(csr.out_degree(0), 1)
+        self.assertEqual(csr_graph.bfs_order(csr, 0), [0, 1, 2, 3])
+        self.assertFalse(csr.has_vertex(4))
+
+
+class TestLevelSynchronousBFS(unittest.TestCase):
+    """测试层同步BFS (串行与进程池版本结果一致)"""
+
+    def setUp(self):
+        self.g = DFSGraph()
+        for u, v in [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("C", "E"), ("E", "F"), ("G", "A")]:
+            self.g.add_edge(u, v)
+
+    def test_compute_layers(self):
+        """测试层级划分"""
+        vertex_layer, layer_vertices = compute_layers(self.g, "A")
+        self.assertEqual(layer_vertices, {0: ["A"], 1: ["B", "C"], 2: ["D", "E"], 3: ["F"]})
+        self.assertEqual(vertex_layer["F"], 3)
+        self.assertNotIn("G", vertex_layer)
+
+    def test_parallel_matches_serial(self):
+        """测试进程池版本与串行版本输出完全相同"""
+        expected = compute_layers(self.g, "A")
+        csr = self.g.freeze()
+        self.assertEqual(parallel_bfs_layers(csr, "A", workers=1), expected)
+        self.assertEqual(parallel_bfs_layers(csr, "A", workers=2, threshold=1), expected)
+
+
+class TestGenerators(unittest.TestCase):
+    """测试大规模图生成器"""
+
+    def test_erdos_renyi_reproducible(self):
+        """测试相同种子生成相同的图"""
+        a = erdos_renyi(300, 0.02, seed=5)
+        b = erdos_renyi(300, 0.02, seed=5)
+        self.assertEqual(a.get_edges(), b.get_edges())
+        self.assertNotEqual(a.get_edges(), erdos_renyi(300, 0.02, seed=6).get_edges())
+
+    def test_erdos_renyi_edges(self):
+        """测试边数接近期望且没有自环和重边"""
+        n, p = 400, 0.01
+        g = erdos_renyi(n, p, seed=1, graph=DFSGraph())
+        expected = n * (n - 1) * p
+        self.assertLess(abs(g.edge_count() - expected), 0.2 * expected)
+        self.assertTrue(all(u != v for u, v in g.get_edges()))
+        self.assertEqual(erdos_renyi(5, 1.0).edge_count(), 20)
+        self.assertEqual(erdos_renyi(5, 0.0).edge_count(), 0)
+
+    def test_barabasi_albert(self):
+        """测试每个新顶点恰好有 m 条指向已有顶点的出边"""
+        g = barabasi_albert(500, 3, seed=2, graph=DFSGraph())
+        self.assertEqual(g.vertex_count(), 500)
+        for v in range(3, 500):
+            neighbors = g.get_neighbors(v)
+            self.assertEqual(len(neighbors), 3)
+            self.assertTrue(all(t < v for t in neighbors))
+        self.assertRaises(ValueError, barabasi_albert, 3, 3)
+
+    def test_grid_and_tree(self):
+        """测试网格图与完全k叉树"""
+        grid = grid_graph(4, 5)
+        self.assertEqual(grid.vertex_count(), 20)
+        self.assertEqual(grid.edge_count(), 4 * 4 + 5 * 3)
+        self.assertEqual(grid.get_neighbors(0), [1, 5])
+        tree = tree_graph(13, 3)
+        self.assertEqual(tree.get_neighbors(0), [1, 2, 3])
+        self.assertEqual(compute_layers(tree, 0)[1][2], list(range(4, 13)))
+
+    def test_traversal_on_generated_graph(self):
+        """测试在生成的大图上 CSR 遍历与 DirectedGraph 遍历一致"""
+        g = barabasi_albert(2000, 2, seed=3, graph=DFSGraph())
+        csr = g.freeze()
+        self.assertEqual(csr_graph.dfs_traversal(csr, 1999), dfs_traversal(g, 1999))
+        self.assertEqual(compute_layers(csr, 1999), compute_layers(g, 1999))
+
+
+class TestForceLayout(unittest.TestCase):
+    """测试 Barnes-Hut 力导向布局"""
+
+    def _min_distance(self, positions):
+        pts = list(positions.values())
+        return min(((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+                   for i, (x1, y1) in enumerate(pts) for (x2, y2) in pts[i + 1:])
+
+    def test_positions_within_canvas(self):
+        """测试布局结果落在画布边距以内"""
+        g = barabasi_albert(60, 2, seed=4, graph=DFSGraph())
+        layout = ForceLayout(g, width=480, height=380, margin=40, seed=0)
+        layout.run()
+        self.assertTrue(layout.done)
+        self.assertEqual(set(g.vertex_positions), set(g.get_vertices()))
+        for x, y in g.vertex_positions.values():
+            self.assertTrue(40 - 1e-6 <= x <= 440 + 1e-6)
+            self.assertTrue(40 - 1e-6 <= y <= 340 + 1e-6)
+
+    def test_deterministic_with_seed(self):
+        """测试相同种子得到相同布局"""
+        results = []
+        for _ in range(2):
+            g = grid_graph(5, 5, graph=DFSGraph())
+            ForceLayout(g, seed=3, iterations=50).run()
+            results.append(dict(g.vertex_positions))
+        self.assertEqual(results[0], results[1])
+
+    def test_step_is_incremental(self):
+        """测试分片推进与迭代预算"""
+        g = grid_graph(4, 4, graph=DFSGraph())
+        layout = ForceLayout(g, iterations=10, seed=1)
+        layout.step(4)
+        self.assertEqual(layout.iteration, 4)
+        self.assertFalse(layout.done)
+        layout.step(100)
+        self.assertEqual(layout.iteration, 10)
+        self.assertTrue(layout.done)
+
+    @staticmethod
+    def _repulsion(layout, theta):
+        from graph.force_layout import _build_quadtree
+        xs, ys = layout.xs, layout.ys
+        x0, y0 = min(xs), min(ys)
+        size = max(max(xs) - x0, max(ys) - y0)
+        root = _build_quadtree(xs, ys, list(range(len(xs))), x0, y0, size * (1 + 1e-9))
+        return [layout._repulsion(root, i, theta * theta, layout.k ** 2) for i in range(len(xs))]
+
+    def test_approximation_matches_exact(self):
+        """测试 theta=0.8 的斥力与精确计算 (theta=0) 接近，且不把顶点自身算进质心"""
+        import random
+        rng = random.Random(5)
+        g = DFSGraph()
+        g.vertex_positions[0] = (0.0, 0.0)  # 位于整个格子的角上，其余质量集中在对角
+        for v in range(21):
+            g.add_vertex(v)
+            if v:
+                g.vertex_positions[v] = (10 + rng.uniform(-0.5, 0.5), 10 + rng.uniform(-0.5, 0.5))
+        layout = ForceLayout(g, seed=0)
+        (ax, ay), (ex, ey) = self._repulsion(layout, 0.8)[0], self._repulsion(layout, 0.0)[0]
+        self.assertLess(((ax - ex) ** 2 + (ay - ey) ** 2) ** 0.5, 1e-3 * (ex * ex + ey * ey) ** 0.5)
+
+        layout = ForceLayout(barabasi_albert(300, 2, seed=4, graph=DFSGraph()), seed=1)
+        approx, exact = self._repulsion(layout, 0.8), self._repulsion(layout, 0.0)
+        error = sum(((ax - ex) ** 2 + (ay - ey) ** 2) ** 0.5 for (ax, ay), (ex, ey) in zip(approx, exact))
+        total = sum((ex * ex + ey * ey) ** 0.5 for ex, ey in exact)
+        self.assertLess(error, 0.05 * total)
+
+    def test_vertices_spread_apart(self):
+        """测试精确计算与近似计算都能把重合的顶点分开"""
+        for theta in (0.0, 0.8):
+            g = grid_graph(6, 6, graph=DFSGraph())
+            for v in g.get_vertices():
+                g.vertex_positions[v] = (240.0, 190.0)
+            ForceLayout(g, theta=theta, seed=2).run()
+            self.assertGreater(self._min_distance(g.vertex_positions), 15)
+
+
+class TestLayeredLayout(unittest.TestCase):
+    """测试分层 (Sugiyama) 布局"""
+
+    def setUp(self):
+        layered.clear_layout_cache()
+
+    def test_tree_layers_without_crossings(self):
+        """测试树按深度分层，且同层子节点的顺序与父节点一致 (没有交叉)"""
+        g = tree_graph(40, 3, graph=DFSGraph())
+        pos = layered.layered_layout(g, width=2000, height=600)
+        layers = compute_layers(g, 0)[1]
+        ys = {layer: {pos[v][1] for v in vs} for layer, vs in layers.items()}
+        self.assertTrue(all(len(y) == 1 for y in ys.values()))
+        for layer in range(1, len(layers)):
+            children = sorted(layers[layer], key=lambda v: pos[v][0])
+            parents = [pos[(v - 1) // 3][0] for v in children]
+            self.assertEqual(parents, sorted(parents))
+            xs = [pos[v][0] for v in children]
+            self.assertTrue(all(b - a > 1 for a, b in zip(xs, xs[1:])))
+
+    def test_dag_edges_point_down(self):
+        """测试 DAG 的每条边都从上层指向下层，且坐标在画布内"""
+        g = DFSGraph()
+        for u, v in [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("A", "D"), ("D", "E"), ("B", "E")]:
+            g.add_edge(u, v)
+        pos = layered.layered_layout(g)
+        for u, v in g.get_edges():
+            self.assertLess(pos[u][1], pos[v][1])
+        for x, y in pos.values():
+            self.assertTrue(40 <= x <= 440 and 40 <= y <= 340)
+        self.assertEqual(g.vertex_positions, pos)
+
+    def test_cycles_and_self_loops(self):
+        """测试带环、自环与互为反向的边的图也能布局"""
+        g = DFSGraph()
+        for u, v in [("A", "B"), ("B", "C"), ("C", "A"), ("C", "C"), ("B", "A"), ("D", "D")]:
+            g.add_edge(u, v)
+        pos = layered.layered_layout(g)
+        self.assertEqual(set(pos), {"A", "B", "C", "D"})
+        self.assertEqual(len({pos[v][1] for v in "ABC"}), 3)
+
+    def test_cache_by_version(self):
+        """测试图未修改时复用缓存，修改后重新计算"""
+        g = grid_graph(5, 5, graph=DFSGraph())
+        version = g.version
+        first = layered.layered_layout(g)
+        g.vertex_positions.clear()
+        original = layered._compute
+        layered._compute = None  # 命中缓存时不会调用
+        try:
+            self.assertEqual(layered.layered_layout(g), first)
+            self.assertEqual(g.vertex_positions, first)
+        finally:
+            layered._compute = original
+        g.add_edge(0, 24)
+        self.assertGreater(g.version, version)
+        self.assertNotEqual(layered.layered_layout(g)[24], first[24])
+
+    def test_large_random_graph(self):
+        """测试大规模带环随机图 (虚拟顶点受预算限制)"""
+        g = erdos_renyi(1500, 0.002, seed=5)
+        pos = layered.layered_layout(g, width=3000, height=3000)
+        self.assertEqual(len(pos), 1500)
+
+
+class TestDFSApplications(unittest.TestCase):
+    """测试拓扑排序与强连通分量"""
+
+    def _graph(self, edges):
+        g = DFSGraph()
+        for u, v in edges:
+            g.add_edge(u, v)
+        return g
+
+    def test_topological_sort(self):
+        """测试拓扑序满足所有边的先后关系"""
+        g = barabasi_albert(3000, 3, seed=6, graph=DFSGraph())
+        order = topological_sort(g)
+        position = {v: i for i, v in enumerate(order)}
+        self.assertEqual(len(order), 3000)
+        self.assertTrue(all(position[u] < position[v] for u, v in g.get_edges()))
+        self.assertEqual(topological_sort(self._graph([("A", "B"), ("A", "C"), ("C", "B")])), ["A", "C", "B"])
+
+    def test_topological_sort_cycle(self):
+        """测试有环时报错，步骤在回边处终止"""
+        g = self._graph([("A", "B"), ("B", "C"), ("C", "A")])
+        self.assertRaises(ValueError, topological_sort, g)
+        steps = topological_sort_traversal(g)
+        self.assertEqual(steps[-2:], [("cycle", "C", "A"), ("done", None, None)])
+
+    def test_deep_path_without_recursion(self):
+        """测试超过递归深度限制的长路径"""
+        n = sys.getrecursionlimit() * 3
+        g = tree_graph(n, 1, graph=DFSGraph())
+        self.assertEqual(topological_sort(g), list(range(n)))
+        g.add_edge(n - 1, 0)
+        self.assertEqual(len(strongly_connected_components(g)), 1)
+
+    def test_scc(self):
+        """测试 Tarjan 与 Kosaraju 结果一致，且分量顺序互为逆拓扑序"""
+        g = self._graph([("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"), ("D", "E"),
+                         ("E", "D"), ("F", "F"), ("E", "F")])
+        tarjan = [sorted(c) for c in strongly_connected_components(g)]
+        self.assertEqual(tarjan, [["F"], ["D", "E"], ["A", "B", "C"]])
+        self.assertEqual([sorted(c) for c in kosaraju_scc(g)], tarjan[::-1])
+        big = erdos_renyi(2000, 0.0008, seed=8, graph=DFSGraph())
+        self.assertEqual(sorted(sorted(c) for c in strongly_connected_components(big)),
+                         sorted(sorted(c) for c in kosaraju_scc(big)))
+
+    def test_traversal_steps(self):
+        """测试动画步骤与直接计算的结果一致"""
+        g = self._graph([("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"), ("A", "E")])
+        steps = tarjan_scc_traversal(g)
+        self.assertEqual(steps[0], ("init", None, None))
+        self.assertEqual(steps[-1], ("done", None, None))
+        found = [d1 for action, d1, _ in steps if action == "scc"]
+        self.assertEqual(found, strongly_connected_components(g))
+        pushes = [d1 for action, d1, _ in steps if action == "push"]
+        pops = [d1 for action, d1, _ in steps if action == "pop"]
+        self.assertEqual(sorted(pushes), sorted(pops))
+        for action, d1, d2 in steps:
+            if action == "backtrack":
+                self.assertTrue(g.has_edge(d2[0], d1))
+
+        dag = self._graph([("A", "B"), ("A", "C"), ("C", "B"), ("D", "C")])
+        steps = topological_sort_traversal(dag)
+        self.assertEqual(steps[-2], ("topo_order", topological_sort(dag), None))
+        self.assertEqual([d1 for action, d1, _ in steps if action == "finish"],
+                         topological_sort(dag)[::-1])
+
+    def test_skip_steps_carry_edge_source(self):
+        """测试 ("skip", v, u) 紧跟在检查同一条边 u -> v 的步骤之后"""
+        dag = self._graph([("A", "B"), ("A", "C"), ("C", "B"), ("D", "C")])
+        cyclic = self._graph([("A", "B"), ("B", "A"), ("C", "A"), ("C", "B"), ("D", "C")])
+        for g, steps in ((dag, topological_sort_traversal(dag)), (cyclic, tarjan_scc_traversal(cyclic))):
+            skips = [i for i, step in enumerate(steps) if step[0] == "skip"]
+            self.assertTrue(skips)
+            for i in skips:
+                _, v, u = steps[i]
+                self.assertTrue(g.has_edge(u, v))
+                self.assertEqual(steps[i - 1], ("check_edge", u, v))
+
+
+class TestShortestPath(unittest.TestCase):
+    """测试带权边、索引堆与 Dijkstra / A*"""
+
+    def _weighted(self, edges):
+        g = DFSGraph()
+        for u, v, w in edges:
+            g.add_edge(u, v, w)
+        return g
+
+    def test_weighted_edges(self):
+        """测试边权的读写与序列化"""
+        for graph_cls in (DFSGraph, BFSGraph):
+            g = graph_cls()
+            g.add_edge("A", "B", 2.5)
+            g.add_edge("A", "C")
+            self.assertEqual(g.get_weight("A", "B"), 2.5)
+            self.assertEqual(g.get_weight("A", "C"), 1)
+            self.assertIsNone(g.get_weight("B", "A"))
+            self.assertFalse(g.add_edge("A", "B", 7))
+            self.assertTrue(g.set_weight("A", "B", 4))
+            self.assertFalse(g.set_weight("B", "A", 4))
+            restored = graph_cls.from_dict(g.to_dict())
+            self.assertEqual(restored.get_weight("A", "B"), 4)
+            self.assertEqual(restored.get_weight("A", "C"), 1)
+
+    def test_indexed_heap(self):
+        """测试索引堆的 push / pop / decrease_key"""
+        import random
+        rng = random.Random(1)
+        heap = IndexedMinHeap()
+        expected = {}
+        for k in range(500):
+            p = rng.random()
+            heap.push(k, p)
+            expected[k] = p
+        for k in range(0, 500, 3):
+            expected[k] /= 2
+            heap.decrease_key(k, expected[k])
+        self.assertRaises(ValueError, heap.decrease_key, 1, 2.0)
+        self.assertRaises(ValueError, heap.push, 1, 0.5)
+        self.assertFalse(heap.push_or_decrease(1, 2.0))
+        popped = [heap.pop() for _ in range(len(heap))]
+        self.assertEqual(popped, sorted(expected.items(), key=lambda kv: kv[1]))
+        self.assertRaises(IndexError, heap.pop)
+
+    def test_recorded_operations(self):
+        """测试记录的堆操作与 HeapOperation 格式一致"""
+        heap = IndexedMinHeap(record=True)
+        for k, p in [("a", 5), ("b", 3), ("c", 8), ("d", 1)]:
+            heap.push(k, p)
+        heap.decrease_key("c", 0)
+        self.assertEqual(heap.operations[-1].heap_state[0], 0)
+        types = {op.op_type for op in heap.operations}
+        self.assertTrue({"insert", "compare", "swap", "sift_up_done", "decrease_key"} <= types)
+        self.assertEqual(heap.pop(), ("c", 0))
+        self.assertEqual(heap.operations[-1].op_type, "sift_down_done")
+
+    def test_dijkstra(self):
+        """测试 Dijkstra 距离、路径与 decrease-key"""
+        g = self._weighted([("A", "B", 4), ("A", "C", 1), ("C", "B", 2), ("B", "D", 1),
+                            ("C", "D", 5), ("D", "E", 3)])
+        dist, parent = dijkstra(g, "A")
+        self.assertEqual(dist, {"A": 0, "B": 3, "C": 1, "D": 4, "E": 7})
+        self.assertEqual(reconstruct_path(parent, "E"), ["A", "C", "B", "D", "E"])
+        self.assertEqual(shortest_path(g, "E", "A"), (None, None))
+        self.assertRaises(ValueError, dijkstra, g, "Z")
+        g.add_edge("E", "A", -1)
+        self.assertRaises(ValueError, dijkstra, g, "A")
+
+    def test_astar_on_grid(self):
+        """测试 A* 与 Dijkstra 在带权网格上的最短距离一致"""
+        import random
+        rng = random.Random(2)
+        cols = 30
+        g = grid_graph(30, cols, graph=DFSGraph())
+        for u, v in g.get_edges():
+            g.set_weight(u, v, rng.randint(1, 9))
+
+        def manhattan(v, t):
+            return abs(v // cols - t // cols) + abs(v % cols - t % cols)
+
+        target = 30 * cols - 1
+        dist, _ = dijkstra(g, 0)
+        path, length = shortest_path(g, 0, target, manhattan)
+        self.assertEqual(length, dist[target])
+        self.assertEqual(sum(g.get_weight(u, v) for u, v in zip(path, path[1:])), length)
+        self.assertEqual(astar(g, 0, target, manhattan)[0][target], dist[target])
+
+    def test_traversal_steps(self):
+        """测试动画步骤：每个顶点出堆一次，堆操作紧随其后"""
+        g = self._weighted([("A", "B", 4), ("A", "C", 1), ("C", "B", 2), ("B", "D", 1)])
+        steps = dijkstra_traversal(g, "A", "D")
+        self.assertEqual([d1 for a, d1, _ in steps if a == "pop"], ["A", "C", "B", "D"])
+        self.assertIn(("relax", "B", (4, 3)), steps)
+        self.assertEqual(steps[-2], ("path", ["A", "C", "B", "D"], 4))
+        relax = steps.index(("relax", "B", (4, 3)))
+        self.assertEqual(steps[relax + 1][0], "heap")
+        self.assertEqual(steps[relax + 1][1][0].op_type, "decrease_key")
+        self.assertEqual(dijkstra_traversal(g, "Z")[0][0], "error")
+
+
+class TestGraphIO(unittest.TestCase):
+    """测试流式边表读写"""
+
+    def _sample(self):
+        g = DFSGraph()
+        g.add_edge("A", "B", 2.5)
+        g.add_edge("A", "C")
+        g.add_edge("C", "A", 3)
+        g.add_vertex("D")  # 孤立顶点
+        g.set_position("A", 10.25, 20)
+        g.set_position("D", 1 / 3, 7.0)
+        return g
+
+    def _assert_same(self, a, b):
+        self.assertEqual(a.get_vertices(), b.get_vertices())
+        self.assertEqual(a.get_edges(), b.get_edges())
+        self.assertEqual(a.vertex_positions, b.vertex_positions)
+        for u, v in a.get_edges():
+            self.assertEqual(a.get_weight(u, v), b.get_weight(u, v))
+
+    def test_text_round_trip(self):
+        """测试文本格式保留顶点顺序、孤立顶点、权值与位置"""
+        import io
+        g = self._sample()
+        buf = io.StringIO()
+        graph_io.write_edge_list(g, buf)
+        buf.seek(0)
+        self._assert_same(g, graph_io.read_edge_list(buf, DFSGraph()))
+
+    def test_text_labels_with_spaces(self):
+        """测试带空白、%、开头为 # / @ 的顶点名经过转义后能往返"""
+        import io
+        g = DFSGraph()
+        g.add_edge("New York", "LA")
+        g.add_edge("LA", "#1", 2)
+        g.add_edge("@", "100%\tdone")
+        g.add_vertex("上 海")
+        g.set_position("New York", 1.0, 2.0)
+        buf = io.StringIO()
+        graph_io.write_edge_list(g, buf)
+        self.assertNotIn("New York", buf.getvalue())
+        buf.seek(0)
+        self._assert_same(g, graph_io.read_edge_list(buf, DFSGraph()))
+        buf.seek(0)
+        self.assertEqual(graph_io.read_edge_list(buf).get_edges(), g.get_edges())
+
+    def test_binary_round_trip(self):
+        """测试二进制格式 (跨多个分块) 与整数顶点"""
+        import io
+        g = self._sample()
+        buf = io.BytesIO()
+        graph_io.write_binary(g, buf)
+        buf.seek(0)
+        self._assert_same(g, graph_io.read_binary(buf, BFSGraph()))
+
+        big = erdos_renyi(3000, 0.005, seed=9, graph=DFSGraph())
+        original = graph_io.CHUNK_EDGES
+        graph_io.CHUNK_EDGES = 1000
+        try:
+            buf = io.BytesIO()
+            graph_io.write_binary(big, buf)
+            buf.seek(0)
+            self._assert_same(big, graph_io.read_binary(buf, DFSGraph()))
+            buf.seek(0)
+            csr = graph_io.read_binary(buf)
+            self.assertEqual(csr.get_edges(), big.get_edges())
+        finally:
+            graph_io.CHUNK_EDGES = original
+
+    def test_files_and_csr(self):
+        """测试读写文件路径，默认读成 CSRGraph"""
+        import tempfile
+        g = grid_graph(6, 7, graph=DFSGraph())
+        g.set_position(5, 1.5, 2.5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            graph_io.write_edge_list(g, path)
+            csr = graph_io.read_edge_list(path, vertex_type=int)
+            self.assertIsInstance(csr, CSRGraph)
+            self.assertEqual(csr.get_edges(), g.get_edges())
+            self.assertEqual(csr.vertex_positions, {5: (1.5, 2.5)})
+            path = os.path.join(tmp, "grid.bin")
+            graph_io.write_binary(csr, path, positions=False)
+            self.assertEqual(graph_io.read_binary(path, DFSGraph()).get_edges(), g.get_edges())
+
+    def test_plain_edge_list_and_errors(self):
+        """测试读取普通的 "u v" 边表文件以及格式错误"""
+        import io
+        text = "# SNAP style\n1 2\n2 3\n\n1 3 0.5\n"
+        g = graph_io.read_edge_list(io.StringIO(text), DFSGraph(), vertex_type=int)
+        self.assertEqual(g.get_edges(), [(1, 2), (1, 3), (2, 3)])
+        self.assertEqual(g.get_weight(1, 3), 0.5)
+        self.assertRaises(ValueError, graph_io.read_edge_list, io.StringIO("1 2 3 4\n"), DFSGraph())
+        self.assertRaises(ValueError, graph_io.read_binary, io.BytesIO(b"XXXX" + bytes(20)))
+
+
+class TestSharedGraphCore(unittest.TestCase):
+    """测试 DFS / BFS 演示共用的图内核与兼容模块"""
+
+    def test_single_graph_class(self):
+        """测试两个兼容模块导出同一个 DirectedGraph"""
+        self.assertIs(DFSGraph, DirectedGraph)
+        self.assertIs(BFSGraph, DirectedGraph)
+        import stack.graph_model as stack_graph
+        import circular_queue.graph_model as queue_graph
+        self.assertIs(stack_graph.generate_random_graph, queue_graph.generate_random_graph)
+
+    def test_iterators_match_steps(self):
+        """测试惰性迭代器与动画步骤的访问顺序一致"""
+        g = barabasi_albert(300, 2, seed=4, graph=DirectedGraph())
+        for v in range(0, 300, 37):
+            g.add_edge(v, 299 - v)
+        visits = [d1 for action, d1, _ in dfs_traversal(g, 299) if action == "visit"]
+        self.assertEqual(list(iter_dfs(g, 299)), visits)
+        visits = [d1 for action, d1, _ in bfs_traversal(g, 299) if action == "visit"]
+        self.assertEqual(list(iter_bfs(g, 299)), visits)
+        self.assertEqual(list(iter_dfs(g, "missing")), [])
+        self.assertEqual(list(iter_bfs(g, "missing")), [])
+
+    def test_demo_graphs(self):
+        """测试演示图生成器在所有允许的规模下都能生成连通的树状图"""
+        for n in range(5, 13):
+            for _ in range(5):
+                for g in (generate_dfs_friendly_graph(n, 2, 4), generate_bfs_friendly_graph(n, 2, 3)):
+                    self.assertEqual(g.vertex_count(), n)
+                    self.assertEqual(len(list(iter_bfs(g, "A"))), n)
+                    self.assertEqual(set(g.vertex_positions), set(g.get_vertices()))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)